@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+창고→현장 출고 매칭 벤치마크 (레거시 iterrows vs 정렬 + searchsorted 매칭)
+
+사용법:
+    python benchmarks/bench_outbound_matcher.py --rows 40000 --repeat 3
+
+``calculate_warehouse_outbound_corrected``와 ``calculate_monthly_sqm_outbound``를
+``use_vectorized=False``(레거시)와 ``True``로 실행하고 창고→현장 출고 결과가
+같은지 함께 검증합니다. 합성 데이터는 한 행의 창고 날짜가 모두 다른 날이어서
+창고간 이동(동일 날짜)이 없으므로 두 경로의 규칙이 같습니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from scripts.stage3_report.report_generator import (  # noqa: E402
+    CorrectedWarehouseIOCalculator,
+)
+
+
+def make_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """창고/현장 날짜가 흩어진 합성 케이스 (창고 날짜는 행 안에서 서로 다른 날)"""
+    calculator = CorrectedWarehouseIOCalculator()
+    rng = np.random.RandomState(seed)
+    base = pd.Timestamp("2023-01-01")
+    warehouses = calculator.warehouse_columns
+    data = {
+        "Case No.": [f"HE-{i:07d}" for i in range(n_rows)],
+        "Pkg": rng.choice([1, 2, 3, np.nan], n_rows),
+        "SQM": rng.choice([np.nan, 1.5, 4.2, 9.0], n_rows),
+    }
+    wh_days = {}
+    for position, column in enumerate(warehouses):
+        days = rng.randint(0, 60, n_rows) * len(warehouses) + position
+        wh_days[column] = days
+        data[column] = pd.Series(base + pd.to_timedelta(days, unit="D")).where(
+            rng.rand(n_rows) < 0.25
+        )
+    for column in calculator.site_columns:
+        days = rng.randint(0, 60 * len(warehouses), n_rows)
+        # 일부는 창고 입고일과 같은 날 현장 도착 (동일 날짜 제외 규칙)
+        same_day = rng.rand(n_rows) < 0.1
+        days[same_day] = wh_days[warehouses[0]][same_day]
+        data[column] = pd.Series(base + pd.to_timedelta(days, unit="D")).where(
+            rng.rand(n_rows) < 0.4
+        )
+    return pd.DataFrame(data)
+
+
+def _site_events(result) -> list:
+    """창고→현장 출고 (행 라벨, 창고, 현장, 날짜, 수량) 정렬 목록"""
+    events = []
+    for item in result["outbound_items"]:
+        if item["Outbound_Type"] != "warehouse_to_site":
+            continue
+        events.append(
+            (
+                int(item["Item_ID"]),
+                item["From_Location"],
+                item["To_Location"],
+                pd.Timestamp(item["Outbound_Date"]),
+                int(item["Pkg_Quantity"]),
+            )
+        )
+    return sorted(events)
+
+
+def _assert_same_site_events(expected, actual) -> None:
+    assert _site_events(actual) == _site_events(expected)
+    assert actual["total_outbound"] == expected["total_outbound"]
+
+
+def _assert_same_sqm(expected: dict, actual: dict) -> None:
+    assert expected.keys() == actual.keys()
+    for month, by_warehouse in expected.items():
+        assert by_warehouse.keys() == actual[month].keys()
+        for warehouse, value in by_warehouse.items():
+            assert abs(actual[month][warehouse] - value) < 1e-6, (month, warehouse)
+
+
+def _best_of(func, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="warehouse→site outbound matcher benchmark")
+    parser.add_argument("--rows", type=int, default=40_000, help="합성 행 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    df = make_frame(args.rows)
+    legacy = CorrectedWarehouseIOCalculator(use_vectorized=False)
+    vectorized = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    print(f"rows={len(df):,}")
+
+    with contextlib.redirect_stdout(None):
+        timings = {
+            name: (
+                _best_of(lambda: legacy_method(df), 1),
+                _best_of(lambda: vectorized_method(df), args.repeat),
+            )
+            for name, legacy_method, vectorized_method in (
+                (
+                    "outbound",
+                    legacy.calculate_warehouse_outbound_corrected,
+                    vectorized.calculate_warehouse_outbound_corrected,
+                ),
+                (
+                    "sqm_outbound",
+                    legacy.calculate_monthly_sqm_outbound,
+                    vectorized.calculate_monthly_sqm_outbound,
+                ),
+            )
+        }
+
+    (_, expected), (_, actual) = timings["outbound"]
+    _assert_same_site_events(expected, actual)
+    (_, expected_sqm), (_, actual_sqm) = timings["sqm_outbound"]
+    _assert_same_sqm(expected_sqm, actual_sqm)
+
+    for name, ((legacy_time, _), (vectorized_time, _)) in timings.items():
+        print(
+            f"{name:<13} legacy {legacy_time:8.3f}s  sort-merge {vectorized_time:8.3f}s  "
+            f"speedup {legacy_time / vectorized_time:8.1f}x"
+        )
+    print("outputs identical")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
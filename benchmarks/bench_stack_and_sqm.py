@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+add_sqm_and_stack 벤치마크 (행 단위 apply vs 컬럼 단위 벡터화)
+
+사용법:
+    python benchmarks/bench_stack_and_sqm.py --rows 100000 --repeat 3
+
+행 단위 기준선은 변경 전 구현과 같은 방식(compute_sqm_from_dims /
+parse_stack_status를 행마다 apply)으로 계산하며, 두 결과가 동일한지 함께 검증합니다.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from scripts.stage2_derived.stack_and_sqm import (  # noqa: E402
+    add_sqm_and_stack,
+    compute_sqm_from_dims,
+    parse_stack_status,
+)
+
+STACK_TEXTS = [
+    "Not stackable",
+    "Non-Stackable",
+    "Stackable",
+    "Stackable X2",
+    "Stackable / 3 pcs",
+    "Stackable 2 tier 800 kg/m2",
+    "600kg/m2",
+    "Only on top",
+    "X4",
+    "1X",
+    "",
+    None,
+]
+
+
+def make_frame(n_rows: int, seed: int = 42) -> pd.DataFrame:
+    """Stage 2 입력과 비슷한 치수/Stack 텍스트 합성 데이터"""
+    rng = np.random.RandomState(seed)
+    # 실제 데이터처럼 수백 종류의 Stack 텍스트 (기본 문구 + 하중 표기 변형)
+    variants = [
+        f"{text} ({load}kg/m2)" if text else text
+        for text in STACK_TEXTS
+        for load in range(0, 1000, 25)
+    ]
+    lengths = rng.randint(20, 1200, n_rows).astype(object)
+    lengths[rng.rand(n_rows) < 0.05] = None
+    widths = np.array([f"{w:,}" for w in rng.randint(20, 1500, n_rows)], dtype=object)
+    return pd.DataFrame(
+        {
+            "L(CM)": lengths,
+            "W(CM)": widths,
+            "Stackability": pd.Series(rng.choice(np.array(variants, dtype=object), n_rows)),
+        }
+    )
+
+
+def add_sqm_and_stack_rowwise(df: pd.DataFrame) -> pd.DataFrame:
+    """변경 전 행 단위 구현 (비교 기준선)"""
+    result_df = df.copy()
+    result_df["SQM"] = result_df.apply(lambda row: compute_sqm_from_dims(row), axis=1)
+    result_df["Stack_Status"] = df["Stackability"].apply(parse_stack_status)
+    return result_df
+
+
+def _best_of(func, df: pd.DataFrame, repeat: int) -> tuple[float, pd.DataFrame]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="add_sqm_and_stack benchmark")
+    parser.add_argument("--rows", type=int, default=100_000, help="합성 행 수")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수 (최솟값 사용)")
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    print(f"rows={len(df):,}, distinct stack texts={df['Stackability'].nunique(dropna=False)}")
+
+    rowwise_time, expected = _best_of(add_sqm_and_stack_rowwise, df, args.repeat)
+    vectorized_time, actual = _best_of(add_sqm_and_stack, df, args.repeat)
+    pd.testing.assert_frame_equal(actual, expected)
+
+    print(f"row-wise apply : {rowwise_time:8.3f}s")
+    print(f"vectorized     : {vectorized_time:8.3f}s")
+    print(f"speedup        : {rowwise_time / vectorized_time:8.1f}x (outputs identical)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,734 @@
+# -*- coding: utf-8 -*-
+"""
+HVDC 파이프라인 벤치마크 하네스
+
+합성 워크로드(``synthetic_workload.py``)를 케이스 수별로 만들고 다음을 측정해
+JSON으로 저장합니다. 커밋 간 결과 파일을 ``--compare``로 비교하면 회귀가 드러납니다.
+
+Suites:
+    functions      핫 함수 - Stage 1 ``_apply_updates`` (vectorized/legacy),
+                   Stage 2 ``calculate_derived_columns``, Stage 3 계산기
+                   (legacy/vectorized/parallel), Stage 4 ``HybridAnomalyDetector.run``
+    stack_and_sqm  ``add_sqm_and_stack`` (vectorized/rowwise, bench_stack_and_sqm.py 재사용)
+    stages         Stage 1-4 전체 실행 (xlsx 입출력 포함, StageProfiler 단계별 타이머/최대 RSS)
+
+legacy 변형(행 단위 루프)은 ``--legacy-max-cases``보다 큰 규모에서 건너뜁니다.
+
+사용법:
+    python benchmarks/run_benchmarks.py --cases 1000,10000 --repeat 3
+    python benchmarks/run_benchmarks.py --cases 100000 --suite functions --workers 8
+    python benchmarks/run_benchmarks.py --cases 1000 --compare benchmarks/results/old.json
+
+결과 파일 기본 경로: ``benchmarks/results/bench_<YYYYmmdd_HHMMSS>_<commit>.json``
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+BENCH_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = BENCH_DIR.parent
+for _path in (PROJECT_ROOT, PROJECT_ROOT / "scripts", BENCH_DIR):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+from synthetic_workload import (  # noqa: E402
+    GENERATOR_VERSION,
+    INVOICE_FILE,
+    MASTER_FILE,
+    SIMENSE_FILE,
+    WAREHOUSE_FILE,
+    SyntheticWorkload,
+    WorkloadPaths,
+    generate_workload,
+    load_manifest,
+)
+
+RESULT_FORMAT_VERSION = 1
+DEFAULT_CASES = "1000,10000"
+DEFAULT_SUITES = ["functions", "stack_and_sqm", "stages"]
+DEFAULT_RESULTS_DIR = BENCH_DIR / "results"
+DEFAULT_WORKDIR = PROJECT_ROOT / "temp" / "benchmarks"
+STAGE3_SHEET = "통합_원본데이터_Fixed"
+
+# (결과 이름, 계산기 메서드, 추가 인자, 병렬 경로 지원)
+STAGE3_CALCULATORS = [
+    ("inbound", "calculate_warehouse_inbound_corrected", (), True),
+    ("outbound", "calculate_warehouse_outbound_corrected", (), True),
+    ("inventory", "calculate_warehouse_inventory_corrected", (), False),
+    ("direct_delivery", "calculate_direct_delivery", (), False),
+    ("inbound_pivot", "create_monthly_inbound_pivot", (), False),
+    ("sqm_inbound", "calculate_monthly_sqm_inbound", (), False),
+    ("sqm_outbound", "calculate_monthly_sqm_outbound", (), True),
+    ("invoice_charges", "calculate_monthly_invoice_charges_prorated", ({},), True),
+]
+
+logger = logging.getLogger("hvdc_benchmarks")
+
+
+@dataclass
+class BenchResult:
+    """측정 1건 (같은 함수/변형/규모의 반복 실행)"""
+
+    suite: str
+    name: str
+    variant: str
+    cases: int
+    rows: int
+    seconds: List[float] = field(default_factory=list)
+    status: str = "ok"
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.suite}/{self.name}/{self.variant}@{self.cases}"
+
+    @property
+    def best(self) -> Optional[float]:
+        return min(self.seconds) if self.seconds else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        best = self.best
+        return {
+            "key": self.key,
+            "suite": self.suite,
+            "name": self.name,
+            "variant": self.variant,
+            "cases": self.cases,
+            "rows": self.rows,
+            "status": self.status,
+            "best_seconds": None if best is None else round(best, 6),
+            "median_seconds": (
+                None if not self.seconds else round(statistics.median(self.seconds), 6)
+            ),
+            "seconds": [round(value, 6) for value in self.seconds],
+            "rows_per_sec": None if not best else round(self.rows / best, 1),
+            "error": self.error,
+            **({"extra": self.extra} if self.extra else {}),
+        }
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    """Stage 코드의 print/WARNING 이하 로그 숨김 (측정 결과만 출력)"""
+    if not enabled:
+        yield
+        return
+    previous = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    try:
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            with contextlib.redirect_stdout(devnull):
+                yield
+    finally:
+        logging.disable(previous)
+
+
+class BenchmarkRunner:
+    """규모별 suite 실행 및 결과 수집"""
+
+    def __init__(
+        self,
+        repeat: int = 3,
+        seed: int = 42,
+        workers: int = 2,
+        legacy_max_cases: int = 20_000,
+        workdir: Path = DEFAULT_WORKDIR,
+        verbose: bool = False,
+    ):
+        self.repeat = max(1, repeat)
+        self.seed = seed
+        self.workers = workers
+        self.legacy_max_cases = legacy_max_cases
+        self.workdir = Path(workdir)
+        self.verbose = verbose
+        self.results: List[BenchResult] = []
+
+    # ----- 측정 공통 -----
+    def measure(
+        self,
+        suite: str,
+        name: str,
+        variant: str,
+        cases: int,
+        rows: int,
+        func: Callable[..., Any],
+        setup: Optional[Callable[[], tuple]] = None,
+        repeat: Optional[int] = None,
+    ) -> BenchResult:
+        """``setup()`` (측정 제외) → ``func(*args)`` 를 repeat회 측정"""
+        result = BenchResult(suite, name, variant, cases, rows)
+        try:
+            for _ in range(repeat or self.repeat):
+                args = setup() if setup else ()
+                with quiet(not self.verbose):
+                    start = time.perf_counter()
+                    func(*args)
+                    result.seconds.append(time.perf_counter() - start)
+        except Exception as exc:  # pylint: disable=broad-except
+            result.status = "error"
+            result.error = f"{type(exc).__name__}: {exc}"
+            logger.debug(traceback.format_exc())
+        return self._record(result)
+
+    def skip(self, suite: str, name: str, variant: str, cases: int, rows: int, reason: str):
+        result = BenchResult(suite, name, variant, cases, rows, status="skipped", error=reason)
+        return self._record(result)
+
+    def _record(self, result: BenchResult) -> BenchResult:
+        self.results.append(result)
+        if result.status == "ok":
+            print(
+                f"  {result.key:<58} best {result.best:9.4f}s  "
+                f"({result.rows / result.best if result.best else 0:,.0f} rows/s)"
+            )
+        else:
+            print(f"  {result.key:<58} {result.status}: {result.error}")
+        return result
+
+    def _legacy_allowed(self, cases: int) -> bool:
+        return cases <= self.legacy_max_cases
+
+    # ----- suites -----
+    def run_functions(self, workload: SyntheticWorkload) -> None:
+        from scripts.stage1_sync_sorted.data_synchronizer_v30 import DataSynchronizerV30
+        from scripts.stage2_derived.derived_columns_processor import calculate_derived_columns
+        from scripts.stage4_anomaly.anomaly_detector_balanced import (
+            DetectorConfig,
+            HybridAnomalyDetector,
+        )
+
+        cases = workload.cases
+        master = workload.master
+
+        # Stage 1 _apply_updates (정렬까지 마친 프레임 기준)
+        with quiet(not self.verbose):
+            sync = DataSynchronizerV30()
+            master_cols = sync._match_and_validate_headers(master, "Master")
+            wh_cols = sync._match_and_validate_headers(workload.warehouse, "Warehouse")
+            m_sorted, w_sorted = sync._apply_master_order_sorting(
+                master, workload.warehouse.copy(), master_cols, wh_cols
+            )
+
+        for variant, vectorized in (("vectorized", True), ("legacy", False)):
+            if not vectorized and not self._legacy_allowed(cases):
+                self.skip(
+                    "functions",
+                    "stage1._apply_updates",
+                    variant,
+                    cases,
+                    len(m_sorted),
+                    "legacy_max_cases",
+                )
+                continue
+            self.measure(
+                "functions",
+                "stage1._apply_updates",
+                variant,
+                cases,
+                len(m_sorted),
+                lambda sync, m, w: sync._apply_updates(m, w, master_cols, wh_cols),
+                setup=lambda v=vectorized: (
+                    DataSynchronizerV30(use_vectorized=v),
+                    m_sorted.copy(),
+                    w_sorted.copy(),
+                ),
+            )
+
+        # Stage 2
+        self.measure(
+            "functions",
+            "stage2.calculate_derived_columns",
+            "vectorized",
+            cases,
+            len(master),
+            calculate_derived_columns,
+            setup=lambda: (master,),
+        )
+
+        # Stage 3 계산기
+        with quiet(not self.verbose):
+            hitachi = calculate_derived_columns(master)
+            simense = calculate_derived_columns(workload.simense)
+            stage3_df = build_stage3_frame(hitachi, simense)
+        rows = len(stage3_df)
+
+        variants = [("vectorized", {"use_vectorized": True})]
+        variants.append(
+            ("parallel", {"use_vectorized": True, "use_parallel": True, "workers": self.workers})
+        )
+        if self._legacy_allowed(cases):
+            variants.append(("legacy", {"use_vectorized": False}))
+        else:
+            self.skip("functions", "stage3.*", "legacy", cases, rows, "legacy_max_cases")
+
+        for variant, options in variants:
+            calculator = new_calculator(**options)
+            self.measure(
+                "functions",
+                "stage3.final_location",
+                variant,
+                cases,
+                rows,
+                calculator.calculate_final_location,
+                setup=lambda: (stage3_df.copy(),),
+            )
+            with quiet(not self.verbose):
+                located = calculator.calculate_final_location(stage3_df.copy())
+            for name, method, extra_args, parallel_supported in STAGE3_CALCULATORS:
+                if variant == "parallel" and not parallel_supported:
+                    continue
+                result = self.measure(
+                    "functions",
+                    f"stage3.{name}",
+                    variant,
+                    cases,
+                    rows,
+                    getattr(calculator, method),
+                    setup=lambda extra=extra_args: (located, *extra),
+                )
+                if variant == "parallel" and name in calculator.parallel_timings:
+                    result.extra["chunks"] = [
+                        {"chunk": t.chunk_id, "pid": t.pid, "rows": t.rows, "seconds": t.seconds}
+                        for t in calculator.parallel_timings[name]
+                    ]
+                    result.extra["workers"] = self.workers
+
+        # Stage 4 (current = 위치 날짜 행렬, legacy = iterrows 규칙/피처)
+        self.measure(
+            "functions",
+            "stage4.HybridAnomalyDetector.run",
+            "current",
+            cases,
+            rows,
+            lambda frame: HybridAnomalyDetector(DetectorConfig()).run(frame),
+            setup=lambda: (located,),
+        )
+        if self._legacy_allowed(cases):
+            self.measure(
+                "functions",
+                "stage4.HybridAnomalyDetector.run",
+                "legacy",
+                cases,
+                rows,
+                lambda frame: HybridAnomalyDetector(DetectorConfig(use_vectorized=False)).run(
+                    frame
+                ),
+                setup=lambda: (located,),
+            )
+        else:
+            self.skip(
+                "functions",
+                "stage4.HybridAnomalyDetector.run",
+                "legacy",
+                cases,
+                rows,
+                "legacy_max_cases",
+            )
+
+    def run_stack_and_sqm(self, cases: int) -> None:
+        from bench_stack_and_sqm import add_sqm_and_stack_rowwise, make_frame
+        from scripts.stage2_derived.stack_and_sqm import add_sqm_and_stack
+
+        frame = make_frame(cases, seed=self.seed)
+        self.measure(
+            "stack_and_sqm",
+            "stage2.add_sqm_and_stack",
+            "vectorized",
+            cases,
+            cases,
+            add_sqm_and_stack,
+            setup=lambda: (frame,),
+        )
+        if self._legacy_allowed(cases):
+            self.measure(
+                "stack_and_sqm",
+                "stage2.add_sqm_and_stack",
+                "rowwise",
+                cases,
+                cases,
+                add_sqm_and_stack_rowwise,
+                setup=lambda: (frame,),
+            )
+        else:
+            self.skip(
+                "stack_and_sqm",
+                "stage2.add_sqm_and_stack",
+                "rowwise",
+                cases,
+                cases,
+                "legacy_max_cases",
+            )
+
+    def run_stages(self, workload: SyntheticWorkload) -> None:
+        from core.stage_artifacts import read_excel_with_sidecar
+        from core.stage_profiler import StageProfiler, set_active_profiler
+        from scripts.stage1_sync_sorted.data_synchronizer_v30 import DataSynchronizerV30
+        from scripts.stage2_derived.derived_columns_processor import (
+            process_derived_columns,
+            resolve_derived_output_path,
+        )
+        from scripts.stage3_report.report_generator import HVDCExcelReporterFinal
+        from scripts.stage4_anomaly.anomaly_detector_balanced import (
+            DetectorConfig,
+            HybridAnomalyDetector,
+        )
+
+        cases = workload.cases
+        paths = self.prepare_workbooks(workload)
+        run_root = self.workdir / f"cases_{cases}_seed_{self.seed}" / "run"
+        run_root.mkdir(parents=True, exist_ok=True)
+        state: Dict[str, Path] = {}
+
+        def stage1():
+            synced = run_root / "synced" / "HVDC WAREHOUSE_HITACHI(HE).synced.xlsx"
+            synced.parent.mkdir(parents=True, exist_ok=True)
+            result = DataSynchronizerV30().synchronize(
+                str(paths.master), str(paths.warehouse), str(synced)
+            )
+            if not result.success:
+                raise RuntimeError(result.message)
+            state["synced"] = Path(result.output_path)
+
+        def stage2():
+            process_derived_columns(input_file=state["synced"], project_root=run_root)
+            state["derived"] = resolve_derived_output_path(project_root=run_root)
+
+        def stage3():
+            reporter = HVDCExcelReporterFinal()
+            reporter.report_output_dir = run_root / "reports"
+            reporter.report_output_dir.mkdir(parents=True, exist_ok=True)
+            calculator = reporter.calculator
+            calculator.hitachi_file = state["derived"]
+            calculator.simense_file = self.derived_simense(workload, run_root)
+            calculator.invoice_file = paths.invoice
+            if self.workers > 1:
+                calculator.use_parallel = True
+                calculator.workers = self.workers
+            state["report"] = Path(reporter.generate_final_excel_report())
+
+        def stage4():
+            df = read_excel_with_sidecar(state["report"], sheet_name=STAGE3_SHEET)
+            HybridAnomalyDetector(DetectorConfig()).run(
+                df,
+                export_excel=str(run_root / "anomaly" / "HVDC_anomaly_report.xlsx"),
+                export_json=str(run_root / "anomaly" / "HVDC_anomaly_report.json"),
+            )
+
+        (run_root / "anomaly").mkdir(parents=True, exist_ok=True)
+        profiler = StageProfiler()
+        set_active_profiler(profiler)
+        try:
+            for stage_num, name, func in (
+                (1, "Data Synchronization", stage1),
+                (2, "Derived Columns", stage2),
+                (3, "Report Generation", stage3),
+                (4, "Anomaly Detection", stage4),
+            ):
+                result = BenchResult("stages", f"stage{stage_num}", "pipeline", cases, 0)
+                try:
+                    with quiet(not self.verbose), profiler.stage(stage_num, name) as record:
+                        func()
+                    result.seconds.append(record.seconds)
+                except Exception as exc:  # pylint: disable=broad-except
+                    result.status = "error"
+                    result.error = f"{type(exc).__name__}: {exc}"
+                    logger.debug(traceback.format_exc())
+                record = profiler.stages[-1]
+                result.rows = record.rows or 0
+                result.extra = record.to_dict()
+                self._record(result)
+                if result.status != "ok":
+                    break
+        finally:
+            set_active_profiler(None)
+
+    # ----- 입력 준비 -----
+    def prepare_workbooks(self, workload: SyntheticWorkload) -> WorkloadPaths:
+        """raw 워크북 기록 (같은 generator/cases/seed면 재사용)"""
+        raw_dir = self.workdir / f"cases_{workload.cases}_seed_{workload.seed}" / "raw"
+        manifest = load_manifest(raw_dir)
+        expected = (GENERATOR_VERSION, workload.cases, workload.seed)
+        if (
+            manifest
+            and (
+                manifest.get("generator_version"),
+                manifest.get("cases"),
+                manifest.get("seed"),
+            )
+            == expected
+        ):
+            return WorkloadPaths(
+                master=raw_dir / MASTER_FILE,
+                warehouse=raw_dir / WAREHOUSE_FILE,
+                simense=raw_dir / SIMENSE_FILE,
+                invoice=raw_dir / INVOICE_FILE,
+            )
+        print(f"  writing workbooks: {raw_dir}")
+        return workload.write(raw_dir)
+
+    def derived_simense(self, workload: SyntheticWorkload, run_root: Path) -> Path:
+        """Stage 3 SIMENSE 입력 (Stage 2 파생 컬럼 적용본)"""
+        from core.stage_artifacts import write_sidecar
+        from scripts.stage2_derived.derived_columns_processor import calculate_derived_columns
+
+        path = run_root / "derived" / SIMENSE_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        derived = calculate_derived_columns(workload.simense)
+        derived.to_excel(path, index=False)
+        write_sidecar(derived, path)
+        return path
+
+    # ----- 실행/저장 -----
+    def run(self, cases_list: Sequence[int], suites: Sequence[str]) -> None:
+        for cases in cases_list:
+            print(f"\n=== {cases:,} cases ===")
+            workload = generate_workload(cases, seed=self.seed)
+            if "functions" in suites:
+                self.run_functions(workload)
+            if "stack_and_sqm" in suites:
+                self.run_stack_and_sqm(cases)
+            if "stages" in suites:
+                self.run_stages(workload)
+
+    def to_dict(self, cases_list: Sequence[int], suites: Sequence[str]) -> Dict[str, Any]:
+        return {
+            "format_version": RESULT_FORMAT_VERSION,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "git": git_info(),
+            "environment": environment_info(),
+            "config": {
+                "cases": list(cases_list),
+                "suites": list(suites),
+                "repeat": self.repeat,
+                "seed": self.seed,
+                "workers": self.workers,
+                "legacy_max_cases": self.legacy_max_cases,
+                "generator_version": GENERATOR_VERSION,
+            },
+            "results": [result.to_dict() for result in self.results],
+        }
+
+
+def new_calculator(**options):
+    from scripts.stage3_report.report_generator import CorrectedWarehouseIOCalculator
+
+    return CorrectedWarehouseIOCalculator(**options)
+
+
+def build_stage3_frame(hitachi: pd.DataFrame, simense: pd.DataFrame) -> pd.DataFrame:
+    """
+    Stage 3 ``load_real_hvdc_data`` + ``process_real_data``와 같은 입력 프레임
+
+    xlsx를 거치지 않고 Stage 2 결과 프레임에서 바로 만듭니다.
+    """
+    from scripts.stage3_report.utils import apply_column_synonyms, normalize_columns
+
+    calculator = new_calculator(use_vectorized=True)
+    parts = []
+    for frame, vendor, source in (
+        (hitachi, "HITACHI", "HITACHI(HE)"),
+        (simense, "SIMENSE", "SIMENSE(SIM)"),
+    ):
+        part = frame.copy()
+        part.columns = normalize_columns(part.columns)
+        part = apply_column_synonyms(part)
+        part["Vendor"] = vendor
+        part["Source_File"] = source
+        parts.append(part)
+    combined = pd.concat(parts, ignore_index=True, sort=False)
+    combined.columns = normalize_columns(combined.columns)
+    combined = apply_column_synonyms(combined)
+    for warehouse in calculator.warehouse_columns:
+        if warehouse not in combined.columns:
+            combined[warehouse] = pd.NaT
+    calculator.combined_data = combined
+    calculator.total_records = len(combined)
+    return calculator.process_real_data()
+
+
+def git_info() -> Dict[str, Any]:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ["git", *args],
+                cwd=PROJECT_ROOT,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "branch": git("rev-parse", "--abbrev-ref", "HEAD"),
+        "dirty": None if status is None else bool(status),
+    }
+
+
+def environment_info() -> Dict[str, Any]:
+    try:
+        import pyarrow
+
+        pyarrow_version = pyarrow.__version__
+    except ImportError:
+        pyarrow_version = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "pyarrow": pyarrow_version,
+    }
+
+
+def compare_results(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    같은 key의 best_seconds 비율(current / baseline) 비교
+
+    Returns:
+        비교 행 목록 (``regression``: 비율이 threshold 초과)
+    """
+    previous = {row["key"]: row for row in baseline.get("results", []) if row.get("best_seconds")}
+    rows = []
+    for row in current.get("results", []):
+        old = previous.get(row["key"])
+        if not old or not row.get("best_seconds"):
+            continue
+        ratio = row["best_seconds"] / old["best_seconds"]
+        rows.append(
+            {
+                "key": row["key"],
+                "baseline": old["best_seconds"],
+                "current": row["best_seconds"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > threshold,
+            }
+        )
+    return rows
+
+
+def parse_cases(value: str) -> List[int]:
+    cases = []
+    for token in value.split(","):
+        token = token.strip().lower().replace("_", "")
+        if not token:
+            continue
+        multiplier = 1
+        if token.endswith("k"):
+            multiplier, token = 1000, token[:-1]
+        cases.append(int(float(token) * multiplier))
+    return cases
+
+
+def default_output_path(git: Dict[str, Any]) -> Path:
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    commit = (git.get("commit") or "nogit")[:10]
+    return DEFAULT_RESULTS_DIR / f"bench_{stamp}_{commit}.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HVDC pipeline benchmarks")
+    parser.add_argument(
+        "--cases",
+        default=DEFAULT_CASES,
+        help="케이스 수 목록 (예: 1000,10k,500k)",
+    )
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=DEFAULT_SUITES,
+        help="실행할 suite (반복 지정 가능, 기본: 전체)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="함수 반복 횟수 (최솟값 기록)")
+    parser.add_argument("--seed", type=int, default=42, help="워크로드 시드")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=max(2, os.cpu_count() or 1),
+        help="Stage 3 병렬 변형 워커 수",
+    )
+    parser.add_argument(
+        "--legacy-max-cases",
+        type=int,
+        default=20_000,
+        help="이 규모보다 크면 legacy/rowwise 변형 생략",
+    )
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR, help="워크북 작업 폴더")
+    parser.add_argument("--output", type=Path, help="결과 JSON 경로")
+    parser.add_argument("--compare", type=Path, help="비교할 이전 결과 JSON")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.25,
+        help="회귀 판정 비율 (current / baseline)",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="회귀가 있으면 종료 코드 1",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Stage 출력/로그 표시")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+    cases_list = parse_cases(args.cases)
+    suites = args.suite or DEFAULT_SUITES
+
+    runner = BenchmarkRunner(
+        repeat=args.repeat,
+        seed=args.seed,
+        workers=args.workers,
+        legacy_max_cases=args.legacy_max_cases,
+        workdir=args.workdir,
+        verbose=args.verbose,
+    )
+    runner.run(cases_list, suites)
+
+    report = runner.to_dict(cases_list, suites)
+    output = args.output or default_output_path(report["git"])
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"\nResults: {output}")
+
+    exit_code = 0 if all(r.status != "error" for r in runner.results) else 1
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        rows = compare_results(report, baseline, args.threshold)
+        print(f"\nCompared with {args.compare} (threshold {args.threshold:.2f}x):")
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(
+                f"  {row['key']:<58} {row['baseline']:9.4f}s → {row['current']:9.4f}s "
+                f"({row['ratio']:.2f}x) {flag}"
+            )
+        if args.fail_on_regression and any(row["regression"] for row in rows):
+            exit_code = 1
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
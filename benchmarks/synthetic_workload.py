@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+HVDC 합성 워크로드 생성기 (벤치마크용)
+
+Stage 1 입력(Case List / HVDC Hitachi), Stage 3 입력(SIMENSE), 인보이스 워크북을
+실제 데이터와 같은 헤더/시트 구성으로 생성합니다. 같은 (cases, seed)는 항상 같은
+데이터를 만듭니다.
+
+케이스 경로 패턴 (비율은 ``ROUTE_WEIGHTS``):
+    - direct: 항구 → 현장 직송
+    - one_wh: 창고 1곳 → 현장
+    - two_wh: 창고간 이동 (DSV Indoor → DSV Al Markaz 등) → 현장
+    - mosb: 창고 → MOSB → 해상 현장(AGI/DAS)
+    - in_wh: 창고 보관 중 (현장 미도착)
+    - pre_arrival: 도착 전 (창고/현장 날짜 없음)
+
+창고간 이동과 MOSB 이동의 일부(``same_day_ratio``)는 같은 날 이동이며, 일부
+(``reversal_ratio``)는 현장 날짜가 창고보다 앞선 시간 역전 케이스입니다.
+HVDC Hitachi 파일은 Master보다 오래된 스냅샷으로, 신규 케이스 누락, 마지막 이동
+날짜 누락, 날짜 변경과 행 순서 섞임이 들어가 Stage 1 갱신/추가/정렬이 모두
+실행됩니다.
+
+사용법:
+    python benchmarks/synthetic_workload.py --cases 10000 --out temp/benchmarks/raw
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+GENERATOR_VERSION = 1
+
+MASTER_FILE = "Case List.xlsx"
+WAREHOUSE_FILE = "HVDC Hitachi.xlsx"
+SIMENSE_FILE = "HVDC WAREHOUSE_SIMENSE(SIM).xlsx"
+INVOICE_FILE = "HVDC WAREHOUSE_INVOICE.xlsx"
+
+WAREHOUSE_COLUMNS = [
+    "DHL WH",
+    "DSV Indoor",
+    "DSV Al Markaz",
+    "Hauler Indoor",
+    "DSV Outdoor",
+    "DSV MZP",
+    "HAULER",
+    "JDN MZD",
+    "MOSB",
+    "AAA Storage",
+]
+SITE_COLUMNS = ["MIR", "SHU", "AGI", "DAS"]
+ONSHORE_SITES = ["MIR", "SHU"]
+OFFSHORE_SITES = ["AGI", "DAS"]
+
+# 첫 입고 창고 분포 (MOSB 제외)
+FIRST_WAREHOUSE_WEIGHTS = {
+    "DSV Indoor": 0.30,
+    "DSV Al Markaz": 0.25,
+    "DSV Outdoor": 0.13,
+    "AAA Storage": 0.08,
+    "Hauler Indoor": 0.06,
+    "DHL WH": 0.05,
+    "DSV MZP": 0.05,
+    "HAULER": 0.04,
+    "JDN MZD": 0.04,
+}
+# 창고간 이동 (Stage 3 WAREHOUSE_TRANSFER_PAIRS 중 MOSB 제외)
+TRANSFER_PAIRS = [
+    ("DSV Indoor", "DSV Al Markaz"),
+    ("DSV Indoor", "DSV Outdoor"),
+    ("DSV Al Markaz", "DSV Outdoor"),
+    ("AAA Storage", "DSV Al Markaz"),
+    ("AAA Storage", "DSV Indoor"),
+]
+MOSB_SOURCES = ["DSV Indoor", "DSV Al Markaz"]
+ROUTE_WEIGHTS = {
+    "direct": 0.22,
+    "one_wh": 0.36,
+    "two_wh": 0.14,
+    "mosb": 0.16,
+    "in_wh": 0.09,
+    "pre_arrival": 0.03,
+}
+STACK_TEXTS = [
+    "Not stackable",
+    "Non-Stackable",
+    "Stackable",
+    "Stackable X2",
+    "Stackable / 3 pcs",
+    "Stackable 2 tier 800 kg/m2",
+    "600kg/m2",
+    "Only on top",
+    "X4",
+    "",
+    None,
+]
+DESCRIPTIONS = [
+    "TRANSFORMER",
+    "CABLE DRUM",
+    "SWITCHGEAR",
+    "CONVERTER VALVE",
+    "SPARE PARTS",
+    "STEEL STRUCTURE",
+    "COOLING UNIT",
+]
+INVOICE_RATES = {
+    "DSV Indoor": 47.0,
+    "DSV Al Markaz": 47.0,
+    "DSV Outdoor": 18.0,
+    "DSV MZP": 33.0,
+    "AAA Storage": 0.0,
+    "MOSB": 0.0,
+}
+
+
+@dataclass
+class WorkloadPaths:
+    """워크북 파일 경로"""
+
+    master: Path
+    warehouse: Path
+    simense: Path
+    invoice: Path
+
+
+@dataclass
+class SyntheticWorkload:
+    """생성된 워크로드 (시트명 → DataFrame)"""
+
+    cases: int
+    seed: int
+    master_sheets: Dict[str, pd.DataFrame]
+    warehouse: pd.DataFrame
+    simense: pd.DataFrame
+    invoice: pd.DataFrame
+    stats: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def master(self) -> pd.DataFrame:
+        """Master 시트를 Stage 1 로드와 같이 합친 프레임 (Source_Sheet 포함)"""
+        return pd.concat(
+            [sheet.assign(Source_Sheet=name) for name, sheet in self.master_sheets.items()],
+            ignore_index=True,
+            sort=False,
+        )
+
+    def write(self, directory: Path) -> WorkloadPaths:
+        """Stage 입력 파일명으로 워크북 기록"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = WorkloadPaths(
+            master=directory / MASTER_FILE,
+            warehouse=directory / WAREHOUSE_FILE,
+            simense=directory / SIMENSE_FILE,
+            invoice=directory / INVOICE_FILE,
+        )
+        _write_workbook(paths.master, self.master_sheets)
+        _write_workbook(paths.warehouse, {"Case List": self.warehouse})
+        _write_workbook(paths.simense, {"Case List": self.simense})
+        _write_workbook(paths.invoice, {"Invoice": self.invoice})
+        manifest = {
+            "generator_version": GENERATOR_VERSION,
+            "cases": self.cases,
+            "seed": self.seed,
+            "stats": self.stats,
+        }
+        (directory / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        return paths
+
+
+def _write_workbook(path: Path, sheets: Dict[str, pd.DataFrame]) -> None:
+    with pd.ExcelWriter(path, engine="xlsxwriter", datetime_format="yyyy-mm-dd") as writer:
+        for name, frame in sheets.items():
+            frame.to_excel(writer, sheet_name=name, index=False)
+
+
+def _dwell_days(rng: np.random.RandomState, n: int, same_day_ratio: float) -> np.ndarray:
+    """창고 체류일 (감마 분포, same_day_ratio 비율은 0일)"""
+    days = np.round(rng.gamma(2.0, 18.0, n)).astype(np.int64) + 1
+    days[rng.rand(n) < same_day_ratio] = 0
+    return days
+
+
+def _case_frame(
+    rng: np.random.RandomState,
+    n: int,
+    prefix: str,
+    first_no: int = 1,
+    start: str = "2023-02-01",
+    span_days: int = 900,
+    same_day_ratio: float = 0.15,
+    reversal_ratio: float = 0.005,
+) -> pd.DataFrame:
+    """케이스 n개의 속성 + 위치별 날짜 프레임"""
+    base = np.datetime64(start, "D")
+    etd = base + rng.randint(0, span_days, n).astype("timedelta64[D]")
+    eta = etd + rng.randint(7, 36, n).astype("timedelta64[D]")
+    arrival = eta + rng.randint(0, 6, n).astype("timedelta64[D]")
+
+    routes = np.array(list(ROUTE_WEIGHTS))
+    route = rng.choice(routes, n, p=np.array(list(ROUTE_WEIGHTS.values())))
+
+    nat = np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")
+    dates = {column: nat.copy() for column in WAREHOUSE_COLUMNS + SITE_COLUMNS}
+
+    def put(column_per_row: np.ndarray, mask: np.ndarray, values: np.ndarray) -> None:
+        for column in np.unique(column_per_row[mask]):
+            rows = mask & (column_per_row == column)
+            dates[column][rows] = values[rows]
+
+    warehouses = np.array(list(FIRST_WAREHOUSE_WEIGHTS))
+    first_wh = rng.choice(warehouses, n, p=np.array(list(FIRST_WAREHOUSE_WEIGHTS.values())))
+    pair_index = rng.randint(0, len(TRANSFER_PAIRS), n)
+    pair_from = np.array([a for a, _ in TRANSFER_PAIRS])[pair_index]
+    pair_to = np.array([b for _, b in TRANSFER_PAIRS])[pair_index]
+    mosb_from = np.array(MOSB_SOURCES)[rng.randint(0, len(MOSB_SOURCES), n)]
+    onshore = np.array(ONSHORE_SITES)[rng.randint(0, len(ONSHORE_SITES), n)]
+    offshore = np.array(OFFSHORE_SITES)[rng.randint(0, len(OFFSHORE_SITES), n)]
+
+    dwell_1 = _dwell_days(rng, n, same_day_ratio).astype("timedelta64[D]")
+    dwell_2 = _dwell_days(rng, n, same_day_ratio).astype("timedelta64[D]")
+    leg = rng.randint(1, 21, n).astype("timedelta64[D]")
+
+    is_direct = route == "direct"
+    is_one = route == "one_wh"
+    is_two = route == "two_wh"
+    is_mosb = route == "mosb"
+    is_in_wh = route == "in_wh"
+
+    put(onshore, is_direct, arrival)
+    put(first_wh, is_one | is_in_wh, arrival)
+    put(onshore, is_one, arrival + dwell_1)
+    put(pair_from, is_two, arrival)
+    put(pair_to, is_two, arrival + dwell_1)
+    put(onshore, is_two, arrival + dwell_1 + dwell_2)
+    put(mosb_from, is_mosb, arrival)
+    dates["MOSB"][is_mosb] = (arrival + dwell_1)[is_mosb]
+    put(offshore, is_mosb, arrival + dwell_1 + dwell_2 + leg)
+
+    # 시간 역전: 현장 날짜를 창고 입고 이전으로
+    reversal = (is_one | is_two) & (rng.rand(n) < reversal_ratio)
+    put(onshore, reversal, arrival - leg)
+
+    pre_arrival = route == "pre_arrival"
+    eta = np.where(pre_arrival, np.datetime64("NaT"), eta)
+
+    pkg = rng.randint(1, 7, n).astype(float)
+    pkg[rng.rand(n) < 0.02] = np.nan
+    length = rng.randint(40, 1200, n).astype(float)
+    width = rng.randint(40, 600, n).astype(float)
+    height = rng.randint(40, 400, n).astype(float)
+    gross_weight = np.round(length * width * height / 1e6 * rng.uniform(80, 400, n), 1)
+
+    numbers = np.arange(first_no, first_no + n)
+    frame = pd.DataFrame(
+        {
+            "No": numbers,
+            "Case No.": [f"{prefix}-{value:07d}" for value in numbers],
+            "HVDC CODE": [
+                f"HVDC-ADOPT-{value // 10000 % 1000:03d}-{value % 10000:04d}" for value in numbers
+            ],
+            "Description": rng.choice(np.array(DESCRIPTIONS, dtype=object), n),
+            "Pkg": pkg,
+            "L(CM)": length,
+            "W(CM)": width,
+            "H(CM)": height,
+            "G.W(kgs)": gross_weight,
+            "CBM": np.round(length * width * height / 1e6, 3),
+            "Stackability": rng.choice(np.array(STACK_TEXTS, dtype=object), n),
+            "ETD/ATD": etd.astype("datetime64[ns]"),
+            "ETA/ATA": eta.astype("datetime64[ns]"),
+        }
+    )
+    for column in WAREHOUSE_COLUMNS + SITE_COLUMNS:
+        frame[column] = dates[column].astype("datetime64[ns]")
+    frame.attrs["route"] = route
+    frame.attrs["same_day"] = (is_two | is_mosb) & (dwell_1 == np.timedelta64(0, "D"))
+    return frame
+
+
+def _stale_snapshot(
+    rng: np.random.RandomState,
+    master: pd.DataFrame,
+    new_ratio: float,
+    stale_ratio: float,
+    changed_ratio: float,
+) -> pd.DataFrame:
+    """Master보다 오래된 창고 파일 스냅샷"""
+    keep = rng.rand(len(master)) >= new_ratio
+    snapshot = master.loc[keep].copy()
+    location_columns = WAREHOUSE_COLUMNS + SITE_COLUMNS
+    block = snapshot[location_columns].to_numpy(dtype="datetime64[ns]")
+    filled = ~np.isnat(block)
+
+    # 마지막 이동 날짜 누락 (Master에서 채워짐)
+    stale = (rng.rand(len(snapshot)) < stale_ratio) & (filled.sum(axis=1) > 1)
+    filled_int = np.where(filled, block.astype("int64"), np.iinfo(np.int64).min)
+    latest = filled_int.argmax(axis=1)
+    block[np.flatnonzero(stale), latest[stale]] = np.datetime64("NaT")
+
+    # 날짜 변경 (Master 값으로 갱신됨)
+    changed = (rng.rand(len(snapshot)) < changed_ratio) & filled.any(axis=1)
+    first = filled.argmax(axis=1)
+    shift = rng.randint(1, 6, len(snapshot)).astype("timedelta64[D]")
+    rows = np.flatnonzero(changed)
+    block[rows, first[rows]] = block[rows, first[rows]] - shift[rows]
+
+    snapshot[location_columns] = block
+    order = rng.permutation(len(snapshot))
+    return snapshot.iloc[order].reset_index(drop=True)
+
+
+def _invoice_frame(cases: pd.DataFrame) -> pd.DataFrame:
+    """창고 × 월 인보이스 (입고 월 기준 SQM 합계 × 요율)"""
+    sqm = (cases["L(CM)"] * cases["W(CM)"] / 10000.0).to_numpy() * cases["Pkg"].fillna(1).to_numpy()
+    parts = []
+    for warehouse, rate in INVOICE_RATES.items():
+        dates = cases[warehouse]
+        present = dates.notna().to_numpy()
+        if not present.any():
+            continue
+        parts.append(
+            pd.DataFrame(
+                {
+                    "Operation Month": dates[present].dt.to_period("M").dt.to_timestamp(),
+                    "Category": warehouse,
+                    "pkgs": cases["Pkg"].fillna(1).to_numpy()[present],
+                    "sqm": sqm[present],
+                }
+            )
+        )
+    if not parts:
+        return pd.DataFrame(columns=["Operation Month", "Category", "pkgs", "sqm"])
+    invoice = (
+        pd.concat(parts, ignore_index=True)
+        .groupby(["Operation Month", "Category"], as_index=False)[["pkgs", "sqm"]]
+        .sum()
+    )
+    invoice["sqm"] = invoice["sqm"].round(2)
+    invoice["Rate (AED/sqm)"] = invoice["Category"].map(INVOICE_RATES)
+    invoice["Original Amount (AED)"] = (invoice["sqm"] * invoice["Rate (AED/sqm)"]).round(2)
+    invoice.insert(0, "HVDC CODE", [f"HVDC-ADOPT-INV-{i:04d}" for i in range(len(invoice))])
+    return invoice
+
+
+def generate_workload(
+    cases: int,
+    seed: int = 42,
+    simense_ratio: float = 0.2,
+    new_ratio: float = 0.05,
+    stale_ratio: float = 0.15,
+    changed_ratio: float = 0.05,
+    local_sheet_ratio: float = 0.1,
+    same_day_ratio: float = 0.15,
+    reversal_ratio: float = 0.005,
+) -> SyntheticWorkload:
+    """
+    합성 워크로드 생성
+
+    Args:
+        cases: HITACHI 케이스 수 (SIMENSE는 ``cases * simense_ratio``)
+        seed: 난수 시드
+        simense_ratio: HITACHI 대비 SIMENSE 케이스 비율
+        new_ratio: 창고 파일에 없는 신규 Master 케이스 비율 (Stage 1 append)
+        stale_ratio: 창고 파일에서 마지막 이동 날짜가 빠진 케이스 비율
+        changed_ratio: 창고 파일에서 첫 입고 날짜가 다른 케이스 비율
+        local_sheet_ratio: Master의 "HE Local" 시트 케이스 비율
+        same_day_ratio: 같은 날 창고간/MOSB 이동 비율
+        reversal_ratio: 시간 역전(현장 < 창고) 케이스 비율
+
+    Returns:
+        SyntheticWorkload
+    """
+    rng = np.random.RandomState(seed)
+    hitachi = _case_frame(
+        rng, cases, "HE", same_day_ratio=same_day_ratio, reversal_ratio=reversal_ratio
+    )
+    route = hitachi.attrs.pop("route")
+    same_day = hitachi.attrs.pop("same_day")
+    n_simense = max(1, int(round(cases * simense_ratio)))
+    simense = _case_frame(
+        rng, n_simense, "SIM", same_day_ratio=same_day_ratio, reversal_ratio=reversal_ratio
+    )
+    simense.attrs.clear()
+
+    local = rng.rand(cases) < local_sheet_ratio
+    master_sheets = {
+        "Case List": hitachi.loc[~local].reset_index(drop=True),
+        "HE Local": hitachi.loc[local].reset_index(drop=True),
+    }
+    warehouse = _stale_snapshot(rng, hitachi, new_ratio, stale_ratio, changed_ratio)
+
+    stats = {
+        "hitachi_cases": cases,
+        "simense_cases": n_simense,
+        "warehouse_rows": len(warehouse),
+        "mosb_cases": int(hitachi["MOSB"].notna().sum()),
+        "same_day_transfers": int(same_day.sum()),
+    }
+    stats.update({f"route_{name}": int((route == name).sum()) for name in ROUTE_WEIGHTS})
+    return SyntheticWorkload(
+        cases=cases,
+        seed=seed,
+        master_sheets=master_sheets,
+        warehouse=warehouse,
+        simense=simense,
+        invoice=_invoice_frame(pd.concat([hitachi, simense], ignore_index=True)),
+        stats=stats,
+    )
+
+
+def load_manifest(directory: Path) -> Optional[Dict]:
+    """기록된 워크로드 manifest (없으면 None)"""
+    path = Path(directory) / "manifest.json"
+    if not path.exists():
+        return None
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="HVDC synthetic workload generator")
+    parser.add_argument("--cases", type=int, default=10_000, help="HITACHI 케이스 수")
+    parser.add_argument("--seed", type=int, default=42, help="난수 시드")
+    parser.add_argument("--out", type=Path, required=True, help="워크북 출력 디렉터리")
+    args = parser.parse_args(argv)
+
+    workload = generate_workload(args.cases, seed=args.seed)
+    paths = workload.write(args.out)
+    print(json.dumps(workload.stats, indent=2))
+    for path in (paths.master, paths.warehouse, paths.simense, paths.invoice):
+        print(f"  - {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
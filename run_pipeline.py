@@ -10,11 +10,12 @@ HVDC Pipeline Integrated Execution Script v4.0.25
 
 import argparse
 import logging
+import re
 import shutil
 import sys
 import time
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import pandas as pd
 import yaml
@@ -27,8 +28,10 @@ PIPELINE_ROOT = Path(__file__).resolve().parent
 PROJECT_ROOT = PIPELINE_ROOT
 PIPELINE_CONFIG_PATH = PROJECT_ROOT / "config" / "pipeline_config.yaml"
 STAGE2_CONFIG_PATH = PROJECT_ROOT / "config" / "stage2_derived_config.yaml"
+STAGE4_CONFIG_PATH = PROJECT_ROOT / "config" / "stage4_anomaly.yaml"
 DEFAULT_STAGE3_SHEET = 0  # First sheet (HITACHI_입고로직_종합리포트_Fixed)
 sys.path.append(str(PIPELINE_ROOT))
+sys.path.append(str(PIPELINE_ROOT / "scripts"))
 
 # �� Stage ����Ʈ
 try:  # pragma: no cover - optional dependency guard
@@ -45,10 +48,12 @@ except ImportError:  # pragma: no cover - runtime import guard
 try:  # pragma: no cover - optional dependency guard
     from scripts.stage2_derived.derived_columns_processor import (
         process_derived_columns,
+        resolve_derived_output_path,
         resolve_synced_input_path as resolve_stage2_synced_input_path,
     )
 except ImportError:  # pragma: no cover - runtime import guard
     process_derived_columns = None  # type: ignore[assignment]
+    resolve_derived_output_path = None  # type: ignore[assignment]
     resolve_stage2_synced_input_path = None  # type: ignore[assignment]
 
 try:  # pragma: no cover - optional dependency guard
@@ -70,6 +75,21 @@ try:  # pragma: no cover - optional dependency guard
 except ImportError:  # pragma: no cover - runtime import guard
     AnomalyVisualizer = None  # type: ignore[assignment]
 
+from core.stage_artifacts import (
+    read_excel_with_sidecar,
+    set_sidecars_enabled,
+    sidecar_paths,
+)
+from core.stage_cache import StageCache
+from core.stage_profiler import StageProfiler, get_active_profiler, set_active_profiler
+
+STAGE_NAMES = {
+    1: "Data Synchronization",
+    2: "Derived Columns",
+    3: "Report Generation",
+    4: "Anomaly Detection",
+}
+
 
 # 각 Stage 임포트
 def resolve_repo_path(path_value: str | Path) -> Path:
@@ -105,6 +125,16 @@ def load_stage2_config() -> Dict:
         return {}
 
 
+def load_stage4_config() -> Dict:
+    """Stage4 설정을 로드합니다. / Load Stage 4 anomaly configuration."""
+
+    try:
+        with open(STAGE4_CONFIG_PATH, "r", encoding="utf-8") as config_file:
+            return yaml.safe_load(config_file) or {}
+    except FileNotFoundError:
+        return {}
+
+
 def configure_logging(pipeline_config: Dict) -> None:
     """로깅 설정을 초기화합니다. / Configure logging for the pipeline."""
 
@@ -157,11 +187,16 @@ def run_stage(
     pipeline_config: Dict,
     stage2_config: Dict,
     args: argparse.Namespace,
+    stage_outputs: Optional[List[Path]] = None,
 ) -> bool:
-    """특정 Stage를 실행합니다. / Execute a single pipeline stage."""
+    """특정 Stage를 실행합니다. / Execute a single pipeline stage.
+
+    ``stage_outputs``가 주어지면 생성된 출력 경로를 해당 리스트에 추가합니다.
+    """
 
     stage_start_time = time.time()
-    stage_outputs: List[Path] = []
+    if stage_outputs is None:
+        stage_outputs = []
 
     try:
         if stage_num == 1:
@@ -205,7 +240,15 @@ def run_stage(
             else:
                 # Use v30 if available, otherwise v29
                 if use_v30:
-                    synchronizer = DataSynchronizerV30()
+                    delta_state_path = None
+                    if getattr(args, "stage1_delta", False):
+                        delta_state_path = str(
+                            output_path.with_name(output_path.stem + ".delta.json")
+                        )
+                    synchronizer = DataSynchronizerV30(
+                        sheet_workers=getattr(args, "stage1_workers", None) or 1,
+                        delta_state_path=delta_state_path,
+                    )
                     print(f"INFO: Using v3.0 (semantic matching) - output: {output_path}")
                 else:
                     synchronizer = DataSynchronizerV29()
@@ -241,6 +284,9 @@ def run_stage(
             )
             if not success:
                 return False
+            stage_outputs.append(
+                resolve_derived_output_path(stage2_config=stage2_config, project_root=PROJECT_ROOT)
+            )
 
         elif stage_num == 3:
             print("[Stage 3] Report Generation... (벡터화 최적화)")
@@ -253,6 +299,12 @@ def run_stage(
             reporter = HVDCExcelReporterFinal()
             calculator = reporter.calculator
 
+            stage3_workers = getattr(args, "stage3_workers", None) or 1
+            if stage3_workers > 1:
+                calculator.use_parallel = True
+                calculator.workers = stage3_workers
+                print(f"INFO: Stage 3 병렬 계산 - 워커 {stage3_workers}개")
+
             data_root = stage3_cfg.get("data_root")
             if data_root:
                 calculator.data_path = resolve_repo_path(data_root)
@@ -298,8 +350,14 @@ def run_stage(
             if excel_source.resolve() != excel_target.resolve():
                 if excel_target.exists():
                     excel_target.unlink()
+                for sidecar in sidecar_paths(excel_target):
+                    sidecar.unlink()
                 shutil.move(str(excel_source), str(excel_target))
                 stage_outputs.append(excel_target.resolve())
+                for sidecar in sidecar_paths(excel_source):
+                    sidecar_target = report_dir / sidecar.name
+                    shutil.move(str(sidecar), str(sidecar_target))
+                    stage_outputs.append(sidecar_target.resolve())
             else:
                 stage_outputs.append(excel_source.resolve())
 
@@ -322,34 +380,9 @@ def run_stage(
             if not stage4_cfg:
                 raise ValueError("Stage 4 IO 설정이 비어 있습니다.")
 
-            input_file = stage4_cfg.get("input_file")
-            if not input_file:
-                raise ValueError("Stage 4 입력 파일 설정이 누락되었습니다.")
-            input_path = resolve_repo_path(input_file)
-
-            # 자동 탐색: config의 파일이 없으면 reports 폴더에서 최신 파일 찾기
-            if not input_path.exists():
-                import re
-
-                filename = input_path.name
-                # 타임스탬프 패턴 (YYYYMMDD_HHMMSS) 찾아서 *로 치환
-                pattern_str = re.sub(r"_\d{8}_\d{6}_", "_*_", filename)
-
-                report_dir = input_path.parent
-                if report_dir.exists():
-                    matching_files = sorted(
-                        report_dir.glob(pattern_str),
-                        key=lambda p: p.stat().st_mtime,
-                        reverse=True,
-                    )
-                    if matching_files:
-                        input_path = matching_files[0]
-                        print(f"INFO: 최신 보고서 파일 자동 선택: {input_path.name}")
-                    else:
-                        raise FileNotFoundError(
-                            f"Stage 4 입력 파일을 찾을 수 없습니다: {input_file}\n"
-                            f"reports 폴더에서 '{pattern_str}' 패턴의 파일도 찾을 수 없습니다."
-                        )
+            input_path = resolve_stage4_input_path(stage4_cfg)
+            if input_path.name != Path(stage4_cfg["input_file"]).name:
+                print(f"INFO: 최신 보고서 파일 자동 선택: {input_path.name}")
 
             sheet_name = (
                 getattr(args, "stage4_sheet_name", None) or stage4_cfg.get("sheet_name") or None
@@ -365,7 +398,7 @@ def run_stage(
                 raise FileNotFoundError(f"Stage 4 입력 파일을 찾을 수 없습니다: {input_path}")
 
             if input_path.suffix.lower() in {".xlsx", ".xlsm", ".xls"}:
-                df = pd.read_excel(input_path, sheet_name=sheet_name)
+                df = read_excel_with_sidecar(input_path, sheet_name=sheet_name)
             else:
                 df = pd.read_csv(input_path)
 
@@ -467,7 +500,203 @@ def run_stage(
         return False
 
 
-def run_all_stages(pipeline_config: Dict, stage2_config: Dict, args: argparse.Namespace) -> bool:
+def resolve_stage4_input_path(stage4_cfg: Dict) -> Path:
+    """Stage 4 입력 보고서 경로를 계산합니다. / Resolve the Stage 4 input report.
+
+    설정된 파일이 없으면 reports 폴더에서 같은 패턴의 최신 보고서를 선택합니다.
+    """
+
+    input_file = stage4_cfg.get("input_file")
+    if not input_file:
+        raise ValueError("Stage 4 입력 파일 설정이 누락되었습니다.")
+    input_path = resolve_repo_path(input_file)
+
+    # 자동 탐색: config의 파일이 없으면 reports 폴더에서 최신 파일 찾기
+    if not input_path.exists():
+        filename = input_path.name
+        # 타임스탬프 패턴 (YYYYMMDD_HHMMSS) 찾아서 *로 치환
+        pattern_str = re.sub(r"_\d{8}_\d{6}_", "_*_", filename)
+
+        report_dir = input_path.parent
+        if report_dir.exists():
+            matching_files = sorted(
+                report_dir.glob(pattern_str),
+                key=lambda p: p.stat().st_mtime,
+                reverse=True,
+            )
+            if matching_files:
+                return matching_files[0]
+            raise FileNotFoundError(
+                f"Stage 4 입력 파일을 찾을 수 없습니다: {input_file}\n"
+                f"reports 폴더에서 '{pattern_str}' 패턴의 파일도 찾을 수 없습니다."
+            )
+
+    return input_path
+
+
+def build_stage_cache(pipeline_config: Dict) -> Optional[StageCache]:
+    """Stage 캐시를 생성합니다. / Create the stage cache (None when disabled)."""
+
+    artifacts_cfg = pipeline_config.get("artifacts", {})
+    if not artifacts_cfg.get("stage_cache", True):
+        return None
+    cache_dir = resolve_repo_path(artifacts_cfg.get("stage_cache_dir", "temp/stage_cache"))
+    version = str(pipeline_config.get("pipeline", {}).get("version", ""))
+    return StageCache(cache_dir, code_version=version)
+
+
+def compute_stage_cache_key(
+    cache: StageCache,
+    stage_num: int,
+    pipeline_config: Dict,
+    stage2_config: Dict,
+    args: argparse.Namespace,
+) -> str:
+    """Stage 입력/설정/코드 해시 키를 계산합니다. / Hash a stage's inputs, config and code."""
+
+    stages_cfg = pipeline_config.get("stages", {})
+    stage_cfg = stages_cfg.get(f"stage{stage_num}", {})
+    io_cfg = stage_cfg.get("io", {})
+    scripts_dir = PIPELINE_ROOT / "scripts"
+    config = {
+        f"stage{stage_num}": stage_cfg,
+        "artifacts": pipeline_config.get("artifacts", {}),
+    }
+    inputs: List[Path] = []
+    options: Dict = {}
+
+    if stage_num == 1:
+        inputs = [resolve_repo_path(io_cfg[key]) for key in ("master_file", "warehouse_file")]
+        options["no_sorting"] = bool(getattr(args, "no_sorting", False))
+        code_dir = "stage1_sync_no_sorting" if options["no_sorting"] else "stage1_sync_sorted"
+    elif stage_num == 2:
+        inputs = [
+            resolve_stage2_synced_input_path(
+                pipeline_config_path=PIPELINE_CONFIG_PATH,
+                stage2_config_path=STAGE2_CONFIG_PATH,
+                project_root=PROJECT_ROOT,
+            )
+        ]
+        config["stage2_derived_config"] = stage2_config
+        code_dir = "stage2_derived"
+    elif stage_num == 3:
+        inputs = [
+            resolve_repo_path(io_cfg[key])
+            for key in ("hitachi_file", "siemens_file", "invoice_file")
+            if io_cfg.get(key)
+        ]
+        options["stage3_report_dir"] = getattr(args, "stage3_report_dir", None)
+        code_dir = "stage3_report"
+    else:
+        try:
+            inputs = [resolve_stage4_input_path(io_cfg)]
+        except (FileNotFoundError, ValueError):
+            inputs = []
+        config["stage4_anomaly"] = load_stage4_config()
+        for option in (
+            "stage4_sheet_name",
+            "stage4_excel_out",
+            "stage4_json_out",
+            "stage4_visualize",
+            "stage4_no_visualize",
+            "stage4_case_column",
+        ):
+            options[option] = getattr(args, option, None)
+        code_dir = "stage4_anomaly"
+
+    return cache.compute_key(
+        stage_num,
+        inputs=inputs,
+        config=config,
+        code_dirs=[scripts_dir / code_dir, scripts_dir / "core"],
+        options=options,
+    )
+
+
+def build_stage_profiler(pipeline_config: Dict, mode: str) -> Optional[StageProfiler]:
+    """Stage 프로파일러를 생성합니다. / Create the stage profiler (None when disabled)."""
+
+    profiling_cfg = pipeline_config.get("profiling", {})
+    if mode == "off" or not profiling_cfg.get("run_profile", "data/processed/run_profile.json"):
+        return None
+    cprofile_dir = None
+    if mode == "cprofile":
+        cprofile_dir = resolve_repo_path(profiling_cfg.get("pstats_dir", "data/processed/profiles"))
+    return StageProfiler(cprofile_dir=cprofile_dir)
+
+
+def write_run_profile(profiler: StageProfiler, pipeline_config: Dict) -> Path:
+    """run_profile.json을 기록합니다. / Write the run profile next to the outputs."""
+
+    profiling_cfg = pipeline_config.get("profiling", {})
+    profile_path = resolve_repo_path(
+        profiling_cfg.get("run_profile", "data/processed/run_profile.json")
+    )
+    return profiler.write(profile_path)
+
+
+def run_stage_profiled(
+    stage_num: int,
+    pipeline_config: Dict,
+    stage2_config: Dict,
+    args: argparse.Namespace,
+    stage_outputs: Optional[List[Path]] = None,
+) -> bool:
+    """활성 프로파일러로 Stage를 계측합니다. / Run a stage under the active profiler."""
+
+    profiler = get_active_profiler()
+    if profiler is None:
+        return run_stage(stage_num, pipeline_config, stage2_config, args, stage_outputs)
+
+    with profiler.stage(stage_num, STAGE_NAMES.get(stage_num, "")):
+        success = run_stage(stage_num, pipeline_config, stage2_config, args, stage_outputs)
+        if not success:
+            profiler.mark_failed()
+    return success
+
+
+def run_stage_cached(
+    stage_num: int,
+    pipeline_config: Dict,
+    stage2_config: Dict,
+    args: argparse.Namespace,
+    cache: Optional[StageCache],
+) -> bool:
+    """캐시를 확인한 뒤 Stage를 실행합니다. / Run a stage unless its cache key matches."""
+
+    if cache is None:
+        return run_stage_profiled(stage_num, pipeline_config, stage2_config, args)
+
+    key = compute_stage_cache_key(cache, stage_num, pipeline_config, stage2_config, args)
+    entry = None if getattr(args, "force", False) else cache.lookup(stage_num, key)
+    if entry is not None:
+        cache.hits.append(stage_num)
+        profiler = get_active_profiler()
+        if profiler is not None:
+            profiler.mark_cached(stage_num, STAGE_NAMES.get(stage_num, ""))
+        print(f"[CACHE] Stage {stage_num}: 입력 변경 없음 - 이전 결과 재사용 (cache hit)")
+        for output in entry.outputs:
+            print(f"      - {output}")
+        print("")
+        return True
+
+    cache.misses.append(stage_num)
+    stage_outputs: List[Path] = []
+    if not run_stage_profiled(stage_num, pipeline_config, stage2_config, args, stage_outputs):
+        return False
+
+    # Stage가 자기 입력을 갱신할 수 있으므로(Stage 4 색상 표시) 실행 후 키로 기록
+    key = compute_stage_cache_key(cache, stage_num, pipeline_config, stage2_config, args)
+    cache.store(stage_num, key, stage_outputs)
+    return True
+
+
+def run_all_stages(
+    pipeline_config: Dict,
+    stage2_config: Dict,
+    args: argparse.Namespace,
+    cache: Optional[StageCache] = None,
+) -> bool:
     """모든 Stage를 순차적으로 실행합니다. / Run all stages sequentially."""
 
     print_banner()
@@ -476,13 +705,15 @@ def run_all_stages(pipeline_config: Dict, stage2_config: Dict, args: argparse.Na
     total_start_time = time.time()
 
     for stage_num in stages:
-        if not run_stage(stage_num, pipeline_config, stage2_config, args):
+        if not run_stage_cached(stage_num, pipeline_config, stage2_config, args, cache):
             print(f"[FAILED] Pipeline stopped at Stage {stage_num}")
             return False
 
     total_duration = time.time() - total_start_time
     print("[SUCCESS] All pipeline stages completed!")
     print(f"Total Duration: {total_duration:.2f}s")
+    if cache is not None:
+        print(f"Stage cache: {cache.summary()}")
 
     return True
 
@@ -492,17 +723,20 @@ def run_specific_stages(
     pipeline_config: Dict,
     stage2_config: Dict,
     args: argparse.Namespace,
+    cache: Optional[StageCache] = None,
 ) -> bool:
     """지정된 Stage만 실행합니다. / Run only selected stages."""
 
     print(f"[INFO] Selected stages: {stage_list}")
 
     for stage_num in stage_list:
-        if not run_stage(stage_num, pipeline_config, stage2_config, args):
+        if not run_stage_cached(stage_num, pipeline_config, stage2_config, args, cache):
             print(f"[FAILED] Pipeline stopped at Stage {stage_num}")
             return False
 
     print("[SUCCESS] Selected stages completed!")
+    if cache is not None:
+        print(f"Stage cache: {cache.summary()}")
     return True
 
 
@@ -516,11 +750,29 @@ def main():
   python run_pipeline.py --all                    # 전체 파이프라인 실행
   python run_pipeline.py --stage 1,2              # Stage 1, 2만 실행
   python run_pipeline.py --stage 2                # Stage 2만 실행
+  python run_pipeline.py --all --force            # 캐시 무시 전체 재실행
         """,
     )
 
     parser.add_argument("--all", action="store_true", help="전체 파이프라인 실행 (Stage 1-4)")
     parser.add_argument("--stage", type=str, help="실행할 Stage 번호 (예: 1,2,3 또는 2)")
+    parser.add_argument(
+        "--stage1-workers",
+        type=int,
+        default=1,
+        help="Stage 1 시트 병렬 파싱 프로세스 수 / Worker processes for Stage 1 sheet parsing",
+    )
+    parser.add_argument(
+        "--stage1-delta",
+        action="store_true",
+        help="Stage 1 델타 동기화 (변경된 Master 행만 처리) / Only sync Master rows changed since the last run",
+    )
+    parser.add_argument(
+        "--stage3-workers",
+        type=int,
+        default=1,
+        help="Stage 3 케이스 단위 병렬 계산 프로세스 수 / Worker processes for Stage 3 calculators",
+    )
     parser.add_argument(
         "--stage3-report-dir",
         type=str,
@@ -556,6 +808,17 @@ def main():
         type=str,
         help="Stage 4 Case 컬럼명 지정 / Specify Stage 4 case column",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Stage 캐시를 무시하고 모두 재실행 / Ignore the stage cache and re-run every stage",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=["timings", "cprofile", "off"],
+        default="timings",
+        help="Stage 프로파일 (run_profile.json, cprofile이면 Stage별 pstats 추가) / Stage profiling mode",
+    )
     parser.add_argument(
         "--no-sorting",
         action="store_true",
@@ -568,6 +831,9 @@ def main():
     pipeline_config = load_pipeline_config()
     stage2_config = load_stage2_config()
     configure_logging(pipeline_config)
+    set_sidecars_enabled(pipeline_config.get("artifacts", {}).get("parquet_sidecars", True))
+    cache = build_stage_cache(pipeline_config)
+    profiler = build_stage_profiler(pipeline_config, args.profile)
 
     # 인자 검증
     if not args.all and not args.stage:
@@ -575,9 +841,10 @@ def main():
         return 1
 
     # 실행
+    set_active_profiler(profiler)
     try:
         if args.all:
-            success = run_all_stages(pipeline_config, stage2_config, args)
+            success = run_all_stages(pipeline_config, stage2_config, args, cache)
         else:
             # Stage 번호 파싱
             try:
@@ -588,7 +855,7 @@ def main():
                     print("ERROR: 유효한 Stage 번호를 입력하세요 (1-4)")
                     return 1
 
-                success = run_specific_stages(stages, pipeline_config, stage2_config, args)
+                success = run_specific_stages(stages, pipeline_config, stage2_config, args, cache)
             except ValueError:
                 print("ERROR: Stage 번호 형식이 올바르지 않습니다 (예: 1,2,3)")
                 return 1
@@ -601,6 +868,11 @@ def main():
     except Exception as e:
         print(f"[ERROR] Unexpected error: {e}")
         return 1
+    finally:
+        set_active_profiler(None)
+        if profiler is not None and profiler.stages:
+            profile_path = write_run_profile(profiler, pipeline_config)
+            print(f"Run profile: {profile_path}")
 
 
 if __name__ == "__main__":
@@ -11,14 +11,44 @@ Main Components:
 - header_normalizer: Normalizes header names handling all edge cases
 - semantic_matcher: Matches headers based on meaning, not exact strings
 - header_registry: Configuration for semantic mappings across all stages
-- data_parser: Core data parsing utilities (Stack_Status, SQM, unit conversions)
+- data_parser: Core data parsing utilities (Stack_Status with memo cache, SQM, unit conversions)
+- workbook_reader: Single-pass sheet loading with shared header detection
+- stage_artifacts: Typed Parquet sidecars for the xlsx files passed between stages
+- stage_cache: Content-hash cache that skips stages whose inputs did not change
+- stage_profiler: Nested phase timers, peak RSS and rows/sec per stage (run_profile.json);
+  not re-exported here, import it as ``core.stage_profiler`` so every stage shares
+  one active profiler
+- location_timeline: Read-only cases × locations visit-date matrix shared by Stage 3/4
 """
 
 from .header_detector import HeaderDetector, detect_header_row
 from .header_normalizer import HeaderNormalizer, normalize_header
 from .semantic_matcher import SemanticMatcher, find_header_by_meaning
 from .header_registry import HeaderRegistry, HVDC_HEADER_REGISTRY, HeaderCategory, HeaderDefinition
-from .data_parser import parse_stack_status, calculate_sqm, convert_mm_to_cm, map_stack_status
+from .data_parser import (
+    StackCacheInfo,
+    calculate_sqm,
+    clear_stack_status_cache,
+    convert_mm_to_cm,
+    map_stack_status,
+    parse_stack_status,
+    parse_stack_status_many,
+    stack_status_cache_info,
+)
+from .workbook_reader import (
+    SheetReadResult,
+    open_workbook,
+    read_sheet_with_header_detection,
+    read_workbook_sheets,
+)
+from .stage_artifacts import (
+    read_excel_with_sidecar,
+    set_sidecars_enabled,
+    sidecar_paths,
+    write_sidecar,
+)
+from .stage_cache import CacheEntry, StageCache
+from .location_timeline import LocationTimeline, parse_date_cells
 
 __version__ = "1.0.0"
 __all__ = [
@@ -36,4 +66,20 @@ __all__ = [
     "calculate_sqm",
     "convert_mm_to_cm",
     "map_stack_status",
+    "parse_stack_status_many",
+    "stack_status_cache_info",
+    "clear_stack_status_cache",
+    "StackCacheInfo",
+    "SheetReadResult",
+    "open_workbook",
+    "read_sheet_with_header_detection",
+    "read_workbook_sheets",
+    "read_excel_with_sidecar",
+    "set_sidecars_enabled",
+    "sidecar_paths",
+    "write_sidecar",
+    "CacheEntry",
+    "StageCache",
+    "LocationTimeline",
+    "parse_date_cells",
 ]
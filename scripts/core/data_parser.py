@@ -6,6 +6,7 @@ Data Parsing Utilities
 Core data parsing functions for HVDC pipeline stages.
 Provides reusable parsing logic for:
 - Stack_Status parsing (stackability text → tier number)
+- Bounded, thread-safe memo cache for parsed Stack texts (hit/miss counters)
 - SQM calculation (dimensions → area)
 - Unit conversions (mm → cm, etc.)
 
@@ -17,7 +18,9 @@ Created: 2025-10-23
 from __future__ import annotations
 
 import re
-from typing import Optional, Iterable
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Iterable
 
 # --- 패턴 준비 ----------------------------------------------------------------
 # 오타/대소문자/공백 변형을 감안해 넉넉히 커버
@@ -79,6 +82,107 @@ def _strip_weights(text: str) -> str:
     return s
 
 
+class StackCacheInfo(NamedTuple):
+    """Stack 파싱 캐시 통계 (functools.lru_cache의 cache_info와 동일 형태)"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        """Stage 로그용 한 줄 요약"""
+        return (
+            f"hits={self.hits}, misses={self.misses}, size={self.currsize}/{self.maxsize}, "
+            f"hit_rate={self.hit_rate:.1%}"
+        )
+
+
+class StackParseCache:
+    """
+    정규화된 Stack 텍스트 → tier 수 LRU 메모 캐시
+
+    Stack 텍스트는 수만 행에 걸쳐 수백 종류뿐이므로 같은 문자열에 대해
+    정규식 파이프라인을 다시 돌리지 않도록 결과를 보관합니다. 여러 스레드에서
+    동시에 호출해도 안전하며, ``maxsize``를 넘으면 가장 오래 쓰이지 않은 항목부터 제거합니다.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Optional[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_or_parse(self, text: str) -> Optional[int]:
+        """캐시된 결과를 반환하거나, 없으면 파싱 후 저장"""
+        with self._lock:
+            if text in self._data:
+                self._hits += 1
+                self._data.move_to_end(text)
+                return self._data[text]
+            self._misses += 1
+
+        result = _parse_stack_text(text)
+
+        with self._lock:
+            self._data[text] = result
+            self._data.move_to_end(text)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return result
+
+    def info(self) -> StackCacheInfo:
+        """현재 캐시 통계"""
+        with self._lock:
+            return StackCacheInfo(self._hits, self._misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        """캐시 항목과 통계를 초기화"""
+        with self._lock:
+            self._data.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+_STACK_CACHE = StackParseCache()
+
+
+def stack_status_cache_info() -> StackCacheInfo:
+    """parse_stack_status 메모 캐시 통계를 반환"""
+    return _STACK_CACHE.info()
+
+
+def clear_stack_status_cache() -> None:
+    """parse_stack_status 메모 캐시와 통계를 초기화"""
+    _STACK_CACHE.clear()
+
+
+def _normalize_stack_value(value: object) -> Optional[str]:
+    """파싱 대상 문자열로 정규화 (공백/NaN → None)"""
+    if value is None:
+        return None
+
+    # numpy.nan 처리
+    try:
+        import numpy as np
+
+        if isinstance(value, float) and np.isnan(value):
+            return None
+    except ImportError:
+        pass
+
+    s = str(value).strip()
+    if not s or s.lower() == "nan":
+        return None
+    return s
+
+
 def parse_stack_status(value: object) -> Optional[int]:
     """
     Stack 텍스트에서 tier 수 파싱
@@ -91,6 +195,8 @@ def parse_stack_status(value: object) -> Optional[int]:
     5) 위 모두에 해당 없으면 → 1
     6) 공백/NaN → None
 
+    같은 텍스트의 파싱 결과는 메모 캐시(stack_status_cache_info 참조)에서 재사용합니다.
+
     Args:
         value: 파싱할 값 (문자열, 숫자, None 등)
 
@@ -109,22 +215,48 @@ def parse_stack_status(value: object) -> Optional[int]:
         >>> parse_stack_status("")
         None
     """
-    if value is None:
+    s = _normalize_stack_value(value)
+    if s is None:
         return None
+    return _STACK_CACHE.get_or_parse(s)
 
-    # numpy.nan 처리
-    try:
-        import numpy as np
 
-        if isinstance(value, float) and np.isnan(value):
-            return None
-    except ImportError:
-        pass
+def parse_stack_status_many(series):
+    """
+    Series 전체 Stack_Status 파싱 (고유값만 1회 파싱)
 
-    s = str(value).strip()
-    if not s or s.lower() == "nan":
-        return None
+    parse_stack_status는 str(value)만 보고 판단하므로 문자열 키로 고유값을 추린 뒤
+    고유값마다 한 번만 파싱하고 코드 배열로 펼칩니다.
+
+    Args:
+        series: pandas Series
+
+    Returns:
+        series.map(parse_stack_status)와 동일한 Series
+
+    Examples:
+        >>> import pandas as pd
+        >>> parse_stack_status_many(pd.Series(["X2", "X2", "Not stackable"])).tolist()
+        [2, 2, 0]
+    """
+    import numpy as np
+    import pandas as pd
+
+    if series.empty:
+        return pd.Series([], index=series.index, dtype=object)
+
+    keys = series.astype(object).astype(str)
+    codes, uniques = pd.factorize(keys)
+    memo = np.array([parse_stack_status(text) for text in uniques] + [None], dtype=object)
+    parsed = memo[codes]
 
+    # None 값은 str()이 "None"이 되므로 원래 규칙(None → None)으로 복원
+    parsed[(series.isna() & (keys == "None")).to_numpy()] = None
+    return pd.Series(parsed, index=series.index, dtype=object).infer_objects()
+
+
+def _parse_stack_text(s: str) -> Optional[int]:
+    """정규화된 Stack 텍스트를 규칙에 따라 파싱 (캐시 미사용)"""
     s_lower = s.lower()
 
     # 1) 명시적 비적재
@@ -179,6 +311,37 @@ def calculate_sqm(length_cm: float, width_cm: float) -> float:
     return (length_cm * width_cm) / 10000
 
 
+def round_array(values, ndigits: int = 2):
+    """
+    내장 round(x, ndigits)와 동일한 결과의 배열 반올림
+
+    np.round는 x*10^n을 거쳐 반올림하므로 .xx5 경계값과 매우 큰 값에서 내장 round와
+    다를 수 있어 해당 값만 내장 round로 다시 계산합니다.
+
+    Args:
+        values: float 배열
+        ndigits: 소수점 자릿수
+
+    Returns:
+        반올림된 float 배열
+
+    Examples:
+        >>> round_array([0.0125, 2.675, 1.5])
+        array([0.01, 2.67, 1.5 ])
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype="float64")
+    rounded = np.round(values, ndigits)
+    scaled = values * (10.0**ndigits)
+    with np.errstate(invalid="ignore"):
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        near_half |= np.abs(values) >= 1e12
+    for i in np.flatnonzero(near_half):
+        rounded.flat[i] = round(float(values.flat[i]), ndigits)
+    return rounded
+
+
 def convert_mm_to_cm(value: float) -> float:
     """
     mm를 cm로 변환
@@ -218,4 +381,6 @@ def map_stack_status(series_like) -> "SeriesLike":
         >>> print(df["Stack_Status"].tolist())
         [0, 2, 3]
     """
+    if hasattr(series_like, "astype") and hasattr(series_like, "isna"):
+        return parse_stack_status_many(series_like)
     return series_like.map(parse_stack_status)
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""
+Location Timeline Module
+========================
+
+Read-only (cases × locations) visit-date matrix shared by Stage 3 and Stage 4.
+
+Stage 3 ``process_real_data`` builds one ``LocationTimeline`` for the
+warehouse/site columns after converting them; the calculators, the report
+sheets and the Stage 4 detectors read dates, day numbers and the per-case
+visit order from it instead of calling ``pd.to_datetime`` on single cells or
+whole columns again.
+
+A timeline holds:
+
+- ``ns``: int64 nanoseconds since the epoch, ``NAT_INT64`` where the cell is
+  missing or cannot be parsed
+- ``days``: int64 day numbers since 1970-01-01 (``NAT_INT64`` where missing)
+- ``missing``: NaT mask
+- the visit order: every dated cell sorted by (case, date, location column
+  order) - the same order as ``sorted(visits, key=date)`` over the columns
+
+Cells are parsed like ``pd.to_datetime(cell)`` one value at a time (each
+distinct value once), so the timeline agrees with row-by-row reference code.
+All arrays are read-only.
+
+Examples:
+    >>> timeline = LocationTimeline.from_frame(df, ["DSV Indoor", "MOSB", "MIR"])
+    >>> timeline.block(["MIR"])  # (cases × 1) int64 ns
+    >>> case, location, ns = timeline.visits()
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# datetime64[ns]의 NaT 정수 표현
+NAT_INT64 = np.iinfo(np.int64).min
+DAY_NS = 86_400 * 10**9
+
+
+def _datetime_or_nat(value):
+    """셀 값 → pd.to_datetime(value) (결측/변환 실패 → NaT)"""
+    if pd.isna(value):
+        return pd.NaT
+    try:
+        return pd.to_datetime(value)
+    except Exception:
+        return pd.NaT
+
+
+def parse_date_cells(series: pd.Series) -> np.ndarray:
+    """
+    Series → datetime64[ns] array with per-cell ``pd.to_datetime`` semantics.
+
+    Missing or unparseable cells become NaT and time zones are dropped
+    (wall-clock time is kept). Each distinct value is parsed once.
+    """
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        series = series.dt.tz_localize(None)
+    if not pd.api.types.is_datetime64_dtype(series):
+        codes, uniques = pd.factorize(series)
+        parsed = [_datetime_or_nat(value) for value in uniques] + [pd.NaT]
+        parsed = [
+            value.tz_localize(None) if getattr(value, "tzinfo", None) is not None else value
+            for value in parsed
+        ]
+        series = pd.Series(pd.to_datetime(np.asarray(parsed, dtype=object)[codes]))
+    return series.to_numpy(dtype="datetime64[ns]")
+
+
+def _readonly(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+@dataclass(frozen=True, eq=False)
+class LocationTimeline:
+    """
+    Read-only visit-date matrix of one case frame.
+
+    Attributes:
+        locations: Location column names (matrix column order, visit tie order)
+        ns: (cases × locations) int64 nanoseconds, ``NAT_INT64`` where missing
+    """
+
+    locations: Tuple[str, ...]
+    ns: np.ndarray
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, locations: Sequence[str]) -> "LocationTimeline":
+        """Parse the location columns of ``df`` (absent columns are all-missing)."""
+        ns = np.full((len(df), len(locations)), NAT_INT64, dtype="int64")
+        for position, location in enumerate(locations):
+            if location in df.columns:
+                ns[:, position] = parse_date_cells(df[location]).view("int64")
+        return cls(tuple(locations), _readonly(ns))
+
+    @property
+    def n_cases(self) -> int:
+        return self.ns.shape[0]
+
+    @cached_property
+    def missing(self) -> np.ndarray:
+        """(cases × locations) NaT mask"""
+        return _readonly(self.ns == NAT_INT64)
+
+    @cached_property
+    def days(self) -> np.ndarray:
+        """(cases × locations) int64 day numbers since 1970-01-01, ``NAT_INT64`` where missing"""
+        days = np.floor_divide(self.ns, DAY_NS)
+        days[self.missing] = NAT_INT64
+        return _readonly(days)
+
+    @cached_property
+    def _visit_order(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        case, location = np.nonzero(~self.missing)
+        order = np.lexsort((location, self.ns[case, location], case))
+        case, location = case[order], location[order]
+        start = np.searchsorted(case, np.arange(self.n_cases + 1))
+        return _readonly(case), _readonly(location), _readonly(start)
+
+    @property
+    def visit_case(self) -> np.ndarray:
+        """Case (row position) of every visit in visit order"""
+        return self._visit_order[0]
+
+    @property
+    def visit_location(self) -> np.ndarray:
+        """Location index (into ``locations``) of every visit in visit order"""
+        return self._visit_order[1]
+
+    @property
+    def visit_start(self) -> np.ndarray:
+        """Offsets: visits of case ``i`` are ``visit_start[i]:visit_start[i + 1]``"""
+        return self._visit_order[2]
+
+    def position(self, location: str) -> int:
+        """Column index of ``location`` (-1 if it is not part of the timeline)"""
+        try:
+            return self.locations.index(location)
+        except ValueError:
+            return -1
+
+    def block(self, columns: Sequence[str], days: bool = False) -> np.ndarray:
+        """
+        (cases × columns) copy of the ns (or day-number) matrix.
+
+        Columns that are not part of the timeline are all ``NAT_INT64``.
+        """
+        source = self.days if days else self.ns
+        block = np.full((self.n_cases, len(columns)), NAT_INT64, dtype="int64")
+        for position, column in enumerate(columns):
+            index = self.position(column)
+            if index >= 0:
+                block[:, position] = source[:, index]
+        return block
+
+    def visits(
+        self, columns: Optional[Sequence[str]] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Dated cells in visit order: (case, column index, ns).
+
+        With ``columns`` only visits to those locations are kept and the column
+        index refers to ``columns``; ties on the same timestamp keep the
+        timeline's location order.
+        """
+        case, location = self.visit_case, self.visit_location
+        if columns is None:
+            return case, location, self.ns[case, location]
+        mapping = np.full(len(self.locations), -1, dtype="int64")
+        for position, column in enumerate(columns):
+            index = self.position(column)
+            if index >= 0:
+                mapping[index] = position
+        keep = mapping[location] >= 0
+        case, location = case[keep], location[keep]
+        return case, mapping[location], self.ns[case, location]
+
+    def take(self, rows) -> "LocationTimeline":
+        """Timeline of a row subset (positions or boolean mask)"""
+        return LocationTimeline(self.locations, _readonly(self.ns[rows]))
@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""
+Stage Artifacts Module
+======================
+
+Typed Parquet sidecars for the Excel files handed from one stage to the next.
+
+Every stage keeps writing its ``.xlsx`` as the human deliverable. Next to it,
+``write_sidecar`` stores the same DataFrame as ``<stem>.parquet`` (or
+``<stem>.<sheet>.parquet`` for a named sheet) together with the SHA-256 of the
+xlsx file. ``read_excel_with_sidecar`` returns the sidecar when that
+fingerprint still matches the xlsx on disk and falls back to ``pd.read_excel``
+otherwise (no sidecar, xlsx edited by hand, pyarrow missing, sidecars off).
+
+pyarrow is optional. Without it sidecars are silently skipped.
+
+The sidecar returns the frame close to what ``pd.read_excel`` would return
+for the written values:
+
+- object columns that mix value types (e.g. dates and ``"TBA"``, or ``1``
+  and ``"x"``) cannot be stored in a typed Parquet column; each cell is
+  stored as tagged JSON (``["i", 1]``, ``["s", "x"]``, ``["d", "<iso>"]``)
+  and decoded on read, so the values keep their types
+- missing values in object columns come back as NaN (not None), and object
+  columns holding only bools and blanks come back as float64
+- whole-number float columns come back as int64, whole floats in mixed
+  columns as int, and dates in mixed columns as ``datetime.datetime``
+- datetime columns come back as ``datetime64[ns]``
+
+Known differences from ``pd.read_excel``:
+
+- pandas extension dtypes (``Int64``, ``string``, ``category``, ...) are kept
+  as written; the Excel reader returns float64/object
+- bool cells inside mixed columns stay bool; the Excel reader may return
+  them as 1/0 depending on the other cells
+
+Sidecars hold plain data only: reading one decodes Parquet and JSON values
+and never runs code from the file. Cells of any other type (e.g.
+``datetime.time``) have no tag; no sidecar is written for such a frame and the
+next stage reads the xlsx. A sidecar whose cells cannot be decoded is ignored
+the same way.
+
+Examples:
+    >>> write_sidecar(df, "synced.xlsx")          # after df.to_excel(...)
+    >>> df = read_excel_with_sidecar("synced.xlsx")
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:  # pragma: no cover - optional dependency guard
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - handled at runtime
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+PARQUET_AVAILABLE = pa is not None
+SIDECAR_SUFFIX = ".parquet"
+SIDECAR_METADATA_KEY = b"hvdc.sidecar"
+SIDECAR_FORMAT_VERSION = 3
+
+SIDECAR_ENV_VAR = "HVDC_PARQUET_SIDECARS"
+
+_FINGERPRINT_CHUNK = 1 << 20
+_CELL_TYPES = {"b": bool, "i": int, "f": float, "s": str}
+_DISABLED_VALUES = {"0", "false", "no", "off"}
+
+PathLike = Union[str, Path]
+SheetKey = Union[int, str, None]
+
+
+def set_sidecars_enabled(enabled: bool) -> None:
+    """
+    Turn sidecar reads/writes on or off.
+
+    The switch lives in the ``HVDC_PARQUET_SIDECARS`` environment variable so
+    it also applies to stage modules that import this file as ``core`` rather
+    than ``scripts.core``, and to worker processes.
+    """
+    os.environ[SIDECAR_ENV_VAR] = "1" if enabled else "0"
+
+
+def sidecars_enabled() -> bool:
+    """Return True when sidecars are enabled and pyarrow is importable."""
+    flag = os.environ.get(SIDECAR_ENV_VAR, "1").strip().lower()
+    return PARQUET_AVAILABLE and flag not in _DISABLED_VALUES
+
+
+def _sheet_label(sheet_name: SheetKey) -> Optional[str]:
+    """Map a read_excel sheet key to a sidecar label (None = first sheet)."""
+    if sheet_name is None or sheet_name == 0:
+        return None
+    return str(sheet_name)
+
+
+def sidecar_path(xlsx_path: PathLike, sheet_name: SheetKey = None) -> Path:
+    """
+    Return the sidecar path for an Excel file (and optional sheet).
+
+    Args:
+        xlsx_path: Path to the Excel deliverable
+        sheet_name: Sheet name; None or 0 means the first sheet
+
+    Returns:
+        ``<stem>.parquet`` or ``<stem>.<sheet>.parquet`` next to the xlsx
+    """
+    path = Path(xlsx_path)
+    label = _sheet_label(sheet_name)
+    name = path.stem if label is None else f"{path.stem}.{label}"
+    return path.with_name(name + SIDECAR_SUFFIX)
+
+
+def sidecar_paths(xlsx_path: PathLike) -> List[Path]:
+    """Return all existing sidecars that belong to an Excel file."""
+    path = Path(xlsx_path)
+    stem = glob.escape(path.stem)
+    found = set(path.parent.glob(stem + SIDECAR_SUFFIX))
+    found.update(path.parent.glob(f"{stem}.*{SIDECAR_SUFFIX}"))
+    return sorted(found)
+
+
+def file_fingerprint(path: PathLike) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_FINGERPRINT_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode_cell(value: Any) -> Optional[str]:
+    """Encode one mixed-column cell as tagged JSON (None for missing)."""
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, (bool, np.bool_)):
+        return json.dumps(["b", bool(value)])
+    if isinstance(value, (int, np.integer)):
+        return json.dumps(["i", int(value)])
+    if isinstance(value, (float, np.floating)):
+        return None if np.isnan(value) else json.dumps(["f", float(value)])
+    if isinstance(value, str):
+        return json.dumps(["s", value], ensure_ascii=False)
+    if isinstance(value, datetime) and value.tzinfo is None:
+        return json.dumps(["d", pd.Timestamp(value).isoformat()])
+    raise ValueError(f"no sidecar encoding for {type(value).__name__} cells")
+
+
+def _decode_cell(raw: Optional[str]) -> Any:
+    """Decode a tagged JSON cell written by ``_encode_cell``."""
+    if raw is None:
+        return np.nan
+    tag, value = json.loads(raw)
+    if tag == "d":
+        return pd.Timestamp(value).to_pydatetime(warn=False)
+    if tag == "f" and float(value).is_integer():
+        return int(value)
+    if tag in _CELL_TYPES:
+        return _CELL_TYPES[tag](value)
+    raise ValueError(f"unknown sidecar cell tag: {tag!r}")
+
+
+def _to_arrow_table(df: pd.DataFrame) -> Tuple[Any, List[str], List[str]]:
+    """
+    Convert a frame to an Arrow table.
+
+    Returns:
+        (table, tagged_columns, object_columns): mixed-type object columns are
+        stored as tagged JSON cells; object_columns lists every object-dtype
+        column
+
+    Raises:
+        ValueError: A mixed column holds a cell type that has no tag
+    """
+    object_columns = [str(column) for column in df.columns if df[column].dtype == object]
+    try:
+        return pa.Table.from_pandas(df, preserve_index=False), [], object_columns
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+        pass
+
+    converted = df.copy()
+    tagged: List[str] = []
+    for column in object_columns:
+        series = converted[column]
+        try:
+            pa.array(series, from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+            try:
+                cells = [_encode_cell(value) for value in series]
+            except ValueError as exc:
+                raise ValueError(f"column {column!r}: {exc}") from None
+            converted[column] = pd.Series(cells, index=series.index, dtype=object)
+            tagged.append(column)
+
+    return pa.Table.from_pandas(converted, preserve_index=False), tagged, object_columns
+
+
+def _excel_object_column(series: pd.Series) -> pd.Series:
+    """Blanks become NaN; a column of only bools and blanks becomes float64."""
+    values = series.to_numpy(dtype=object, copy=True)
+    missing = pd.isna(values)
+    values[missing] = np.nan
+    if missing.any() and all(isinstance(value, (bool, np.bool_)) for value in values[~missing]):
+        return pd.Series(values, index=series.index, dtype="float64")
+    return pd.Series(values, index=series.index, dtype=object)
+
+
+def _is_whole_number_column(values: np.ndarray) -> bool:
+    """Return True when a float column would be read back from Excel as int64."""
+    return (
+        len(values) > 0
+        and bool(np.isfinite(values).all())
+        and bool((values == np.floor(values)).all())
+        and bool((np.abs(values) < 2**63).all())
+    )
+
+
+def _restore_frame(df: pd.DataFrame, metadata: Dict[str, Any]) -> pd.DataFrame:
+    """
+    Undo the sidecar encodings and apply the ``pd.read_excel`` dtype rules.
+
+    Excel stores every number as a float and the reader returns whole numbers
+    as ints, so whole-number float columns come back as int64 and whole floats
+    in mixed columns as int.
+    """
+    tagged = set(metadata.get("tagged_columns", []))
+    object_columns = set(metadata.get("object_columns", []))
+    for column in df.columns:
+        if column in tagged:
+            df[column] = pd.Series(
+                [_decode_cell(raw) for raw in df[column]], index=df.index, dtype=object
+            )
+            continue
+
+        dtype = df[column].dtype
+        if column in object_columns and dtype == object:
+            df[column] = _excel_object_column(df[column])
+        elif isinstance(dtype, np.dtype) and dtype.kind == "f":
+            if _is_whole_number_column(df[column].to_numpy()):
+                df[column] = df[column].astype("int64")
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            unit = (
+                dtype.unit if isinstance(dtype, pd.DatetimeTZDtype) else np.datetime_data(dtype)[0]
+            )
+            if unit != "ns":
+                df[column] = df[column].dt.as_unit("ns")
+    return df
+
+
+def write_sidecar(
+    df: pd.DataFrame, xlsx_path: PathLike, sheet_name: SheetKey = None
+) -> Optional[Path]:
+    """
+    Write a typed Parquet sidecar for an Excel file that was just saved.
+
+    Must be called after the xlsx is final (including any formatting pass),
+    because the sidecar records the xlsx fingerprint at this moment.
+
+    Args:
+        df: DataFrame that was written to the xlsx
+        xlsx_path: Path to the saved Excel file
+        sheet_name: Sheet the frame was written to; None or 0 for the first
+
+    Returns:
+        Sidecar path, or None when sidecars are unavailable or writing failed
+    """
+    if not sidecars_enabled():
+        return None
+
+    target = sidecar_path(xlsx_path, sheet_name)
+    try:
+        if not all(isinstance(column, str) for column in df.columns):
+            raise ValueError("column names must be strings")
+        if df.columns.duplicated().any():
+            raise ValueError("duplicate column names")
+
+        table, tagged, object_columns = _to_arrow_table(df)
+        metadata: Dict[str, Any] = {
+            "format_version": SIDECAR_FORMAT_VERSION,
+            "source_name": Path(xlsx_path).name,
+            "source_sha256": file_fingerprint(xlsx_path),
+            "sheet_name": _sheet_label(sheet_name),
+            "tagged_columns": tagged,
+            "object_columns": object_columns,
+        }
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[SIDECAR_METADATA_KEY] = json.dumps(metadata).encode("utf-8")
+        table = table.replace_schema_metadata(schema_metadata)
+
+        tmp_path = target.with_name(target.name + ".tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, target)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("Parquet sidecar not written for %s: %s", xlsx_path, exc)
+        if target.exists():
+            target.unlink()
+        return None
+
+    if tagged:
+        logger.info("Sidecar %s: mixed-type columns stored as tagged JSON: %s", target.name, tagged)
+    return target
+
+
+def read_sidecar_metadata(path: PathLike) -> Optional[Dict[str, Any]]:
+    """Return the sidecar metadata dict, or None if absent/unreadable."""
+    if not PARQUET_AVAILABLE:
+        return None
+    try:
+        raw = (pq.read_schema(path).metadata or {}).get(SIDECAR_METADATA_KEY)
+    except (OSError, pa.ArrowInvalid):
+        return None
+    return json.loads(raw.decode("utf-8")) if raw else None
+
+
+def read_sidecar(xlsx_path: PathLike, sheet_name: SheetKey = None) -> Optional[pd.DataFrame]:
+    """
+    Return the sidecar frame if it exists and matches the xlsx fingerprint.
+
+    Args:
+        xlsx_path: Path to the Excel deliverable
+        sheet_name: Sheet key as passed to ``pd.read_excel``
+
+    Returns:
+        DataFrame from the sidecar, or None when it is missing or stale
+    """
+    if not sidecars_enabled():
+        return None
+
+    path = sidecar_path(xlsx_path, sheet_name)
+    if not path.exists() or not Path(xlsx_path).exists():
+        return None
+
+    metadata = read_sidecar_metadata(path)
+    if not metadata or metadata.get("format_version") != SIDECAR_FORMAT_VERSION:
+        return None
+    if metadata.get("source_sha256") != file_fingerprint(xlsx_path):
+        logger.info("Stale Parquet sidecar ignored (xlsx changed): %s", path.name)
+        return None
+
+    try:
+        return _restore_frame(pq.read_table(path).to_pandas(), metadata)
+    except (TypeError, ValueError) as exc:
+        logger.warning("Unreadable Parquet sidecar ignored: %s (%s)", path.name, exc)
+        return None
+
+
+def read_excel_with_sidecar(
+    xlsx_path: PathLike, sheet_name: SheetKey = 0, **read_excel_kwargs: Any
+) -> pd.DataFrame:
+    """
+    Load one sheet, preferring a fresh Parquet sidecar over the xlsx.
+
+    Args:
+        xlsx_path: Path to the Excel file
+        sheet_name: Sheet index 0 or sheet name
+        **read_excel_kwargs: Passed to ``pd.read_excel`` on fallback
+
+    Returns:
+        DataFrame loaded from the sidecar or the xlsx
+    """
+    df = read_sidecar(xlsx_path, sheet_name)
+    if df is not None:
+        logger.info("Loaded %s from Parquet sidecar", Path(xlsx_path).name)
+        return df
+    return pd.read_excel(xlsx_path, sheet_name=sheet_name, **read_excel_kwargs)
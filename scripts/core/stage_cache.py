@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""
+Stage Cache Module
+==================
+
+Content-hash cache that lets ``run_pipeline.py`` skip stages whose inputs
+have not changed since the last successful run.
+
+A stage key is the SHA-256 over:
+- the content of every input file (missing files hash as ``<missing>``)
+- the relevant config sections (canonical JSON)
+- the code version: pipeline version plus the content of the stage's ``*.py``
+  files (and ``scripts/core``)
+- stage-specific options (e.g. CLI overrides)
+
+After a successful run the key and the stage's output paths are stored in
+``<cache_dir>/stage<N>.json``. A later run with the same key reuses those
+outputs as long as they all still exist. The key is recomputed after the run,
+so a stage that annotates its own inputs (Stage 4 colouring the Stage 3 report)
+still hits on the next run.
+
+Examples:
+    >>> cache = StageCache("temp/stage_cache")
+    >>> key = cache.compute_key(1, inputs=[master, warehouse], config={...})
+    >>> entry = cache.lookup(1, key)
+    >>> if entry is None:
+    ...     outputs = run_stage_1()
+    ...     cache.store(1, key, outputs)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from .stage_artifacts import file_fingerprint
+
+PathLike = Union[str, Path]
+
+CACHE_FORMAT_VERSION = 1
+
+
+def _json_default(value: Any) -> str:
+    """Serialize non-JSON config values (Path, datetime...) as strings."""
+    return str(value)
+
+
+@dataclass
+class CacheEntry:
+    """Recorded result of a successful stage run."""
+
+    stage: int
+    key: str
+    outputs: List[str]
+    created_at: float
+
+    def outputs_exist(self) -> bool:
+        """Return True when every recorded output is still on disk."""
+        return all(Path(output).exists() for output in self.outputs)
+
+
+@dataclass
+class StageCache:
+    """
+    Per-stage content-hash cache backed by small JSON manifests.
+
+    Attributes:
+        cache_dir: Directory holding ``stage<N>.json`` manifests
+        code_version: Pipeline version string mixed into every key
+        hits: Stages served from the cache in this run
+        misses: Stages executed in this run
+    """
+
+    cache_dir: Path
+    code_version: str = ""
+    hits: List[int] = field(default_factory=list)
+    misses: List[int] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.cache_dir = Path(self.cache_dir)
+        self._code_hashes: Dict[Path, str] = {}
+
+    def _manifest_path(self, stage: int) -> Path:
+        return self.cache_dir / f"stage{stage}.json"
+
+    def _code_hash(self, directory: Path) -> str:
+        """Hash the ``*.py`` files directly inside a source directory."""
+        directory = Path(directory)
+        if directory not in self._code_hashes:
+            digest = hashlib.sha256()
+            for source in sorted(directory.glob("*.py")):
+                digest.update(source.name.encode("utf-8"))
+                digest.update(source.read_bytes())
+            self._code_hashes[directory] = digest.hexdigest()
+        return self._code_hashes[directory]
+
+    def compute_key(
+        self,
+        stage: int,
+        inputs: Sequence[PathLike] = (),
+        config: Optional[Dict[str, Any]] = None,
+        code_dirs: Sequence[PathLike] = (),
+        options: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """
+        Build the cache key of one stage.
+
+        Args:
+            stage: Stage number
+            inputs: Input files whose content the stage depends on
+            config: Config sections that influence the stage
+            code_dirs: Source directories whose ``*.py`` files define the stage
+            options: Extra run options (CLI overrides) that change the outputs
+
+        Returns:
+            SHA-256 hex digest
+        """
+        payload = {
+            "format": CACHE_FORMAT_VERSION,
+            "stage": stage,
+            "code_version": self.code_version,
+            "inputs": [
+                [str(path), file_fingerprint(path) if Path(path).is_file() else "<missing>"]
+                for path in inputs
+            ],
+            "config": config or {},
+            "code": [[str(path), self._code_hash(Path(path))] for path in code_dirs],
+            "options": options or {},
+        }
+        blob = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=_json_default)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def lookup(self, stage: int, key: str) -> Optional[CacheEntry]:
+        """
+        Return the recorded entry if its key matches and its outputs exist.
+
+        Args:
+            stage: Stage number
+            key: Key from ``compute_key``
+
+        Returns:
+            CacheEntry on a hit, None on a miss
+        """
+        manifest = self._manifest_path(stage)
+        if not manifest.exists():
+            return None
+        try:
+            with open(manifest, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("format") != CACHE_FORMAT_VERSION or data.get("key") != key:
+            return None
+        entry = CacheEntry(
+            stage=stage,
+            key=key,
+            outputs=list(data.get("outputs", [])),
+            created_at=float(data.get("created_at", 0.0)),
+        )
+        return entry if entry.outputs_exist() else None
+
+    def store(self, stage: int, key: str, outputs: Iterable[PathLike]) -> CacheEntry:
+        """
+        Record a successful stage run.
+
+        Args:
+            stage: Stage number
+            key: Key describing the inputs the outputs were produced from
+            outputs: Files/directories produced by the stage
+
+        Returns:
+            The stored CacheEntry
+        """
+        entry = CacheEntry(
+            stage=stage,
+            key=key,
+            outputs=[str(Path(output)) for output in outputs],
+            created_at=time.time(),
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._manifest_path(stage)
+        tmp_path = manifest.with_name(manifest.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "format": CACHE_FORMAT_VERSION,
+                    "stage": stage,
+                    "key": key,
+                    "outputs": entry.outputs,
+                    "created_at": entry.created_at,
+                },
+                handle,
+                ensure_ascii=False,
+                indent=2,
+            )
+        tmp_path.replace(manifest)
+        return entry
+
+    def summary(self) -> str:
+        """Return a one-line hit/miss summary for the run report."""
+        return f"hits {self.hits}, misses {self.misses}"
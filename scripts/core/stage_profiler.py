@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+Stage Profiler Module
+=====================
+
+Nested phase timers, peak RSS and row throughput for pipeline stages.
+
+``run_pipeline.py`` wraps every stage in ``StageProfiler.stage(...)`` and
+writes the collected records to ``run_profile.json``. Stage code marks its
+own phases with the module-level ``profile_phase`` context manager and
+reports its row count with ``record_rows``; both are no-ops when no
+profiler is active (e.g. a stage script run on its own or in tests).
+
+The active profiler is module state, so every stage imports this module as
+``core.stage_profiler`` (``scripts/`` on ``sys.path``), never through
+``scripts.core``.
+
+Per stage the profile holds:
+
+- wall time of the stage and of every (nested) phase
+- peak RSS of this process while the stage ran (sampled in a background
+  thread from psutil or ``/proc/self/statm``; ``None`` when neither exists)
+- process and child-process ``ru_maxrss`` high-water marks
+- rows processed and rows/sec
+- optionally a cProfile ``stage<N>.pstats`` dump
+
+Examples:
+    >>> profiler = StageProfiler(cprofile_dir="data/processed/profiles")
+    >>> set_active_profiler(profiler)
+    >>> with profiler.stage(2, "Derived Columns"):
+    ...     with profile_phase("load"):
+    ...         df = load()
+    ...     record_rows(len(df))
+    >>> profiler.write("data/processed/run_profile.json")
+"""
+
+from __future__ import annotations
+
+import contextlib
+import cProfile
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+try:  # pragma: no cover - optional dependency guard
+    import psutil
+except ImportError:  # pragma: no cover - handled at runtime
+    psutil = None  # type: ignore[assignment]
+
+try:  # pragma: no cover - resource is POSIX only
+    import resource
+except ImportError:  # pragma: no cover - handled at runtime
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FORMAT_VERSION = 1
+RSS_SAMPLE_INTERVAL = 0.05
+
+PathLike = Union[str, Path]
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+# ru_maxrss 단위: Linux는 KiB, macOS는 byte
+_MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process in bytes, or None if unavailable."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss_mb(who: str) -> Optional[float]:
+    if resource is None:
+        return None
+    usage = resource.getrusage(getattr(resource, who))
+    return _mb(usage.ru_maxrss * _MAXRSS_UNIT)
+
+
+def _mb(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value / (1024 * 1024), 1)
+
+
+def _rate(rows: Optional[int], seconds: float) -> Optional[float]:
+    if rows is None or seconds <= 0:
+        return None
+    return round(rows / seconds, 1)
+
+
+@dataclass
+class PhaseRecord:
+    """Timing of one phase; ``phases`` holds the nested phases in start order."""
+
+    name: str
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    phases: List["PhaseRecord"] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "seconds": round(self.seconds, 4),
+            "rows": self.rows,
+            "rows_per_sec": _rate(self.rows, self.seconds),
+            "phases": [phase.to_dict() for phase in self.phases],
+        }
+
+
+@dataclass
+class StageRecord:
+    """Profile of one stage run (or cache hit)."""
+
+    stage: int
+    name: str
+    status: str = "running"
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    peak_rss_mb: Optional[float] = None
+    process_peak_rss_mb: Optional[float] = None
+    children_peak_rss_mb: Optional[float] = None
+    pstats: Optional[str] = None
+    phases: List[PhaseRecord] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "name": self.name,
+            "status": self.status,
+            "seconds": round(self.seconds, 4),
+            "rows": self.rows,
+            "rows_per_sec": _rate(self.rows, self.seconds),
+            "peak_rss_mb": self.peak_rss_mb,
+            "process_peak_rss_mb": self.process_peak_rss_mb,
+            "children_peak_rss_mb": self.children_peak_rss_mb,
+            "pstats": self.pstats,
+            "phases": [phase.to_dict() for phase in self.phases],
+        }
+
+
+class _RssSampler:
+    """Background thread that keeps the highest RSS seen since ``start``."""
+
+    def __init__(self, interval: float = RSS_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.peak = current_rss_bytes()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+
+    def _sample(self) -> None:
+        rss = current_rss_bytes()
+        if rss is not None and (self.peak is None or rss > self.peak):
+            self.peak = rss
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "_RssSampler":
+        if self.peak is not None:
+            self._thread.start()
+        return self
+
+    def stop(self) -> Optional[int]:
+        if self._thread.is_alive():
+            self._stop.set()
+            self._thread.join()
+        self._sample()
+        return self.peak
+
+
+class StageProfiler:
+    """
+    Collects ``StageRecord``s for one pipeline run.
+
+    Args:
+        cprofile_dir: When set, every stage also runs under cProfile and the
+            stats are dumped to ``<cprofile_dir>/stage<N>.pstats``.
+    """
+
+    def __init__(self, cprofile_dir: Optional[PathLike] = None):
+        self.cprofile_dir = Path(cprofile_dir) if cprofile_dir else None
+        self.started_at = datetime.now()
+        self.stages: List[StageRecord] = []
+        self._start = time.perf_counter()
+        self._current: Optional[StageRecord] = None
+        self._phase_stack: List[PhaseRecord] = []
+
+    @contextlib.contextmanager
+    def stage(self, stage_num: int, name: str = "") -> Iterator[StageRecord]:
+        """Profile one stage. A raised exception marks the stage ``failed``."""
+        record = StageRecord(stage=stage_num, name=name or f"Stage {stage_num}")
+        self.stages.append(record)
+        self._current, self._phase_stack = record, []
+
+        profile = cProfile.Profile() if self.cprofile_dir else None
+        sampler = _RssSampler().start()
+        start = time.perf_counter()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield record
+        except BaseException:
+            record.status = "failed"
+            raise
+        finally:
+            if profile is not None:
+                profile.disable()
+            record.seconds = time.perf_counter() - start
+            record.peak_rss_mb = _mb(sampler.stop())
+            record.process_peak_rss_mb = _max_rss_mb("RUSAGE_SELF")
+            record.children_peak_rss_mb = _max_rss_mb("RUSAGE_CHILDREN")
+            if record.status == "running":
+                record.status = "ok"
+            if profile is not None:
+                self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+                pstats_path = self.cprofile_dir / f"stage{stage_num}.pstats"
+                profile.dump_stats(str(pstats_path))
+                record.pstats = str(pstats_path)
+            self._current, self._phase_stack = None, []
+            logger.info(
+                "Stage %s profile: %.2fs, peak RSS %s MB, rows %s",
+                stage_num,
+                record.seconds,
+                record.peak_rss_mb,
+                record.rows,
+            )
+
+    def mark_failed(self) -> None:
+        """Mark the running stage as failed without raising (``run_stage`` returns False)."""
+        if self._current is not None:
+            self._current.status = "failed"
+
+    def mark_cached(self, stage_num: int, name: str = "") -> StageRecord:
+        """Record a stage that was skipped by the stage cache."""
+        record = StageRecord(stage=stage_num, name=name or f"Stage {stage_num}", status="cached")
+        self.stages.append(record)
+        return record
+
+    @contextlib.contextmanager
+    def phase(self, name: str, rows: Optional[int] = None) -> Iterator[PhaseRecord]:
+        """Time a phase, nested under the innermost open phase of the current stage."""
+        if self._current is None:
+            yield PhaseRecord(name, rows=rows)
+            return
+        record = PhaseRecord(name, rows=rows)
+        parent = self._phase_stack[-1].phases if self._phase_stack else self._current.phases
+        parent.append(record)
+        self._phase_stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            self._phase_stack.pop()
+
+    def set_rows(self, rows: Optional[int]) -> None:
+        """Set the row count of the current stage."""
+        if self._current is not None and rows is not None:
+            self._current.rows = int(rows)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format_version": PROFILE_FORMAT_VERSION,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "total_seconds": round(time.perf_counter() - self._start, 4),
+            "argv": list(sys.argv),
+            "pid": os.getpid(),
+            "stages": [record.to_dict() for record in self.stages],
+        }
+
+    def write(self, path: PathLike) -> Path:
+        """Write the profile as JSON and return the path."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as handle:
+            json.dump(self.to_dict(), handle, ensure_ascii=False, indent=2)
+        return path
+
+
+_ACTIVE: Optional[StageProfiler] = None
+
+
+def set_active_profiler(profiler: Optional[StageProfiler]) -> None:
+    """Install the profiler used by ``profile_phase`` and ``record_rows`` (None = off)."""
+    global _ACTIVE
+    _ACTIVE = profiler
+
+
+def get_active_profiler() -> Optional[StageProfiler]:
+    return _ACTIVE
+
+
+def profile_phase(name: str, rows: Optional[int] = None):
+    """Phase timer of the active profiler; a no-op context when none is active."""
+    if _ACTIVE is None:
+        return contextlib.nullcontext()
+    return _ACTIVE.phase(name, rows=rows)
+
+
+def record_rows(rows: Optional[int]) -> None:
+    """Report the current stage's row count to the active profiler."""
+    if _ACTIVE is not None:
+        _ACTIVE.set_rows(rows)
@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+Workbook Reader Module
+======================
+
+Single-pass Excel sheet loading with header detection.
+
+``pd.read_excel`` + ``detect_header_row`` parse every sheet several times:
+once for header detection (first ``max_search_rows`` rows), once more for
+the actual data. This module streams each worksheet exactly once through a
+read-only openpyxl workbook, runs header detection on the buffered leading
+rows and builds the DataFrame from the same buffer.
+
+Cell conversion and DataFrame construction follow ``pd.read_excel`` (openpyxl
+engine) so the resulting frames are identical to the previous two-step load.
+
+Independent sheets can also be parsed concurrently in a process pool with
+``read_workbook_sheets(..., max_workers=N)``; results keep workbook order.
+
+Examples:
+    >>> with open_workbook("Case List.xlsx") as book:
+    ...     for name in book.sheet_names:
+    ...         result = read_sheet_with_header_detection(book, name)
+    ...         print(name, result.header_row, len(result.data))
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from .header_detector import HeaderDetector
+
+
+@dataclass
+class SheetReadResult:
+    """Result of loading one worksheet."""
+
+    sheet_name: str
+    data: pd.DataFrame
+    header_row: int
+    confidence: float
+    parse_seconds: float
+
+
+class WorkbookHandle:
+    """
+    Read-only openpyxl workbook opened once and shared by all sheet reads.
+
+    Attributes:
+        book: The underlying openpyxl workbook (read_only=True, data_only=True)
+        sheet_names: Worksheet titles in workbook order (chart sheets excluded)
+    """
+
+    def __init__(self, file_path: str):
+        from openpyxl import load_workbook
+
+        self.file_path = str(file_path)
+        self.book = load_workbook(self.file_path, read_only=True, data_only=True, keep_links=False)
+        self.sheet_names: List[str] = [sheet.title for sheet in self.book.worksheets]
+
+    def close(self) -> None:
+        """Release the file handle held by the read-only workbook."""
+        self.book.close()
+
+
+@contextmanager
+def open_workbook(file_path: str) -> Iterator[WorkbookHandle]:
+    """
+    Open an Excel file once for single-pass sheet reads.
+
+    Args:
+        file_path: Path to the Excel file
+
+    Yields:
+        WorkbookHandle that is closed on exit
+    """
+    handle = WorkbookHandle(file_path)
+    try:
+        yield handle
+    finally:
+        handle.close()
+
+
+def _convert_cell(cell) -> Any:
+    """Convert an openpyxl cell the same way pandas' openpyxl reader does."""
+    from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+
+    if cell.value is None:
+        return ""  # compat with xlrd / pandas
+    elif cell.data_type == TYPE_ERROR:
+        return np.nan
+    elif cell.data_type == TYPE_NUMERIC:
+        val = int(cell.value)
+        if val == cell.value:
+            return val
+        return float(cell.value)
+
+    return cell.value
+
+
+def _rectangularize(rows: List[List[Any]]) -> List[List[Any]]:
+    """Trim trailing empty cells/rows and pad rows to equal width."""
+    data: List[List[Any]] = []
+    last_row_with_data = -1
+    for row_number, row in enumerate(rows):
+        trimmed = list(row)
+        while trimmed and trimmed[-1] == "":
+            trimmed.pop()
+        if trimmed:
+            last_row_with_data = row_number
+        data.append(trimmed)
+
+    data = data[: last_row_with_data + 1]
+
+    if data:
+        max_width = max(len(row) for row in data)
+        data = [row + [""] * (max_width - len(row)) for row in data]
+
+    return data
+
+
+def _frame_from_rows(
+    rows: List[List[Any]], header: Optional[int], nrows: Optional[int] = None
+) -> pd.DataFrame:
+    """Build a DataFrame from converted rows exactly like ``pd.read_excel``."""
+    if not rows:
+        return pd.DataFrame()
+    parser = TextParser(rows, header=header, nrows=nrows, skip_blank_lines=False)
+    return parser.read(nrows=nrows)
+
+
+def read_worksheet_rows(book: WorkbookHandle, sheet_name: str) -> List[List[Any]]:
+    """
+    Stream all rows of a worksheet once, converting cells like pandas.
+
+    Args:
+        book: Open workbook handle
+        sheet_name: Worksheet title
+
+    Returns:
+        List of converted rows (untrimmed)
+    """
+    sheet = book.book[sheet_name]
+    sheet.reset_dimensions()
+    return [[_convert_cell(cell) for cell in row] for row in sheet.rows]
+
+
+def read_sheet_with_header_detection(
+    book: WorkbookHandle,
+    sheet_name: str,
+    detector: Optional[HeaderDetector] = None,
+) -> SheetReadResult:
+    """
+    Load one worksheet in a single pass with automatic header detection.
+
+    Header detection runs on the first ``detector.max_search_rows`` buffered
+    rows (the same window ``detect_header_row`` reads from disk), and the
+    DataFrame is built from the same buffer with the detected header row.
+
+    Args:
+        book: Open workbook handle
+        sheet_name: Worksheet title
+        detector: HeaderDetector to use (default settings if None)
+
+    Returns:
+        SheetReadResult with the DataFrame, header row, confidence and parse time
+    """
+    detector = detector or HeaderDetector()
+    start = time.perf_counter()
+
+    raw_rows = read_worksheet_rows(book, sheet_name)
+
+    # Same window as ``pd.read_excel(header=None, nrows=max_search_rows)``
+    max_rows = detector.max_search_rows
+    search_rows = _rectangularize(raw_rows[: max_rows + 1])
+    search_df = _frame_from_rows(search_rows, None, nrows=max_rows)
+    header_row, confidence = detector.detect_from_dataframe(search_df)
+
+    data = _frame_from_rows(_rectangularize(raw_rows), header_row)
+
+    return SheetReadResult(
+        sheet_name=sheet_name,
+        data=data,
+        header_row=header_row,
+        confidence=confidence,
+        parse_seconds=time.perf_counter() - start,
+    )
+
+
+def _read_sheet_job(
+    file_path: str, sheet_name: str, detector: Optional[HeaderDetector]
+) -> SheetReadResult:
+    """Process-pool job: open the workbook in the worker and read one sheet."""
+    try:
+        with open_workbook(file_path) as book:
+            return read_sheet_with_header_detection(book, sheet_name, detector)
+    except Exception as exc:
+        raise ValueError(f"Failed to load sheet '{sheet_name}' from {file_path}: {exc}") from exc
+
+
+def read_workbook_sheets(
+    file_path: str,
+    sheet_names: Sequence[str],
+    detector: Optional[HeaderDetector] = None,
+    max_workers: int = 1,
+) -> List[SheetReadResult]:
+    """
+    Load several sheets of one workbook, optionally in parallel.
+
+    With ``max_workers > 1`` and more than one sheet, each sheet is parsed and
+    header-detected in its own worker process (every worker opens the file
+    read-only). Otherwise the workbook is opened once and read serially.
+
+    Args:
+        file_path: Path to the Excel file
+        sheet_names: Sheets to load, in the desired output order
+        detector: HeaderDetector to use (default settings if None)
+        max_workers: Number of worker processes (1 = serial)
+
+    Returns:
+        SheetReadResult list in the same order as ``sheet_names``
+    """
+    sheet_names = list(sheet_names)
+    workers = min(max(1, int(max_workers or 1)), len(sheet_names))
+
+    if workers <= 1:
+        with open_workbook(file_path) as book:
+            return [
+                read_sheet_with_header_detection(book, sheet_name, detector)
+                for sheet_name in sheet_names
+            ]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_read_sheet_job, str(file_path), sheet_name, detector)
+            for sheet_name in sheet_names
+        ]
+        return [future.result() for future in futures]
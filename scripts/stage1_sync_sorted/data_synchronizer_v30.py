@@ -24,6 +24,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime
+import warnings
 import pandas as pd
 import numpy as np
 from pathlib import Path
@@ -38,8 +39,36 @@ from ..core import (
     detect_header_row,
     HVDC_HEADER_REGISTRY,
     HeaderCategory,
+    HeaderDetector,
     HeaderRegistry,
+    open_workbook,
+    read_sheet_with_header_detection,
+    read_workbook_sheets,
+    write_sidecar,
 )
+from .delta_state import (
+    DeltaState,
+    cell_token,
+    first_positions,
+    is_missing,
+    master_case_keys,
+    row_fingerprints,
+    warehouse_case_keys,
+)
+
+# 파이프라인 프로파일러 (활성 프로파일러는 core.stage_profiler 한 곳에만 있음;
+# scripts/가 sys.path에 없는 단독 실행/테스트에서는 no-op)
+try:
+    from core.stage_profiler import profile_phase, record_rows
+except ImportError:
+    from contextlib import nullcontext
+
+    def profile_phase(name, rows=None):  # type: ignore[misc]
+        return nullcontext()
+
+    def record_rows(rows):  # type: ignore[misc]
+        return None
+
 
 # ===== Configuration =====
 ORANGE = "FFC000"  # Changed date cell
@@ -102,6 +131,41 @@ def _to_date(val) -> Optional[pd.Timestamp]:
         return None
 
 
+def _to_date_array(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Column-wise counterpart of ``_to_date`` used by the vectorized merge engine.
+
+    Each distinct value is parsed once with ``_to_date`` so the result is
+    identical to calling it per cell.
+
+    Returns:
+        Tuple of (normalized datetime64 array, missing mask, NaT mask) where
+        ``missing`` marks cells for which ``_to_date`` returns None and ``nat``
+        marks cells that parsed to NaT.
+    """
+    values = np.asarray(values, dtype=object)
+    missing = np.fromiter(
+        (v is None or (isinstance(v, float) and np.isnan(v)) for v in values),
+        dtype=bool,
+        count=len(values),
+    )
+    normalized = np.full(len(values), np.datetime64("NaT", "ns"), dtype="datetime64[ns]")
+
+    present = np.flatnonzero(~missing)
+    if len(present):
+        codes, uniques = pd.factorize(values[present])
+        parsed = [_to_date(v) for v in uniques]
+        unparsed = np.array([p is None for p in parsed], dtype=bool)
+        parsed_dates = pd.DatetimeIndex([pd.NaT if p is None else p for p in parsed])
+        parsed_dates = parsed_dates.normalize().to_numpy(dtype="datetime64[ns]")
+        valid = codes >= 0
+        normalized[present[valid]] = parsed_dates[codes[valid]]
+        missing[present[valid]] |= unparsed[codes[valid]]
+
+    nat = ~missing & np.isnat(normalized)
+    return normalized, missing, nat
+
+
 @dataclass
 class Change:
     """Record of a single cell change."""
@@ -180,20 +244,45 @@ class DataSynchronizerV30:
         >>>     print(f"Error: {result.message}")
     """
 
-    def __init__(self, date_semantic_keys: Optional[List[str]] = None) -> None:
+    def __init__(
+        self,
+        date_semantic_keys: Optional[List[str]] = None,
+        use_vectorized: bool = True,
+        sheet_workers: int = 1,
+        delta_state_path: Optional[str] = None,
+    ) -> None:
         """
         Initialize the synchronizer.
 
         Args:
             date_semantic_keys: List of semantic keys for date columns.
                 If None, uses the default DATE_SEMANTIC_KEYS.
+            use_vectorized: Use the columnar merge engine in ``_apply_updates``.
+                False falls back to the row-by-row legacy loop.
+            sheet_workers: Worker processes for per-sheet parsing of multi-sheet
+                files. 1 (default) loads sheets serially.
+            delta_state_path: Enables delta sync. Per-case fingerprints of the
+                previous sync are read from / written to this JSON file and
+                Master rows that cannot change anything skip ``_apply_updates``.
         """
         # Use semantic keys instead of hardcoded column names
         self.date_semantic_keys = date_semantic_keys or DATE_SEMANTIC_KEYS
+        self.use_vectorized = use_vectorized
+        self.sheet_workers = max(1, int(sheet_workers or 1))
+        self.delta_state_path = delta_state_path
+
+        # Delta sync counters (master_rows / changed_rows / skipped_rows)
+        self.delta_stats: Dict[str, int] = {}
 
         # Initialize the semantic matcher
         self.matcher = SemanticMatcher(min_confidence=0.7, allow_partial=True)
 
+        # Header detection shared by all sheet loads
+        self.header_detector = HeaderDetector()
+
+        # Per-sheet parse time (file_label -> {sheet_name: seconds})
+        self.sheet_timings: Dict[str, Dict[str, float]] = {}
+
         # Change tracking
         self.change_tracker = ChangeTracker()
 
@@ -269,30 +358,47 @@ class DataSynchronizerV30:
         print(f"Loading {file_label} file: {Path(file_path).name}")
         print(f"{'='*60}")
 
-        xl = pd.ExcelFile(file_path)
         all_dfs = []
         header_row = None
+        sheet_timings: Dict[str, float] = {}
+
+        # Single pass: each sheet is streamed once, header detection runs on
+        # the buffered leading rows and the DataFrame is built from the same rows
+        with open_workbook(file_path) as book:
+            print(f"Found {len(book.sheet_names)} sheets in file")
+
+            load_sheets = []
+            for sheet_name in book.sheet_names:
+                # Skip summary/aggregate sheets
+                if self._should_skip_sheet(sheet_name):
+                    print(f"\n  Loading sheet: '{sheet_name}'")
+                    print(f"  [SKIP] Aggregate sheet (not Case data)")
+                    continue
+                load_sheets.append(sheet_name)
 
-        print(f"Found {len(xl.sheet_names)} sheets in file")
-
-        for sheet_name in xl.sheet_names:
+            if self.sheet_workers > 1 and len(load_sheets) > 1:
+                # Sheets are independent until the concat below: parse them concurrently
+                print(f"  Parsing {len(load_sheets)} sheets with {self.sheet_workers} workers")
+                results = read_workbook_sheets(
+                    file_path, load_sheets, self.header_detector, self.sheet_workers
+                )
+            else:
+                results = [
+                    read_sheet_with_header_detection(book, sheet_name, self.header_detector)
+                    for sheet_name in load_sheets
+                ]
+
+        for result in results:
+            sheet_name = result.sheet_name
+            sheet_header_row = result.header_row
+            df = result.data
+            sheet_timings[sheet_name] = result.parse_seconds
             print(f"\n  Loading sheet: '{sheet_name}'")
 
-            # Skip summary/aggregate sheets
-            if self._should_skip_sheet(sheet_name):
-                print(f"  [SKIP] Aggregate sheet (not Case data)")
-                continue
-
-            # Detect header row for this sheet
-            sheet_header_row, confidence = detect_header_row(file_path, sheet_name)
-
             if header_row is None:
                 header_row = sheet_header_row
 
-            print(f"  [OK] Header at row {sheet_header_row} (confidence: {confidence:.0%})")
-
-            # Load sheet
-            df = pd.read_excel(xl, sheet_name=sheet_name, header=sheet_header_row)
+            print(f"  [OK] Header at row {sheet_header_row} (confidence: {result.confidence:.0%})")
 
             if df.empty:
                 print(f"  [SKIP] Empty sheet")
@@ -305,7 +411,9 @@ class DataSynchronizerV30:
             self._track_dhl_wh(df, f"Sheet '{sheet_name}' loaded")
 
             all_dfs.append(df)
-            print(f"  [OK] {len(df)} rows loaded")
+            print(f"  [OK] {len(df)} rows loaded (parse: {result.parse_seconds:.2f}s)")
+
+        self.sheet_timings[file_label] = sheet_timings
 
         if not all_dfs:
             raise ValueError(f"No valid sheets found in {file_label}")
@@ -764,6 +872,10 @@ class DataSynchronizerV30:
         """
         Apply updates from Master to Warehouse using matched column names.
 
+        Dispatches to the columnar merge engine (default) or the row-by-row
+        legacy loop depending on ``self.use_vectorized``. Both produce the
+        same ChangeTracker entries and statistics.
+
         Args:
             master: Master DataFrame
             wh: Warehouse DataFrame
@@ -775,15 +887,39 @@ class DataSynchronizerV30:
         """
         print("\nApplying updates from Master to Warehouse...")
 
-        stats = dict(updates=0, date_updates=0, field_updates=0, appends=0)
+        common_keys, master_only_keys = self._resolve_sync_keys(master_cols, wh_cols)
 
-        # Build warehouse index by case number
-        wh_case_col = wh_cols["case_number"]
-        wh_index = self._build_case_index(wh, wh_case_col)
+        if self.use_vectorized:
+            wh, stats = self._apply_updates_vectorized(
+                master, wh, master_cols, wh_cols, common_keys, master_only_keys
+            )
+        else:
+            wh, stats = self._apply_updates_legacy(
+                master, wh, master_cols, wh_cols, common_keys, master_only_keys
+            )
 
-        # Get master case column
-        master_case_col = master_cols["case_number"]
+        print(f"  [OK] Updates: {stats['updates']} cells changed")
+        print(f"    - Date updates: {stats['date_updates']}")
+        print(f"    - Field updates: {stats['field_updates']}")
+        print(f"    - New records: {stats['appends']}")
+        if "source_sheet_updates" in stats:
+            print(f"    - Source_Sheet updates: {stats['source_sheet_updates']}")
+
+        return wh, stats
+
+    def _resolve_sync_keys(
+        self, master_cols: Dict[str, str], wh_cols: Dict[str, str]
+    ) -> Tuple[set, set]:
+        """
+        Split matched semantic keys into common and master-only groups.
+
+        Args:
+            master_cols: Master column mapping
+            wh_cols: Warehouse column mapping
 
+        Returns:
+            Tuple of (common_keys, master_only_keys)
+        """
         # Find all semantic keys that exist in both files
         common_keys = set(master_cols.keys()) & set(wh_cols.keys())
 
@@ -800,6 +936,221 @@ class DataSynchronizerV30:
             print(f"  Master-only columns found: {list(master_only_keys)}")
             print(f"  These will be added to Warehouse during sync")
 
+        return common_keys, master_only_keys
+
+    def _delta_columns(
+        self, master: pd.DataFrame, master_cols: Dict[str, str], wh_cols: Dict[str, str]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Columns whose values decide the outcome of syncing one case.
+
+        Returns:
+            Tuple of (master columns, warehouse columns), aligned by position
+        """
+        common_keys = sorted(set(master_cols) & set(wh_cols))
+        master_only_keys = sorted(set(master_cols) - set(wh_cols))
+
+        m_columns = [master_cols[k] for k in common_keys + master_only_keys]
+        w_columns = [wh_cols[k] for k in common_keys] + [master_cols[k] for k in master_only_keys]
+        if "Source_Sheet" in master.columns:
+            m_columns.append("Source_Sheet")
+            w_columns.append("Source_Sheet")
+        return m_columns, w_columns
+
+    def _delta_candidates(
+        self,
+        master: pd.DataFrame,
+        wh: pd.DataFrame,
+        master_cols: Dict[str, str],
+        wh_cols: Dict[str, str],
+    ) -> Tuple[pd.Series, List[int], List[int]]:
+        """
+        Master rows with a unique case key that already exists in the Warehouse.
+
+        Returns:
+            Tuple of (master case keys, master positions, matching warehouse positions)
+        """
+        m_keys = master_case_keys(master[master_cols["case_number"]])
+        w_positions = first_positions(warehouse_case_keys(wh[wh_cols["case_number"]]))
+        counts = m_keys.value_counts()
+
+        m_pos: List[int] = []
+        w_pos: List[int] = []
+        for position, key in enumerate(m_keys.tolist()):
+            if key and counts[key] == 1 and key in w_positions:
+                m_pos.append(position)
+                w_pos.append(w_positions[key])
+        return m_keys, m_pos, w_pos
+
+    def _select_delta_rows(
+        self,
+        master: pd.DataFrame,
+        wh: pd.DataFrame,
+        master_cols: Dict[str, str],
+        wh_cols: Dict[str, str],
+    ) -> pd.DataFrame:
+        """
+        Drop Master rows whose case is unchanged since the previous sync.
+
+        A row is dropped when its case was recorded as settled and both its
+        Master row and its Warehouse row still carry the recorded fingerprints.
+        Such rows would not produce any change in ``_apply_updates``.
+
+        Args:
+            master: Master DataFrame
+            wh: Warehouse DataFrame
+            master_cols: Master column mapping
+            wh_cols: Warehouse column mapping
+
+        Returns:
+            Master rows that still need ``_apply_updates`` (original order)
+        """
+        self.delta_stats = dict(master_rows=len(master), changed_rows=len(master), skipped_rows=0)
+
+        state = DeltaState.load(self.delta_state_path)
+        if state is None or not state.matches(master_cols, wh_cols, self.date_semantic_keys):
+            print("  Delta: no usable state from previous sync - processing all Master rows")
+            return master
+
+        m_columns, w_columns = self._delta_columns(master, master_cols, wh_cols)
+        m_keys, m_pos, w_pos = self._delta_candidates(master, wh, master_cols, wh_cols)
+        m_fps = row_fingerprints(master, m_columns, m_pos, strict=True)
+        w_fps = row_fingerprints(wh, w_columns, w_pos, strict=False)
+
+        unchanged = np.zeros(len(master), dtype=bool)
+        for position, m_fp, w_fp in zip(m_pos, m_fps, w_fps):
+            if state.cases.get(m_keys.iat[position]) == (m_fp, w_fp):
+                unchanged[position] = True
+
+        skipped = int(unchanged.sum())
+        self.delta_stats.update(changed_rows=len(master) - skipped, skipped_rows=skipped)
+        print(
+            f"  Delta: {len(master) - skipped} of {len(master)} Master rows changed "
+            f"({skipped} unchanged rows carried over)"
+        )
+        return master[~unchanged]
+
+    def _save_delta_state(
+        self,
+        master: pd.DataFrame,
+        synced: pd.DataFrame,
+        master_cols: Dict[str, str],
+        wh_cols: Dict[str, str],
+    ) -> int:
+        """
+        Record fingerprints of cases whose synced row is settled.
+
+        A case is settled when re-applying its Master row to the synced row
+        would log no change and write no different value, using the same
+        rules as ``_apply_updates``.
+
+        Args:
+            master: Master DataFrame used for this sync
+            synced: Final Warehouse DataFrame as written to the output file
+            master_cols: Master column mapping
+            wh_cols: Warehouse column mapping
+
+        Returns:
+            Number of settled cases recorded
+        """
+        m_keys, m_pos, w_pos = self._delta_candidates(master, synced, master_cols, wh_cols)
+        settled = np.ones(len(m_pos), dtype=bool)
+
+        def column_values(df: pd.DataFrame, column: str, positions: List[int]) -> np.ndarray:
+            return df[column].to_numpy(dtype=object)[np.asarray(positions, dtype=np.int64)]
+
+        common_keys = set(master_cols) & set(wh_cols)
+        master_only_keys = set(master_cols) - set(wh_cols)
+        for semantic_key in common_keys:
+            w_col = wh_cols[semantic_key]
+            if w_col in METADATA_COLUMNS:
+                continue
+            if semantic_key not in self.date_semantic_keys and not ALWAYS_OVERWRITE_NONDATE:
+                continue
+            m_vals = column_values(master, master_cols[semantic_key], m_pos)
+            s_vals = column_values(synced, w_col, w_pos)
+            is_date = semantic_key in self.date_semantic_keys
+            settled &= [
+                pd.isna(m)
+                or (
+                    not is_missing(s)
+                    and cell_token(m) == cell_token(s)
+                    and (is_date or str(m) == str(s))
+                )
+                for m, s in zip(m_vals, s_vals)
+            ]
+
+        for semantic_key in master_only_keys:
+            m_col = master_cols[semantic_key]
+            if m_col not in synced.columns:
+                settled[:] = False
+                break
+            m_vals = column_values(master, m_col, m_pos)
+            s_vals = column_values(synced, m_col, w_pos)
+            settled &= [
+                pd.isna(m) or (not is_missing(s) and cell_token(m) == cell_token(s))
+                for m, s in zip(m_vals, s_vals)
+            ]
+
+        if "Source_Sheet" in master.columns and "Source_Sheet" in synced.columns:
+            m_vals = column_values(master, "Source_Sheet", m_pos)
+            s_vals = column_values(synced, "Source_Sheet", w_pos)
+            settled &= [
+                not is_missing(m) and cell_token(m) == cell_token(s) for m, s in zip(m_vals, s_vals)
+            ]
+
+        m_pos = [p for p, ok in zip(m_pos, settled) if ok]
+        w_pos = [p for p, ok in zip(w_pos, settled) if ok]
+        m_columns, w_columns = self._delta_columns(master, master_cols, wh_cols)
+        m_fps = row_fingerprints(master, m_columns, m_pos, strict=True)
+        w_fps = row_fingerprints(synced, w_columns, w_pos, strict=False)
+
+        state = DeltaState(
+            master_columns=dict(master_cols),
+            warehouse_columns=dict(wh_cols),
+            date_semantic_keys=list(self.date_semantic_keys),
+            cases={
+                m_keys.iat[position]: (m_fp, w_fp)
+                for position, m_fp, w_fp in zip(m_pos, m_fps, w_fps)
+            },
+        )
+        state.save(self.delta_state_path)
+        return len(state.cases)
+
+    def _apply_updates_legacy(
+        self,
+        master: pd.DataFrame,
+        wh: pd.DataFrame,
+        master_cols: Dict[str, str],
+        wh_cols: Dict[str, str],
+        common_keys: set,
+        master_only_keys: set,
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Row-by-row update loop (v3.0 original implementation).
+
+        Kept as the reference implementation for the columnar engine.
+
+        Args:
+            master: Master DataFrame
+            wh: Warehouse DataFrame
+            master_cols: Master column mapping
+            wh_cols: Warehouse column mapping
+            common_keys: Semantic keys present in both files
+            master_only_keys: Semantic keys present only in Master
+
+        Returns:
+            Tuple of (updated_warehouse, statistics)
+        """
+        stats = dict(updates=0, date_updates=0, field_updates=0, appends=0)
+
+        # Build warehouse index by case number
+        wh_case_col = wh_cols["case_number"]
+        wh_index = self._build_case_index(wh, wh_case_col)
+
+        # Get master case column
+        master_case_col = master_cols["case_number"]
+
         # Process each master row
         for mi, mrow in master.iterrows():
             # Get case number
@@ -926,15 +1277,234 @@ class DataSynchronizerV30:
                             change_type="master_only_update",
                         )
 
-        print(f"  [OK] Updates: {stats['updates']} cells changed")
-        print(f"    - Date updates: {stats['date_updates']}")
-        print(f"    - Field updates: {stats['field_updates']}")
-        print(f"    - New records: {stats['appends']}")
-        if "source_sheet_updates" in stats:
-            print(f"    - Source_Sheet updates: {stats['source_sheet_updates']}")
+        return wh, stats
+
+    def _apply_updates_vectorized(
+        self,
+        master: pd.DataFrame,
+        wh: pd.DataFrame,
+        master_cols: Dict[str, str],
+        wh_cols: Dict[str, str],
+        common_keys: set,
+        master_only_keys: set,
+    ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        Columnar merge engine equivalent to ``_apply_updates_legacy``.
+
+        Master rows are aligned to Warehouse rows with a single lookup on the
+        case key, diffs are computed column by column with boolean masks, and
+        all new cases are appended with one ``pd.concat``. Master rows that
+        repeat a case key are applied in successive rounds (n-th occurrence in
+        round n) so later rows see earlier writes exactly like the loop did.
+        Change records are emitted in the loop's (row, column) order.
+
+        Args:
+            master: Master DataFrame
+            wh: Warehouse DataFrame
+            master_cols: Master column mapping
+            wh_cols: Warehouse column mapping
+            common_keys: Semantic keys present in both files
+            master_only_keys: Semantic keys present only in Master
+
+        Returns:
+            Tuple of (updated_warehouse, statistics)
+        """
+        stats = dict(updates=0, date_updates=0, field_updates=0, appends=0)
+
+        wh = wh.reset_index(drop=True)
+        wh_index = self._build_case_index(wh, wh_cols["case_number"])
+
+        # Master key: same normalization as the loop (strip + upper only)
+        case_values = master[master_cols["case_number"]]
+        keys = case_values.astype(str).str.strip().str.upper().where(case_values.notna(), "")
+        keys = keys.to_numpy(dtype=object)
+
+        valid = keys != ""
+        targets = pd.Series(keys).map(wh_index).to_numpy()
+        found = valid & pd.notna(targets)
+        upd_pos = np.flatnonzero(found)
+        upd_target = targets[upd_pos].astype(np.int64)
+        new_pos = np.flatnonzero(valid & ~found)
+
+        master_values = {
+            col: master[col].to_numpy(dtype=object)
+            for col in set(master_cols.values()) | ({"Source_Sheet"} & set(master.columns))
+        }
+        common_order = list(common_keys)
+        master_only_order = list(master_only_keys)
+
+        # (master_position, column_sequence, record) - sorted into loop order at the end
+        records: List[Tuple[int, int, Dict[str, Any]]] = []
+
+        # Master-only columns are created on the first processed row: as None when
+        # it updates an existing case, as NaN when it is appended via concat.
+        if valid.any():
+            fill = None if found[np.flatnonzero(valid)[0]] else np.nan
+            for semantic_key in master_only_order:
+                m_col = master_cols[semantic_key]
+                if m_col not in wh.columns:
+                    wh[m_col] = fill
+
+        sync_source_sheet = "Source_Sheet" in master.columns and "Source_Sheet" in wh.columns
+
+        occurrence = pd.Series(upd_target).groupby(upd_target).cumcount().to_numpy()
+        n_rounds = int(occurrence.max()) + 1 if len(occurrence) else 0
+
+        for round_no in range(n_rounds):
+            in_round = occurrence == round_no
+            rows = upd_pos[in_round]
+            tgt = upd_target[in_round]
+
+            if sync_source_sheet:
+                old_source = wh["Source_Sheet"].to_numpy(dtype=object)[tgt]
+                new_source = master_values["Source_Sheet"][rows]
+                self._assign_cells(wh, "Source_Sheet", tgt, new_source)
+                changed_sources = sum(1 for o, n in zip(old_source, new_source) if o != n)
+                if changed_sources:
+                    stats["source_sheet_updates"] = (
+                        stats.get("source_sheet_updates", 0) + changed_sources
+                    )
+
+            for seq, semantic_key in enumerate(common_order):
+                m_col = master_cols[semantic_key]
+                w_col = wh_cols[semantic_key]
+
+                # Skip metadata columns - preserve Warehouse's original value
+                if w_col in METADATA_COLUMNS:
+                    continue
+
+                mvals = master_values[m_col][rows]
+                wvals = wh[w_col].to_numpy(dtype=object)[tgt]
+                has_value = pd.notna(mvals)
+
+                if semantic_key in self.date_semantic_keys:
+                    # Date column: Master always wins if it has a value
+                    m_norm, m_missing, m_nat = _to_date_array(mvals)
+                    w_norm, w_missing, w_nat = _to_date_array(wvals)
+                    both_parsed = ~m_missing & ~w_missing
+                    same_date = np.where(m_nat | w_nat, m_nat & w_nat, m_norm == w_norm)
+                    equal = (m_missing & w_missing) | (both_parsed & same_date)
+                    changed = has_value & ~equal
+                    change_type = "date_update"
+                    stats["date_updates"] += int(changed.sum())
+                    # Equal logically - still written to ensure consistent format
+                    written = has_value
+                elif ALWAYS_OVERWRITE_NONDATE:
+                    # Non-date column: Overwrite if Master has value
+                    changed = has_value.copy()
+                    idx = np.flatnonzero(has_value)
+                    changed[idx] = [
+                        (w is None) or (str(m) != str(w)) for m, w in zip(mvals[idx], wvals[idx])
+                    ]
+                    change_type = "field_update"
+                    stats["field_updates"] += int(changed.sum())
+                    written = changed
+                else:
+                    continue
+
+                stats["updates"] += int(changed.sum())
+                if written.any():
+                    self._assign_cells(wh, w_col, tgt[written], mvals[written])
+                for i in np.flatnonzero(changed):
+                    records.append(
+                        (
+                            int(rows[i]),
+                            seq,
+                            dict(
+                                row_index=int(tgt[i]),
+                                column_name=w_col,
+                                old_value=wvals[i],
+                                new_value=mvals[i],
+                                change_type=change_type,
+                            ),
+                        )
+                    )
+
+            # Process master-only columns (like DHL WH) for existing cases
+            for seq, semantic_key in enumerate(master_only_order, start=len(common_order)):
+                m_col = master_cols[semantic_key]
+                mvals = master_values[m_col][rows]
+                old_vals = wh[m_col].to_numpy(dtype=object)[tgt]
+                changed = pd.notna(mvals)
+                idx = np.flatnonzero(changed)
+                changed[idx] = [bool(o != m) for o, m in zip(old_vals[idx], mvals[idx])]
+
+                n_changed = int(changed.sum())
+                stats["updates"] += n_changed
+                stats["field_updates"] += n_changed
+                if n_changed:
+                    self._assign_cells(wh, m_col, tgt[changed], mvals[changed])
+                for i in np.flatnonzero(changed):
+                    records.append(
+                        (
+                            int(rows[i]),
+                            seq,
+                            dict(
+                                row_index=int(tgt[i]),
+                                column_name=m_col,
+                                old_value=old_vals[i],
+                                new_value=mvals[i],
+                                change_type="master_only_update",
+                            ),
+                        )
+                    )
+
+        # Append all new cases in one concat
+        if len(new_pos):
+            append_cols: Dict[str, np.ndarray] = {}
+            for semantic_key in common_order:
+                m_col = master_cols[semantic_key]
+                append_cols[wh_cols[semantic_key]] = master_values[m_col][new_pos]
+            for semantic_key in master_only_order:
+                m_col = master_cols[semantic_key]
+                append_cols[m_col] = master_values[m_col][new_pos]  # Use master column name
+            if "Source_Sheet" in master.columns:
+                append_cols["Source_Sheet"] = master_values["Source_Sheet"][new_pos]
+
+            base_len = len(wh)
+            appended = pd.DataFrame(append_cols).infer_objects()
+            wh = pd.concat([wh, appended], ignore_index=True)
+            stats["appends"] += len(new_pos)
+
+            for k, mpos in enumerate(new_pos):
+                row_data = {col: values[k] for col, values in append_cols.items()}
+                new_case = dict(case_no=keys[mpos], row_data=row_data, row_index=base_len + k)
+                records.append((int(mpos), 0, new_case))
+
+        records.sort(key=lambda record: (record[0], record[1]))
+        for _, _, record in records:
+            if "case_no" in record:
+                self.change_tracker.log_new_case(**record)
+            else:
+                self.change_tracker.add_change(**record)
 
         return wh, stats
 
+    @staticmethod
+    def _assign_cells(
+        df: pd.DataFrame, column: str, positions: np.ndarray, values: np.ndarray
+    ) -> None:
+        """
+        Write ``values`` into ``df[column]`` at integer ``positions``.
+
+        Mirrors ``DataFrame.at`` semantics: date strings written into a
+        datetime64 column are parsed, and values the column dtype cannot hold
+        upcast the column to object instead of raising.
+        """
+        col_idx = df.columns.get_loc(column)
+        if pd.api.types.is_datetime64_dtype(df[column].dtype):
+            try:
+                values = pd.to_datetime(pd.Series(values, dtype=object), format="mixed").to_numpy()
+            except (TypeError, ValueError):
+                pass
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error", FutureWarning)
+                df.iloc[positions, col_idx] = values
+        except (FutureWarning, TypeError, ValueError):
+            df[column] = df[column].astype(object)
+            df.iloc[positions, col_idx] = values
+
     def synchronize(
         self, master_xlsx: str, warehouse_xlsx: str, output_path: Optional[str] = None
     ) -> SyncResult:
@@ -970,39 +1540,57 @@ class DataSynchronizerV30:
             print("PHASE 1: Loading Files")
             print("=" * 60)
 
-            m_df, m_header_row = self._load_file_with_header_detection(master_xlsx, "Master")
-            w_df, w_header_row = self._load_file_with_header_detection(warehouse_xlsx, "Warehouse")
+            with profile_phase("load"):
+                m_df, m_header_row = self._load_file_with_header_detection(master_xlsx, "Master")
+                w_df, w_header_row = self._load_file_with_header_detection(
+                    warehouse_xlsx, "Warehouse"
+                )
 
             # Phase 2: Match headers using semantic keys
             print("\n" + "=" * 60)
             print("PHASE 2: Semantic Header Matching")
             print("=" * 60)
 
-            self.master_columns = self._match_and_validate_headers(m_df, "Master")
-            self.warehouse_columns = self._match_and_validate_headers(w_df, "Warehouse")
+            with profile_phase("header_match"):
+                self.master_columns = self._match_and_validate_headers(m_df, "Master")
+                self.warehouse_columns = self._match_and_validate_headers(w_df, "Warehouse")
 
             # Phase 3: Sort according to Master order
             print("\n" + "=" * 60)
             print("PHASE 3: Sorting")
             print("=" * 60)
 
-            m_df, w_df = self._apply_master_order_sorting(
-                m_df, w_df, self.master_columns, self.warehouse_columns
-            )
+            with profile_phase("sort", rows=len(m_df)):
+                m_df, w_df = self._apply_master_order_sorting(
+                    m_df, w_df, self.master_columns, self.warehouse_columns
+                )
 
             # Phase 4: Apply updates
             print("\n" + "=" * 60)
             print("PHASE 4: Synchronization")
             print("=" * 60)
 
-            updated_w_df, stats = self._apply_updates(
-                m_df, w_df, self.master_columns, self.warehouse_columns
-            )
+            with profile_phase("sync", rows=len(m_df)):
+                m_sync_df = m_df
+                if self.delta_state_path:
+                    with profile_phase("delta_select"):
+                        m_sync_df = self._select_delta_rows(
+                            m_df, w_df, self.master_columns, self.warehouse_columns
+                        )
 
-            # Maintain Master order after updates (v2.9 방식)
-            updated_w_df = self._maintain_warehouse_order(
-                updated_w_df, m_df, self.master_columns, self.warehouse_columns
-            )
+                with profile_phase("apply_updates", rows=len(m_sync_df)):
+                    updated_w_df, stats = self._apply_updates(
+                        m_sync_df, w_df, self.master_columns, self.warehouse_columns
+                    )
+                if self.delta_state_path:
+                    stats["delta_skipped_rows"] = self.delta_stats["skipped_rows"]
+
+                # Maintain Master order after updates (v2.9 방식)
+                with profile_phase("maintain_order"):
+                    updated_w_df = self._maintain_warehouse_order(
+                        updated_w_df, m_df, self.master_columns, self.warehouse_columns
+                    )
+            record_rows(len(updated_w_df))
 
             # DEBUG: Track final state before saving
             print("\n" + "=" * 60)
@@ -1025,16 +1613,31 @@ class DataSynchronizerV30:
 
             # Save
             print(f"  Writing to: {Path(out).name}")
-            with pd.ExcelWriter(out, engine="openpyxl") as writer:
-                updated_w_df.to_excel(writer, sheet_name=sheet_name, index=False)
+            with profile_phase("save", rows=len(updated_w_df)):
+                with pd.ExcelWriter(out, engine="openpyxl") as writer:
+                    updated_w_df.to_excel(writer, sheet_name=sheet_name, index=False)
 
             print(f"  [OK] Saved")
 
             # Apply color formatting
             print(f"  Applying color formatting...")
-            self._apply_excel_formatting(out, sheet_name, w_header_row)
+            with profile_phase("format"):
+                self._apply_excel_formatting(out, sheet_name, w_header_row)
             print(f"  [OK] Formatting applied")
 
+            # Typed sidecar for Stage 2 (fingerprint taken after formatting)
+            with profile_phase("sidecar"):
+                sidecar = write_sidecar(updated_w_df, out)
+            if sidecar is not None:
+                print(f"  [OK] Parquet sidecar: {sidecar.name}")
+
+            if self.delta_state_path:
+                with profile_phase("delta_state"):
+                    settled = self._save_delta_state(
+                        m_df, updated_w_df, self.master_columns, self.warehouse_columns
+                    )
+                print(f"  [OK] Delta state: {settled} settled cases recorded")
+
             # Prepare result
             stats["output_file"] = out
 
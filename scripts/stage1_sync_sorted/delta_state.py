@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Delta Sync State for DataSynchronizer v3.0
+==========================================
+
+Per-case row fingerprints persisted between Stage 1 runs so that delta mode
+can skip Master rows that cannot produce any change.
+
+A case is recorded only when, after a sync, its Master row and its synced
+Warehouse row are *settled*: re-applying the Master row would neither log a
+change nor alter a value. On the next run a Master row is skipped when
+
+- its case key is unique in Master and present in the Warehouse,
+- its Master fingerprint equals the recorded one, and
+- the Warehouse row for the case still has the recorded fingerprint.
+
+Such a row would produce no ChangeTracker entry in a full run either, so the
+ChangeTracker output stays equivalent.
+
+Master fingerprints are strict (value type + repr). Warehouse fingerprints use
+tokens that survive an Excel write/read round trip ("" and NaN are both
+missing, datetime and Timestamp are equal), while still keeping int and float
+apart because the sync compares non-date fields with ``str()``. Two values
+with the same token therefore also compare equal under the sync's date,
+``str()`` and ``!=`` checks.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DELTA_STATE_VERSION = 1
+ABSENT_TOKEN = "<absent>"
+MISSING_TOKEN = "~"
+
+_NON_ALNUM = re.compile(r"[^A-Z0-9]")
+
+
+def master_case_keys(values: pd.Series) -> pd.Series:
+    """Case keys exactly as the sync loop builds them (strip + upper)."""
+    keys = values.astype(str).str.strip().str.upper()
+    return keys.where(values.notna(), "")
+
+
+def warehouse_case_keys(values: pd.Series) -> pd.Series:
+    """Case keys as ``_build_case_index`` builds them (alphanumeric only)."""
+    keys = values.fillna("").astype(str).str.strip().str.upper()
+    return keys.map(lambda key: _NON_ALNUM.sub("", key))
+
+
+def first_positions(keys: pd.Series) -> Dict[str, int]:
+    """Map each non-empty key to its first row position."""
+    positions: Dict[str, int] = {}
+    for position, key in enumerate(keys.tolist()):
+        if key and key not in positions:
+            positions[key] = position
+    return positions
+
+
+def is_missing(value: Any) -> bool:
+    """True for None/NaN/NaT/pd.NA and the empty string."""
+    if isinstance(value, str):
+        return value == ""
+    try:
+        return bool(pd.isna(value))
+    except (TypeError, ValueError):
+        return False
+
+
+def strict_token(value: Any) -> str:
+    """Type-exact token used for Master rows."""
+    return f"{type(value).__name__}:{value!r}"
+
+
+def cell_token(value: Any) -> str:
+    """Round-trip stable token used for Warehouse rows."""
+    if is_missing(value):
+        return MISSING_TOKEN
+    if isinstance(value, (bool, np.bool_)):
+        return f"b:{bool(value)}"
+    if isinstance(value, (int, np.integer)):
+        return f"i:{int(value)}"
+    if isinstance(value, (float, np.floating)):
+        return f"f:{float(value)!r}"
+    if isinstance(value, (dt.datetime, np.datetime64)):
+        return f"d:{pd.Timestamp(value).isoformat()}"
+    if isinstance(value, str):
+        return f"s:{value}"
+    return f"o:{type(value).__name__}:{value}"
+
+
+def row_fingerprints(
+    df: pd.DataFrame, columns: Sequence[str], positions: Sequence[int], strict: bool
+) -> List[str]:
+    """
+    Fingerprint selected rows over a fixed column list.
+
+    Args:
+        df: Source frame
+        columns: Columns to hash, in a fixed order (missing columns hash as absent)
+        positions: Row positions to fingerprint
+        strict: Use ``strict_token`` (Master) instead of ``cell_token``
+
+    Returns:
+        Hex fingerprint per requested position
+    """
+    token = strict_token if strict else cell_token
+    positions = np.asarray(positions, dtype=np.int64)
+    tokens = {}
+    for i, column in enumerate(columns):
+        if column in df.columns:
+            values = df[column].to_numpy(dtype=object)[positions]
+            tokens[i] = [token(v) for v in values]
+        else:
+            tokens[i] = [ABSENT_TOKEN] * len(positions)
+
+    if not len(positions):
+        return []
+    hashed = pd.util.hash_pandas_object(pd.DataFrame(tokens), index=False)
+    return [f"{value:016x}" for value in hashed.to_numpy()]
+
+
+@dataclass
+class DeltaState:
+    """
+    Persisted fingerprints of settled cases from the previous sync.
+
+    Attributes:
+        master_columns: Master semantic mapping the state was built with
+        warehouse_columns: Warehouse semantic mapping the state was built with
+        date_semantic_keys: Date keys used for the comparison rules
+        cases: case key -> (master fingerprint, warehouse fingerprint)
+    """
+
+    master_columns: Dict[str, str]
+    warehouse_columns: Dict[str, str]
+    date_semantic_keys: List[str]
+    cases: Dict[str, Tuple[str, str]] = field(default_factory=dict)
+
+    def matches(
+        self,
+        master_columns: Dict[str, str],
+        warehouse_columns: Dict[str, str],
+        date_semantic_keys: Sequence[str],
+    ) -> bool:
+        """True when the state was built with the same column setup."""
+        return (
+            self.master_columns == dict(master_columns)
+            and self.warehouse_columns == dict(warehouse_columns)
+            and self.date_semantic_keys == list(date_semantic_keys)
+        )
+
+    @classmethod
+    def load(cls, path: str | Path) -> Optional["DeltaState"]:
+        """Load a state file; None if missing, unreadable or outdated."""
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != DELTA_STATE_VERSION:
+            return None
+        return cls(
+            master_columns=dict(data.get("master_columns", {})),
+            warehouse_columns=dict(data.get("warehouse_columns", {})),
+            date_semantic_keys=list(data.get("date_semantic_keys", [])),
+            cases={key: (fps[0], fps[1]) for key, fps in data.get("cases", {}).items()},
+        )
+
+    def save(self, path: str | Path) -> None:
+        """Write the state file atomically."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "version": DELTA_STATE_VERSION,
+                    "master_columns": self.master_columns,
+                    "warehouse_columns": self.warehouse_columns,
+                    "date_semantic_keys": self.date_semantic_keys,
+                    "cases": {key: list(fps) for key, fps in self.cases.items()},
+                },
+                handle,
+                ensure_ascii=False,
+            )
+        tmp_path.replace(path)
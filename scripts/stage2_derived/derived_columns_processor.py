@@ -22,6 +22,7 @@ from copy import copy
 from pathlib import Path
 from typing import Iterable, Optional, Tuple
 
+import numpy as np
 import pandas as pd  # type: ignore[import-untyped]
 import yaml
 
@@ -64,10 +65,14 @@ from core.standard_header_order import (
     normalize_header_names_for_stage2,
     analyze_header_compatibility,
 )
+from core.data_parser import stack_status_cache_info
+from core.stage_artifacts import read_excel_with_sidecar, write_sidecar
+from core.stage_profiler import profile_phase, record_rows
 from .stack_and_sqm import add_sqm_and_stack, get_sqm_with_fallback
 
 SITE_COLUMN_LOOKUP = {col.lower() for col in SITE_COLUMNS}
 WAREHOUSE_COLUMN_LOOKUP = {col.lower() for col in WAREHOUSE_COLUMNS}
+NAT_INT64 = np.iinfo(np.int64).min
 
 
 def _load_yaml_config(path: Path) -> dict:
@@ -146,29 +151,30 @@ def resolve_derived_output_path(
 
 
 def _latest_location_and_date(
-    row: pd.Series,
-) -> Tuple[str | None, pd.Timestamp | pd.NaT]:
-    """최근 위치와 날짜를 계산합니다. / Compute the latest location and date."""
-    non_null = row.dropna()
-    if non_null.empty:
-        return None, pd.NaT
-    latest_date = non_null.max()
-    latest_columns = non_null[non_null == latest_date].index
-    return latest_columns[0], latest_date
-
-
-def _classify_storage(location: str | None) -> str:
-    """위치 기반 보관 유형을 분류합니다. / Classify storage based on location."""
-    if location is None or location == "":
-        return ""
-    if location == "Pre Arrival":
-        return "Pre Arrival"
-    lowered = location.lower()
-    if lowered in SITE_COLUMN_LOOKUP:
-        return "site"
-    if lowered in WAREHOUSE_COLUMN_LOOKUP:
-        return "warehouse"
-    return ""
+    block: pd.DataFrame,
+) -> Tuple[pd.Series, pd.Series]:
+    """
+    블록 전체의 최근 위치/날짜를 한 번에 계산합니다.
+    / Compute the latest location and date for every row of a datetime block.
+
+    동률이면 컬럼 순서상 첫 컬럼을 선택합니다 (idxmax 규칙).
+    / Ties resolve to the first column in block order (idxmax semantics).
+
+    Returns:
+        (location, date): 행별 위치(없으면 None)와 날짜(없으면 NaT)
+    """
+    # NaT는 int64 최솟값이므로 argmax가 유효한 최대 날짜의 첫 컬럼을 선택
+    values = block.to_numpy(dtype="datetime64[ns]").view("int64")
+    has_date = (values != NAT_INT64).any(axis=1)
+    first_max = values.argmax(axis=1)
+    latest = values[np.arange(len(block)), first_max]
+
+    columns = np.asarray(block.columns, dtype=object)
+    location = pd.Series(
+        np.where(has_date, columns[first_max], None), index=block.index, dtype=object
+    )
+    date = pd.Series(latest.view("datetime64[ns]"), index=block.index)
+    return location, date
 
 
 def _to_datetime_columns(df: pd.DataFrame, columns: Iterable[str]) -> None:
@@ -200,78 +206,56 @@ def calculate_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
     else:
         working_df[STATUS_SITE_COLUMN] = ""
 
-    working_df[STATUS_CURRENT_COLUMN] = working_df.apply(
-        lambda row: (
-            "site"
-            if row[STATUS_SITE_COLUMN] == 1
-            else ("warehouse" if row[STATUS_WAREHOUSE_COLUMN] == 1 else "Pre Arrival")
-        ),
-        axis=1,
+    site_present = (
+        working_df[st_cols].notna().any(axis=1).to_numpy()
+        if st_cols
+        else np.zeros(len(working_df), dtype=bool)
+    )
+    warehouse_present = (
+        working_df[wh_cols].notna().any(axis=1).to_numpy()
+        if wh_cols
+        else np.zeros(len(working_df), dtype=bool)
+    )
+    status_current = np.select(
+        [site_present, warehouse_present], ["site", "warehouse"], default="Pre Arrival"
+    )
+    working_df[STATUS_CURRENT_COLUMN] = pd.Series(
+        status_current, index=working_df.index, dtype=object
     )
 
-    if st_cols:
-        site_latest = working_df[st_cols].apply(
-            _latest_location_and_date,
-            axis=1,
-            result_type="expand",
-        )
-    else:
-        site_latest = pd.DataFrame(index=working_df.index, columns=[0, 1])
-
-    if wh_cols:
-        warehouse_latest = working_df[wh_cols].apply(
-            _latest_location_and_date,
-            axis=1,
-            result_type="expand",
-        )
-    else:
-        warehouse_latest = pd.DataFrame(index=working_df.index, columns=[0, 1])
-
-    if not site_latest.empty:
-        site_latest.columns = ["location", "date"]
-    if not warehouse_latest.empty:
-        warehouse_latest.columns = ["location", "date"]
-
-    location_series = pd.Series("Pre Arrival", index=working_df.index)
+    location_series = pd.Series("Pre Arrival", index=working_df.index, dtype=object)
     location_date_series = pd.Series(
         pd.NaT,
         index=working_df.index,
         dtype="datetime64[ns]",
     )
 
-    site_mask = working_df[STATUS_CURRENT_COLUMN] == "site"
-    warehouse_mask = working_df[STATUS_CURRENT_COLUMN] == "warehouse"
-
-    if not site_latest.empty:
-        site_locations = site_latest.loc[site_mask, "location"]
-        site_locations = site_locations.fillna("Pre Arrival")
-        location_series.loc[site_mask] = site_locations
-        site_dates = site_latest.loc[site_mask, "date"]
-        location_date_series.loc[site_mask] = site_dates
-
-    if not warehouse_latest.empty:
-        warehouse_locations = warehouse_latest.loc[
-            warehouse_mask,
-            "location",
-        ]
-        warehouse_locations = warehouse_locations.fillna("Pre Arrival")
-        location_series.loc[warehouse_mask] = warehouse_locations
-        location_date_series.loc[warehouse_mask] = warehouse_latest.loc[
-            warehouse_mask,
-            "date",
-        ]
-
-    location_filled = location_series.replace({None: "Pre Arrival"})
-    working_df[STATUS_LOCATION_COLUMN] = location_filled
+    # 현장 > 창고 우선순위: 각 블록의 최근 위치/날짜를 해당 상태 행에만 적용
+    for columns, mask in ((wh_cols, warehouse_present & ~site_present), (st_cols, site_present)):
+        if not columns or not mask.any():
+            continue
+        latest_location, latest_date = _latest_location_and_date(working_df[columns])
+        location_series[mask] = latest_location[mask].fillna("Pre Arrival")
+        location_date_series[mask] = latest_date[mask]
+
+    working_df[STATUS_LOCATION_COLUMN] = location_series
     working_df[STATUS_LOCATION_DATE_COLUMN] = location_date_series
 
-    storage_series = location_series.apply(_classify_storage)
-    unresolved_storage_mask = storage_series == ""
-    storage_series.loc[unresolved_storage_mask] = working_df.loc[
-        unresolved_storage_mask,
-        STATUS_CURRENT_COLUMN,
-    ]
-    working_df[STATUS_STORAGE_COLUMN] = storage_series
+    lowered_location = location_series.str.lower()
+    storage_series = np.select(
+        [
+            location_series == "Pre Arrival",
+            lowered_location.isin(SITE_COLUMN_LOOKUP),
+            lowered_location.isin(WAREHOUSE_COLUMN_LOOKUP),
+        ],
+        ["Pre Arrival", "site", "warehouse"],
+        default="",
+    )
+    # 분류되지 않은 위치는 Status_Current로 보완
+    storage_series = np.where(storage_series == "", status_current, storage_series)
+    working_df[STATUS_STORAGE_COLUMN] = pd.Series(
+        storage_series, index=working_df.index, dtype=object
+    )
 
     if wh_cols:
         warehouse_handling = working_df[wh_cols].notna().sum(axis=1)
@@ -310,6 +294,8 @@ def calculate_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
                 "WARNING: 치수 기반 SQM 계산 실패, '규격' 또는 '수량' 컬럼이 없어 SQM 계산을 건너뜁니다."
             )
 
+    print(f"Stack 파싱 캐시: {stack_status_cache_info().summary()}")
+
     # Stack_Status 처리
     if "Stack_Status" in working_df.columns:
         working_df[STACK_STATUS_COLUMN] = working_df["Stack_Status"]
@@ -350,18 +336,23 @@ def process_derived_columns(
         raise FileNotFoundError(f"입력 파일을 찾을 수 없습니다: {resolved_input_path}")
 
     # 데이터 로드
-    df = pd.read_excel(resolved_input_path)
+    with profile_phase("load"):
+        df = read_excel_with_sidecar(resolved_input_path)
     print(f"원본 데이터 로드 완료: {len(df)}행, {len(df.columns)}컬럼")
+    record_rows(len(df))
 
-    df = calculate_derived_columns(df)
+    with profile_phase("derive", rows=len(df)):
+        df = calculate_derived_columns(df)
 
     # ✅ 헤더명 정규화 추가 (No → no., site  handling → site handling)
     print("\n[INFO] Stage 2 헤더명 정규화 중...")
-    df = normalize_header_names_for_stage2(df)
+    with profile_phase("normalize_headers"):
+        df = normalize_header_names_for_stage2(df)
 
     # ✅ SQM/Stack 계산 검증 추가
     print("\n[INFO] SQM/Stack 계산 최종 검증:")
-    validation = validate_sqm_stack_presence(df)
+    with profile_phase("validate"):
+        validation = validate_sqm_stack_presence(df)
     print(f"  - SQM 계산됨: {validation['sqm_calculated_count']}개")
     print(f"  - Stack_Status 파싱됨: {validation['stack_parsed_count']}개")
 
@@ -371,7 +362,8 @@ def process_derived_columns(
 
     # ✅ 헤더 호환성 분석 추가
     print("\n[INFO] 헤더 호환성 분석 중...")
-    compatibility = analyze_header_compatibility(df, is_stage2=True)
+    with profile_phase("header_compatibility"):
+        compatibility = analyze_header_compatibility(df, is_stage2=True)
     print(
         f"  - 매칭률: {compatibility['matching_rate']:.1f}% ({compatibility['matched_columns']}/{compatibility['total_columns']}개)"
     )
@@ -384,7 +376,8 @@ def process_derived_columns(
 
     # ✅ 표준 헤더 순서로 재정렬 추가 (유연한 검색)
     print(f"\n[INFO] Stage 2 표준 헤더 순서로 재정렬 중 (유연한 검색)...")
-    df = reorder_dataframe_columns(df, is_stage2=True, use_semantic_matching=True)
+    with profile_phase("reorder"):
+        df = reorder_dataframe_columns(df, is_stage2=True, use_semantic_matching=True)
     print(f"  [SUCCESS] 재정렬 완료: {len(df.columns)}개 컬럼")
 
     wh_cols = [c for c in WAREHOUSE_COLUMNS if c in df.columns]
@@ -400,8 +393,13 @@ def process_derived_columns(
 
     stage2_config = load_stage2_config(config_path=stage2_config_path)
     output_path = resolve_derived_output_path(stage2_config=stage2_config, project_root=root)
-    df.to_excel(output_path, index=False)
+    with profile_phase("save", rows=len(df)):
+        df.to_excel(output_path, index=False)
     print(f"SUCCESS: 파일 저장 완료: {output_path}")
+    with profile_phase("sidecar"):
+        sidecar = write_sidecar(df, output_path)
+    if sidecar is not None:
+        print(f"SUCCESS: Parquet 사이드카 저장: {sidecar.name}")
 
     return True
 
@@ -10,6 +10,7 @@ STACK.MD 기반 치수 기반 SQM 계산 및 Stack_Status 파싱 로직을 구
 - Stack 텍스트 파싱: "Not stackable" → 0, "X2" → 2 등
 - mm 단위 자동 변환 (÷10)
 - 폴백 전략: 치수 없으면 기존 추정 로직 사용
+- DataFrame 단위 벡터화: 치수 컬럼 1회 탐지 + pd.to_numeric, Stack 텍스트는 고유값만 파싱
 
 작성자: AI Development Team
 버전: v1.0
@@ -20,12 +21,14 @@ from __future__ import annotations
 
 import math
 import re
-from typing import Optional, Union
+from typing import List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 # Core 모듈에서 Stack_Status 파싱 함수 import
 from core.data_parser import parse_stack_status as core_parse_stack_status
+from core.data_parser import parse_stack_status_many, round_array
 
 # 정규식 패턴 사전 컴파일 (성능 최적화)
 NOT_STACK_PATTERNS = [
@@ -46,6 +49,10 @@ XNUM_PAT = re.compile(r"[xX]\s*(\d+)")
 PCS_PAT = re.compile(r"(\d+)\s*(pcs?)", re.IGNORECASE)
 TIER_PAT = re.compile(r"(\d+)\s*(tier|tiers?)", re.IGNORECASE)
 
+# 치수 컬럼 자동 탐지 후보 (compute_sqm_from_dims와 동일 순서)
+LENGTH_COLUMN_CANDIDATES: List[str] = ["L(CM)", "Length (cm)", "L CM", "Length", "L(mm)", "L(MM)"]
+WIDTH_COLUMN_CANDIDATES: List[str] = ["W(CM)", "Width (cm)", "W CM", "Width", "W(mm)", "W(MM)"]
+
 
 def _to_float(value: Union[str, float, int, None]) -> Optional[float]:
     """
@@ -74,6 +81,77 @@ def _to_float(value: Union[str, float, int, None]) -> Optional[float]:
         return None
 
 
+def _resolve_dimension_column(
+    columns: pd.Index, column: Optional[str], candidates: List[str]
+) -> Optional[str]:
+    """지정 컬럼이 없으면 후보 목록에서 첫 번째로 존재하는 컬럼을 반환"""
+    if column:
+        return column
+    return next((col for col in candidates if col in columns), None)
+
+
+def _is_mm_column(column: str) -> bool:
+    """mm 단위 컬럼 여부"""
+    return "mm" in column.lower()
+
+
+def _to_float_series(series: pd.Series) -> pd.Series:
+    """
+    _to_float의 벡터화 버전 (공백/쉼표 제거 후 pd.to_numeric)
+
+    Args:
+        series: 변환할 Series
+
+    Returns:
+        float64 Series (변환 실패 시 NaN)
+    """
+    if series.dtype == object and pd.api.types.infer_dtype(series, skipna=True) != "empty":
+        try:
+            cleaned = series.str.strip().str.replace(",", "", regex=False)
+        except AttributeError:  # 문자열 값이 없는 object 컬럼
+            cleaned = None
+        if cleaned is not None:
+            series = cleaned.where(cleaned.notna(), series)
+    return pd.to_numeric(series, errors="coerce").astype("float64")
+
+
+def compute_sqm_series(
+    df: pd.DataFrame, l_col: Optional[str] = None, w_col: Optional[str] = None
+) -> pd.Series:
+    """
+    DataFrame 전체 치수 기반 SQM 계산 (compute_sqm_from_dims 벡터화)
+
+    치수 컬럼은 1회만 탐지하고 pd.to_numeric으로 변환합니다. 결과는 행 단위
+    compute_sqm_from_dims 적용 결과와 동일합니다 (계산 불가 행은 NaN, 전체 불가 시 None).
+
+    Args:
+        df: 처리할 DataFrame
+        l_col: 길이 컬럼명 (None이면 자동 탐지)
+        w_col: 너비 컬럼명 (None이면 자동 탐지)
+
+    Returns:
+        SQM Series
+    """
+    l_col = _resolve_dimension_column(df.columns, l_col, LENGTH_COLUMN_CANDIDATES)
+    w_col = _resolve_dimension_column(df.columns, w_col, WIDTH_COLUMN_CANDIDATES)
+    if not l_col or not w_col or l_col not in df.columns or w_col not in df.columns:
+        return pd.Series([None] * len(df), index=df.index, dtype=object)
+
+    length = _to_float_series(df[l_col]).to_numpy()
+    width = _to_float_series(df[w_col]).to_numpy()
+    if _is_mm_column(l_col):
+        length = length / 10.0
+    if _is_mm_column(w_col):
+        width = width / 10.0
+
+    # L <= 0 또는 W <= 0 → None (NaN 비교는 False이므로 NaN은 그대로 전파)
+    invalid = (length <= 0) | (width <= 0) | np.isnan(length) | np.isnan(width)
+    with np.errstate(invalid="ignore", over="ignore"):
+        sqm = round_array((length * width) / 10000.0)
+    values = np.where(invalid, None, sqm)
+    return pd.Series(values, index=df.index, dtype=object).infer_objects()
+
+
 def compute_sqm_from_dims(
     row: pd.Series, l_col: Optional[str] = None, w_col: Optional[str] = None
 ) -> Optional[float]:
@@ -89,17 +167,8 @@ def compute_sqm_from_dims(
         계산된 SQM 값 또는 None (계산 불가 시)
     """
     # 컬럼명 자동 탐지
-    if not l_col:
-        for col in ["L(CM)", "Length (cm)", "L CM", "Length", "L(mm)", "L(MM)"]:
-            if col in row.index:
-                l_col = col
-                break
-
-    if not w_col:
-        for col in ["W(CM)", "Width (cm)", "W CM", "Width", "W(mm)", "W(MM)"]:
-            if col in row.index:
-                w_col = col
-                break
+    l_col = _resolve_dimension_column(row.index, l_col, LENGTH_COLUMN_CANDIDATES)
+    w_col = _resolve_dimension_column(row.index, w_col, WIDTH_COLUMN_CANDIDATES)
 
     if not l_col or not w_col:
         return None
@@ -112,9 +181,9 @@ def compute_sqm_from_dims(
         return None
 
     # mm 단위인 경우 cm으로 변환
-    if "mm" in l_col.lower() or "MM" in l_col:
+    if _is_mm_column(l_col):
         L = L / 10.0
-    if "mm" in w_col.lower() or "MM" in w_col:
+    if _is_mm_column(w_col):
         W = W / 10.0
 
     # SQM 계산: L(cm) × W(cm) / 10,000
@@ -138,6 +207,22 @@ def parse_stack_status(text: Union[str, None]) -> Optional[int]:
     return core_parse_stack_status(text)
 
 
+def parse_stack_status_series(series: pd.Series) -> pd.Series:
+    """
+    Series 전체 Stack_Status 파싱 (고유 텍스트만 1회 파싱)
+
+    core.data_parser.parse_stack_status_many에 위임합니다. Stack 텍스트는 수백 종류에
+    불과해 행 수와 무관하게 정규식 호출 횟수가 고유값 수로 제한됩니다.
+
+    Args:
+        series: Stack 텍스트 Series
+
+    Returns:
+        Series.apply(parse_stack_status)와 동일한 결과
+    """
+    return parse_stack_status_many(series)
+
+
 def add_sqm_and_stack(
     df: pd.DataFrame,
     l_col: Optional[str] = None,
@@ -158,11 +243,9 @@ def add_sqm_and_stack(
     """
     result_df = df.copy()
 
-    # SQM 계산
+    # SQM 계산 (컬럼 단위 벡터화)
     if l_col or w_col or any(col in df.columns for col in ["L(CM)", "W(CM)", "Length", "Width"]):
-        result_df["SQM"] = result_df.apply(
-            lambda row: compute_sqm_from_dims(row, l_col, w_col), axis=1
-        )
+        result_df["SQM"] = compute_sqm_series(result_df, l_col, w_col)
     else:
         # 치수 컬럼이 없어도 기본값으로 SQM 컬럼 추가
         result_df["SQM"] = None
@@ -170,12 +253,12 @@ def add_sqm_and_stack(
     # Stack_Status 계산
     if stack_col or any(col in df.columns for col in ["Stackability", "Stackable", "Stack"]):
         if stack_col and stack_col in df.columns:
-            result_df["Stack_Status"] = df[stack_col].apply(parse_stack_status)
+            result_df["Stack_Status"] = parse_stack_status_series(df[stack_col])
         else:
             # 자동 탐지
             for col in ["Stackability", "Stackable", "Stack", "Stack ability"]:
                 if col in df.columns:
-                    result_df["Stack_Status"] = df[col].apply(parse_stack_status)
+                    result_df["Stack_Status"] = parse_stack_status_series(df[col])
                     break
             else:
                 # Stack 컬럼이 없으면 기본값으로 Stack_Status 컬럼 추가
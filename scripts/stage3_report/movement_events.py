@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+Stage 3 Movement Event Store
+============================
+
+입고/창고간 이동/출고/직송 결과를 행마다 Python dict로 들고 있는 대신,
+하나의 타입 지정 컬럼형 이벤트 프레임으로 보관합니다.
+
+이벤트 프레임 스키마 (``EVENT_COLUMNS``):
+- Item_ID: 원본 행 라벨 (정수 라벨이면 int64)
+- Event_Type: category (external_arrival / warehouse_transfer /
+  warehouse_to_site / direct_delivery)
+- From_Location / To_Location: 창고·현장 category
+- Event_Date: datetime64[ns]
+- Year_Month: int32 (YYYYMM, 예: 202302)
+- Pkg_Quantity: int32
+
+기존 결과 키(``inbound_items`` 등)에는 ``EventRecords``가 들어갑니다.
+``EventRecords``는 list-of-dict처럼 순회/인덱싱/len이 가능한 호환 뷰로,
+dict는 접근할 때만 만들어지며 키 이름과 값 형식(``"2023-02"`` 문자열,
+Timestamp, int)은 기존 결과와 같습니다. 집계는 ``records.frame``을 직접 사용합니다.
+
+Examples:
+    >>> events = make_event_frame(
+    ...     item_id=[0, 1], event_type="external_arrival", from_location=None,
+    ...     to_location=["DSV Indoor", "MOSB"], event_date=dates, pkg_quantity=[1, 3],
+    ... )
+    >>> items = EventRecords(events, INBOUND_LAYOUT)
+    >>> items[0]["Year_Month"]
+    '2024-01'
+    >>> items.frame.groupby("To_Location", observed=True)["Pkg_Quantity"].sum()
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+EVENT_TYPES = ["external_arrival", "warehouse_transfer", "warehouse_to_site", "direct_delivery"]
+EVENT_TYPE_DTYPE = pd.CategoricalDtype(EVENT_TYPES)
+
+EVENT_COLUMNS = [
+    "Item_ID",
+    "Event_Type",
+    "From_Location",
+    "To_Location",
+    "Event_Date",
+    "Year_Month",
+    "Pkg_Quantity",
+]
+
+# 호환 dict 레이아웃: (dict 키, 이벤트 컬럼). 컬럼이 None이면 constants 값 사용
+RecordLayout = Tuple[Tuple[str, Optional[str]], ...]
+
+INBOUND_LAYOUT: RecordLayout = (
+    ("Item_ID", "Item_ID"),
+    ("Warehouse", "To_Location"),
+    ("Inbound_Date", "Event_Date"),
+    ("Year_Month", "Year_Month"),
+    ("Pkg_Quantity", "Pkg_Quantity"),
+    ("Inbound_Type", "Event_Type"),
+)
+TRANSFER_LAYOUT: RecordLayout = (
+    ("Row_ID", "Item_ID"),
+    ("from_warehouse", "From_Location"),
+    ("to_warehouse", "To_Location"),
+    ("transfer_date", "Event_Date"),
+    ("pkg_quantity", "Pkg_Quantity"),
+    ("transfer_type", None),
+    ("Year_Month", "Year_Month"),
+)
+TRANSFER_CONSTANTS = {"transfer_type": "warehouse_to_warehouse"}
+OUTBOUND_LAYOUT: RecordLayout = (
+    ("Item_ID", "Item_ID"),
+    ("From_Location", "From_Location"),
+    ("To_Location", "To_Location"),
+    ("Outbound_Date", "Event_Date"),
+    ("Year_Month", "Year_Month"),
+    ("Pkg_Quantity", "Pkg_Quantity"),
+    ("Outbound_Type", "Event_Type"),
+)
+DIRECT_LAYOUT: RecordLayout = (
+    ("Item_ID", "Item_ID"),
+    ("Site", "To_Location"),
+    ("Delivery_Date", "Event_Date"),
+    ("Year_Month", "Year_Month"),
+    ("Pkg_Quantity", "Pkg_Quantity"),
+)
+
+
+def location_dtype(locations: Iterable[str]) -> pd.CategoricalDtype:
+    """창고/현장 이름 목록으로 공통 category dtype 생성 (순서 유지, 중복 제거)"""
+    return pd.CategoricalDtype(list(dict.fromkeys(locations)))
+
+
+def _as_location(values, dtype: Optional[pd.CategoricalDtype], length: int) -> pd.Categorical:
+    if values is None:
+        values = [None] * length
+    elif isinstance(values, str):
+        values = [values] * length
+    values = pd.Series(values, dtype=object).to_numpy()
+    if dtype is not None:
+        missing = set(pd.unique(values[pd.notna(values)])) - set(dtype.categories)
+        if missing:
+            dtype = location_dtype(list(dtype.categories) + sorted(missing))
+    return pd.Categorical(values, dtype=dtype)
+
+
+def _as_item_ids(values) -> np.ndarray:
+    ids = pd.Series(values, dtype=object).to_numpy()
+    if all(isinstance(value, (int, np.integer)) and not isinstance(value, bool) for value in ids):
+        return ids.astype("int64")
+    return ids
+
+
+def year_month_number(dates: pd.Series) -> np.ndarray:
+    """datetime Series → int32 YYYYMM 배열"""
+    dates = pd.to_datetime(pd.Series(dates).reset_index(drop=True))
+    return (dates.dt.year * 100 + dates.dt.month).to_numpy(dtype="int32")
+
+
+def year_month_text(numbers) -> List[str]:
+    """int YYYYMM 값 → ``"YYYY-MM"`` 문자열 목록 (고유값 단위 변환)"""
+    codes, uniques = pd.factorize(np.asarray(numbers, dtype="int64"))
+    labels = np.array([f"{value // 100:04d}-{value % 100:02d}" for value in uniques], dtype=object)
+    return labels[codes].tolist() if len(codes) else []
+
+
+def make_event_frame(
+    item_id,
+    event_type,
+    from_location,
+    to_location,
+    event_date,
+    pkg_quantity,
+    locations: Optional[pd.CategoricalDtype] = None,
+) -> pd.DataFrame:
+    """
+    이벤트 프레임 생성
+
+    Args:
+        item_id: 원본 행 라벨 배열
+        event_type: EVENT_TYPES 중 하나(전체 공통) 또는 배열
+        from_location / to_location: 위치 배열, 단일 이름, 또는 None
+        event_date: 이벤트 날짜 배열 (Year_Month는 여기서 계산)
+        pkg_quantity: 수량 배열
+        locations: 위치 category dtype (없는 이름은 자동 추가)
+
+    Returns:
+        pd.DataFrame: EVENT_COLUMNS 스키마 프레임
+    """
+    ids = _as_item_ids(item_id)
+    length = len(ids)
+    if isinstance(event_type, str):
+        event_type = [event_type] * length
+    if length:
+        dates = pd.to_datetime(pd.Series(event_date).reset_index(drop=True))
+    else:
+        dates = pd.Series([], dtype="datetime64[ns]")
+    dates = dates.astype("datetime64[ns]")
+    return pd.DataFrame(
+        {
+            "Item_ID": ids,
+            "Event_Type": pd.Categorical(event_type, dtype=EVENT_TYPE_DTYPE),
+            "From_Location": _as_location(from_location, locations, length),
+            "To_Location": _as_location(to_location, locations, length),
+            "Event_Date": dates,
+            "Year_Month": year_month_number(dates),
+            "Pkg_Quantity": np.asarray(pkg_quantity, dtype="int64").astype("int32"),
+        },
+        columns=EVENT_COLUMNS,
+    )
+
+
+def empty_event_frame(locations: Optional[pd.CategoricalDtype] = None) -> pd.DataFrame:
+    """빈 이벤트 프레임 (스키마 dtype 유지)"""
+    return make_event_frame([], [], None, None, [], [], locations)
+
+
+def events_from_records(
+    records: List[Dict[str, Any]],
+    layout: RecordLayout,
+    event_type: Optional[str] = None,
+    locations: Optional[pd.CategoricalDtype] = None,
+) -> pd.DataFrame:
+    """
+    기존 list-of-dict 결과를 레이아웃에 따라 이벤트 프레임으로 변환
+
+    레이아웃에 Event_Type 키가 없으면(창고간 이동, 직송) event_type을 지정합니다.
+    """
+    columns = {column: key for key, column in layout if column is not None}
+    values = {column: [record.get(key) for record in records] for column, key in columns.items()}
+    return make_event_frame(
+        values["Item_ID"],
+        values.get("Event_Type", event_type),
+        values.get("From_Location"),
+        values.get("To_Location"),
+        values["Event_Date"],
+        values["Pkg_Quantity"],
+        locations,
+    )
+
+
+def relabel_items(frame: pd.DataFrame, labels) -> pd.DataFrame:
+    """Item_ID(원본 프레임 행 위치)를 행 라벨로 바꾼 프레임 (병렬 청크 결과 병합용)"""
+    positions = frame["Item_ID"].to_numpy(dtype="int64")
+    return frame.assign(Item_ID=_as_item_ids(np.asarray(labels, dtype=object)[positions]))
+
+
+def concat_events(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """이벤트 프레임 결합 (위치 category가 달라도 category dtype 유지)"""
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        return empty_event_frame()
+    categories: Dict[str, list] = {"From_Location": [], "To_Location": []}
+    for frame in frames:
+        for column, names in categories.items():
+            names.extend(frame[column].cat.categories)
+    aligned = [
+        frame.astype({column: location_dtype(names) for column, names in categories.items()})
+        for frame in frames
+    ]
+    return pd.concat(aligned, ignore_index=True)
+
+
+class EventRecords(Sequence):
+    """
+    이벤트 프레임 위의 읽기 전용 list-of-dict 호환 뷰
+
+    Attributes:
+        frame: EVENT_COLUMNS 스키마 이벤트 프레임 (집계는 이 프레임으로)
+        layout: dict 키 ↔ 이벤트 컬럼 매핑
+        constants: 컬럼 없이 고정값을 갖는 dict 키
+    """
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        layout: RecordLayout,
+        constants: Optional[Dict[str, Any]] = None,
+    ):
+        self.frame = frame.reset_index(drop=True)
+        self.layout = layout
+        self.constants = dict(constants or {})
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def _column_values(self, frame: pd.DataFrame, key: str, column: Optional[str]) -> list:
+        if column is None:
+            return [self.constants[key]] * len(frame)
+        if column == "Year_Month":
+            return year_month_text(frame[column].to_numpy())
+        series = frame[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.astype(object).where(series.notna(), None).tolist()
+        return series.tolist()
+
+    def _records(self, frame: pd.DataFrame) -> List[Dict[str, Any]]:
+        keys = [key for key, _ in self.layout]
+        columns = [self._column_values(frame, key, column) for key, column in self.layout]
+        return [dict(zip(keys, values)) for values in zip(*columns)]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._records(self.frame.iloc[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("EventRecords index out of range")
+        return self._records(self.frame.iloc[index : index + 1])[0]
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # 한 번에 전부 만들지 않도록 블록 단위로 dict 생성
+        block = 10_000
+        for start in range(0, len(self.frame), block):
+            yield from self._records(self.frame.iloc[start : start + block])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, EventRecords):
+            return self.to_list() == other.to_list()
+        if isinstance(other, list):
+            return self.to_list() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"EventRecords({len(self)} events, keys={[key for key, _ in self.layout]})"
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """기존 list-of-dict 결과로 변환"""
+        return self._records(self.frame)
+
+    def to_frame(self) -> pd.DataFrame:
+        """기존 ``pd.DataFrame(items)``와 같은 레코드 모양 DataFrame"""
+        return pd.DataFrame(self.to_list(), columns=[key for key, _ in self.layout])
+
+
+def event_frame(items) -> Optional[pd.DataFrame]:
+    """결과 항목이 EventRecords면 이벤트 프레임, 아니면 None (레거시 list)"""
+    return items.frame if isinstance(items, EventRecords) else None
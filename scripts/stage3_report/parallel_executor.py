@@ -0,0 +1,354 @@
+# -*- coding: utf-8 -*-
+"""
+Stage 3 Parallel Executor
+=========================
+
+Stage 3 계산기(입고/출고/SQM 출고/일할 과금)를 케이스 단위 청크로 나눠
+여러 프로세스에서 실행합니다.
+
+- 입력 프레임은 임시 파일에 **한 번만** 기록합니다 (pyarrow가 있고 모든 object
+  컬럼이 문자열이면 Arrow IPC, 아니면 pickle). 각 워커는 시작 시 한 번 읽고,
+  작업에는 청크 번호와 행 위치만 전달됩니다.
+- 청크는 케이스 키(기본 ``Case No.``, 없으면 인덱스) 단위로 나눠 같은 케이스의
+  행이 항상 같은 청크에 들어갑니다. 청크 안의 행은 원래 순서를 유지합니다.
+- 워커 수는 설정 가능하며(상한 없음), 1 이하이면 같은 프로세스에서 직렬 실행합니다.
+- 작업 실패는 폴백하지 않고 ``ChunkExecutionError``로 청크 정보와 함께 올립니다.
+- 청크별 실행 시간은 ``ParallelExecutor.timings``에 ``ChunkTiming``으로 기록합니다.
+
+작업 함수는 모듈 최상위 함수 ``task(context, chunk_df, *args)`` 형태여야 하며,
+``chunk_df``의 인덱스는 전체 프레임 기준 행 위치(0..N-1)입니다. 원래 행 라벨로의
+변환과 결과 병합은 호출 측에서 ``Chunk.positions``로 처리합니다.
+
+Examples:
+    >>> executor = ParallelExecutor(workers=4)
+    >>> results = executor.map(df, _inbound_chunk_task, context=calculator)
+    >>> [timing.seconds for timing in executor.timings]
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:  # pyarrow는 선택 의존성 (없으면 pickle 파일로 공유)
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - pyarrow 미설치 환경
+    pa = None
+    feather = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CASE_COLUMN = "Case No."
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """케이스 단위 청크 (전체 프레임 기준 행 위치, 오름차순)"""
+
+    chunk_id: int
+    positions: np.ndarray
+    n_cases: int
+    first_case: Any
+    last_case: Any
+
+    @property
+    def rows(self) -> int:
+        return len(self.positions)
+
+    def describe(self) -> str:
+        return (
+            f"chunk {self.chunk_id} (rows={self.rows}, cases={self.n_cases}, "
+            f"{self.first_case!r}..{self.last_case!r})"
+        )
+
+
+@dataclass(frozen=True)
+class ChunkTiming:
+    """청크 1개 실행 기록"""
+
+    chunk_id: int
+    pid: int
+    rows: int
+    cases: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class ChunkResult:
+    """청크 작업 결과"""
+
+    chunk: Chunk
+    value: Any
+
+
+class ChunkExecutionError(RuntimeError):
+    """청크 작업 실패 (원인 예외는 ``__cause__``)"""
+
+    def __init__(self, task_name: str, chunk: Chunk, cause: BaseException):
+        self.task_name = task_name
+        self.chunk = chunk
+        super().__init__(
+            f"{task_name} failed on {chunk.describe()}: {type(cause).__name__}: {cause}"
+        )
+
+
+def partition_by_case(
+    df: pd.DataFrame, n_chunks: int, case_column: Optional[str] = DEFAULT_CASE_COLUMN
+) -> List[Chunk]:
+    """
+    케이스 키 단위로 행 위치를 청크로 분할
+
+    케이스는 처음 등장한 순서대로 누적 행 수 기준 균등하게 배정됩니다.
+    케이스 키가 결측인 행은 각각 독립 케이스로 취급합니다.
+
+    Args:
+        df: 입력 프레임
+        n_chunks: 최대 청크 수 (케이스 수보다 많으면 케이스 수로 줄어듦)
+        case_column: 케이스 키 컬럼 (없으면 인덱스 라벨)
+
+    Returns:
+        List[Chunk]: 비어 있지 않은 청크 목록 (chunk_id 순)
+    """
+    if case_column is not None and case_column in df.columns:
+        keys = df[case_column]
+    else:
+        keys = pd.Series(df.index, index=df.index)
+    codes, _ = pd.factorize(keys, sort=False)
+    missing = codes < 0
+    if missing.any():
+        codes = codes.copy()
+        codes[missing] = codes.max() + 1 + np.arange(missing.sum())
+
+    n_rows = len(codes)
+    if n_rows == 0:
+        return []
+    counts = np.bincount(codes)
+    n_chunks = max(1, min(int(n_chunks), len(counts)))
+    rows_before = np.cumsum(counts) - counts
+    chunk_of_case = rows_before * n_chunks // n_rows
+    chunk_of_row = chunk_of_case[codes]
+
+    order = np.argsort(chunk_of_row, kind="stable")
+    boundaries = np.cumsum(np.bincount(chunk_of_row, minlength=n_chunks))[:-1]
+    key_values = keys.to_numpy()
+    chunks = []
+    for positions in np.split(order, boundaries):
+        if not len(positions):
+            continue
+        chunks.append(
+            Chunk(
+                chunk_id=len(chunks),
+                positions=positions,
+                n_cases=len(np.unique(codes[positions])),
+                first_case=key_values[positions[0]],
+                last_case=key_values[positions[-1]],
+            )
+        )
+    return chunks
+
+
+def _arrow_table(df: pd.DataFrame):
+    """
+    Arrow로 손실 없이 왕복 가능한 경우에만 (Table, NaN 결측 object 컬럼) 반환
+
+    object 컬럼은 문자열(결측 포함)일 때만 허용합니다. 날짜·숫자가 섞인 object
+    컬럼은 dtype이 바뀌므로 None을 반환해 pickle로 공유합니다. Arrow는 결측을
+    None으로 돌려주므로, 원본 결측이 NaN인 컬럼은 로드 시 NaN으로 되돌립니다.
+    """
+    if pa is None or not all(isinstance(column, str) for column in df.columns):
+        return None
+    if df.columns.has_duplicates:
+        return None
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=True)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    nan_columns = []
+    for column in df.columns[df.dtypes == object]:
+        field_type = table.schema.field(column).type
+        if not (pa.types.is_string(field_type) or pa.types.is_null(field_type)):
+            return None
+        values = df[column].to_numpy()
+        missing = values[pd.isna(values)]
+        if not len(missing):
+            continue
+        is_none = np.array([value is None for value in missing])
+        if is_none.all():
+            continue
+        if is_none.any():
+            return None
+        nan_columns.append(column)
+    return table, nan_columns
+
+
+class SharedFrame:
+    """
+    워커 간 공유용으로 임시 파일에 한 번 기록한 입력 프레임
+
+    Attributes:
+        path: 기록된 파일 경로
+        format: ``"arrow"`` (Arrow IPC, memory-map 로드) 또는 ``"pickle"``
+        nan_columns: Arrow 로드 후 결측을 NaN으로 되돌릴 object 컬럼
+    """
+
+    def __init__(self, df: pd.DataFrame, directory: Optional[str] = None):
+        self._directory = tempfile.mkdtemp(prefix="hvdc_stage3_", dir=directory)
+        arrow = _arrow_table(df)
+        if arrow is not None:
+            table, self.nan_columns = arrow
+            self.format = "arrow"
+            self.path = Path(self._directory) / "frame.arrow"
+            feather.write_feather(table, str(self.path), compression="uncompressed")
+        else:
+            self.format = "pickle"
+            self.nan_columns = []
+            self.path = Path(self._directory) / "frame.pkl"
+            with open(self.path, "wb") as handle:
+                pickle.dump(df, handle, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @property
+    def load_args(self) -> tuple:
+        """``SharedFrame.load``에 넘길 인자 (워커 initializer용)"""
+        return str(self.path), self.format, list(self.nan_columns)
+
+    @staticmethod
+    def load(path: str, fmt: str, nan_columns: Sequence[str] = ()) -> pd.DataFrame:
+        if fmt == "arrow":
+            frame = feather.read_table(path, memory_map=True).to_pandas()
+            for column in nan_columns:
+                frame[column] = frame[column].where(frame[column].notna(), np.nan)
+            return frame
+        with open(path, "rb") as handle:
+            return pickle.load(handle)
+
+    def close(self) -> None:
+        shutil.rmtree(self._directory, ignore_errors=True)
+
+    def __enter__(self) -> "SharedFrame":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# 워커 프로세스 상태 (initializer에서 한 번 설정)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _init_worker(load_args: tuple, context: Any) -> None:
+    _WORKER_STATE["frame"] = SharedFrame.load(*load_args)
+    _WORKER_STATE["context"] = context
+
+
+def _chunk_frame(frame: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+    chunk_df = frame.take(positions)
+    chunk_df.index = pd.Index(positions)
+    return chunk_df
+
+
+def _run_chunk(task: Callable, positions: np.ndarray, args: tuple):
+    """워커 작업: 공유 프레임에서 청크를 잘라 task 실행 → (값, pid, 초)"""
+    start = time.perf_counter()
+    chunk_df = _chunk_frame(_WORKER_STATE["frame"], positions)
+    value = task(_WORKER_STATE["context"], chunk_df, *args)
+    return value, os.getpid(), time.perf_counter() - start
+
+
+class ParallelExecutor:
+    """
+    케이스 단위 청크 병렬 실행기
+
+    Args:
+        workers: 워커 프로세스 수 (None이면 CPU 수, 1 이하면 직렬)
+        chunks: 청크 수 (None이면 워커 수)
+        case_column: 케이스 키 컬럼
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        chunks: Optional[int] = None,
+        case_column: Optional[str] = DEFAULT_CASE_COLUMN,
+    ):
+        self.workers = max(1, int(workers or os.cpu_count() or 1))
+        self.chunks = max(1, int(chunks or self.workers))
+        self.case_column = case_column
+        self.timings: List[ChunkTiming] = []
+
+    def map(
+        self,
+        df: pd.DataFrame,
+        task: Callable,
+        context: Any = None,
+        args: Sequence[Any] = (),
+    ) -> List[ChunkResult]:
+        """
+        청크마다 ``task(context, chunk_df, *args)`` 실행
+
+        Returns:
+            List[ChunkResult]: chunk_id 순 결과
+
+        Raises:
+            ChunkExecutionError: 작업이 실패한 첫 청크 정보 포함
+        """
+        task_name = getattr(task, "__name__", repr(task))
+        chunks = partition_by_case(df, self.chunks, self.case_column)
+        args = tuple(args)
+        self.timings = []
+
+        workers = min(self.workers, len(chunks))
+        if workers <= 1:
+            values = []
+            for chunk in chunks:
+                start = time.perf_counter()
+                try:
+                    value = task(context, _chunk_frame(df, chunk.positions), *args)
+                except Exception as exc:
+                    raise ChunkExecutionError(task_name, chunk, exc) from exc
+                values.append((value, os.getpid(), time.perf_counter() - start))
+        else:
+            with (
+                SharedFrame(df) as shared,
+                ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(shared.load_args, context),
+                ) as pool,
+            ):
+                futures = [pool.submit(_run_chunk, task, chunk.positions, args) for chunk in chunks]
+                values = []
+                for chunk, future in zip(chunks, futures):
+                    try:
+                        values.append(future.result())
+                    except Exception as exc:
+                        for pending in futures:
+                            pending.cancel()
+                        raise ChunkExecutionError(task_name, chunk, exc) from exc
+
+        results = []
+        for chunk, (value, pid, seconds) in zip(chunks, values):
+            timing = ChunkTiming(chunk.chunk_id, pid, chunk.rows, chunk.n_cases, seconds)
+            self.timings.append(timing)
+            logger.info(
+                " %s chunk %d: %d행 / %d케이스, pid=%d, %.3fs",
+                task_name,
+                timing.chunk_id,
+                timing.rows,
+                timing.cases,
+                timing.pid,
+                timing.seconds,
+            )
+            results.append(ChunkResult(chunk, value))
+        return results
@@ -21,10 +21,13 @@ Samsung C&T · ADNOC · DSV Partnership
 Multi-Level Header: 창고 17열(누계 포함), 현장 9열
 """
 
+import copy
+import hashlib
 import logging
 import os
 import re
 import sys
+import weakref
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
@@ -39,7 +42,10 @@ from core.standard_header_order import (
     normalize_header_names_for_stage3,
     analyze_header_compatibility,
 )
-from core.data_parser import parse_stack_status
+from core.data_parser import parse_stack_status_many, round_array, stack_status_cache_info
+from core.stage_artifacts import read_excel_with_sidecar, write_sidecar
+from core.stage_profiler import profile_phase, record_rows
+from core.location_timeline import DAY_NS, LocationTimeline
 
 import numpy as np
 import pandas as pd
@@ -47,6 +53,29 @@ import yaml
 import warnings
 
 from .utils import normalize_columns, apply_column_synonyms
+from .movement_events import (
+    DIRECT_LAYOUT,
+    INBOUND_LAYOUT,
+    OUTBOUND_LAYOUT,
+    TRANSFER_CONSTANTS,
+    TRANSFER_LAYOUT,
+    EventRecords,
+    concat_events,
+    empty_event_frame,
+    event_frame,
+    events_from_records,
+    location_dtype,
+    make_event_frame,
+    relabel_items,
+    year_month_text,
+)
+from .parallel_executor import ChunkResult, ParallelExecutor
+from .streaming_excel import (
+    SheetLayoutError,
+    read_sheet_dimensions,
+    verify_sheet_dimensions,
+    write_excel_sheets,
+)
 
 warnings.filterwarnings("ignore")
 
@@ -68,6 +97,20 @@ STAGE2_CONFIG_PATH = PIPELINE_ROOT / "config" / "stage2_derived_config.yaml"
 DEFAULT_STAGE2_OUTPUT = "data/processed/derived/HVDC_WAREHOUSE_HITACHI_HE_derived.xlsx"
 DEFAULT_REPORTS_DIR = "data/processed/reports"
 
+# datetime64[ns]의 NaT 정수 표현 (날짜 블록 argmax/마스크용)
+NAT_INT64 = np.iinfo(np.int64).min
+
+# 창고간 이동 감지 대상 (출발 창고, 도착 창고) - 결과는 이 순서대로 나열됨
+WAREHOUSE_TRANSFER_PAIRS = [
+    ("DSV Indoor", "DSV Al Markaz"),
+    ("DSV Indoor", "DSV Outdoor"),
+    ("DSV Al Markaz", "DSV Outdoor"),
+    ("AAA Storage", "DSV Al Markaz"),
+    ("AAA Storage", "DSV Indoor"),
+    ("DSV Indoor", "MOSB"),
+    ("DSV Al Markaz", "MOSB"),
+]
+
 
 def _load_yaml_config(config_path: Path) -> Dict:
     """YAML 설정을 로드합니다. / Load a YAML configuration file."""
@@ -103,6 +146,26 @@ def _check_duplicate_function(func_name: str):
 
 
 # 공통 헬퍼 함수
+# SQM 탐색 컬럼 (우선순위 순)
+STAGE2_SQM_COLUMNS = ["SQM", "sqm", "Area", "area", "AREA"]
+ACTUAL_SQM_COLUMNS = STAGE2_SQM_COLUMNS + [
+    "Size_SQM",
+    "Item_SQM",
+    "Package_SQM",
+    "Total_SQM",
+    "M2",
+    "m2",
+    "SQUARE",
+    "Square",
+    "square",
+    "Dimension",
+    "Space",
+    "Volume_SQM",
+]
+LENGTH_COLUMNS = ["L(CM)", "Length (cm)", "L CM", "Length", "L(mm)", "L(MM)"]
+WIDTH_COLUMNS = ["W(CM)", "Width (cm)", "W CM", "Width", "W(mm)", "W(MM)"]
+
+
 def _get_pkg(row):
     """Pkg 컬럼에서 수량을 안전하게 추출하는 헬퍼 함수"""
     pkg_value = row.get("Pkg", 1)
@@ -111,6 +174,11 @@ def _get_pkg(row):
     if isinstance(pkg_value, pd.Series):
         pkg_value = pkg_value.iloc[0] if len(pkg_value) > 0 else 1
 
+    return _pkg_scalar(pkg_value)
+
+
+def _pkg_scalar(pkg_value) -> int:
+    """Pkg 셀 값 → 수량 (결측/빈값/0/변환 불가 → 1)"""
     if pd.isna(pkg_value) or pkg_value == "" or pkg_value == 0:
         return 1
     try:
@@ -129,8 +197,7 @@ def _get_sqm(row):
     3. 기존 추정 로직 (PKG×1.5)
     """
     # 1순위: Stage 2에서 계산된 SQM 컬럼
-    stage2_sqm_columns = ["SQM", "sqm", "Area", "area", "AREA"]
-    for col in stage2_sqm_columns:
+    for col in STAGE2_SQM_COLUMNS:
         if col in row.index and pd.notna(row[col]):
             try:
                 sqm_value = float(row[col])
@@ -141,14 +208,10 @@ def _get_sqm(row):
 
     # 2순위: 치수 기반 계산 (STACK.MD 로직)
     try:
-        # L, W 컬럼 찾기
-        l_cols = ["L(CM)", "Length (cm)", "L CM", "Length", "L(mm)", "L(MM)"]
-        w_cols = ["W(CM)", "Width (cm)", "W CM", "Width", "W(mm)", "W(MM)"]
-
         L = None
         W = None
 
-        for col in l_cols:
+        for col in LENGTH_COLUMNS:
             if col in row.index and pd.notna(row[col]):
                 try:
                     L = float(str(row[col]).replace(",", "").strip())
@@ -160,7 +223,7 @@ def _get_sqm(row):
                 except (ValueError, TypeError):
                     continue
 
-        for col in w_cols:
+        for col in WIDTH_COLUMNS:
             if col in row.index and pd.notna(row[col]):
                 try:
                     W = float(str(row[col]).replace(",", "").strip())
@@ -188,28 +251,8 @@ def _get_sqm(row):
 
 def _get_sqm_with_source(row):
     """SQM 추출 + 소스 구분 (실제 vs 추정)"""
-    sqm_columns = [
-        "SQM",
-        "sqm",
-        "Area",
-        "area",
-        "AREA",
-        "Size_SQM",
-        "Item_SQM",
-        "Package_SQM",
-        "Total_SQM",
-        "M2",
-        "m2",
-        "SQUARE",
-        "Square",
-        "square",
-        "Dimension",
-        "Space",
-        "Volume_SQM",
-    ]
-
     # 실제 SQM 값 찾기
-    for col in sqm_columns:
+    for col in ACTUAL_SQM_COLUMNS:
         if col in row.index and pd.notna(row[col]):
             try:
                 sqm_value = float(row[col])
@@ -224,6 +267,148 @@ def _get_sqm_with_source(row):
     return estimated_sqm, "ESTIMATED", "PKG_BASED"
 
 
+def _map_unique(series: pd.Series, func) -> np.ndarray:
+    """고유값마다 func를 1회만 호출해 행 배열로 펼침 (결측은 func(NaN))"""
+    codes, uniques = pd.factorize(series)
+    mapped = [func(value) for value in uniques] + [func(np.nan)]
+    return np.asarray(mapped, dtype=object)[codes]
+
+
+def _float_or_nan(value) -> float:
+    """float(value) 변환 (결측/변환 실패 → NaN)"""
+    if pd.isna(value):
+        return np.nan
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return np.nan
+
+
+def _dimension_cell(value) -> Tuple[float, bool]:
+    """치수 셀 → (값, 변환 성공 여부). 쉼표/공백 제거 후 float 변환."""
+    if pd.isna(value):
+        return np.nan, False
+    try:
+        return float(str(value).replace(",", "").strip()), True
+    except (ValueError, TypeError):
+        return np.nan, False
+
+
+def _float_values(series: pd.Series) -> np.ndarray:
+    """Series → float 배열 (행 헬퍼의 float(row[col])과 동일 규칙)"""
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype="float64", na_value=np.nan)
+    return _map_unique(series, _float_or_nan).astype("float64")
+
+
+def _get_pkg_series(df: pd.DataFrame) -> pd.Series:
+    """_get_pkg 벡터화: 행별 Pkg 수량 (int)"""
+    if "Pkg" not in df.columns:
+        return pd.Series(1, index=df.index, dtype="int64")
+    pkg = df["Pkg"]
+    if isinstance(pkg, pd.DataFrame):  # 중복 컬럼: 첫 번째 사용
+        pkg = pkg.iloc[:, 0]
+    return pd.Series(_map_unique(pkg, _pkg_scalar).astype("int64"), index=df.index)
+
+
+def _first_positive(df: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    컬럼 우선순위대로 첫 번째 양수 값을 선택
+
+    Returns:
+        (values, column_index): 선택 값(없으면 NaN)과 선택 컬럼 위치(없으면 -1)
+    """
+    values = np.full(len(df), np.nan)
+    chosen = np.full(len(df), -1, dtype=np.int64)
+    for position, col in enumerate(columns):
+        if col not in df.columns:
+            continue
+        candidate = _float_values(df[col])
+        with np.errstate(invalid="ignore"):
+            take = (chosen < 0) & (candidate > 0)
+        values[take] = candidate[take]
+        chosen[take] = position
+    return values, chosen
+
+
+def _dimension_values(df: pd.DataFrame, columns: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    _get_sqm의 L/W 탐색 루프 벡터화
+
+    첫 번째 양수 값(mm 컬럼은 ÷10)을 사용하고, 양수가 없으면 마지막으로 변환된
+    값을 그대로 사용합니다 (행 헬퍼와 동일).
+
+    Returns:
+        (values, converted): 치수 값과 변환 성공 여부
+    """
+    values = np.full(len(df), np.nan)
+    converted = np.zeros(len(df), dtype=bool)
+    found_positive = np.zeros(len(df), dtype=bool)
+    for col in columns:
+        if col not in df.columns:
+            continue
+        codes, uniques = pd.factorize(df[col])
+        cells = [_dimension_cell(value) for value in uniques] + [(np.nan, False)]
+        parsed = np.array([cell[0] for cell in cells], dtype="float64")[codes]
+        ok = np.array([cell[1] for cell in cells], dtype=bool)[codes]
+
+        update = ok & ~found_positive
+        values[update] = parsed[update]
+        converted |= update
+        with np.errstate(invalid="ignore"):
+            positive = update & (parsed > 0)
+        if "mm" in col.lower():
+            values[positive] = values[positive] / 10.0
+        found_positive |= positive
+    return values, converted
+
+
+def _get_sqm_series(df: pd.DataFrame) -> pd.Series:
+    """
+    _get_sqm 벡터화: df.apply(_get_sqm, axis=1)과 동일한 행별 SQM
+
+    우선순위: Stage 2 SQM 컬럼 → 치수(L×W/10000, 소수 2자리) → PKG×1.5
+    """
+    result, _ = _first_positive(df, STAGE2_SQM_COLUMNS)
+    pending = np.isnan(result)
+
+    has_length = any(col in df.columns for col in LENGTH_COLUMNS)
+    has_width = any(col in df.columns for col in WIDTH_COLUMNS)
+    if pending.any() and has_length and has_width:
+        length, length_ok = _dimension_values(df, LENGTH_COLUMNS)
+        width, width_ok = _dimension_values(df, WIDTH_COLUMNS)
+        with np.errstate(invalid="ignore", over="ignore"):
+            dims_sqm = round_array((length * width) / 10000.0)
+        use_dims = pending & length_ok & width_ok
+        result[use_dims] = dims_sqm[use_dims]
+        pending &= ~use_dims
+
+    if pending.any():
+        result[pending] = _get_pkg_series(df).to_numpy()[pending] * 1.5
+    return pd.Series(result, index=df.index, dtype="float64")
+
+
+def _get_sqm_with_source_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    _get_sqm_with_source 벡터화
+
+    Returns:
+        sqm / source("ACTUAL"|"ESTIMATED") / column 컬럼을 가진 DataFrame
+    """
+    values, chosen = _first_positive(df, ACTUAL_SQM_COLUMNS)
+    actual = chosen >= 0
+    estimated = _get_pkg_series(df).to_numpy() * 1.5
+    columns = np.asarray(ACTUAL_SQM_COLUMNS + ["PKG_BASED"], dtype=object)
+    return pd.DataFrame(
+        {
+            "sqm": np.where(actual, values, estimated),
+            "source": np.where(actual, "ACTUAL", "ESTIMATED").astype(object),
+            "column": columns[np.where(actual, chosen, len(ACTUAL_SQM_COLUMNS))],
+        },
+        index=df.index,
+    )
+
+
 def _calculate_stack_status(df: pd.DataFrame, stack_col: str = "Stack") -> pd.Series:
     """
     Stack 컬럼 텍스트를 파싱하여 Stack_Status 반환
@@ -239,8 +424,8 @@ def _calculate_stack_status(df: pd.DataFrame, stack_col: str = "Stack") -> pd.Se
         logger.warning(f"[WARN] '{stack_col}' 컬럼이 없습니다. Stack_Status를 None으로 설정합니다.")
         return pd.Series([None] * len(df), index=df.index)
 
-    # core.data_parser 사용
-    return df[stack_col].apply(parse_stack_status)
+    # core.data_parser 사용 (고유 텍스트만 파싱)
+    return parse_stack_status_many(df[stack_col])
 
 
 def _calculate_total_sqm(df: pd.DataFrame) -> pd.Series:
@@ -263,22 +448,79 @@ def _calculate_total_sqm(df: pd.DataFrame) -> pd.Series:
         logger.warning(f"[WARN] Total sqm 계산에 필요한 컬럼 누락: {missing_cols}")
         return result
 
-    # 계산: SQM × PKG
-    for idx in df.index:
-        try:
-            pkg = df.loc[idx, "Pkg"]
-            sqm = df.loc[idx, "SQM"]
+    # 계산: SQM × PKG (둘 다 양수인 숫자 값일 때만, 그 외 None)
+    pkg = _numeric_cells(df["Pkg"])
+    sqm = _numeric_cells(df["SQM"])
+    with np.errstate(invalid="ignore"):
+        valid = (pkg > 0) & (sqm > 0)
+    product = np.where(valid, sqm * pkg, np.nan)
+    numeric_input = pd.api.types.is_numeric_dtype(df["Pkg"]) or pd.api.types.is_numeric_dtype(
+        df["SQM"]
+    )
+    # numpy 스칼라 곱은 np.round, 파이썬 float끼리는 내장 round와 동일하게 반올림
+    result[:] = np.round(product, 2) if numeric_input else round_array(product)
+    return result
 
-            # 모든 값이 유효한 경우에만 계산
-            if pd.notna(pkg) and pd.notna(sqm) and pkg > 0 and sqm > 0:
-                result.loc[idx] = round(sqm * pkg, 2)
-            else:
-                result.loc[idx] = None
-        except Exception as e:
-            logger.debug(f"[DEBUG] Total sqm 계산 오류 (idx={idx}): {e}")
-            result.loc[idx] = None
 
-    return result
+def _numeric_cells(series: pd.Series) -> np.ndarray:
+    """숫자 셀만 float로, 문자열/날짜 등 비숫자 셀은 NaN (비교 시 예외 → None 규칙)"""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype="float64", na_value=np.nan)
+
+    def _number(value) -> float:
+        if isinstance(value, (int, float, np.number)) and not pd.isna(value):
+            return float(value)
+        return np.nan
+
+    return _map_unique(series, _number).astype("float64")
+
+
+def _location_fingerprint(df: pd.DataFrame, columns: List[str]) -> bytes:
+    """
+    위치 날짜 컬럼 내용 해시 (셀 제자리 수정/컬럼 재할당 감지용)
+
+    datetime64 컬럼은 int64 버퍼를 그대로, 그 외 dtype은 셀 해시를 사용합니다.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for column in columns:
+        digest.update(column.encode("utf-8") + b"\0")
+        if column not in df.columns:
+            digest.update(b"<absent>")
+            continue
+        values = df[column]
+        if isinstance(values, pd.Series) and pd.api.types.is_datetime64_any_dtype(values):
+            digest.update(str(values.dtype).encode("utf-8"))
+            data = values.array.asi8
+        else:
+            data = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        digest.update(np.ascontiguousarray(data).view(np.uint8))
+    return digest.digest()
+
+
+class AnalysisContext:
+    """
+    계산 실행 단위 분석 컨텍스트 (프레임 1개당 1회 계산, 벡터화 계산기가 공유)
+
+    - timeline: 위치(창고 + 현장) 날짜 LocationTimeline (행 × 위치, 방문 순서)
+    - transfers: 창고간 이동 감지 결과 (행 위치 기준, 첫 사용 시 1회 계산)
+
+    다른 프레임 객체, 인덱스 변경(행 추가/삭제), 위치 날짜 컬럼 내용 변경(재할당 또는
+    셀 제자리 수정)이면 무효이며, 내용은 호출마다 컬럼 해시로 비교합니다.
+    """
+
+    def __init__(self, df: pd.DataFrame, locations: List[str]):
+        self.locations = list(locations)
+        self.timeline = LocationTimeline.from_frame(df, self.locations)
+        self.transfers: Optional[pd.DataFrame] = None
+        self._frame = weakref.ref(df)
+        self._index = df.index
+        self._fingerprint = _location_fingerprint(df, self.locations)
+
+    def matches(self, df: pd.DataFrame, locations: List[str]) -> bool:
+        """같은 프레임·같은 인덱스·같은 위치 날짜 내용이면 True"""
+        if self._frame() is not df or df.index is not self._index or self.locations != locations:
+            return False
+        return _location_fingerprint(df, self.locations) == self._fingerprint
 
 
 # KPI 임계값 (수정 버전 검증 완료)
@@ -290,6 +532,26 @@ KPI_THRESHOLDS = {
 }
 
 
+# ===== 병렬 청크 작업 (ParallelExecutor 워커에서 실행, context = 계산기 복사본) =====
+# chunk_df 인덱스는 전체 프레임 기준 행 위치이며, 병합은 계산기의 _parallel 메서드에서 수행
+
+
+def _inbound_chunk_task(calculator, chunk_df: pd.DataFrame):
+    return calculator._inbound_events(chunk_df)
+
+
+def _outbound_chunk_task(calculator, chunk_df: pd.DataFrame):
+    return calculator._outbound_parts(chunk_df)
+
+
+def _sqm_site_outbound_chunk_task(calculator, chunk_df: pd.DataFrame, transferred_warehouses):
+    return calculator._sqm_site_outbound_matches(chunk_df, transferred_warehouses)
+
+
+def _billing_segments_chunk_task(calculator, chunk_df: pd.DataFrame, wh_cols: List[str]):
+    return calculator._billing_segments(chunk_df, wh_cols)
+
+
 def validate_kpi_thresholds(stats: Dict) -> Dict:
     """KPI 임계값 검증 (수정 버전)"""
     logger.info(" KPI 임계값 검증 시작 (수정 버전)")
@@ -341,11 +603,22 @@ def validate_kpi_thresholds(stats: Dict) -> Dict:
 class CorrectedWarehouseIOCalculator:
     """수정된 창고 입출고 계산기"""
 
-    def __init__(self, use_vectorized=False, use_parallel=False):
-        """초기화"""
+    def __init__(self, use_vectorized=False, use_parallel=False, workers=None):
+        """
+        초기화
+
+        Args:
+            use_vectorized: 벡터화 계산 사용
+            use_parallel: 케이스 단위 병렬 계산 사용 (use_vectorized와 함께, 1000행 초과 시)
+            workers: 병렬 워커 프로세스 수 (None이면 CPU 수)
+        """
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.use_vectorized = use_vectorized
         self.use_parallel = use_parallel
+        self.workers = workers
+        self.parallel_chunks = None  # None이면 워커 수만큼 청크 분할
+        self.parallel_timings = {}  # 계산명 → List[ChunkTiming]
+        self._analysis = None  # AnalysisContext (계산 대상 프레임이 바뀌면 다시 생성)
 
         pipeline_config = _load_yaml_config(PIPELINE_CONFIG_PATH)
         stage2_config = _load_yaml_config(STAGE2_CONFIG_PATH)
@@ -404,6 +677,9 @@ class CorrectedWarehouseIOCalculator:
 
         self.site_columns = ["AGI", "DAS", "MIR", "SHU"]
 
+        # 입출고 이벤트 프레임의 공통 위치 category
+        self.location_dtype = location_dtype(self.warehouse_columns + self.site_columns)
+
         #  수정: 위치 우선순위 (타이브레이커용)
         self.location_priority = {
             "DSV Al Markaz": 1,
@@ -570,7 +846,7 @@ class CorrectedWarehouseIOCalculator:
             # HITACHI 데이터 로드 (전체)
             if self.hitachi_file.exists():
                 logger.info(f" HITACHI 데이터 로드: {self.hitachi_file}")
-                hitachi_data = pd.read_excel(self.hitachi_file, engine="openpyxl")
+                hitachi_data = read_excel_with_sidecar(self.hitachi_file, engine="openpyxl")
                 # [패치] 컬럼명 정규화 및 동의어 매핑
                 hitachi_data.columns = normalize_columns(hitachi_data.columns)
                 hitachi_data = apply_column_synonyms(hitachi_data)
@@ -611,7 +887,7 @@ class CorrectedWarehouseIOCalculator:
             # SIMENSE 데이터 로드 (전체)
             if self.simense_file.exists():
                 logger.info(f" SIMENSE 데이터 로드: {self.simense_file}")
-                simense_data = pd.read_excel(self.simense_file, engine="openpyxl")
+                simense_data = read_excel_with_sidecar(self.simense_file, engine="openpyxl")
                 # [패치] 컬럼명 정규화 및 동의어 매핑
                 simense_data.columns = normalize_columns(simense_data.columns)
                 simense_data = apply_column_synonyms(simense_data)
@@ -795,9 +1071,48 @@ class CorrectedWarehouseIOCalculator:
         # v3.3-flow override: wh handling 우회 + 새로운 로직 적용
         self._override_flow_code()
 
+        # 위치 날짜 타임라인 1회 생성 (이후 계산기/시트가 공유)
+        if self.use_vectorized:
+            self.location_timeline(self.combined_data)
+
         logger.info(" 데이터 전처리 완료 (원본 handling 컬럼 보존)")
         return self.combined_data
 
+    def _run_parallel(self, name: str, df: pd.DataFrame, task, *args) -> List[ChunkResult]:
+        """
+        케이스 단위 청크 병렬 실행 (입력 프레임은 1회 공유, 실패 시 ChunkExecutionError)
+
+        청크별 실행 시간은 ``self.parallel_timings[name]``에 기록됩니다.
+        """
+        context = copy.copy(self)
+        context.combined_data = None  # 워커에는 계산 설정만 전달
+        context.parallel_timings = {}
+        context._analysis = None  # 청크마다 워커에서 새로 생성
+        executor = ParallelExecutor(workers=self.workers, chunks=self.parallel_chunks)
+        results = executor.map(df, task, context, args)
+        self.parallel_timings[name] = executor.timings
+        return results
+
+    def analysis_context(self, df: pd.DataFrame) -> AnalysisContext:
+        """
+        df의 분석 컨텍스트 (위치 날짜 LocationTimeline + 창고간 이동)
+
+        같은 프레임이면 입고/출고/SQM/과금 등 모든 벡터화 계산이 한 번 파싱한
+        결과를 재사용하고, 프레임이 바뀌면 새로 만듭니다.
+        """
+        locations = self.warehouse_columns + self.site_columns
+        if self._analysis is None or not self._analysis.matches(df, locations):
+            self._analysis = AnalysisContext(df, locations)
+        return self._analysis
+
+    def location_timeline(self, df: pd.DataFrame) -> LocationTimeline:
+        """df의 위치(창고 + 현장) 날짜 타임라인 (분석 컨텍스트 공유, 읽기 전용)"""
+        return self.analysis_context(df).timeline
+
+    def invalidate_analysis_context(self) -> None:
+        """분석 컨텍스트 폐기 (다음 벡터화 계산에서 새로 생성)"""
+        self._analysis = None
+
     def calculate_warehouse_inbound_corrected(self, df: pd.DataFrame) -> Dict:
         """
          수정된 창고 입고 계산
@@ -881,47 +1196,40 @@ class CorrectedWarehouseIOCalculator:
         """벡터화된 창고 입고 계산 (PATCH.MD 전략)"""
         logger.info(" Vectorized 창고 입고 계산 시작")
 
-        # 1. 창고 컬럼을 melt하여 벡터화 처리
-        df_with_index = df.reset_index().rename(columns={"index": "Row_ID"})
-        wh_df = df_with_index.melt(
-            id_vars=["Row_ID", "Pkg"],
-            value_vars=self.warehouse_columns,
-            var_name="Warehouse",
-            value_name="Inbound_Date",
-        )
-        wh_df = wh_df[wh_df["Inbound_Date"].notna()].copy()
-        wh_df["Row_ID"] = wh_df["Row_ID"].apply(
-            lambda value: int(value)
-            if isinstance(value, (int, np.integer))
-            else value
-        )
-        wh_df["Inbound_Date"] = pd.to_datetime(wh_df["Inbound_Date"])
-        wh_df["Year_Month"] = wh_df["Inbound_Date"].dt.strftime("%Y-%m")
-        wh_df["Pkg_Quantity"] = wh_df["Pkg"].fillna(1).clip(lower=1).astype(int)
+        result = self._inbound_result(*self._inbound_events(df))
 
-        # 2. 창고간 이동 감지 (벡터화)
-        df_with_transfers = df.copy()
-        df_with_transfers["transfers"] = df_with_transfers.apply(
-            self._detect_warehouse_transfers, axis=1
-        )
-        transfers_flat = pd.DataFrame(
-            [t for transfers in df_with_transfers["transfers"] for t in transfers]
+        logger.info(f" Vectorized 창고 입고 계산 완료: {result['total_inbound']}건")
+        return result
+
+    def _inbound_events(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        입고 이벤트 프레임 생성 (외부 입고, 창고간 이동)
+
+        외부 입고는 창고 컬럼 순서 → 행 순서, 이동은 행 순서로 나열됩니다.
+        """
+        labels = df.index.to_numpy(dtype=object)
+
+        # 1. 창고 날짜 블록에서 유효한 셀 (창고 컬럼 → 행 순, melt 순서와 동일)
+        wh_ns = self.location_timeline(df).block(self.warehouse_columns)
+        wh_cols, wh_rows = np.nonzero(wh_ns.T != NAT_INT64)
+        wh_df = pd.DataFrame(
+            {
+                "Row": wh_rows,
+                "Warehouse": np.asarray(self.warehouse_columns, dtype=object)[wh_cols],
+                "Inbound_Date": wh_ns[wh_rows, wh_cols].view("datetime64[ns]"),
+                "Pkg_Quantity": self._get_pkg_quantity_vectorized(df).to_numpy()[wh_rows],
+            }
         )
 
-        if not transfers_flat.empty:
-            if "Row_ID" in transfers_flat.columns:
-                transfers_flat["Row_ID"] = transfers_flat["Row_ID"].apply(
-                    lambda value: int(value)
-                    if isinstance(value, (int, np.integer))
-                    else value
-                )
-            transfers_flat["transfer_date"] = pd.to_datetime(
-                transfers_flat["transfer_date"]
-            )
-            transfers_flat["Year_Month"] = transfers_flat["transfer_date"].dt.strftime(
-                "%Y-%m"
-            )
+        # 2. 창고간 이동 (분석 컨텍스트 공유, 행 → 이동 쌍 순)
+        positions = self._transfer_positions(df)
+        order = np.lexsort((positions["Pair"].to_numpy(), positions["Row"].to_numpy()))
+        transfers_flat = positions.iloc[order].reset_index(drop=True)
+        transfers_flat["pkg_quantity"] = _get_pkg_series(df).to_numpy()[
+            transfers_flat["Row"].to_numpy()
+        ]
 
+        if not transfers_flat.empty:
             transfer_destinations = transfers_flat.rename(
                 columns={
                     "to_warehouse": "Warehouse",
@@ -930,135 +1238,87 @@ class CorrectedWarehouseIOCalculator:
                 }
             )
             transfer_destinations = transfer_destinations[
-                ["Row_ID", "Warehouse", "Inbound_Date", "Transfer_Quantity"]
+                ["Row", "Warehouse", "Inbound_Date", "Transfer_Quantity"]
             ]
 
             wh_df = wh_df.merge(
                 transfer_destinations,
-                on=["Row_ID", "Warehouse", "Inbound_Date"],
+                on=["Row", "Warehouse", "Inbound_Date"],
                 how="left",
             )
-            wh_df["Transfer_Quantity"] = (
-                wh_df["Transfer_Quantity"].fillna(0).astype(int)
-            )
+            wh_df["Transfer_Quantity"] = wh_df["Transfer_Quantity"].fillna(0).astype(int)
         else:
             wh_df["Transfer_Quantity"] = 0
 
         # 창고간 이동 목적지 수량 제외
-        wh_df["External_Quantity"] = (
-            wh_df["Pkg_Quantity"] - wh_df["Transfer_Quantity"]
-        ).clip(lower=0)
-        external_wh_df = wh_df[wh_df["External_Quantity"] > 0].copy()
-        external_wh_df["Pkg_Quantity"] = (
-            external_wh_df["External_Quantity"].astype(int)
+        wh_df["External_Quantity"] = (wh_df["Pkg_Quantity"] - wh_df["Transfer_Quantity"]).clip(
+            lower=0
         )
-        external_wh_df.drop(columns=["Transfer_Quantity", "External_Quantity", "Pkg"], inplace=True)
+        external_wh_df = wh_df[wh_df["External_Quantity"] > 0]
+
+        # 3. 컬럼형 이벤트 프레임
+        inbound_events = make_event_frame(
+            item_id=labels[external_wh_df["Row"].to_numpy()],
+            event_type="external_arrival",
+            from_location=None,
+            to_location=external_wh_df["Warehouse"],
+            event_date=external_wh_df["Inbound_Date"],
+            pkg_quantity=external_wh_df["External_Quantity"].astype(int),
+            locations=self.location_dtype,
+        )
+        transfers_flat["Row_ID"] = labels[transfers_flat["Row"].to_numpy()]
+        return inbound_events, self._transfer_event_frame(transfers_flat)
 
-        # 3. 집계 (벡터화)
-        if external_wh_df.empty:
+    def _inbound_result(self, inbound_events: pd.DataFrame, transfer_events: pd.DataFrame) -> Dict:
+        """입고 이벤트 프레임 → 집계 + list-of-dict 호환 뷰 결과"""
+        quantity = inbound_events["Pkg_Quantity"].astype("int64")
+        if inbound_events.empty:
             by_month_wh = pd.DataFrame(columns=self.warehouse_columns)
         else:
-            by_month_wh = (
-                external_wh_df.groupby(["Year_Month", "Warehouse"])["Pkg_Quantity"].sum()
-                .unstack(fill_value=0)
-            )
-        by_warehouse = by_month_wh.sum(axis=0).to_dict()
-        by_month = by_month_wh.sum(axis=1).to_dict()
-        total_inbound = int(external_wh_df["Pkg_Quantity"].sum())
-
-        # 4. 결과 구성
-        if external_wh_df.empty:
-            inbound_items: List[Dict] = []
-        else:
-            inbound_items = external_wh_df.rename(columns={"Row_ID": "Item_ID"}).to_dict("records")
-
-        for item in inbound_items:
-            if isinstance(item.get("Item_ID"), (int, np.integer)):
-                item["Item_ID"] = int(item["Item_ID"])
-            item["Inbound_Type"] = "external_arrival"
-
-        warehouse_transfers = (
-            transfers_flat.to_dict("records") if not transfers_flat.empty else []
-        )
-
-        logger.info(f" Vectorized 창고 입고 계산 완료: {total_inbound}건")
+            keys = [
+                year_month_text(inbound_events["Year_Month"]),
+                inbound_events["To_Location"].astype(object).to_numpy(),
+            ]
+            by_month_wh = quantity.groupby(keys).sum().unstack(fill_value=0)
 
         return {
-            "total_inbound": total_inbound,
-            "by_warehouse": by_warehouse,
-            "by_month": by_month,
-            "inbound_items": inbound_items,
-            "warehouse_transfers": warehouse_transfers,
+            "total_inbound": int(quantity.sum()),
+            "by_warehouse": by_month_wh.sum(axis=0).to_dict(),
+            "by_month": by_month_wh.sum(axis=1).to_dict(),
+            "inbound_items": EventRecords(inbound_events, INBOUND_LAYOUT),
+            "warehouse_transfers": EventRecords(
+                transfer_events, TRANSFER_LAYOUT, TRANSFER_CONSTANTS
+            ),
         }
 
     def _calculate_warehouse_inbound_parallel(self, df: pd.DataFrame) -> Dict:
-        """병렬 처리된 창고 입고 계산"""
-        logger.info(" Parallel 창고 입고 계산 시작")
-
-        try:
-            from multiprocessing import Pool, cpu_count
-            import numpy as np
-
-            n_cores = min(cpu_count(), 4)  # 최대 4코어로 제한
-            chunks = np.array_split(df, n_cores)
+        """
+        병렬 창고 입고 계산 (케이스 단위 청크, 결과는 벡터화 경로와 동일)
 
-            with Pool(n_cores) as pool:
-                results = pool.starmap(
-                    self._process_chunk_inbound,
-                    [(chunk, self.warehouse_columns) for chunk in chunks],
-                )
+        청크별 이벤트를 합친 뒤 벡터화 경로의 순서(외부 입고: 창고 컬럼 → 행,
+        이동: 행)로 정렬하고 Item_ID를 원본 행 라벨로 되돌립니다.
+        """
+        logger.info(" Parallel 창고 입고 계산 시작")
 
-            # 결과 병합
-            inbound_items = pd.concat([r["inbound_items"] for r in results], ignore_index=True)
-            transfers_flat = pd.concat([r["transfers"] for r in results], ignore_index=True)
+        results = self._run_parallel("inbound", df, _inbound_chunk_task)
+        labels = df.index.to_numpy()
 
-            # 집계
-            by_month_wh = (
-                inbound_items.groupby(["Year_Month", "Warehouse"])["Pkg_Quantity"]
-                .sum()
-                .unstack(fill_value=0)
+        inbound_events = concat_events([result.value[0] for result in results])
+        order = np.lexsort(
+            (
+                inbound_events["Item_ID"].to_numpy(dtype="int64"),
+                inbound_events["To_Location"].cat.codes.to_numpy(),
             )
-            by_warehouse = by_month_wh.sum(axis=0).to_dict()
-            by_month = by_month_wh.sum(axis=1).to_dict()
-            total_inbound = inbound_items["Pkg_Quantity"].sum()
-
-            logger.info(f" Parallel 창고 입고 계산 완료: {total_inbound}건")
-            return {
-                "total_inbound": total_inbound,
-                "by_warehouse": by_warehouse,
-                "by_month": by_month,
-                "inbound_items": inbound_items.to_dict("records"),
-                "warehouse_transfers": transfers_flat.to_dict("records"),
-            }
-
-        except Exception as e:
-            logger.error(f"병렬 처리 실패: {e}, 벡터화로 폴백")
-            return self._calculate_warehouse_inbound_vectorized(df)
-
-    def _process_chunk_inbound(self, chunk_df: pd.DataFrame, warehouse_columns: list) -> dict:
-        """청크 단위 입고 처리"""
-        # 1. 창고 입고 데이터 처리
-        wh_df = chunk_df.melt(
-            id_vars=["Pkg"],
-            value_vars=warehouse_columns,
-            var_name="Warehouse",
-            value_name="Inbound_Date",
-        )
-        wh_df = wh_df[wh_df["Inbound_Date"].notna()]
-        wh_df["Inbound_Date"] = pd.to_datetime(wh_df["Inbound_Date"])
-        wh_df["Year_Month"] = wh_df["Inbound_Date"].dt.strftime("%Y-%m")
-        wh_df["Pkg_Quantity"] = self._get_pkg_quantity_vectorized(wh_df)
-
-        # 2. 창고간 이동 감지
-        transfers_flat = self._vectorized_detect_warehouse_transfers_batch(chunk_df)
-        transfer_dest = (
-            set(transfers_flat["to_warehouse"].unique()) if not transfers_flat.empty else set()
         )
+        inbound_events = relabel_items(inbound_events.iloc[order], labels)
 
-        # 3. 이동 목적지 제외
-        wh_df = wh_df[~wh_df["Warehouse"].isin(transfer_dest)]
+        transfer_events = concat_events([result.value[1] for result in results])
+        order = np.argsort(transfer_events["Item_ID"].to_numpy(dtype="int64"), kind="stable")
+        transfer_events = relabel_items(transfer_events.iloc[order], labels)
 
-        return {"inbound_items": wh_df, "transfers": transfers_flat}
+        result = self._inbound_result(inbound_events, transfer_events)
+        logger.info(f" Parallel 창고 입고 계산 완료: {result['total_inbound']}건")
+        return result
 
     def calculate_warehouse_outbound_corrected(self, df: pd.DataFrame) -> Dict:
         """
@@ -1175,10 +1435,118 @@ class CorrectedWarehouseIOCalculator:
         """벡터화된 창고 출고 계산 (PATCH.MD 전략)"""
         logger.info(" Vectorized 창고 출고 계산 시작")
 
-        # 1. 창고간 이동 출고 처리 (완전 벡터화)
+        result = self._outbound_result(*self._outbound_parts(df))
+
+        logger.info(f" Vectorized 창고 출고 계산 완료: {result['total_outbound']}건")
+        return result
+
+    def _outbound_parts(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+        """
+        출고 구성 요소: (창고간 이동 프레임, 창고→현장 이벤트 프레임 또는 None)
+
+        창고→현장 이벤트는 행 순서이고 Item_ID는 입고/이동 이벤트와 같은 행 라벨입니다.
+        창고 또는 현장 날짜가 하나도 없으면 현장 이벤트는 None입니다.
+        """
+        # 1. 창고간 이동 출고 (완전 벡터화)
         transfers_flat = self._vectorized_detect_warehouse_transfers_batch(df)
 
-        outbound_items = []
+        # 2. 창고→현장 출고: 케이스(행)별로 창고 입고일 다음 날 이후 가장 빠른 현장 이동,
+        #    창고 컬럼 순서상 첫 번째로 매칭되는 창고만 출고 (창고간 이동 창고 제외 없음)
+        matches = self._warehouse_site_matches(df, by_day=True, first_only=True)
+        if matches is None:
+            return transfers_flat, None
+
+        rows = matches["Row"].to_numpy()
+        pkg_quantity = self._get_pkg_quantity_vectorized(df).to_numpy()[rows]
+        site_events = make_event_frame(
+            item_id=df.index.to_numpy(dtype=object)[rows],
+            event_type="warehouse_to_site",
+            from_location=matches["Warehouse"].to_numpy(),
+            to_location=matches["Site"].to_numpy(),
+            event_date=matches["Site_Date"],
+            pkg_quantity=pkg_quantity,
+            locations=self.location_dtype,
+        )
+        return transfers_flat, site_events
+
+    def _warehouse_site_matches(
+        self,
+        df: pd.DataFrame,
+        by_day: bool,
+        first_only: bool,
+        excluded_warehouses=(),
+    ) -> Optional[pd.DataFrame]:
+        """
+        창고→현장 출고 매칭 (정렬 + 행 그룹 searchsorted, O((W + S) log S))
+
+        각 (행, 창고 날짜)에 대해 같은 행의 현장 날짜 중 창고 날짜보다 늦은 가장
+        빠른 현장 이동을 찾습니다. 같은 현장 날짜는 현장 컬럼 순서가 앞선 쪽입니다.
+
+        Args:
+            df: 계산 대상 프레임
+            by_day: True면 달력 날짜로 비교 (동일 날짜 현장 이동 제외),
+                False면 시각까지 비교
+            first_only: 행마다 창고 컬럼 순서상 첫 번째로 매칭되는 창고만 유지
+            excluded_warehouses: 매칭에서 제외할 창고
+
+        Returns:
+            Row(행 위치), Warehouse, Site, Site_Date 컬럼 프레임 (행 → 창고 컬럼 순).
+            창고 날짜나 현장 날짜가 하나도 없으면 None
+        """
+        timeline = self.location_timeline(df)
+        wh_ns = timeline.block(self.warehouse_columns)
+        wh_valid = wh_ns != NAT_INT64
+        # 현장 이동: 타임라인 방문 순서 = (행, 현장 날짜, 현장 컬럼) 순
+        site_rows, site_cols, site_dates = timeline.visits(self.site_columns)
+        if not wh_valid.any() or not len(site_rows):
+            return None
+
+        excluded = [
+            position
+            for position, warehouse in enumerate(self.warehouse_columns)
+            if warehouse in excluded_warehouses
+        ]
+        wh_valid[:, excluded] = False
+
+        wh_rows, wh_cols = np.nonzero(wh_valid)
+        wh_dates = wh_ns[wh_rows, wh_cols]
+
+        # 비교 키 (달력 날짜 또는 시각)를 순위로 압축해 (행, 키) 복합 키로 검색
+        site_keys = np.floor_divide(site_dates, DAY_NS) if by_day else site_dates
+        wh_keys = np.floor_divide(wh_dates, DAY_NS) if by_day else wh_dates
+        uniques, ranks = np.unique(np.concatenate([site_keys, wh_keys]), return_inverse=True)
+        width = len(uniques)
+        site_composite = site_rows * width + ranks[: len(site_keys)]
+        wh_composite = wh_rows * width + ranks[len(site_keys) :]
+
+        positions = np.searchsorted(site_composite, wh_composite, side="right")
+        matched = positions < len(site_composite)
+        matched[matched] = site_rows[positions[matched]] == wh_rows[matched]
+
+        rows = wh_rows[matched]
+        cols = wh_cols[matched]
+        positions = positions[matched]
+        if first_only and len(rows):
+            # np.nonzero는 (행, 창고 컬럼) 순이므로 행별 첫 항목이 첫 번째 창고
+            _, first = np.unique(rows, return_index=True)
+            rows, cols, positions = rows[first], cols[first], positions[first]
+
+        warehouses = np.asarray(self.warehouse_columns, dtype=object)
+        sites = np.asarray(self.site_columns, dtype=object)
+        return pd.DataFrame(
+            {
+                "Row": rows,
+                "Warehouse": warehouses[cols],
+                "Site": sites[site_cols[positions]],
+                "Site_Date": site_dates[positions].view("datetime64[ns]"),
+            }
+        )
+
+    def _outbound_result(
+        self, transfers_flat: pd.DataFrame, site_events: Optional[pd.DataFrame]
+    ) -> Dict:
+        """창고간 이동 프레임 + 창고→현장 이벤트 → 출고 집계 결과"""
+        outbound_events: List[pd.DataFrame] = []
         total_outbound = 0
         by_warehouse = {}
         by_month = {}
@@ -1197,264 +1565,82 @@ class CorrectedWarehouseIOCalculator:
                 by_month[month] = by_month.get(month, 0) + quantity
                 total_outbound += quantity
 
-            # 창고간 이동으로 이미 출고된 창고 추적
-            transferred_warehouses = set(transfers_flat["from_warehouse"].unique())
-        else:
-            transferred_warehouses = set()
-
-        # 2. 창고→현장 출고 처리 (벡터화)
-        # 창고 컬럼과 현장 컬럼을 melt하여 처리
-        # SQM 컬럼이 없으면 Pkg만 사용
-        id_vars = ["Pkg"]
-        if "SQM" in df.columns:
-            id_vars.append("SQM")
-
-        wh_melt = df.melt(
-            id_vars=id_vars,
-            value_vars=self.warehouse_columns,
-            var_name="Warehouse",
-            value_name="wh_date",
-        )
-        site_melt = df.melt(
-            id_vars=id_vars, value_vars=self.site_columns, var_name="Site", value_name="site_date"
-        )
+        # 창고→현장 출고 처리
+        if site_events is not None:
+            outbound_events.append(site_events)
 
-        # 날짜 변환
-        wh_melt["wh_date"] = pd.to_datetime(wh_melt["wh_date"], errors="coerce")
-        site_melt["site_date"] = pd.to_datetime(site_melt["site_date"], errors="coerce")
-
-        # 유효한 데이터만 필터링
-        wh_valid = wh_melt[wh_melt["wh_date"].notna()].copy()
-        site_valid = site_melt[site_melt["site_date"].notna()].copy()
-
-        # 창고간 이동으로 이미 출고된 창고 제외 로직 제거 (너무 광범위하게 적용됨)
-        # wh_valid = wh_valid[~wh_valid["Warehouse"].isin(transferred_warehouses)]
-
-        # 창고-현장 매칭 (오리지널 로직 적용)
-        if not wh_valid.empty and not site_valid.empty:
-            # 창고간 이동으로 이미 출고된 창고 추적 로직 제거 (너무 광범위하게 적용됨)
-            # transferred_from_warehouses = set()
-            # for transfer in transfers_flat.to_dict("records"):
-            #     transferred_from_warehouses.add(transfer["from_warehouse"])
-            
-            warehouse_site_outbound = []
-            
-            # 행별로 그룹화하여 처리
-            for row_idx in wh_valid.index.unique():
-                row_warehouses = wh_valid[wh_valid.index == row_idx]
-                row_sites = site_valid[site_valid.index == row_idx]
-                
-                if not row_warehouses.empty and not row_sites.empty:
-                    # 각 창고에 대해 해당 행의 현장들과 매칭
-                    for _, wh_row in row_warehouses.iterrows():
-                        warehouse = wh_row["Warehouse"]
-                        
-                        # 창고간 이동으로 이미 출고된 창고 제외 로직 제거 (너무 광범위하게 적용됨)
-                        # if warehouse in transferred_from_warehouses:
-                        #     continue
-                        
-                        wh_date = wh_row["wh_date"]
-                        pkg_quantity = wh_row["Pkg"] if pd.notna(wh_row["Pkg"]) else 1
-                        pkg_quantity = max(1, int(pkg_quantity))
-                        
-                        # 수정된 로직: 창고 입고일 이후 모든 현장 이동 인정
-                        next_site_movements = []
-                        for _, site_row in row_sites.iterrows():
-                            site_date = site_row["site_date"]
-                            # 창고 입고일 이후 현장 이동 (동일 날짜 제외)
-                            if site_date.date() > wh_date.date():
-                                next_site_movements.append((site_row["Site"], site_date))
-                        
-                        # 가장 빠른 현장 이동을 출고로 계산
-                        if next_site_movements:
-                            next_site, next_date = min(next_site_movements, key=lambda x: x[1])
-                            
-                            warehouse_site_outbound.append({
-                                "Item_ID": row_idx,
-                                "From_Location": warehouse,
-                                "To_Location": next_site,
-                                "Outbound_Date": next_date,
-                                "Year_Month": next_date.strftime("%Y-%m"),
-                                "Pkg_Quantity": pkg_quantity,
-                                "Outbound_Type": "warehouse_to_site",
-                            })
-                            
-                            # 중복 출고 방지를 위해 break 추가 (오리지널 로직)
-                            break
-            
-            # 결과를 outbound_items에 추가
-            outbound_items.extend(warehouse_site_outbound)
-            
             # 집계 업데이트
-            for item in warehouse_site_outbound:
-                warehouse = item["From_Location"]
-                month = item["Year_Month"]
-                quantity = item["Pkg_Quantity"]
-                
-                by_warehouse[warehouse] = by_warehouse.get(warehouse, 0) + quantity
-                by_month[month] = by_month.get(month, 0) + quantity
-                total_outbound += quantity
+            quantity = site_events["Pkg_Quantity"].astype("int64")
+            for warehouse, total in (
+                quantity.groupby(site_events["From_Location"], observed=True, sort=False)
+                .sum()
+                .items()
+            ):
+                by_warehouse[warehouse] = by_warehouse.get(warehouse, 0) + total
+            for month, total in (
+                quantity.groupby(year_month_text(site_events["Year_Month"]), sort=False)
+                .sum()
+                .items()
+            ):
+                by_month[month] = by_month.get(month, 0) + total
+            total_outbound += quantity.sum()
 
-        # 창고간 이동 아이템 추가
+        # 창고간 이동 아이템 추가 (Item_ID는 기존과 같이 이동 목록 순번)
         if not transfers_flat.empty:
-            for _, transfer in transfers_flat.iterrows():
-                outbound_items.append(
-                    {
-                        "Item_ID": transfer.name,
-                        "From_Location": transfer["from_warehouse"],
-                        "To_Location": transfer["to_warehouse"],
-                        "Outbound_Date": transfer["transfer_date"],
-                        "Year_Month": transfer["Year_Month"],
-                        "Pkg_Quantity": transfer["Pkg_Quantity"],
-                        "Outbound_Type": "warehouse_transfer",
-                    }
-                )
-
-        logger.info(f" Vectorized 창고 출고 계산 완료: {total_outbound}건")
+            outbound_events.append(
+                self._transfer_event_frame(transfers_flat.assign(Row_ID=transfers_flat.index))
+            )
 
         return {
             "total_outbound": total_outbound,
             "by_warehouse": by_warehouse,
             "by_month": by_month,
-            "outbound_items": outbound_items,
+            "outbound_items": EventRecords(concat_events(outbound_events), OUTBOUND_LAYOUT),
         }
 
     def _calculate_warehouse_outbound_parallel(self, df: pd.DataFrame) -> Dict:
-        """병렬 처리된 창고 출고 계산"""
-        logger.info(" Parallel 창고 출고 계산 시작")
-
-        try:
-            from multiprocessing import Pool, cpu_count
-            import numpy as np
+        """
+        병렬 창고 출고 계산 (케이스 단위 청크, 결과는 벡터화 경로와 동일)
 
-            n_cores = min(cpu_count(), 4)  # 최대 4코어로 제한
-            chunks = np.array_split(df, n_cores)
+        창고간 이동은 (이동 쌍, 행) 순으로, 창고→현장 이벤트는 행 순으로 정렬하고
+        Item_ID를 원본 행 라벨로 되돌린 뒤 벡터화 경로와 같은 집계를 수행합니다.
+        """
+        logger.info(" Parallel 창고 출고 계산 시작")
 
-            with Pool(n_cores) as pool:
-                results = pool.starmap(
-                    self._process_chunk_outbound,
-                    [(chunk, self.warehouse_columns, self.site_columns) for chunk in chunks],
+        results = self._run_parallel("outbound", df, _outbound_chunk_task)
+
+        transfer_frames = [result.value[0] for result in results]
+        non_empty = [frame for frame in transfer_frames if not frame.empty]
+        if non_empty:
+            transfers_flat = pd.concat(non_empty, ignore_index=True)
+            pair_rank = {pair: rank for rank, pair in enumerate(WAREHOUSE_TRANSFER_PAIRS)}
+            pairs = zip(transfers_flat["from_warehouse"], transfers_flat["to_warehouse"])
+            order = np.lexsort(
+                (
+                    transfers_flat["Row_ID"].to_numpy(dtype="int64"),
+                    np.array([pair_rank[pair] for pair in pairs]),
                 )
-
-            # 결과 병합
-            outbound_items = pd.concat([r["outbound_items"] for r in results], ignore_index=True)
-
-            # 집계
-            by_month_wh = (
-                outbound_items.groupby(["Year_Month", "From_Location"])["Pkg_Quantity"]
-                .sum()
-                .unstack(fill_value=0)
-            )
-            by_warehouse = by_month_wh.sum(axis=0).to_dict()
-            by_month = by_month_wh.sum(axis=1).to_dict()
-            total_outbound = outbound_items["Pkg_Quantity"].sum()
-
-            logger.info(f" Parallel 창고 출고 계산 완료: {total_outbound}건")
-            return {
-                "total_outbound": total_outbound,
-                "by_warehouse": by_warehouse,
-                "by_month": by_month,
-                "outbound_items": outbound_items.to_dict("records"),
-            }
-
-        except Exception as e:
-            logger.error(f"병렬 처리 실패: {e}, 벡터화로 폴백")
-            return self._calculate_warehouse_outbound_vectorized(df)
-
-    def _process_chunk_outbound(
-        self, chunk_df: pd.DataFrame, warehouse_columns: list, site_columns: list
-    ) -> dict:
-        """청크 단위 출고 처리"""
-        # 1. 창고간 이동 감지
-        transfers_flat = self._vectorized_detect_warehouse_transfers_batch(chunk_df)
-        if not transfers_flat.empty:
-            transfers_flat["Outbound_Type"] = "warehouse_transfer"
-            transfers_flat.rename(
-                columns={
-                    "from_warehouse": "From_Location",
-                    "to_warehouse": "To_Location",
-                    "transfer_date": "Outbound_Date",
-                },
-                inplace=True,
             )
-            transfers_flat["Year_Month"] = transfers_flat["Outbound_Date"].dt.strftime("%Y-%m")
-            transfers_flat["Pkg_Quantity"] = self._get_pkg_quantity_vectorized(transfers_flat)
-        else:
-            transfers_flat = pd.DataFrame(
-                columns=[
-                    "From_Location",
-                    "To_Location",
-                    "Outbound_Date",
-                    "Year_Month",
-                    "Pkg_Quantity",
-                    "Outbound_Type",
-                ]
-            )
-
-        # 2. 창고→현장 이동 처리
-        # SQM 컬럼이 없으면 Pkg만 사용
-        id_vars = ["Pkg"]
-        if "SQM" in chunk_df.columns:
-            id_vars.append("SQM")
-
-        wh_melt = chunk_df.melt(
-            id_vars=id_vars,
-            value_vars=warehouse_columns,
-            var_name="Warehouse",
-            value_name="warehouse_date",
-        )
-        site_melt = chunk_df.melt(
-            id_vars=id_vars, value_vars=site_columns, var_name="Site", value_name="site_date"
-        )
-
-        merged = wh_melt.merge(
-            site_melt, left_index=True, right_index=True, suffixes=("_wh", "_site")
-        )
-        merged = merged[(merged["warehouse_date"].notna()) & (merged["site_date"].notna())]
-        merged["warehouse_date"] = pd.to_datetime(merged["warehouse_date"])
-        merged["site_date"] = pd.to_datetime(merged["site_date"])
-
-        # 다음 날 이동만 출고로 인정
-        next_day_mask = (
-            merged["site_date"].dt.date == (merged["warehouse_date"] + pd.Timedelta(days=1)).dt.date
-        )
-        outbound_site = merged[next_day_mask].copy()
-
-        if not outbound_site.empty:
-            outbound_site["Year_Month"] = outbound_site["site_date"].dt.strftime("%Y-%m")
-            outbound_site["Outbound_Type"] = "warehouse_to_site"
-            outbound_site["From_Location"] = outbound_site["Warehouse"]
-            outbound_site["To_Location"] = outbound_site["Site"]
-            outbound_site["Outbound_Date"] = outbound_site["site_date"]
-            outbound_site["Pkg_Quantity"] = self._get_pkg_quantity_vectorized(outbound_site)
-
-            # 필요한 컬럼만 선택
-            outbound_site = outbound_site[
-                [
-                    "From_Location",
-                    "To_Location",
-                    "Outbound_Date",
-                    "Year_Month",
-                    "Pkg_Quantity",
-                    "Outbound_Type",
-                ]
+            transfers_flat = transfers_flat.iloc[order].reset_index(drop=True)
+            labels = df.index.to_numpy()[transfers_flat["Row_ID"].to_numpy(dtype="int64")]
+            transfers_flat["Row_ID"] = [
+                int(value) if isinstance(value, (int, np.integer)) else value for value in labels
             ]
         else:
-            outbound_site = pd.DataFrame(
-                columns=[
-                    "From_Location",
-                    "To_Location",
-                    "Outbound_Date",
-                    "Year_Month",
-                    "Pkg_Quantity",
-                    "Outbound_Type",
-                ]
-            )
-
-        # 3. 결과 병합
-        outbound_items = pd.concat([transfers_flat, outbound_site], ignore_index=True)
-
-        return {"outbound_items": outbound_items}
+            transfers_flat = transfer_frames[0] if transfer_frames else pd.DataFrame()
+
+        # 청크 프레임의 행 라벨은 전체 프레임 행 위치 (케이스마다 행은 한 청크에만 있음)
+        site_frames = [result.value[1] for result in results if result.value[1] is not None]
+        site_events = None
+        if site_frames:
+            site_events = concat_events(site_frames)
+            order = np.argsort(site_events["Item_ID"].to_numpy(dtype="int64"), kind="stable")
+            site_events = relabel_items(site_events.iloc[order], df.index.to_numpy())
+            site_events = site_events.reset_index(drop=True)
+
+        result = self._outbound_result(transfers_flat, site_events)
+        logger.info(f" Parallel 창고 출고 계산 완료: {result['total_outbound']}건")
+        return result
 
     def calculate_warehouse_inventory_corrected(self, df: pd.DataFrame) -> Dict:
         """
@@ -1565,17 +1751,7 @@ class CorrectedWarehouseIOCalculator:
         transfers = []
 
         # 주요 창고간 이동 패턴들
-        warehouse_pairs = [
-            ("DSV Indoor", "DSV Al Markaz"),
-            ("DSV Indoor", "DSV Outdoor"),
-            ("DSV Al Markaz", "DSV Outdoor"),
-            ("AAA Storage", "DSV Al Markaz"),
-            ("AAA Storage", "DSV Indoor"),
-            ("DSV Indoor", "MOSB"),
-            ("DSV Al Markaz", "MOSB"),
-        ]
-
-        for from_wh, to_wh in warehouse_pairs:
+        for from_wh, to_wh in WAREHOUSE_TRANSFER_PAIRS:
             from_date = pd.to_datetime(row.get(from_wh), errors="coerce")
             to_date = pd.to_datetime(row.get(to_wh), errors="coerce")
 
@@ -1601,87 +1777,91 @@ class CorrectedWarehouseIOCalculator:
 
         return transfers
 
-    def _vectorized_detect_warehouse_transfers_batch(self, df: pd.DataFrame) -> pd.DataFrame:
-        """완전 벡터화된 창고간 이동 감지 (v4.1 전략)"""
-        logger.info(" Vectorized 창고간 이동 감지 시작")
+    def _transfer_positions(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        창고간 이동 감지 (분석 컨텍스트당 1회, _detect_warehouse_transfers와 같은 규칙)
 
-        transfers_list = []
-        warehouse_pairs = [
-            ("DSV Indoor", "DSV Al Markaz"),
-            ("DSV Indoor", "DSV Outdoor"),
-            ("DSV Al Markaz", "DSV Outdoor"),
-            ("AAA Storage", "DSV Al Markaz"),
-            ("AAA Storage", "DSV Indoor"),
-            ("DSV Indoor", "MOSB"),
-            ("DSV Al Markaz", "MOSB"),
-        ]
+        Returns:
+            Row(행 위치), Pair(WAREHOUSE_TRANSFER_PAIRS 순번), from_warehouse,
+            to_warehouse, transfer_date 프레임 - (이동 쌍, 행) 순. 공유 결과이므로
+            수정하지 말고 복사해서 사용합니다.
+        """
+        context = self.analysis_context(df)
+        if context.transfers is None:
+            timeline = context.timeline
+            rows, pairs = [], []
+            for pair, (from_wh, to_wh) in enumerate(WAREHOUSE_TRANSFER_PAIRS):
+                if not self._validate_transfer_logic(from_wh, to_wh, None, None):
+                    continue
+                from_day, to_day = timeline.block([from_wh, to_wh], days=True).T
+                # 동일 날짜 이동 (시각은 달라도 됨)
+                matched = np.flatnonzero((from_day != NAT_INT64) & (from_day == to_day))
+                rows.append(matched)
+                pairs.append(np.full(len(matched), pair))
+            rows = np.concatenate(rows) if rows else np.array([], dtype="int64")
+            pairs = np.concatenate(pairs) if pairs else np.array([], dtype="int64")
+            pair_names = np.asarray(WAREHOUSE_TRANSFER_PAIRS, dtype=object)
+            from_positions = [timeline.position(name) for name in pair_names[:, 0]]
+            context.transfers = pd.DataFrame(
+                {
+                    "Row": rows.astype("int64"),
+                    "Pair": pairs.astype("int64"),
+                    "from_warehouse": pair_names[pairs, 0],
+                    "to_warehouse": pair_names[pairs, 1],
+                    "transfer_date": timeline.ns[
+                        rows, np.asarray(from_positions, dtype="int64")[pairs]
+                    ].view("datetime64[ns]"),
+                }
+            )
+        return context.transfers
 
-        for from_wh, to_wh in warehouse_pairs:
-            if from_wh in df.columns and to_wh in df.columns:
-                # 벡터화된 날짜 변환
-                from_date = pd.to_datetime(df[from_wh], errors="coerce")
-                to_date = pd.to_datetime(df[to_wh], errors="coerce")
+    def _vectorized_detect_warehouse_transfers_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """완전 벡터화된 창고간 이동 감지 (v4.1 전략, 분석 컨텍스트의 감지 결과 재사용)"""
+        logger.info(" Vectorized 창고간 이동 감지 시작")
 
-                # 동일 날짜 이동 마스크
-                same_date_mask = (
-                    from_date.notna() & to_date.notna() & (from_date.dt.date == to_date.dt.date)
-                )
-
-                if same_date_mask.any():
-                    # 유효한 이동만 필터링
-                    valid_mask = same_date_mask & self._validate_transfer_logic_vectorized(
-                        from_wh, to_wh, from_date, to_date, df
-                    )
-
-                    if valid_mask.any():
-                        # 이동 데이터 생성
-                        transfer_df = df[valid_mask].copy()
-                        transfer_df["Row_ID"] = transfer_df.index
-                        transfer_df["from_warehouse"] = from_wh
-                        transfer_df["to_warehouse"] = to_wh
-                        transfer_df["transfer_date"] = from_date[valid_mask]
-                        transfer_df["pkg_quantity"] = self._get_pkg_quantity_vectorized(transfer_df)
-                        transfer_df["transfer_type"] = "warehouse_to_warehouse"
-                        transfer_df["Year_Month"] = transfer_df["transfer_date"].dt.strftime(
-                            "%Y-%m"
-                        )
-
-                        transfers_list.append(
-                            transfer_df[
-                                [
-                                    "Row_ID",
-                                    "from_warehouse",
-                                    "to_warehouse",
-                                    "transfer_date",
-                                    "pkg_quantity",
-                                    "transfer_type",
-                                    "Year_Month",
-                                ]
-                            ]
-                        )
+        positions = self._transfer_positions(df)
+        rows = positions["Row"].to_numpy()
+        labels = df.index.to_numpy(dtype=object)[rows]
+        pkg_quantity = self._get_pkg_quantity_vectorized(df).to_numpy()[rows] if len(rows) else []
+        result = pd.DataFrame(
+            {
+                "Row_ID": [
+                    int(value) if isinstance(value, (int, np.integer)) else value
+                    for value in labels
+                ],
+                "from_warehouse": positions["from_warehouse"].to_numpy(),
+                "to_warehouse": positions["to_warehouse"].to_numpy(),
+                "transfer_date": positions["transfer_date"].to_numpy(),
+                "pkg_quantity": pkg_quantity,
+                "transfer_type": "warehouse_to_warehouse",
+                "Year_Month": positions["transfer_date"].dt.strftime("%Y-%m").to_numpy(),
+            },
+            columns=[
+                "Row_ID",
+                "from_warehouse",
+                "to_warehouse",
+                "transfer_date",
+                "pkg_quantity",
+                "transfer_type",
+                "Year_Month",
+            ],
+        )
+        logger.info(f" Vectorized 창고간 이동 감지 완료: {len(result)}건")
+        return result
 
-        if transfers_list:
-            result = pd.concat(transfers_list, ignore_index=True)
-            logger.info(f" Vectorized 창고간 이동 감지 완료: {len(result)}건")
-            result["Row_ID"] = result["Row_ID"].apply(
-                lambda value: int(value)
-                if isinstance(value, (int, np.integer))
-                else value
-            )
-            return result
-        else:
-            logger.info(" Vectorized 창고간 이동 감지 완료: 0건")
-            return pd.DataFrame(
-                columns=[
-                    "Row_ID",
-                    "from_warehouse",
-                    "to_warehouse",
-                    "transfer_date",
-                    "pkg_quantity",
-                    "transfer_type",
-                    "Year_Month",
-                ]
-            )
+    def _transfer_event_frame(self, transfers_flat: pd.DataFrame) -> pd.DataFrame:
+        """창고간 이동 프레임(Row_ID, from/to_warehouse, ...) → 이벤트 프레임"""
+        if transfers_flat.empty:
+            return empty_event_frame(self.location_dtype)
+        return make_event_frame(
+            item_id=transfers_flat["Row_ID"],
+            event_type="warehouse_transfer",
+            from_location=transfers_flat["from_warehouse"],
+            to_location=transfers_flat["to_warehouse"],
+            event_date=transfers_flat["transfer_date"],
+            pkg_quantity=transfers_flat["pkg_quantity"],
+            locations=self.location_dtype,
+        )
 
     def _validate_transfer_logic_vectorized(self, from_wh, to_wh, from_date, to_date, df):
         """벡터화된 이동 로직 검증"""
@@ -1756,6 +1936,53 @@ class CorrectedWarehouseIOCalculator:
 
         return latest_locations[0]
 
+    def calculate_final_locations_at_dates(self, df: pd.DataFrame, snapshot_dates) -> pd.DataFrame:
+        """
+        여러 시점의 위치를 한 번에 계산 (_calculate_final_location_at_date 배치 버전)
+
+        케이스별 방문 이력을 (케이스, 날짜, 우선순위) 순으로 한 번 정렬한 뒤,
+        모든 (케이스, 시점) 조회를 searchsorted 한 번으로 처리합니다.
+        시점 이하의 가장 최근 방문 위치를 고르고, 동일 날짜면 location_priority가
+        높은(숫자가 작은) 위치를 고릅니다. 방문이 없으면 "Unknown".
+
+        Args:
+            df: 창고/현장 날짜 컬럼이 있는 케이스 프레임
+            snapshot_dates: 조회 시점 목록 (예: 월말 날짜)
+
+        Returns:
+            pd.DataFrame: index=df.index, columns=시점(DatetimeIndex), 값=위치
+        """
+        targets = pd.DatetimeIndex(pd.to_datetime(list(snapshot_dates))).astype("datetime64[ns]")
+        n_cases = len(df)
+        result = np.full((n_cases, len(targets)), "Unknown", dtype=object)
+
+        locations, values = self._priority_date_block(df)
+        case, rank = np.nonzero(values != NAT_INT64)
+        if len(case) and len(targets):
+            dates = values[case, rank]
+            target_ns = targets.asi8
+
+            # 방문/시점 날짜를 공통 순번으로 압축해 (케이스, 날짜)를 단일 정렬 키로 사용
+            timeline = np.unique(np.concatenate([dates, target_ns]))
+            span = len(timeline) + 1
+            date_pos = np.searchsorted(timeline, dates)
+
+            # 같은 케이스·같은 날짜 안에서는 우선순위가 높은 위치가 마지막에 오도록 정렬
+            order = np.lexsort((-rank, date_pos, case))
+            keys = case[order] * span + date_pos[order]
+            visit_case = case[order]
+            visit_location = locations[rank[order]]
+
+            target_pos = np.searchsorted(timeline, target_ns)
+            queries = np.arange(n_cases)[:, None] * span + target_pos[None, :]
+            hit = np.searchsorted(keys, queries, side="right") - 1
+            hit_index = np.clip(hit, 0, None)
+            found = (hit >= 0) & (visit_case[hit_index] == np.arange(n_cases)[:, None])
+            found &= ~np.isnat(targets.to_numpy())[None, :]
+            result = np.where(found, visit_location[hit_index], "Unknown").astype(object)
+
+        return pd.DataFrame(result, index=df.index, columns=targets)
+
     def validate_io_consistency(
         self, inbound_result: Dict, outbound_result: Dict, inventory_result: Dict
     ) -> Dict:
@@ -1814,6 +2041,58 @@ class CorrectedWarehouseIOCalculator:
 
     def calculate_direct_delivery(self, df: pd.DataFrame) -> Dict:
         """직접 배송 계산 (Port → Site)"""
+        if not self.use_vectorized:
+            return self._calculate_direct_delivery_legacy(df)
+
+        logger.info(" Vectorized 직접 배송 계산 시작")
+
+        # Flow Code가 1인 경우 (Port → Site)
+        if "FLOW_CODE" in df.columns:
+            direct_mask = (df["FLOW_CODE"] == 1).to_numpy(dtype=bool)
+        else:
+            direct_mask = np.zeros(len(df), dtype=bool)
+        direct_rows = df[direct_mask]
+        sites = [site for site in self.site_columns if site in direct_rows.columns]
+        pkg_quantity = _get_pkg_series(direct_rows).to_numpy()
+        site_block = self.location_timeline(df).block(sites)[direct_mask]
+
+        # 현장 컬럼을 길게 펼친 뒤 날짜가 유효한 셀만 (행 순서 → 현장 순서)
+        positions, site_names, dates = [], [], []
+        for column, site in enumerate(sites):
+            site_dates = site_block[:, column].view("datetime64[ns]")
+            valid = np.flatnonzero(~np.isnat(site_dates))
+            positions.append(valid)
+            site_names.append(np.full(len(valid), site, dtype=object))
+            dates.append(site_dates[valid])
+        if positions:
+            positions = np.concatenate(positions)
+            order = np.argsort(positions, kind="stable")
+            positions = positions[order]
+            site_names = np.concatenate(site_names)[order]
+            dates = np.concatenate(dates)[order]
+        else:
+            positions = np.array([], dtype="int64")
+
+        direct_events = make_event_frame(
+            item_id=direct_rows.index.to_numpy(dtype=object)[positions],
+            event_type="direct_delivery",
+            from_location=None,
+            to_location=site_names,
+            event_date=dates,
+            pkg_quantity=pkg_quantity[positions],
+            locations=self.location_dtype,
+        )
+        total_direct = int(pkg_quantity[positions].sum())
+
+        logger.info(f" Vectorized 직접 배송 계산 완료: {total_direct}건")
+
+        return {
+            "total_direct_delivery": total_direct,
+            "direct_deliveries": EventRecords(direct_events, DIRECT_LAYOUT),
+        }
+
+    def _calculate_direct_delivery_legacy(self, df: pd.DataFrame) -> Dict:
+        """기존 iterrows 방식 (레거시)"""
         logger.info(" 직접 배송 계산 시작")
 
         direct_deliveries = []
@@ -1854,6 +2133,47 @@ class CorrectedWarehouseIOCalculator:
 
     def create_monthly_inbound_pivot(self, df: pd.DataFrame) -> pd.DataFrame:
         """월별 입고 피벗 테이블 생성"""
+        if not self.use_vectorized:
+            return self._create_monthly_inbound_pivot_legacy(df)
+
+        logger.info(" 월별 입고 피벗 테이블 생성 시작 (melt + pivot_table)")
+
+        # 월별 기간 생성 (현재 월까지 동적 계산)
+        end_month = datetime.now().strftime("%Y-%m")
+        months = pd.date_range("2023-02", end_month, freq="MS")
+        month_strings = [month.strftime("%Y-%m") for month in months]
+
+        # 창고 + 현장 날짜 블록(분석 컨텍스트 공유)을 월 단위 Period로 변환
+        locations = self.warehouse_columns + self.site_columns
+        dates = self.location_timeline(df).block(locations).view("datetime64[ns]")
+        periods = pd.DataFrame(
+            {
+                location: pd.DatetimeIndex(dates[:, position]).to_period("M")
+                for position, location in enumerate(locations)
+            },
+            index=df.index,
+        )
+        periods["Pkg"] = df["Pkg"]
+
+        long_df = periods.melt(
+            id_vars="Pkg", value_vars=locations, var_name="Location", value_name="Month"
+        ).dropna(subset=["Month"])
+        pivot = long_df.pivot_table(
+            index="Month", columns="Location", values="Pkg", aggfunc="sum", fill_value=0
+        )
+        pivot.index = pivot.index.strftime("%Y-%m")
+        pivot = pivot.reindex(index=month_strings, columns=locations, fill_value=0)
+
+        pivot_df = pivot.astype("int64").add_suffix("_Inbound")
+        pivot_df.insert(0, "Year_Month", month_strings)
+        pivot_df = pivot_df.reset_index(drop=True)
+        pivot_df.columns.name = None
+        logger.info(f" 월별 입고 피벗 테이블 완료: {pivot_df.shape}")
+
+        return pivot_df
+
+    def _create_monthly_inbound_pivot_legacy(self, df: pd.DataFrame) -> pd.DataFrame:
+        """기존 월 × 위치 strftime 비교 방식 (레거시)"""
         logger.info(" 월별 입고 피벗 테이블 생성 시작")
 
         # 월별 기간 생성 (현재 월까지 동적 계산)
@@ -1896,29 +2216,70 @@ class CorrectedWarehouseIOCalculator:
         # Status_Location이 있으면 우선 사용
         if "Status_Location" in df.columns:
             df["Final_Location"] = df["Status_Location"].fillna("Unknown")
+        elif self.use_vectorized:
+            # Status_Location이 없으면 날짜 블록에서 가장 최근 위치 (동일 날짜면 우선순위)
+            df["Final_Location"] = self._latest_locations(df)
         else:
-            # Status_Location이 없으면 가장 최근 위치로 계산
-            df["Final_Location"] = "Unknown"
+            self._calculate_final_location_legacy(df)
 
-            for idx, row in df.iterrows():
-                all_locations = self.warehouse_columns + self.site_columns
-                valid_locations = []
+        logger.info(" 최종 위치 계산 완료")
+        return df
 
-                for location in all_locations:
-                    if location in row.index and pd.notna(row[location]):
-                        try:
-                            location_date = pd.to_datetime(row[location])
-                            valid_locations.append((location, location_date))
-                        except:
-                            continue
+    def _latest_locations(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        행별 가장 최근 날짜의 위치 (벡터화)
 
-                if valid_locations:
-                    # 가장 최근 날짜의 위치
-                    latest_location = max(valid_locations, key=lambda x: x[1])[0]
-                    df.at[idx, "Final_Location"] = latest_location
+        위치 컬럼을 location_priority 순으로 정렬한 날짜 블록에서 argmax(idxmax)로
+        첫 최대값을 고르므로, 동일 날짜면 우선순위가 높은(숫자가 작은) 위치가 선택됩니다.
+        날짜가 하나도 없으면 "Unknown".
+        """
+        locations, values = self._priority_date_block(df)
+        if not len(locations):
+            return np.full(len(df), "Unknown", dtype=object)
 
-        logger.info(" 최종 위치 계산 완료")
-        return df
+        # NaT는 int64 최솟값이므로 argmax가 유효한 최대 날짜의 첫 컬럼을 선택
+        has_date = (values != NAT_INT64).any(axis=1)
+        latest = locations[values.argmax(axis=1)]
+        return np.where(has_date, latest, "Unknown").astype(object)
+
+    def _priority_date_block(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        location_priority 순(동일 우선순위는 컬럼 순서)으로 정렬한 위치 이름과
+        행 × 위치 날짜 블록(int64 ns, 결측/변환 실패는 NAT_INT64)
+        """
+        all_locations = self.warehouse_columns + self.site_columns
+        locations = sorted(
+            (location for location in all_locations if location in df.columns),
+            key=lambda location: self.location_priority.get(location, 99),
+        )
+        if not locations:
+            return np.asarray([], dtype=object), np.empty((len(df), 0), dtype="int64")
+        values = self.location_timeline(df).block(locations)
+        return np.asarray(locations, dtype=object), values
+
+    def _calculate_final_location_legacy(self, df: pd.DataFrame) -> None:
+        """기존 iterrows 방식 (레거시)"""
+        df["Final_Location"] = "Unknown"
+
+        for idx, row in df.iterrows():
+            all_locations = self.warehouse_columns + self.site_columns
+            valid_locations = []
+
+            for location in all_locations:
+                if location in row.index and pd.notna(row[location]):
+                    try:
+                        location_date = pd.to_datetime(row[location])
+                        valid_locations.append((location, location_date))
+                    except:
+                        continue
+
+            if valid_locations:
+                # 가장 최근 날짜의 위치 (동일 날짜면 우선순위로 결정)
+                latest_location = max(
+                    valid_locations,
+                    key=lambda x: (x[1], -self.location_priority.get(x[0], 99)),
+                )[0]
+                df.at[idx, "Final_Location"] = latest_location
 
     def calculate_monthly_sqm_inbound(self, df: pd.DataFrame) -> Dict:
         """월별 SQM 입고 계산"""
@@ -1962,26 +2323,23 @@ class CorrectedWarehouseIOCalculator:
         """벡터화된 월별 SQM 입고 계산 (PATCH.MD 전략)"""
         logger.info(" Vectorized 월별 SQM 입고 계산 시작")
 
-        # 1. 창고 컬럼을 melt하여 벡터화 처리
+        # 1. 창고 날짜 블록(분석 컨텍스트 공유)에서 유효한 셀 (창고 컬럼 → 행 순)
         # SQM 컬럼이 없으면 Pkg만 사용
         id_vars = ["Pkg"]
         if "SQM" in df.columns:
             id_vars.append("SQM")
 
-        wh_df = df.melt(
-            id_vars=id_vars,
-            value_vars=self.warehouse_columns,
-            var_name="Warehouse",
-            value_name="Inbound_Date",
+        wh_ns = self.location_timeline(df).block(self.warehouse_columns)
+        wh_cols, wh_rows = np.nonzero(wh_ns.T != NAT_INT64)
+        wh_df = pd.DataFrame(
+            {
+                "Warehouse": np.asarray(self.warehouse_columns, dtype=object)[wh_cols],
+                "Inbound_Date": wh_ns[wh_rows, wh_cols].view("datetime64[ns]"),
+            }
         )
 
-        # 유효한 데이터만 필터링
-        wh_df = wh_df[wh_df["Inbound_Date"].notna()].copy()
-        wh_df["Inbound_Date"] = pd.to_datetime(wh_df["Inbound_Date"], errors="coerce")
-        wh_df = wh_df[wh_df["Inbound_Date"].notna()]
-
-        # SQM 값 계산 (벡터화)
-        wh_df["SQM_Value"] = wh_df.apply(lambda row: _get_sqm(row), axis=1)
+        # SQM 값 계산 (벡터화, 행별 1회)
+        wh_df["SQM_Value"] = _get_sqm_series(df[id_vars]).to_numpy()[wh_rows]
         wh_df["Year_Month"] = wh_df["Inbound_Date"].dt.strftime("%Y-%m")
 
         # 2. 월별·창고별 집계 (벡터화)
@@ -2075,23 +2433,30 @@ class CorrectedWarehouseIOCalculator:
         """벡터화된 월별 SQM 출고 계산 (PATCH.MD 전략)"""
         logger.info(" Vectorized 월별 SQM 출고 계산 시작")
 
-        # 1. 창고간 이동 출고 처리 (완전 벡터화)
-        transfers_flat = self._vectorized_detect_warehouse_transfers_batch(df)
+        monthly_sqm_outbound, transferred_warehouses = self._sqm_transfer_outbound(df)
+        matches = self._sqm_site_outbound_matches(df, transferred_warehouses)
+        self._add_sqm_site_outbound(monthly_sqm_outbound, df, matches)
+
+        logger.info(f" Vectorized 월별 SQM 출고 계산 완료")
+        return monthly_sqm_outbound
+
+    def _sqm_transfer_outbound(self, df: pd.DataFrame) -> Tuple[Dict, set]:
+        """창고간 이동 SQM 출고 → ({월: {창고: SQM}}, 이동 출발 창고 집합)"""
+        # 1. 창고간 이동 출고 처리 (분석 컨텍스트 공유)
+        positions = self._transfer_positions(df)
 
         monthly_sqm_outbound = {}
 
         # 창고간 이동 출고 처리
-        if not transfers_flat.empty:
-            transfers_flat["Year_Month"] = transfers_flat["transfer_date"].dt.strftime("%Y-%m")
-            # SQM 값 계산을 위해 원본 행에 접근
-            sqm_values = []
-            for idx in transfers_flat.index:
-                try:
-                    sqm_val = _get_sqm(df.iloc[idx])
-                    sqm_values.append(sqm_val)
-                except:
-                    sqm_values.append(0)
-            transfers_flat["SQM_Value"] = sqm_values
+        if not positions.empty:
+            # SQM 값은 이동이 감지된 원본 행에서 조회
+            transfers_flat = pd.DataFrame(
+                {
+                    "from_warehouse": positions["from_warehouse"],
+                    "Year_Month": positions["transfer_date"].dt.strftime("%Y-%m"),
+                    "SQM_Value": _get_sqm_series(df).to_numpy()[positions["Row"].to_numpy()],
+                }
+            )
 
             # 집계 (벡터화)
             transfer_grouped = transfers_flat.groupby(["from_warehouse", "Year_Month"])[
@@ -2107,119 +2472,81 @@ class CorrectedWarehouseIOCalculator:
         else:
             transferred_warehouses = set()
 
-        # 2. 창고→현장 출고 처리 (벡터화)
-        # 창고 컬럼과 현장 컬럼을 melt하여 처리
-        # SQM 컬럼이 없으면 Pkg만 사용
-        id_vars = ["Pkg"]
-        if "SQM" in df.columns:
-            id_vars.append("SQM")
-
-        wh_melt = df.melt(
-            id_vars=id_vars,
-            value_vars=self.warehouse_columns,
-            var_name="Warehouse",
-            value_name="wh_date",
-        )
-        site_melt = df.melt(
-            id_vars=id_vars,
-            value_vars=self.site_columns,
-            var_name="Site",
-            value_name="site_date",
-        )
-
-        # 날짜 변환
-        wh_melt["wh_date"] = pd.to_datetime(wh_melt["wh_date"], errors="coerce")
-        site_melt["site_date"] = pd.to_datetime(site_melt["site_date"], errors="coerce")
-
-        # 유효한 데이터만 필터링
-        wh_valid = wh_melt[wh_melt["wh_date"].notna()].copy()
-        site_valid = site_melt[site_melt["site_date"].notna()].copy()
-
-        # 창고간 이동으로 이미 출고된 창고 제외
-        wh_valid = wh_valid[~wh_valid["Warehouse"].isin(transferred_warehouses)]
-
-        # 창고-현장 매칭 (다음 날 이동만)
-        if not wh_valid.empty and not site_valid.empty:
-            # 각 행별로 창고-현장 매칭
-            for idx, wh_row in wh_valid.iterrows():
-                # 해당 행의 현장 이동 찾기
-                row_sites = site_valid[site_valid.index == wh_row.name]
-                next_sites = row_sites[row_sites["site_date"] > wh_row["wh_date"]]
-
-                if not next_sites.empty:
-                    # 가장 빠른 현장 이동 선택
-                    next_site = next_sites.loc[next_sites["site_date"].idxmin()]
-
-                    # SQM 값 계산
-                    try:
-                        sqm_value = _get_sqm(df.iloc[wh_row.name])
-                    except:
-                        sqm_value = 0
-                    warehouse = wh_row["Warehouse"]
-                    month = next_site["site_date"].strftime("%Y-%m")
-
-                    if month not in monthly_sqm_outbound:
-                        monthly_sqm_outbound[month] = {}
-                    monthly_sqm_outbound[month][warehouse] = (
-                        monthly_sqm_outbound[month].get(warehouse, 0) + sqm_value
-                    )
-
-        logger.info(f" Vectorized 월별 SQM 출고 계산 완료")
-        return monthly_sqm_outbound
+        return monthly_sqm_outbound, transferred_warehouses
 
-    def _calculate_monthly_sqm_outbound_parallel(self, df: pd.DataFrame) -> Dict:
-        """병렬 처리된 SQM 출고 계산"""
-        logger.info(" Parallel 월별 SQM 출고 계산 시작")
-
-        try:
-            from multiprocessing import Pool, cpu_count
-            import numpy as np
-
-            n_cores = min(cpu_count(), 4)  # 최대 4코어로 제한
-            chunks = np.array_split(df, n_cores)
-
-            with Pool(n_cores) as pool:
-                results = pool.starmap(
-                    self._process_chunk_sqm_outbound,
-                    [(chunk, self.warehouse_columns, self.site_columns) for chunk in chunks],
-                )
+    def _sqm_site_outbound_matches(
+        self, df: pd.DataFrame, transferred_warehouses: set
+    ) -> pd.DataFrame:
+        """
+        창고→현장 SQM 출고 매칭 (창고 입고 시각 이후 가장 빠른 현장 이동, 창고별 모두)
 
-            # 결과 병합
-            all_outbound_items = pd.concat(
-                [r["outbound_items"] for r in results], ignore_index=True
+        Returns:
+            Row(행 위치), Warehouse, Year_Month 프레임 - 행 → 창고 컬럼 순
+        """
+        # 창고간 이동으로 이미 출고된 창고는 제외
+        matches = self._warehouse_site_matches(
+            df, by_day=False, first_only=False, excluded_warehouses=transferred_warehouses
+        )
+        if matches is None:
+            return pd.DataFrame(
+                {
+                    "Row": np.array([], dtype="int64"),
+                    "Warehouse": np.array([], dtype=object),
+                    "Year_Month": np.array([], dtype=object),
+                }
             )
+        return pd.DataFrame(
+            {
+                "Row": matches["Row"],
+                "Warehouse": matches["Warehouse"],
+                "Year_Month": matches["Site_Date"].dt.strftime("%Y-%m"),
+            }
+        )
 
-            # SQM 값 추가
-            all_outbound_items["SQM_Value"] = self._get_sqm_vectorized(
-                all_outbound_items.merge(
-                    df, left_on="Item_ID", right_index=True, suffixes=("", "_dup")
-                )
+    def _add_sqm_site_outbound(
+        self, monthly_sqm_outbound: Dict, df: pd.DataFrame, matches: pd.DataFrame
+    ) -> None:
+        """매칭 결과의 SQM을 월/창고별로 누적 (SQM은 Row 위치의 행에서 조회)"""
+        if matches.empty:
+            return
+        rows = matches["Row"].to_numpy(dtype="int64")
+        sqm_values = pd.Series(_get_sqm_series(df).to_numpy()[rows], index=matches.index)
+        totals = sqm_values.groupby([matches["Year_Month"], matches["Warehouse"]], sort=False).sum()
+        for (month, warehouse), sqm_value in totals.items():
+            if month not in monthly_sqm_outbound:
+                monthly_sqm_outbound[month] = {}
+            monthly_sqm_outbound[month][warehouse] = (
+                monthly_sqm_outbound[month].get(warehouse, 0) + sqm_value
             )
 
-            # 월별 집계
-            monthly_sqm_outbound = (
-                all_outbound_items.groupby(["Year_Month", "From_Location"])["SQM_Value"]
-                .sum()
-                .unstack(fill_value=0)
-                .to_dict("index")
-            )
+    def _calculate_monthly_sqm_outbound_parallel(self, df: pd.DataFrame) -> Dict:
+        """
+        병렬 월별 SQM 출고 계산 (결과는 벡터화 경로와 동일)
 
-            logger.info(f" Parallel 월별 SQM 출고 계산 완료")
-            return monthly_sqm_outbound
+        창고간 이동 감지(벡터화)는 전체 프레임에서 한 번 수행하고, 창고→현장
+        매칭만 케이스 단위 청크로 병렬 실행한 뒤 전체 프레임 행 순으로 누적합니다.
+        """
+        logger.info(" Parallel 월별 SQM 출고 계산 시작")
 
-        except Exception as e:
-            logger.error(f"병렬 처리 실패: {e}, 벡터화로 폴백")
-            return self._calculate_monthly_sqm_outbound_vectorized(df)
+        monthly_sqm_outbound, transferred_warehouses = self._sqm_transfer_outbound(df)
+        results = self._run_parallel(
+            "sqm_outbound", df, _sqm_site_outbound_chunk_task, transferred_warehouses
+        )
 
-    def _process_chunk_sqm_outbound(
-        self, chunk_df: pd.DataFrame, warehouse_columns: list, site_columns: list
-    ) -> dict:
-        """청크 단위 SQM 출고 처리"""
-        # 창고 출고 계산 (기존 로직 재사용)
-        outbound_result = self._calculate_warehouse_outbound_vectorized(chunk_df)
-        outbound_items = pd.DataFrame(outbound_result["outbound_items"])
+        frames = [
+            result.value.assign(Row=result.chunk.positions[result.value["Row"].to_numpy()])
+            for result in results
+            if not result.value.empty
+        ]
+        if frames:
+            matches = pd.concat(frames, ignore_index=True)
+            matches = matches.sort_values("Row", kind="stable", ignore_index=True)
+        else:
+            matches = self._sqm_site_outbound_matches(df.iloc[:0], transferred_warehouses)
+        self._add_sqm_site_outbound(monthly_sqm_outbound, df, matches)
 
-        return {"outbound_items": outbound_items}
+        logger.info(f" Parallel 월별 SQM 출고 계산 완료")
+        return monthly_sqm_outbound
 
     def calculate_cumulative_sqm_inventory(self, sqm_inbound: Dict, sqm_outbound: Dict) -> Dict:
         """누적 SQM 재고 계산"""
@@ -2332,6 +2659,9 @@ class CorrectedWarehouseIOCalculator:
         max_month = pd.to_datetime(max(all_dates)).to_period("M").to_timestamp()
         months = pd.date_range(min_month, max_month, freq="MS")
 
+        # 실측 SQM 우선, 없으면 PKG×1.5 추정 (월 루프 밖에서 1회 계산)
+        sqm_values = _get_sqm_series(df).tolist()
+
         result = {}
         for month_start in months:
             month_end = month_start + pd.offsets.MonthEnd(0)
@@ -2341,8 +2671,7 @@ class CorrectedWarehouseIOCalculator:
             # 일별 합계 (창고별)
             daily_sum = {w: [0.0] * days_in_month for w in wh_cols}
 
-            for _, row in df.iterrows():
-                sqm = _get_sqm(row)  # 실측 SQM 우선, 없으면 PKG×1.5 추정
+            for (_, row), sqm in zip(df.iterrows(), sqm_values):
                 for loc, seg_start, seg_end in case_segments(row):
                     # 월 범위와 교집합 계산
                     s = max(seg_start, month_start)
@@ -2405,305 +2734,190 @@ class CorrectedWarehouseIOCalculator:
     def _calculate_monthly_invoice_charges_prorated_vectorized(
         self, df: pd.DataFrame, passthrough_amounts: dict = None
     ) -> dict:
-        """벡터화된 일할 과금 계산 (v4.1 전략)"""
-        logger.info(" Vectorized 일할 과금 시스템 시작")
+        """
+        구간 산술 기반 일할 과금 계산
+
+        케이스별 창고 체류 구간 [start, end)를 월 경계로 잘라 월별 SQM×일수를
+        직접 계산하고, 월 일수로 나눠 월평균 면적을 구합니다. 일 단위 행을 만들지
+        않으므로 O(구간 수 × 걸친 월 수)로 동작하며 결과는 레거시 일별 누적과 같습니다.
+        """
+        logger.info(" Vectorized 일할 과금 시스템 시작 (구간 산술)")
 
-        passthrough_amounts = passthrough_amounts or {}
-        rates = self.warehouse_sqm_rates
         wh_cols = [w for w in self.warehouse_columns if w in df.columns]
 
         if not wh_cols:
             logger.warning("일할 과금 계산을 위한 창고 컬럼이 없습니다.")
             return {}
 
-        # 1. Melt로 방문 기록을 long format으로 변환
-        df_with_index = df.copy()
-        df_with_index["row_id"] = df_with_index.index
-
-        visits = df_with_index.melt(
-            id_vars=["row_id"],
-            value_vars=wh_cols,
-            var_name="loc",
-            value_name="dt",
-        )
-        visits = visits[visits["dt"].notna()]
-        visits["dt"] = pd.to_datetime(visits["dt"])
-        visits = visits.sort_values(["row_id", "dt"])
-
-        # 2. Vectorized segments with shift
-        visits["next_dt"] = visits.groupby("row_id")["dt"].shift(-1)
-        visits["same_day"] = visits["dt"].dt.date == visits["next_dt"].dt.date
-        segments = visits[~visits["same_day"]].copy()
-        segments["seg_end"] = segments["next_dt"]
-
-        # 3. Explode date ranges for daily sums
-        def explode_dates(row):
-            if pd.isna(row["seg_end"]):
-                return pd.DataFrame(
-                    {"date": [row["dt"]], "loc": [row["loc"]], "row_id": [row["row_id"]]}
-                )
-            dates = pd.date_range(row["dt"], row["seg_end"] - pd.Timedelta(days=1), freq="D")
-            return pd.DataFrame({"date": dates, "loc": row["loc"], "row_id": row["row_id"]})
+        segments = self._billing_segments(df, wh_cols)
+        if segments is None:
+            logger.warning(" 과금 대상 날짜가 없습니다")
+            return {}
 
-        daily = pd.concat([explode_dates(r) for _, r in segments.iterrows()], ignore_index=True)
+        result = self._prorated_charges(*segments[1:], wh_cols, passthrough_amounts or {})
+        logger.info(f" Vectorized 일할 과금 완료: {len(result)}개월, 구간 {len(segments[0])}개")
+        return result
 
-        # 4. Merge SQM and aggregate
-        daily = daily.merge(
-            df.reset_index(names="row_id")[["row_id"]].assign(SQM=_get_sqm(df)), on="row_id"
+    def _prorated_charges(
+        self,
+        loc_idx: np.ndarray,
+        start: np.ndarray,
+        next_day: np.ndarray,
+        has_next: np.ndarray,
+        sqm: np.ndarray,
+        wh_cols: List[str],
+        passthrough_amounts: dict,
+    ) -> dict:
+        """체류 구간 → 월별 창고 과금 결과 (과금 월: 첫 구간 월 ~ 마지막 구간 월)"""
+        months = pd.date_range(
+            pd.Timestamp(start.min(), unit="D").to_period("M").to_timestamp(),
+            pd.Timestamp(start.max(), unit="D").to_period("M").to_timestamp(),
+            freq="MS",
         )
-        daily["Year_Month"] = daily["date"].dt.strftime("%Y-%m")
-        daily_sum = daily.groupby(["Year_Month", "loc", "date"])["SQM"].sum().reset_index()
 
-        # 5. Monthly avg and billing (groupby)
-        monthly_avg = (
-            daily_sum.groupby(["Year_Month", "loc"])["SQM"].mean().reset_index(name="avg_sqm")
+        # 월 경계 (M개월 + 다음 달 시작), 진행 중 체류는 마지막 과금 월 말일까지
+        bounds = pd.date_range(months[0], periods=len(months) + 1, freq="MS")
+        bounds_day = bounds.to_numpy(dtype="datetime64[D]").astype("int64")
+        days_in_month = np.diff(bounds_day)
+        end = np.where(has_next, next_day, bounds_day[-1])
+
+        # 구간 × 걸친 월 쌍 생성 후 월과의 교집합 일수 계산
+        first_month = np.searchsorted(bounds_day, start, side="right") - 1
+        last_month = np.searchsorted(bounds_day, end - 1, side="right") - 1
+        spans = last_month - first_month + 1
+        pair_segment = np.repeat(np.arange(len(start)), spans)
+        pair_month = first_month[pair_segment] + (
+            np.arange(len(pair_segment)) - np.repeat(np.cumsum(spans) - spans, spans)
+        )
+        overlap = np.minimum(end[pair_segment], bounds_day[pair_month + 1]) - np.maximum(
+            start[pair_segment], bounds_day[pair_month]
         )
 
+        # (월, 창고)별 SQM×일수 합계 → 월평균 면적
+        sqm_days = np.zeros((len(months), len(wh_cols)))
+        np.add.at(sqm_days, (pair_month, loc_idx[pair_segment]), sqm[pair_segment] * overlap)
+        avg_sqm = sqm_days / days_in_month[:, None]
+
         result = {}
-        for ym in monthly_avg["Year_Month"].unique():
-            ym_df = monthly_avg[monthly_avg["Year_Month"] == ym]
+        for m, month_start in enumerate(months):
+            ym = month_start.strftime("%Y-%m")
             result[ym] = {}
             total = 0.0
+            for i, w in enumerate(wh_cols):
+                entry = self._monthly_charge_entry(ym, w, float(avg_sqm[m, i]), passthrough_amounts)
+                result[ym][w] = entry
+                total += entry["monthly_charge_aed"]
+            result[ym]["total_monthly_charge_aed"] = round(total, 2)
+        return result
 
-            for _, r in ym_df.iterrows():
-                w = r["loc"]
-                mode = self.billing_mode.get(w, "rate")
-                avg_sqm = r["avg_sqm"]
+    def _billing_segments(self, df: pd.DataFrame, wh_cols: List[str]):
+        """
+        케이스별 창고 체류 구간 (레거시 case_segments와 동일 규칙)
 
-                if mode == "rate":
-                    amt = round(avg_sqm * rates.get(w, 0.0), 2)
-                    source = "AvgSQM×Rate"
-                elif mode == "passthrough":
-                    amt = float(passthrough_amounts.get((ym, w), 0.0))
-                    source = "Invoice Total (passthrough)"
-                else:
-                    amt = 0.0
-                    source = "No charge (policy)"
-
-                result[ym][w] = {
-                    "billing_mode": mode,
-                    "avg_sqm": round(avg_sqm, 2),
-                    "rate_aed": rates.get(w, 0.0),
-                    "monthly_charge_aed": amt,
-                    "amount_source": source,
-                }
-                total += amt
+        방문을 날짜순(동일 날짜는 컬럼 순서)으로 정렬하고, 다음 방문이 같은 날이면
+        0일 구간으로 제외합니다(동일일 WH↔WH 이동 이중과금 방지).
 
-            result[ym]["total_monthly_charge_aed"] = round(total, 2)
+        Returns:
+            (행 위치, 창고 인덱스, 시작일, 다음 방문일, 다음 방문 여부, SQM) 또는
+            None (방문 없음). 구간은 (행 위치, 시작일, 창고 인덱스) 순이며 날짜는
+            1970-01-01 기준 일수(int64)입니다. 다음 방문이 없는 진행 중 체류의
+            종료일은 과금 월 범위가 정해진 뒤 ``_prorated_charges``에서 정합니다.
+        """
+        case, loc_idx, visit_ns = self.location_timeline(df).visits(wh_cols)
+        if not len(case):
+            return None
+        visit_day = np.floor_divide(visit_ns, DAY_NS)
+
+        has_next = np.append(case[1:] == case[:-1], False)
+        next_day = np.append(visit_day[1:], 0)
+        keep = ~(has_next & (next_day == visit_day))
+
+        sqm = _get_sqm_series(df).to_numpy(dtype="float64")
+        return (
+            case[keep],
+            loc_idx[keep],
+            visit_day[keep],
+            next_day[keep],
+            has_next[keep],
+            sqm[case[keep]],
+        )
 
-        logger.info(f" Vectorized 일할 과금 완료")
-        return result
+    def _monthly_charge_entry(
+        self, ym: str, warehouse: str, avg_sqm: float, passthrough_amounts: dict
+    ) -> dict:
+        """창고 1개월 과금 항목 (모드별 차등, 레거시와 같은 필드/반올림)"""
+        mode = self.billing_mode.get(warehouse, "rate")
+        if mode == "rate":
+            # Rate-기반: 월평균 면적 × 계약단가
+            rate = self.warehouse_sqm_rates.get(warehouse, 0.0)
+            return {
+                "billing_mode": "rate",
+                "avg_sqm": round(avg_sqm, 2),
+                "rate_aed": rate,
+                "monthly_charge_aed": round(avg_sqm * rate, 2),
+                "amount_source": "AvgSQM×Rate",
+            }
+        if mode == "passthrough":
+            # Passthrough: 인보이스 총액 그대로 적용
+            amt = float(passthrough_amounts.get((ym, warehouse), 0.0))
+            return {
+                "billing_mode": "passthrough",
+                "avg_sqm": round(avg_sqm, 2),  # 정보용
+                "rate_aed": 0.0,
+                "monthly_charge_aed": round(amt, 2),
+                "amount_source": "Invoice Total (passthrough)",
+            }
+        # No-charge: 항상 0원 (MOSB 등)
+        return {
+            "billing_mode": "no-charge",
+            "avg_sqm": round(avg_sqm, 2),  # 정보용
+            "rate_aed": 0.0,
+            "monthly_charge_aed": 0.0,
+            "amount_source": "No charge (policy)",
+        }
 
     def _calculate_monthly_invoice_charges_prorated_parallel(
         self, df: pd.DataFrame, passthrough_amounts: dict = None
     ) -> dict:
-        """병렬 처리된 일할 과금 계산 (v4.1 전략)"""
-        logger.info(" Parallel 일할 과금 시스템 시작")
-
-        try:
-            from multiprocessing import Pool, cpu_count
-            import numpy as np
-
-            n_cores = min(cpu_count(), 4)  # 최대 4코어로 제한
-            chunks = np.array_split(df, n_cores)
-
-            with Pool(n_cores) as pool:
-                results = pool.starmap(
-                    self._process_chunk_invoice_charges,
-                    [(chunk, passthrough_amounts) for chunk in chunks],
-                )
-
-            # 월별 결과 병합
-            merged_result = self._merge_invoice_results(results)
-            logger.info(f" Parallel 일할 과금 완료: {len(merged_result)}개월")
-            return merged_result
-
-        except Exception as e:
-            logger.error(f"병렬 처리 실패: {e}, 벡터화로 폴백")
-            return self._calculate_monthly_invoice_charges_prorated_vectorized(
-                df, passthrough_amounts
-            )
+        """
+        병렬 일할 과금 계산 (결과는 벡터화 경로와 동일)
 
-    def _process_chunk_invoice_charges(
-        self, chunk_df: pd.DataFrame, passthrough_amounts: dict = None
-    ) -> dict:
-        """청크 단위 일할 과금 처리"""
-        passthrough_amounts = passthrough_amounts or {}
-        rates = self.warehouse_sqm_rates
-        chunk_df = chunk_df.copy()
-        wh_cols = [w for w in self.warehouse_columns if w in chunk_df.columns]
+        체류 구간 추출(날짜 파싱 포함)을 케이스 단위 청크로 병렬 실행하고, 구간을
+        전체 행 위치 순으로 합친 뒤 월 범위·월별 누적은 한 번에 계산합니다.
+        """
+        logger.info(" Parallel 일할 과금 시스템 시작")
 
+        wh_cols = [w for w in self.warehouse_columns if w in df.columns]
         if not wh_cols:
-            logger.warning("청크 일할 과금 계산을 위한 창고 컬럼이 없습니다.")
-            return {}
-
-        # 1. Melt로 방문 기록을 long format으로 변환
-        chunk_df["row_id"] = chunk_df.index
-
-        visits = chunk_df.melt(
-            id_vars=["row_id"],
-            value_vars=wh_cols,
-            var_name="loc",
-            value_name="dt",
-        )
-        visits = visits[visits["dt"].notna()]
-        visits["dt"] = pd.to_datetime(visits["dt"])
-        visits = visits.sort_values(["row_id", "dt"])
-
-        # 2. Vectorized segments with shift
-        visits["next_dt"] = visits.groupby("row_id")["dt"].shift(-1)
-        visits["same_day"] = visits["dt"].dt.date == visits["next_dt"].dt.date
-        segments = visits[~visits["same_day"]].copy()
-        segments["seg_end"] = segments["next_dt"]
-
-        # 3. Explode date ranges for daily sums (Numpy 기반 최적화)
-        def explode_dates_vectorized(row):
-            if pd.isna(row["seg_end"]):
-                return pd.DataFrame(
-                    {"date": [row["dt"]], "loc": [row["loc"]], "row_id": [row["row_id"]]}
-                )
-
-            # Numpy 기반 날짜 범위 생성
-            start_date = row["dt"]
-            end_date = row["seg_end"] - pd.Timedelta(days=1)
-            dates = pd.date_range(start_date, end_date, freq="D")
-
-            return pd.DataFrame(
-                {
-                    "date": dates,
-                    "loc": [row["loc"]] * len(dates),
-                    "row_id": [row["row_id"]] * len(dates),
-                }
-            )
-
-        daily_list = []
-        for _, row in segments.iterrows():
-            daily_list.append(explode_dates_vectorized(row))
-
-        if daily_list:
-            daily = pd.concat(daily_list, ignore_index=True)
-        else:
-            daily = pd.DataFrame(columns=["date", "loc", "row_id"])
-
-        # 4. Merge SQM and aggregate
-        if not daily.empty:
-            daily = daily.merge(
-                chunk_df.reset_index(names="row_id")[["row_id"]].assign(
-                    SQM=self._get_sqm_vectorized(chunk_df)
-                ),
-                on="row_id",
-            )
-            daily["Year_Month"] = daily["date"].dt.strftime("%Y-%m")
-            daily_sum = daily.groupby(["Year_Month", "loc", "date"])["SQM"].sum().reset_index()
-
-            # 5. Monthly avg and billing (groupby)
-            monthly_avg = (
-                daily_sum.groupby(["Year_Month", "loc"])["SQM"].mean().reset_index(name="avg_sqm")
-            )
-
-            result = {}
-            for ym in monthly_avg["Year_Month"].unique():
-                ym_df = monthly_avg[monthly_avg["Year_Month"] == ym]
-                result[ym] = {}
-                total = 0.0
-
-                for _, r in ym_df.iterrows():
-                    w = r["loc"]
-                    mode = self.billing_mode.get(w, "rate")
-                    avg_sqm = r["avg_sqm"]
-
-                    if mode == "rate":
-                        amt = round(avg_sqm * rates.get(w, 0.0), 2)
-                        source = "AvgSQM×Rate"
-                    elif mode == "passthrough":
-                        amt = float(passthrough_amounts.get((ym, w), 0.0))
-                        source = "Invoice Total (passthrough)"
-                    else:
-                        amt = 0.0
-                        source = "No charge (policy)"
-
-                    result[ym][w] = {
-                        "billing_mode": mode,
-                        "avg_sqm": round(avg_sqm, 2),
-                        "rate_aed": rates.get(w, 0.0),
-                        "monthly_charge_aed": amt,
-                        "amount_source": source,
-                    }
-                    total += amt
-
-                result[ym]["total_monthly_charge_aed"] = round(total, 2)
-
-            return result
-        else:
+            logger.warning("일할 과금 계산을 위한 창고 컬럼이 없습니다.")
             return {}
 
-    def _get_sqm_vectorized(self, df: pd.DataFrame) -> pd.Series:
-        """벡터화된 SQM 값 추출"""
-        sqm_columns = [
-            "SQM",
-            "sqm",
-            "Area",
-            "area",
-            "AREA",
-            "Size_SQM",
-            "Item_SQM",
-            "Package_SQM",
-            "Total_SQM",
-            "M2",
-            "m2",
-            "SQUARE",
-            "Square",
-            "square",
-            "Dimension",
-            "Space",
-            "Volume_SQM",
+        results = self._run_parallel("invoice_charges", df, _billing_segments_chunk_task, wh_cols)
+        parts = [
+            (result.chunk.positions[result.value[0]],) + tuple(result.value[1:])
+            for result in results
+            if result.value is not None
         ]
-        for col in sqm_columns:
-            if col in df.columns:
-                sqm = df[col].fillna(0).clip(lower=0).astype(float)
-                if (sqm > 0).any():
-                    return sqm
-        return df.get("Pkg", pd.Series()).fillna(1).clip(lower=1).astype(int) * 1.5
-
-    def _merge_invoice_results(self, results: list) -> dict:
-        """병렬 처리 결과 병합"""
-        if not results:
+        if not parts:
+            logger.warning(" 과금 대상 날짜가 없습니다")
             return {}
 
-        # 첫 번째 결과를 기준으로 시작
-        merged = results[0].copy()
-
-        # 나머지 결과들을 병합
-        for result in results[1:]:
-            for ym, ym_data in result.items():
-                if ym not in merged:
-                    merged[ym] = {}
-
-                for warehouse, data in ym_data.items():
-                    if warehouse == "total_monthly_charge_aed":
-                        # 총액은 합산
-                        merged[ym][warehouse] = merged[ym].get(warehouse, 0) + data
-                    else:
-                        # 창고별 데이터는 병합
-                        merged[ym][warehouse] = data
-
-        return merged
+        case, *columns = (np.concatenate(values) for values in zip(*parts))
+        order = np.argsort(case, kind="stable")
+        result = self._prorated_charges(
+            *(values[order] for values in columns), wh_cols, passthrough_amounts or {}
+        )
+        logger.info(f" Parallel 일할 과금 완료: {len(result)}개월, 구간 {len(case)}개")
+        return result
 
     def analyze_sqm_data_quality(self, df: pd.DataFrame) -> Dict:
         """SQM 데이터 품질 분석"""
         logger.info(" SQM 데이터 품질 분석 시작")
 
-        actual_sqm_count = 0
-        estimated_sqm_count = 0
         total_records = len(df)
-
-        for idx, row in df.iterrows():
-            sqm_value, source, column = _get_sqm_with_source(row)
-
-            if source == "ACTUAL":
-                actual_sqm_count += 1
-            else:
-                estimated_sqm_count += 1
+        sources = _get_sqm_with_source_frame(df)["source"]
+        actual_sqm_count = int((sources == "ACTUAL").sum())
+        estimated_sqm_count = total_records - actual_sqm_count
 
         actual_percentage = (actual_sqm_count / total_records) * 100 if total_records > 0 else 0
         estimated_percentage = (
@@ -2734,6 +2948,8 @@ class HVDCExcelReporterFinal:
         self.calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
         self.report_output_dir = self.calculator.reports_output_dir
         self.report_output_dir.mkdir(parents=True, exist_ok=True)
+        # 최종 리포트 xlsx를 행 순서 스트리밍으로 기록 (False면 pd.ExcelWriter)
+        self.streaming_excel = True
 
         logger.info(" HVDC Excel Reporter Final 초기화 완료 (v3.0-corrected)")
 
@@ -2742,34 +2958,49 @@ class HVDCExcelReporterFinal:
         logger.info(" calculate_warehouse_statistics() - 종합 통계 계산 (SQM 확장)")
 
         # 데이터 로드 및 처리
-        self.calculator.load_real_hvdc_data()
-        df = self.calculator.process_real_data()
-        df = self.calculator.calculate_final_location(df)
+        with profile_phase("load"):
+            self.calculator.load_real_hvdc_data()
+        with profile_phase("process_real_data"):
+            df = self.calculator.process_real_data()
+        record_rows(len(df))
+        rows = len(df)
+        with profile_phase("final_location", rows=rows):
+            df = self.calculator.calculate_final_location(df)
 
         # 4가지 핵심 계산 (기존)
-        inbound_result = self.calculator.calculate_warehouse_inbound_corrected(df)
-        outbound_result = self.calculator.calculate_warehouse_outbound_corrected(df)
-        inventory_result = self.calculator.calculate_warehouse_inventory_corrected(df)
-        direct_result = self.calculator.calculate_direct_delivery(df)
+        with profile_phase("inbound", rows=rows):
+            inbound_result = self.calculator.calculate_warehouse_inbound_corrected(df)
+        with profile_phase("outbound", rows=rows):
+            outbound_result = self.calculator.calculate_warehouse_outbound_corrected(df)
+        with profile_phase("inventory", rows=rows):
+            inventory_result = self.calculator.calculate_warehouse_inventory_corrected(df)
+        with profile_phase("direct_delivery", rows=rows):
+            direct_result = self.calculator.calculate_direct_delivery(df)
 
         # 월별 피벗 계산 (기존)
-        inbound_pivot = self.calculator.create_monthly_inbound_pivot(df)
+        with profile_phase("inbound_pivot", rows=rows):
+            inbound_pivot = self.calculator.create_monthly_inbound_pivot(df)
 
         #  NEW: SQM 기반 누적 재고 계산
-        sqm_inbound = self.calculator.calculate_monthly_sqm_inbound(df)
-        sqm_outbound = self.calculator.calculate_monthly_sqm_outbound(df)
-        sqm_cumulative = self.calculator.calculate_cumulative_sqm_inventory(
-            sqm_inbound, sqm_outbound
-        )
+        with profile_phase("sqm_inbound", rows=rows):
+            sqm_inbound = self.calculator.calculate_monthly_sqm_inbound(df)
+        with profile_phase("sqm_outbound", rows=rows):
+            sqm_outbound = self.calculator.calculate_monthly_sqm_outbound(df)
+        with profile_phase("sqm_cumulative"):
+            sqm_cumulative = self.calculator.calculate_cumulative_sqm_inventory(
+                sqm_inbound, sqm_outbound
+            )
 
         #  NEW: 일할 과금 시스템 적용 (passthrough 금액은 별도 로딩 필요)
         passthrough_amounts = {}  # 기본값 - 향후 hvdc wh invoice.py에서 주입
-        sqm_charges = self.calculator.calculate_monthly_invoice_charges_prorated(
-            df, passthrough_amounts
-        )
+        with profile_phase("invoice_charges", rows=rows):
+            sqm_charges = self.calculator.calculate_monthly_invoice_charges_prorated(
+                df, passthrough_amounts
+            )
 
         #  NEW: SQM 데이터 품질 분석
-        sqm_quality = self.calculator.analyze_sqm_data_quality(df)
+        with profile_phase("sqm_quality", rows=rows):
+            sqm_quality = self.calculator.analyze_sqm_data_quality(df)
 
         return {
             "inbound_result": inbound_result,
@@ -2786,8 +3017,133 @@ class HVDCExcelReporterFinal:
             "sqm_data_quality": sqm_quality,
         }
 
+    @staticmethod
+    def _report_month_strings() -> List[str]:
+        """월별 시트 기간 (2023-02 ~ 현재 월)"""
+        end_month = datetime.now().strftime("%Y-%m")
+        months = pd.date_range("2023-02", end_month, freq="MS")
+        return [month.strftime("%Y-%m") for month in months]
+
+    @staticmethod
+    def _warehouse_flow_events(stats: Dict) -> pd.DataFrame:
+        """
+        창고 입출고 이벤트 프레임 (Year_Month, Warehouse, direction, Pkg_Quantity)
+
+        - in: 순수 입고(external_arrival) + 창고간 이동 입고(to_warehouse)
+        - out: 창고간 이동 출고(from_warehouse) + 창고→현장 출고(From_Location)
+
+        수량 키 폴백 규칙은 기존 루프와 동일합니다. Float_Quantity는 수량이 float인
+        이벤트 표시로, 기존 시트와 같은 컬럼 dtype(int/float)을 만들 때 사용합니다.
+        결과가 EventRecords면 dict를 만들지 않고 이벤트 프레임에서 바로 가져옵니다.
+        """
+        inbound_items = stats["inbound_result"].get("inbound_items", [])
+        transfers = stats["inbound_result"].get("warehouse_transfers", [])
+        outbound_items = stats["outbound_result"].get("outbound_items", [])
+
+        columns = ["Year_Month", "Warehouse", "direction", "Pkg_Quantity", "Float_Quantity"]
+        events = []
+        parts = []
+
+        def add(month, warehouse, direction, pkg_qty):
+            events.append((month, warehouse, direction, pkg_qty, isinstance(pkg_qty, float)))
+
+        def add_frame(frame, location_column, direction, zero_as_one=False):
+            quantity = frame["Pkg_Quantity"].to_numpy(dtype="float64")
+            if zero_as_one:
+                # 기존 `pkg_quantity or 1` 폴백과 동일
+                quantity = np.where(quantity == 0, 1.0, quantity)
+            part = {
+                "Year_Month": year_month_text(frame["Year_Month"]),
+                "Warehouse": frame[location_column].astype(object).to_numpy(),
+                "direction": [direction] * len(frame),
+                "Pkg_Quantity": quantity,
+                "Float_Quantity": np.zeros(len(frame), dtype=bool),
+            }
+            parts.append(pd.DataFrame(part, columns=columns))
+
+        inbound_frame = event_frame(inbound_items)
+        if inbound_frame is not None:
+            external = inbound_frame["Event_Type"] == "external_arrival"
+            add_frame(inbound_frame[external], "To_Location", "in")
+        else:
+            for item in inbound_items:
+                if item.get("Inbound_Type") == "external_arrival":
+                    pkg_qty = item.get("Pkg_Quantity", 1)
+                    add(item.get("Year_Month"), item.get("Warehouse"), "in", pkg_qty)
+
+        transfer_frame = event_frame(transfers)
+        if transfer_frame is not None:
+            add_frame(transfer_frame, "To_Location", "in", zero_as_one=True)
+            add_frame(transfer_frame, "From_Location", "out", zero_as_one=True)
+        else:
+            for transfer in transfers:
+                pkg_qty = transfer.get("pkg_quantity") or transfer.get("Pkg_Quantity", 1)
+                add(transfer.get("Year_Month"), transfer.get("to_warehouse"), "in", pkg_qty)
+                add(transfer.get("Year_Month"), transfer.get("from_warehouse"), "out", pkg_qty)
+
+        outbound_frame = event_frame(outbound_items)
+        if outbound_frame is not None:
+            add_frame(outbound_frame, "From_Location", "out", zero_as_one=True)
+        else:
+            for item in outbound_items:
+                pkg_qty = item.get("Pkg_Quantity") or item.get("pkg_quantity", 1)
+                add(item.get("Year_Month"), item.get("From_Location"), "out", pkg_qty)
+
+        frame = pd.DataFrame(events, columns=columns)
+        frame["Pkg_Quantity"] = pd.to_numeric(frame["Pkg_Quantity"]).astype("float64")
+        frame["Float_Quantity"] = frame["Float_Quantity"].astype(bool)
+        if parts:
+            frame = pd.concat([frame] + parts, ignore_index=True)
+        return frame
+
     def create_warehouse_monthly_sheet(self, stats: Dict) -> pd.DataFrame:
         """창고_월별_입출고 시트 생성 (동일 날짜 창고간 이동 반영)"""
+        if not self.calculator.use_vectorized:
+            return self._create_warehouse_monthly_sheet_legacy(stats)
+
+        logger.info(" 창고_월별_입출고 시트 생성 (창고간 이동 반영, groupby 집계)")
+
+        month_strings = self._report_month_strings()
+        warehouses = list(self.calculator.warehouse_columns)
+
+        # (direction, Warehouse, Year_Month) 단위 1회 집계 후 월×창고 격자로 펼침
+        events = self._warehouse_flow_events(stats)
+        totals = events.groupby(["direction", "Warehouse", "Year_Month"]).agg(
+            quantity=("Pkg_Quantity", "sum"), has_float=("Float_Quantity", "any")
+        )
+        grid = pd.MultiIndex.from_product([["in", "out"], warehouses, month_strings])
+        totals = totals.reindex(grid).fillna({"quantity": 0, "has_float": False})
+
+        data = {"입고월": month_strings}
+        for direction, prefix in (("in", "입고"), ("out", "출고")):
+            for warehouse in warehouses:
+                cell = totals.loc[(direction, warehouse)]
+                values = cell["quantity"].to_numpy()
+                # float 수량이 없는 컬럼은 기존과 같이 정수 컬럼
+                if not cell["has_float"].astype(bool).any():
+                    values = values.astype("int64")
+                data[f"{prefix}_{warehouse}"] = values
+        warehouse_monthly = pd.DataFrame(data)
+
+        # 누계 열 추가
+        warehouse_monthly["누계_입고"] = warehouse_monthly[
+            [f"입고_{warehouse}" for warehouse in warehouses]
+        ].sum(axis=1)
+        warehouse_monthly["누계_출고"] = warehouse_monthly[
+            [f"출고_{warehouse}" for warehouse in warehouses]
+        ].sum(axis=1)
+
+        # 총합계 행 추가
+        total_row = ["Total"]
+        for col in warehouse_monthly.columns[1:]:
+            total_row.append(warehouse_monthly[col].sum())
+        warehouse_monthly.loc[len(warehouse_monthly)] = total_row
+
+        logger.info(f" 창고_월별_입출고 시트 완료 (창고간 이동 반영): {warehouse_monthly.shape}")
+        return warehouse_monthly
+
+    def _create_warehouse_monthly_sheet_legacy(self, stats: Dict) -> pd.DataFrame:
+        """기존 월×창고×항목 루프 방식 (레거시)"""
         logger.info(" 창고_월별_입출고 시트 생성 (창고간 이동 반영)")
 
         # 월별 기간 생성 (2023-02 ~ 현재 월까지 동적 계산)
@@ -2893,6 +3249,53 @@ class HVDCExcelReporterFinal:
 
     def create_site_monthly_sheet(self, stats: Dict) -> pd.DataFrame:
         """현장_월별_입고재고 시트 생성 (Multi-Level Header 9열) - 중복 없는 실제 현장 입고만 집계"""
+        if not self.calculator.use_vectorized:
+            return self._create_site_monthly_sheet_legacy(stats)
+
+        logger.info(" 현장_월별_입고재고 시트 생성 (9열, 중복 없는 집계, groupby 집계)")
+
+        month_strings = self._report_month_strings()
+
+        # 중복 없는 집계를 위해 processed_data 사용
+        df = stats["processed_data"]
+        sites = ["AGI", "DAS", "MIR", "SHU"]
+
+        # 현장별로 Final_Location이 해당 현장인 행만 입고월 기준 1회 집계
+        site_dates = self.calculator.location_timeline(df).block(sites).view("datetime64[ns]")
+        inbound_by_site = {}
+        for position, site in enumerate(sites):
+            mask = (df["Final_Location"] == site) & (df[site].notna())
+            year_month = pd.DatetimeIndex(site_dates[mask.to_numpy(), position]).strftime("%Y-%m")
+            monthly = df.loc[mask, "Pkg"].groupby(year_month).sum()
+            inbound_by_site[site] = monthly.reindex(month_strings, fill_value=0)
+
+        data = {"입고월": month_strings}
+        for site in sites:
+            data[f"입고_{site}"] = [int(value) for value in inbound_by_site[site]]
+        for site in sites:
+            data[f"재고_{site}"] = [int(value) for value in inbound_by_site[site].cumsum()]
+        site_monthly = pd.DataFrame(data)
+
+        # 총합계 행 추가
+        total_row = ["Total"]
+
+        # 입고 총합
+        for site in sites:
+            total_inbound = site_monthly[f"입고_{site}"].sum()
+            total_row.append(total_inbound)
+
+        # 재고 총합 (최종 재고)
+        for site in sites:
+            final_inventory = site_monthly[f"재고_{site}"].iloc[-1] if not site_monthly.empty else 0
+            total_row.append(final_inventory)
+
+        site_monthly.loc[len(site_monthly)] = total_row
+
+        logger.info(f" 현장_월별_입고재고 시트 완료: {site_monthly.shape} (9열, 중복 없는 집계)")
+        return site_monthly
+
+    def _create_site_monthly_sheet_legacy(self, stats: Dict) -> pd.DataFrame:
+        """기존 월×현장 마스크 방식 (레거시)"""
         logger.info(" 현장_월별_입고재고 시트 생성 (9열, 중복 없는 집계)")
 
         # 월별 기간 생성 (2023-02 ~ 현재 월까지 동적 계산)
@@ -2981,7 +3384,53 @@ class HVDCExcelReporterFinal:
     def _ftd__build_segments(self, df: pd.DataFrame) -> pd.DataFrame:
         """Port → WH → MOSB → Site 구간(세그먼트) 생성.
         가중치는 기본 Pkg(없으면 1). 동일일자 WH↔WH는 calculator의 transfer 감지 로직이 보정.
+
+        위치 타임라인의 방문 순서(케이스, 날짜, 위치 컬럼 순)에서 케이스 내 직전 방문을
+        From/Start로 잇고, 케이스 첫 방문은 Port(시작 = 첫 방문 시점)에서 출발합니다.
         """
+        if not self.calculator.use_vectorized:
+            return self._ftd__build_segments_legacy(df)
+
+        timeline = self.calculator.location_timeline(df)
+        case, location, end = timeline.visits()
+        if not len(case):
+            return pd.DataFrame()
+
+        # 케이스 첫 방문이면 Port 가상 시작점, 아니면 직전 방문 (grouped shift)
+        first = np.ones(len(case), dtype=bool)
+        first[1:] = case[1:] != case[:-1]
+        previous = np.roll(np.arange(len(case)), 1)
+        previous[first] = np.flatnonzero(first)
+        start = end[previous]
+
+        locations = np.asarray(timeline.locations, dtype=object)
+        from_location = locations[location[previous]]
+        from_location[first] = "Port"
+
+        if "Case No." in df.columns:
+            case_ids = df["Case No."].to_numpy()
+        else:
+            case_ids = df.index.to_numpy()
+        if "Pkg" in df.columns:
+            pkg = _map_unique(df["Pkg"], lambda value: int(value) if pd.notna(value) else 1)
+            pkg = pkg.astype("int64")
+        else:
+            pkg = np.ones(len(df), dtype="int64")
+
+        return pd.DataFrame(
+            {
+                "Case": case_ids[case],
+                "From": from_location,
+                "To": locations[location],
+                "Start": start.view("datetime64[ns]"),
+                "End": end.view("datetime64[ns]"),
+                "Dwell_Days": np.maximum(np.floor_divide(end - start, DAY_NS), 0),
+                "Pkg": pkg[case],
+            }
+        )
+
+    def _ftd__build_segments_legacy(self, df: pd.DataFrame) -> pd.DataFrame:
+        """기존 iterrows 방식 (레거시)"""
         segments = []
         for idx, row in df.iterrows():
             case_id = row.get("Case No.", idx)
@@ -3345,7 +3794,8 @@ class HVDCExcelReporterFinal:
         logger.info(" 최종 Excel 리포트 생성 시작 (v3.0-corrected)")
 
         # 종합 통계 계산
-        stats = self.calculate_warehouse_statistics()
+        with profile_phase("statistics"):
+            stats = self.calculate_warehouse_statistics()
 
         # KPI 검증 실행 (수정 버전)
         kpi_validation = validate_kpi_thresholds(stats)
@@ -3420,26 +3870,28 @@ class HVDCExcelReporterFinal:
                 print(f"    {col}: 컬럼 없음")
 
         #  FIX: 전체 데이터는 CSV로도 저장 (백업용)
-        hitachi_original.to_csv(
-            self.report_output_dir / "HITACHI_원본데이터_FULL_fixed.csv",
-            index=False,
-            encoding="utf-8-sig",
-        )
-        siemens_original.to_csv(
-            self.report_output_dir / "SIEMENS_원본데이터_FULL_fixed.csv",
-            index=False,
-            encoding="utf-8-sig",
-        )
-        combined_original.to_csv(
-            self.report_output_dir / "통합_원본데이터_FULL_fixed.csv",
-            index=False,
-            encoding="utf-8-sig",
-        )
+        with profile_phase("csv_backup", rows=len(combined_original)):
+            hitachi_original.to_csv(
+                self.report_output_dir / "HITACHI_원본데이터_FULL_fixed.csv",
+                index=False,
+                encoding="utf-8-sig",
+            )
+            siemens_original.to_csv(
+                self.report_output_dir / "SIEMENS_원본데이터_FULL_fixed.csv",
+                index=False,
+                encoding="utf-8-sig",
+            )
+            combined_original.to_csv(
+                self.report_output_dir / "통합_원본데이터_FULL_fixed.csv",
+                index=False,
+                encoding="utf-8-sig",
+            )
 
         # Stage 3 SQM 관련 시트 사전 계산
-        sqm_cumulative_sheet = self.create_sqm_cumulative_sheet(stats)
-        sqm_invoice_sheet = self.create_sqm_invoice_sheet(stats)
-        sqm_pivot_sheet = self.create_sqm_pivot_sheet(stats)
+        with profile_phase("sqm_sheets"):
+            sqm_cumulative_sheet = self.create_sqm_cumulative_sheet(stats)
+            sqm_invoice_sheet = self.create_sqm_invoice_sheet(stats)
+            sqm_pivot_sheet = self.create_sqm_pivot_sheet(stats)
 
         # Excel 파일 생성 (수정 버전)
         excel_filename = (
@@ -3472,6 +3924,7 @@ class HVDCExcelReporterFinal:
         combined_normalized["Stack_Status"] = _calculate_stack_status(combined_normalized, "Stack")
         stack_parsed = combined_normalized["Stack_Status"].notna().sum()
         logger.info(f"  - Stack_Status 파싱 완료: {stack_parsed}개")
+        logger.info(f"  - Stack 파싱 캐시: {stack_status_cache_info().summary()}")
 
         # Total sqm 계산
         combined_normalized["Total sqm"] = _calculate_total_sqm(combined_normalized)
@@ -3558,75 +4011,65 @@ class HVDCExcelReporterFinal:
         if problem_cols:
             logger.warning(f"[WARN] 문제가 될 수 있는 컬럼명: {problem_cols}")
 
-        # ✅ 모든 시트를 단일 ExcelWriter 컨텍스트 안에서 저장
-        with pd.ExcelWriter(excel_filename, engine="xlsxwriter") as writer:
-            warehouse_monthly_with_headers.to_excel(
-                writer, sheet_name="창고_월별_입출고", index=True
-            )
-            site_monthly_with_headers.to_excel(writer, sheet_name="현장_월별_입고재고", index=True)
-            flow_analysis.to_excel(writer, sheet_name="Flow_Code_분석", index=False)
-            transaction_summary.to_excel(writer, sheet_name="전체_트랜잭션_요약", index=False)
-            kpi_validation_df.to_excel(writer, sheet_name="KPI_검증_결과", index=False)
-            sqm_cumulative_sheet.to_excel(writer, sheet_name="SQM_누적재고", index=False)
-            sqm_invoice_sheet.to_excel(writer, sheet_name="SQM_Invoice과금", index=False)
-            sqm_pivot_sheet.to_excel(writer, sheet_name="SQM_피벗테이블", index=False)
-            sample_data.to_excel(writer, sheet_name="원본_데이터_샘플", index=False)
-
-            #  FIX: 수정된 원본 데이터 시트들 (표준 헤더 순서 적용)
-            hitachi_reordered.to_excel(writer, sheet_name="HITACHI_원본데이터_Fixed", index=False)
-            siemens_reordered.to_excel(writer, sheet_name="SIEMENS_원본데이터_Fixed", index=False)
-
-            # 🔍 디버그: combined_reordered 저장 전 최종 확인
-            logger.info(f"\n[DEBUG] combined_reordered Excel 저장 직전:")
-            logger.info(f"  - 컬럼 수: {len(combined_reordered.columns)}")
-            logger.info(
-                f"  - Total sqm 위치: {list(combined_reordered.columns).index('Total sqm') if 'Total sqm' in combined_reordered.columns else 'NOT FOUND'}"
-            )
-            logger.info(
-                f"  - Stack_Status 위치: {list(combined_reordered.columns).index('Stack_Status') if 'Stack_Status' in combined_reordered.columns else 'NOT FOUND'}"
-            )
+        # 🔍 디버그: combined_reordered 저장 전 최종 확인
+        logger.info(f"\n[DEBUG] combined_reordered Excel 저장 직전:")
+        logger.info(f"  - 컬럼 수: {len(combined_reordered.columns)}")
+        logger.info(
+            f"  - Total sqm 위치: {list(combined_reordered.columns).index('Total sqm') if 'Total sqm' in combined_reordered.columns else 'NOT FOUND'}"
+        )
+        logger.info(
+            f"  - Stack_Status 위치: {list(combined_reordered.columns).index('Stack_Status') if 'Stack_Status' in combined_reordered.columns else 'NOT FOUND'}"
+        )
 
-            # 🔍 디버그: Excel 저장 전 최종 컬럼 검증
-            logger.info(f"\n[DEBUG] Excel 저장 전 최종 컬럼 검증:")
-            logger.info(f"  - combined_reordered 컬럼 수: {len(combined_reordered.columns)}")
-            logger.info(f"  - Total sqm 존재: {'Total sqm' in combined_reordered.columns}")
-            logger.info(f"  - Stack_Status 존재: {'Stack_Status' in combined_reordered.columns}")
-            logger.info(
-                f"  - Total sqm 위치: {list(combined_reordered.columns).index('Total sqm') if 'Total sqm' in combined_reordered.columns else 'NOT FOUND'}"
-            )
-            logger.info(
-                f"  - Stack_Status 위치: {list(combined_reordered.columns).index('Stack_Status') if 'Stack_Status' in combined_reordered.columns else 'NOT FOUND'}"
-            )
+        # ✅ 시트 순서대로 (시트명, 데이터, index) - 원본 데이터 시트는 표준 헤더 순서 적용
+        report_sheets = [
+            ("창고_월별_입출고", warehouse_monthly_with_headers, True),
+            ("현장_월별_입고재고", site_monthly_with_headers, True),
+            ("Flow_Code_분석", flow_analysis, False),
+            ("전체_트랜잭션_요약", transaction_summary, False),
+            ("KPI_검증_결과", kpi_validation_df, False),
+            ("SQM_누적재고", sqm_cumulative_sheet, False),
+            ("SQM_Invoice과금", sqm_invoice_sheet, False),
+            ("SQM_피벗테이블", sqm_pivot_sheet, False),
+            ("원본_데이터_샘플", sample_data, False),
+            ("HITACHI_원본데이터_Fixed", hitachi_reordered, False),
+            ("SIEMENS_원본데이터_Fixed", siemens_reordered, False),
+            ("통합_원본데이터_Fixed", combined_reordered, False),
+        ]
+        combined_sheet_df = combined_reordered
+        sheet_layouts = None
+
+        logger.info(f"[DEBUG] Excel 저장 시도: {len(combined_reordered.columns)}개 컬럼")
+        with profile_phase("save", rows=len(combined_reordered)):
+            if self.streaming_excel:
+                # 행 순서 스트리밍 기록 (xlsxwriter constant_memory)
+                sheet_layouts = write_excel_sheets(excel_filename, report_sheets)
+            else:
+                with pd.ExcelWriter(excel_filename, engine="xlsxwriter") as writer:
+                    for sheet_name, sheet_df, with_index in report_sheets:
+                        sheet_df.to_excel(writer, sheet_name=sheet_name, index=with_index)
+        logger.info("[SUCCESS] Excel 저장 완료")
 
-            # 🔍 디버그: Excel 저장 시도
+        logger.info(f" 표준 헤더 순서 적용 완료: {len(combined_reordered.columns)}개 컬럼")
+
+        # 저장 후 검증 (시트 데이터 대신 시트 목록/dimension 메타데이터만 읽음)
+        with profile_phase("verify"):
             try:
-                # Excel 저장 시 컬럼 제한 확인
-                logger.info(f"[DEBUG] Excel 저장 시도: {len(combined_reordered.columns)}개 컬럼")
-                combined_reordered.to_excel(writer, sheet_name="통합_원본데이터_Fixed", index=False)
-                logger.info("[SUCCESS] Excel 저장 완료")
+                if sheet_layouts is not None:
+                    verify_sheet_dimensions(excel_filename, sheet_layouts)
+                else:
+                    dimensions = read_sheet_dimensions(excel_filename)
+                    expected = [sheet_name for sheet_name, _, _ in report_sheets]
+                    if list(dimensions) != expected:
+                        raise SheetLayoutError(f"시트 순서 불일치: {list(dimensions)}")
             except Exception as e:
-                logger.error(f"[ERROR] Excel 저장 실패: {e}")
-                # 컬럼명 문제일 수 있으므로 컬럼명을 안전하게 변경
-                safe_df = combined_reordered.copy()
-                safe_df.columns = [
-                    str(col).replace(" ", "_").replace(".", "_") for col in safe_df.columns
-                ]
-                safe_df.to_excel(writer, sheet_name="통합_원본데이터_Fixed", index=False)
-                logger.info("[FALLBACK] 안전한 컬럼명으로 Excel 저장 완료")
-
-        # 🔍 디버그: Excel 저장 후 검증
-        logger.info(f"\n[DEBUG] Excel 저장 후 검증:")
-        logger.info(f"  - combined_reordered 컬럼 수: {len(combined_reordered.columns)}")
-        logger.info(f"  - 'Total sqm' 존재: {'Total sqm' in combined_reordered.columns}")
-        logger.info(f"  - 'Stack_Status' 존재: {'Stack_Status' in combined_reordered.columns}")
-
-        logger.info(f" 표준 헤더 순서 적용 완료: {len(combined_reordered.columns)}개 컬럼")
+                print(f" [경고] 엑셀 파일 저장 후 검증 실패: {e}")
 
-        # 저장 후 검증
-        try:
-            _ = pd.read_excel(excel_filename, sheet_name=0)
-        except Exception as e:
-            print(f" [경고] 엑셀 파일 저장 후 열기 실패: {e}")
+        # Stage 4 입력 시트용 Parquet 사이드카 (xlsx 확정 후 지문 기록)
+        with profile_phase("sidecar"):
+            sidecar = write_sidecar(combined_sheet_df, excel_filename, "통합_원본데이터_Fixed")
+        if sidecar:
+            logger.info(" 통합_원본데이터_Fixed Parquet 사이드카 저장 완료")
 
         logger.info(f" 최종 Excel 리포트 생성 완료: {excel_filename}")
         logger.info(
@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+Stage 3 Streaming Excel Writer
+==============================
+
+``pd.ExcelWriter``는 셀을 **컬럼 순서**로 기록하므로 xlsxwriter의
+``constant_memory`` 모드(행 순서 기록 시 완료된 행을 바로 디스크로 flush)와
+함께 쓸 수 없고, 일반 모드에서는 워크북 전체 셀이 메모리에 남습니다.
+원본 데이터 시트 3개(HITACHI/SIEMENS/통합)가 들어가는 최종 리포트는 이 때문에
+최대 메모리가 수 GB까지 올라갑니다.
+
+``StreamingExcelWriter``는 같은 레이아웃을 **행 순서**로 기록합니다.
+
+- 헤더: pandas ``to_excel``과 같은 서식(굵게, 얇은 테두리, 가운데/위 정렬),
+  MultiIndex 컬럼은 레벨별 헤더 행 + 같은 라벨 구간 병합 + 인덱스 이름 행
+- 값: NaN/NaT/None은 빈 셀, datetime은 ``YYYY-MM-DD HH:MM:SS``, date는
+  ``YYYY-MM-DD``, ±inf는 ``"inf"``/``"-inf"`` 문자열 (pandas 기본값과 동일)
+- 데이터 행은 ``chunk_rows`` 단위로 object 배열로 변환해 기록하므로 시트 전체를
+  셀 객체로 만들지 않습니다.
+
+``read_sheet_dimensions``는 저장 후 검증용으로 각 시트의 ``<dimension>``
+메타데이터(행/열 수)만 읽습니다 (시트 데이터 파싱 없음).
+
+Examples:
+    >>> with StreamingExcelWriter("report.xlsx") as writer:
+    ...     writer.write_frame(monthly, "창고_월별_입출고", index=True)
+    ...     writer.write_frame(raw, "통합_원본데이터_Fixed")
+    >>> verify_sheet_dimensions("report.xlsx", writer.layouts)
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from openpyxl import load_workbook
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+DEFAULT_CHUNK_ROWS = 5000
+# pandas ExcelFormatter.header_style / xlsxwriter 엔진 기본 서식
+HEADER_FORMAT = {"bold": True, "border": 1, "align": "center", "valign": "top"}
+DATETIME_FORMAT = "YYYY-MM-DD HH:MM:SS"
+DATE_FORMAT = "YYYY-MM-DD"
+TIMEDELTA_FORMAT = "0"
+
+_PLAIN_TYPES = (str, bool, int, float)
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    """
+    기록된 시트 1개
+
+    ``rows``/``columns``는 실제로 값이나 서식을 기록한 셀 범위(헤더 포함)로,
+    xlsx의 ``<dimension>``과 같은 기준입니다. 끝쪽 행/열이 모두 빈 값이면
+    ``header_rows + data_rows``보다 작을 수 있고, 셀이 하나도 없는 시트는 1x1입니다.
+    """
+
+    name: str
+    rows: int
+    columns: int
+    header_rows: int
+    data_rows: int
+
+
+class SheetLayoutError(ValueError):
+    """저장된 시트 구성이 기록한 레이아웃과 다름"""
+
+
+class StreamingExcelWriter:
+    """
+    xlsxwriter ``constant_memory`` 워크북에 DataFrame을 행 순서로 기록
+
+    Args:
+        path: 출력 xlsx 경로
+        chunk_rows: 한 번에 object 배열로 변환할 데이터 행 수
+
+    Attributes:
+        layouts: 시트 기록 순서대로의 ``SheetLayout`` 목록
+    """
+
+    def __init__(self, path: PathLike, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.path = Path(path)
+        self.chunk_rows = max(1, int(chunk_rows))
+        self.workbook = xlsxwriter.Workbook(str(self.path), {"constant_memory": True})
+        self.layouts: List[SheetLayout] = []
+        self._header_format = self.workbook.add_format(HEADER_FORMAT)
+        self._value_formats = {
+            datetime: self.workbook.add_format({"num_format": DATETIME_FORMAT}),
+            date: self.workbook.add_format({"num_format": DATE_FORMAT}),
+            timedelta: self.workbook.add_format({"num_format": TIMEDELTA_FORMAT}),
+        }
+        self._header_value_formats = {
+            kind: self.workbook.add_format({**HEADER_FORMAT, "num_format": num_format})
+            for kind, num_format in (
+                (datetime, DATETIME_FORMAT),
+                (date, DATE_FORMAT),
+                (timedelta, TIMEDELTA_FORMAT),
+            )
+        }
+
+    def __enter__(self) -> "StreamingExcelWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.workbook.close()
+
+    def write_frame(self, df: pd.DataFrame, sheet_name: str, index: bool = False) -> SheetLayout:
+        """
+        DataFrame 1개를 새 시트로 기록 (``df.to_excel(writer, sheet_name, index=index)``와
+        같은 셀 배치)
+
+        Returns:
+            SheetLayout
+        """
+        multi_columns = isinstance(df.columns, pd.MultiIndex)
+        if multi_columns and not index:
+            raise NotImplementedError(
+                "Writing to Excel with MultiIndex columns and no index ('index'=False) "
+                "is not yet implemented."
+            )
+        worksheet = self.workbook.add_worksheet(sheet_name)
+        index_levels = df.index.nlevels if index else 0
+        if multi_columns:
+            header_rows = self._write_multi_header(worksheet, df, index_levels)
+        else:
+            header_rows = self._write_flat_header(worksheet, df, index_levels)
+
+        row = header_rows
+        for start in range(0, len(df), self.chunk_rows):
+            chunk = df.iloc[start : start + self.chunk_rows]
+            row = self._write_rows(worksheet, chunk, row, index_levels)
+
+        # 셀이 없는 시트도 <dimension ref="A1"/>로 저장되므로 1x1로 기록
+        layout = SheetLayout(
+            name=sheet_name,
+            rows=worksheet.dim_rowmax + 1 if worksheet.dim_rowmax is not None else 1,
+            columns=worksheet.dim_colmax + 1 if worksheet.dim_colmax is not None else 1,
+            header_rows=header_rows,
+            data_rows=len(df),
+        )
+        self.layouts.append(layout)
+        return layout
+
+    # ----- 헤더 -----
+    def _write_flat_header(self, worksheet, df: pd.DataFrame, index_levels: int) -> int:
+        labels: List = []
+        if index_levels:
+            labels.extend(df.index.names)
+        labels.extend(df.columns)
+        for col, label in enumerate(labels):
+            if label is not None:
+                self._write_header_cell(worksheet, 0, col, label)
+        return 1
+
+    def _write_multi_header(self, worksheet, df: pd.DataFrame, index_levels: int) -> int:
+        columns = df.columns
+        nlevels = columns.nlevels
+        offset = index_levels
+        tuples = list(columns)
+        for level in range(nlevels):
+            if index_levels and columns.names[level] is not None:
+                self._write_header_cell(worksheet, level, offset - 1, columns.names[level])
+            if level == nlevels - 1:
+                for col, key in enumerate(tuples):
+                    self._write_header_cell(worksheet, level, offset + col, key[level])
+                continue
+            # 상위 레벨 라벨이 모두 같은 연속 구간은 병합 (pandas merge_cells=True)
+            start = 0
+            while start < len(tuples):
+                end = start
+                prefix = tuples[start][: level + 1]
+                while end + 1 < len(tuples) and tuples[end + 1][: level + 1] == prefix:
+                    end += 1
+                label = tuples[start][level]
+                if end > start:
+                    worksheet.merge_range(
+                        level,
+                        offset + start,
+                        level,
+                        offset + end,
+                        _header_value(label),
+                        self._header_format,
+                    )
+                else:
+                    self._write_header_cell(worksheet, level, offset + start, label)
+                start = end + 1
+        header_rows = nlevels
+        if index_levels:
+            # pandas는 MultiIndex 컬럼 아래에 인덱스 이름 행을 한 줄 둡니다
+            for col, name in enumerate(df.index.names):
+                if name is not None:
+                    self._write_header_cell(worksheet, header_rows, col, name)
+            header_rows += 1
+        return header_rows
+
+    def _write_header_cell(self, worksheet, row: int, col: int, label) -> None:
+        value = _header_value(label)
+        if value is None or value == "":
+            worksheet.write_blank(row, col, None, self._header_format)
+            return
+        fmt = self._header_value_formats.get(_value_kind(value), self._header_format)
+        worksheet.write(row, col, value, fmt)
+
+    # ----- 데이터 -----
+    def _write_rows(self, worksheet, chunk: pd.DataFrame, row: int, index_levels: int) -> int:
+        arrays = []
+        if index_levels:
+            index = chunk.index
+            for level in range(index_levels):
+                values = index.get_level_values(level) if index_levels > 1 else index
+                arrays.append(_cell_values(pd.Series(values, copy=False)))
+        for position in range(chunk.shape[1]):
+            arrays.append(_cell_values(chunk.iloc[:, position]))
+
+        header_format = self._header_format
+        header_value_formats = self._header_value_formats
+        value_formats = self._value_formats
+        write = worksheet.write
+        for values in zip(*arrays):
+            for col, value in enumerate(values):
+                if value is None:
+                    if col < index_levels:
+                        worksheet.write_blank(row, col, None, header_format)
+                    continue
+                kind = _value_kind(value)
+                if col < index_levels:
+                    fmt = header_value_formats.get(kind, header_format)
+                else:
+                    fmt = value_formats.get(kind)
+                if kind is timedelta:
+                    value = value.total_seconds() / 86400
+                write(row, col, value, fmt)
+            row += 1
+        return row
+
+
+def _value_kind(value) -> Optional[type]:
+    if isinstance(value, datetime):
+        return datetime
+    if isinstance(value, date):
+        return date
+    if isinstance(value, timedelta):
+        return timedelta
+    return None
+
+
+def _header_value(label):
+    if label is None or (isinstance(label, float) and math.isnan(label)):
+        return None
+    return _plain_value(label)
+
+
+def _plain_value(value):
+    """pandas xlsxwriter 엔진과 같은 값 변환 (빈 값은 None)"""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        if math.isinf(value):
+            return "inf" if value > 0 else "-inf"
+        return value
+    if isinstance(value, (_PLAIN_TYPES, datetime, date, timedelta)):
+        if isinstance(value, datetime) and pd.isna(value):
+            return None
+        return value
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return str(value)
+
+
+def _cell_values(series: pd.Series) -> np.ndarray:
+    """컬럼 1개를 셀 값 object 배열로 변환 (결측은 None)"""
+    values = series.to_numpy(dtype=object, copy=True)
+    missing = pd.isna(series).to_numpy()
+    values[missing] = None
+    dtype = series.dtype
+    if dtype == object or isinstance(dtype, pd.CategoricalDtype):
+        return np.fromiter(
+            (None if value is None else _plain_value(value) for value in values),
+            dtype=object,
+            count=len(values),
+        )
+    if pd.api.types.is_float_dtype(dtype):
+        finite = np.isfinite(series.to_numpy(dtype=float, na_value=np.nan))
+        for position in np.flatnonzero(~finite & ~missing):
+            values[position] = "inf" if values[position] > 0 else "-inf"
+    elif not (
+        pd.api.types.is_integer_dtype(dtype)
+        or pd.api.types.is_bool_dtype(dtype)
+        or pd.api.types.is_datetime64_any_dtype(dtype)
+        or pd.api.types.is_timedelta64_dtype(dtype)
+    ):
+        values[~missing] = [_plain_value(value) for value in values[~missing]]
+    return values
+
+
+def write_excel_sheets(
+    path: PathLike,
+    sheets: Sequence[Tuple[str, pd.DataFrame, bool]],
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> List[SheetLayout]:
+    """
+    (시트 이름, DataFrame, index) 목록을 순서대로 스트리밍 기록
+
+    Returns:
+        시트별 SheetLayout
+    """
+    with StreamingExcelWriter(path, chunk_rows=chunk_rows) as writer:
+        for sheet_name, df, index in sheets:
+            writer.write_frame(df, sheet_name, index=index)
+    return writer.layouts
+
+
+def read_sheet_dimensions(path: PathLike) -> Dict[str, Tuple[int, int]]:
+    """
+    시트별 (행 수, 열 수)를 ``<dimension>`` 메타데이터에서만 읽기
+
+    read-only openpyxl은 시트 XML 앞부분의 dimension 요소까지만 파싱합니다.
+    dimension이 없는 시트는 (0, 0)입니다.
+    """
+    book = load_workbook(path, read_only=True)
+    try:
+        dimensions = {}
+        for worksheet in book.worksheets:
+            dimensions[worksheet.title] = (worksheet.max_row or 0, worksheet.max_column or 0)
+        return dimensions
+    finally:
+        book.close()
+
+
+def verify_sheet_dimensions(path: PathLike, layouts: Sequence[SheetLayout]) -> None:
+    """
+    저장된 워크북의 시트 순서/크기가 기록한 레이아웃과 같은지 확인
+
+    Raises:
+        SheetLayoutError: 시트 누락/순서 불일치 또는 행·열 수 불일치
+    """
+    dimensions = read_sheet_dimensions(path)
+    expected_names = [layout.name for layout in layouts]
+    if list(dimensions) != expected_names:
+        raise SheetLayoutError(f"시트 순서 불일치: {list(dimensions)} != {expected_names}")
+    for layout in layouts:
+        rows, columns = dimensions[layout.name]
+        if (rows, columns) != (layout.rows, layout.columns):
+            raise SheetLayoutError(
+                f"{layout.name}: 저장된 크기 {rows}x{columns} != 기록 {layout.rows}x{layout.columns}"
+            )
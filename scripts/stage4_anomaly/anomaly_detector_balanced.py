@@ -18,6 +18,7 @@ from __future__ import annotations
 import json
 import logging
 import math
+import sys
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -50,6 +51,26 @@ try:
 except Exception:
     OPENPYXL_AVAILABLE = False
 
+# 위치 날짜 타임라인 (단독 실행 시 scripts/ 경로 추가)
+try:
+    from core.location_timeline import DAY_NS, NAT_INT64, LocationTimeline
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from core.location_timeline import DAY_NS, NAT_INT64, LocationTimeline
+
+# 파이프라인 프로파일러 (run_pipeline 밖에서 단독 실행하면 no-op)
+try:
+    from core.stage_profiler import profile_phase, record_rows
+except Exception:
+    from contextlib import nullcontext
+
+    def profile_phase(name, rows=None):  # type: ignore[misc]
+        return nullcontext()
+
+    def record_rows(rows):  # type: ignore[misc]
+        return None
+
+
 logger = logging.getLogger("balanced_boost")
 logger.setLevel(logging.INFO)
 if not logger.handlers:
@@ -126,6 +147,9 @@ class DetectorConfig:
     # 알림(선택)
     min_risk_to_alert: float = 0.9
 
+    # 위치 날짜 행렬 기반 규칙/피처 계산 (False면 행 단위 iterrows 경로)
+    use_vectorized: bool = True
+
     def __post_init__(self):
         if self.column_map is None:
             # Master 헤더 이름으로 정규화
@@ -172,6 +196,18 @@ class DetectorConfig:
 
 
 # ----- Utilities ---------------------------------------------------------------
+def case_ids(df: pd.DataFrame) -> np.ndarray:
+    """행별 str(CASE_NO) (컬럼이 없으면 "NA")"""
+    if "CASE_NO" not in df.columns:
+        return np.full(len(df), "NA", dtype=object)
+    return np.asarray([str(value) for value in df["CASE_NO"]], dtype=object)
+
+
+def location_timeline(df: pd.DataFrame, cfg: DetectorConfig) -> LocationTimeline:
+    """창고 + 현장 열의 위치 날짜 타임라인 (셀별 pd.to_datetime, 없는 열은 결측)"""
+    return LocationTimeline.from_frame(df, cfg.warehouse_columns + cfg.site_columns)
+
+
 class HeaderNormalizer:
     def __init__(self, column_map: Dict[str, str]):
         self.map = {k.lower(): v for k, v in column_map.items()}
@@ -233,13 +269,71 @@ class FeatureBuilder:
         self.cfg = cfg
 
     def build(
-        self, df: pd.DataFrame
+        self, df: pd.DataFrame, timeline: Optional[LocationTimeline] = None
     ) -> Tuple[pd.DataFrame, List[Tuple[str, str, int]]]:
         """
         반환:
           - 행 단위 피처(정규화된 CASE_NO index)
           - dwell 목록[(case_id, location, dwell_days)]
+
+        위치 날짜 행렬에서 TOUCH_COUNT/FIRST_TS/LAST_TS는 행 단위 축약,
+        dwell은 방문 순서(케이스, 날짜, 열 순서)의 케이스 내 차분으로 계산합니다.
         """
+        if not self.cfg.use_vectorized:
+            return self._build_rowwise(df)
+        if timeline is None:
+            timeline = location_timeline(df, self.cfg)
+        ids = case_ids(df)
+
+        # 행 단위 축약 (결측은 NAT_INT64 = int64 최솟값)
+        dated = ~timeline.missing
+        touch_count = dated.sum(axis=1)
+        has_points = touch_count > 0
+        first_ns = np.where(dated, timeline.ns, np.iinfo(np.int64).max).min(axis=1)
+        last_ns = timeline.ns.max(axis=1)
+        first_ns[~has_points] = NAT_INT64
+        total_days = np.floor_divide(last_ns - first_ns, DAY_NS)
+        if has_points.all():
+            total_days = total_days.astype("int64")
+        else:
+            total_days = np.where(has_points, total_days, np.nan)
+
+        # dwell: 같은 케이스의 연속 방문 차분
+        case, location, ns = timeline.visits()
+        same_case = case[1:] == case[:-1]
+        dwell_days = np.floor_divide(np.diff(ns)[same_case], DAY_NS)
+        locations = np.asarray(timeline.locations, dtype=object)
+        dwell_list = list(
+            zip(
+                ids[case[:-1][same_case]].tolist(),
+                locations[location[:-1][same_case]].tolist(),
+                dwell_days.tolist(),
+            )
+        )
+
+        def numeric(column: str) -> np.ndarray:
+            if column not in df.columns:
+                return np.full(len(df), np.nan)
+            return pd.to_numeric(df[column], errors="coerce").to_numpy()
+
+        feat = pd.DataFrame(
+            {
+                "TOUCH_COUNT": touch_count.astype("int64"),
+                "TOTAL_DAYS": total_days,
+                "FIRST_TS": first_ns.view("datetime64[ns]"),
+                "LAST_TS": last_ns.view("datetime64[ns]"),
+                "AMOUNT": numeric("AMOUNT"),
+                "QTY": numeric("QTY"),
+                "PKG": numeric("PKG"),
+            },
+            index=pd.Index(ids, name="CASE_NO"),
+        )
+        return feat, dwell_list
+
+    def _build_rowwise(
+        self, df: pd.DataFrame
+    ) -> Tuple[pd.DataFrame, List[Tuple[str, str, int]]]:
+        """기존 iterrows 방식 (참조 구현)"""
         rows = []
         dwell_list: List[Tuple[str, str, int]] = []
 
@@ -346,6 +440,47 @@ class RuleDetector:
     def __init__(self, cfg: DetectorConfig):
         self.cfg = cfg
 
+    def time_reversals(
+        self, df: pd.DataFrame, timeline: Optional[LocationTimeline] = None
+    ) -> List[AnomalyRecord]:
+        """
+        time_reversal의 프레임 단위 버전 (행 순서, 행당 최대 1건)
+
+        날짜순 정렬이 열 순서와 다르다 = 열 순서로 나열한 방문 중 인접한 두
+        방문의 날짜가 감소하는 곳이 있다. 첫 감소 구간을 설명에 노출합니다.
+        """
+        if timeline is None:
+            timeline = location_timeline(df, self.cfg)
+        rows, columns = np.nonzero(~timeline.missing)  # 행 → 열 순서
+        ns = timeline.ns[rows, columns]
+        reversed_pair = (rows[1:] == rows[:-1]) & (ns[:-1] > ns[1:])
+        pair = np.flatnonzero(reversed_pair)
+        if not len(pair):
+            return []
+        _, first = np.unique(rows[pair], return_index=True)
+        pair = pair[first]
+
+        ids = case_ids(df)
+        days = np.datetime_as_string(ns.view("datetime64[ns]").astype("datetime64[D]"))
+        records = []
+        for a, b in zip(pair.tolist(), (pair + 1).tolist()):
+            name_a = timeline.locations[columns[a]]
+            name_b = timeline.locations[columns[b]]
+            records.append(
+                AnomalyRecord(
+                    case_id=ids[rows[a]],
+                    anomaly_type=AnomalyType.TIME_REVERSAL,
+                    severity=AnomalySeverity.CRITICAL,
+                    description=f"{name_a}({days[a]}) → {name_b}({days[b]}) 시간 역전",
+                    detected_value=None,
+                    expected_range=None,
+                    location=None,
+                    timestamp=datetime.now(),
+                    risk_score=0.999,  # balanced 위험도 기준 상한 근사치
+                )
+            )
+        return records
+
     def time_reversal(self, row: pd.Series) -> Optional[AnomalyRecord]:
         pts: List[Tuple[str, pd.Timestamp]] = []
         for col in self.cfg.warehouse_columns + self.cfg.site_columns:
@@ -524,8 +659,10 @@ class HybridAnomalyDetector:
         export_excel: Optional[str] = None,
         export_json: Optional[str] = None,
     ) -> Dict:
-        df = self.normalizer.normalize(df_raw)
-        issues = self.validator.validate(df)
+        with profile_phase("normalize", rows=len(df_raw)):
+            df = self.normalizer.normalize(df_raw)
+            issues = self.validator.validate(df)
+        record_rows(len(df))
         anomalies: List[AnomalyRecord] = []
         if issues:
             logger.warning(f"데이터 품질 이슈: {issues}")
@@ -547,17 +684,29 @@ class HybridAnomalyDetector:
                 ]
             )
 
-        # Rule — row-wise
-        for _, row in df.iterrows():
-            ar = self.rule.time_reversal(row)
-            if ar:
-                anomalies.append(ar)
+        # 위치 날짜 행렬 (규칙/피처 공유, 1회 파싱)
+        timeline = None
+        if self.cfg.use_vectorized:
+            with profile_phase("timeline", rows=len(df)):
+                timeline = location_timeline(df, self.cfg)
+
+        # Rule — 시간 역전
+        with profile_phase("rule", rows=len(df)):
+            if timeline is not None:
+                anomalies.extend(self.rule.time_reversals(df, timeline))
+            else:
+                for _, row in df.iterrows():
+                    ar = self.rule.time_reversal(row)
+                    if ar:
+                        anomalies.append(ar)
 
         # Features & Dwell
-        feat, dwell_list = FeatureBuilder(self.cfg).build(df)
+        with profile_phase("feature", rows=len(df)):
+            feat, dwell_list = FeatureBuilder(self.cfg).build(df, timeline)
 
         # Statistical — per location
-        stat_recs = self.stat.per_location_outliers(dwell_list)
+        with profile_phase("statistical", rows=len(dwell_list)):
+            stat_recs = self.stat.per_location_outliers(dwell_list)
         anomalies.extend(stat_recs)
 
         # Balanced: feed to combiner
@@ -567,48 +716,50 @@ class HybridAnomalyDetector:
         self.comb.ingest_stat(stat_recs)
 
         # ML
-        use_cols = [
-            c
-            for c in ["TOUCH_COUNT", "TOTAL_DAYS", "AMOUNT", "QTY", "PKG"]
-            if c in feat.columns
-        ]
-        X = feat[use_cols].fillna(0.0)
-        y, risk = self.ml.fit_predict(X)
-
-        if len(X):
-            for case_id, yi, ri in zip(X.index, y, risk):
-                if yi == 1:
-                    fused = self.comb.fuse(str(case_id), float(ri))
-                    sev = (
-                        AnomalySeverity.CRITICAL
-                        if fused >= 0.97
-                        else (
-                            AnomalySeverity.HIGH
-                            if fused >= 0.90
-                            else AnomalySeverity.MEDIUM
+        with profile_phase("ml", rows=len(feat)):
+            use_cols = [
+                c
+                for c in ["TOUCH_COUNT", "TOTAL_DAYS", "AMOUNT", "QTY", "PKG"]
+                if c in feat.columns
+            ]
+            X = feat[use_cols].fillna(0.0)
+            y, risk = self.ml.fit_predict(X)
+
+            if len(X):
+                for case_id, yi, ri in zip(X.index, y, risk):
+                    if yi == 1:
+                        fused = self.comb.fuse(str(case_id), float(ri))
+                        sev = (
+                            AnomalySeverity.CRITICAL
+                            if fused >= 0.97
+                            else (
+                                AnomalySeverity.HIGH
+                                if fused >= 0.90
+                                else AnomalySeverity.MEDIUM
+                            )
                         )
-                    )
-                    anomalies.append(
-                        AnomalyRecord(
-                            case_id=str(case_id),
-                            anomaly_type=AnomalyType.ML_OUTLIER,
-                            severity=sev,
-                            description=f"ML 이상치(위험도 {fused:.3f})",
-                            detected_value=float(fused),
-                            expected_range=None,
-                            location=None,
-                            timestamp=datetime.now(),
-                            risk_score=float(fused),
+                        anomalies.append(
+                            AnomalyRecord(
+                                case_id=str(case_id),
+                                anomaly_type=AnomalyType.ML_OUTLIER,
+                                severity=sev,
+                                description=f"ML 이상치(위험도 {fused:.3f})",
+                                detected_value=float(fused),
+                                expected_range=None,
+                                location=None,
+                                timestamp=datetime.now(),
+                                risk_score=float(fused),
+                            )
                         )
-                    )
 
         # Summary & export
         summary = self._build_summary(anomalies)
-        if export_json:
-            self._export_json(Path(export_json), anomalies)
-        if export_excel:
-            # 지표 덤프 포함
-            self._export_excel(Path(export_excel), anomalies, feat.reset_index())
+        with profile_phase("export", rows=len(anomalies)):
+            if export_json:
+                self._export_json(Path(export_json), anomalies)
+            if export_excel:
+                # 지표 덤프 포함
+                self._export_excel(Path(export_excel), anomalies, feat.reset_index())
         return {"summary": summary, "count": len(anomalies), "anomalies": anomalies}
 
     # -------- Summary/Exporters --------
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+테스트용 무작위 케이스 프레임 팩토리
+
+위치 컬럼(기본: Stage 3 창고 + 현장)마다 start + 임의 일수(+ 시각) 날짜를 만들고
+fill_rate 비율만 남긴다. 각 테스트는 행 수/시드/기간/채움 비율과 추가 컬럼 후보만
+넘기고, 텍스트 셀·동일 날짜 같은 특수 셀은 반환된 프레임에 직접 넣는다.
+"""
+
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def random_cases(
+    n_rows: int,
+    seed: int,
+    *,
+    start: str = "2024-01-01",
+    span_days: int = 60,
+    fill_rate: float = 0.3,
+    hours: Sequence[int] = (),
+    columns: Optional[Sequence[str]] = None,
+    choices: Optional[Dict[str, Sequence[Any]]] = None,
+    first_index: int = 0,
+) -> pd.DataFrame:
+    """
+    무작위 위치 날짜 케이스 프레임 생성
+
+    Args:
+        n_rows: 행 수
+        seed: np.random.RandomState 시드
+        start: 날짜 시작일
+        span_days: 날짜 범위 (start + 0 ~ span_days-1일)
+        fill_rate: 위치 셀에 날짜가 들어갈 비율
+        hours: 날짜에 더할 시각 후보 (비우면 자정)
+        columns: 위치 컬럼 (기본: Stage 3 창고 + 현장 컬럼)
+        choices: 위치 컬럼 앞에 둘 컬럼별 값 후보 (예: {"Pkg": [1, 2, np.nan]})
+        first_index: RangeIndex 시작값
+
+    Returns:
+        choices 컬럼 + 위치 날짜 컬럼(datetime64, 빈 셀은 NaT) 프레임
+    """
+    if columns is None:
+        from scripts.stage3_report.report_generator import CorrectedWarehouseIOCalculator
+
+        calculator = CorrectedWarehouseIOCalculator()
+        columns = calculator.warehouse_columns + calculator.site_columns
+
+    rng = np.random.RandomState(seed)
+    data = {column: rng.choice(values, n_rows) for column, values in (choices or {}).items()}
+    base = pd.Timestamp(start)
+    for column in columns:
+        offsets = pd.to_timedelta(rng.randint(0, span_days, n_rows), unit="D")
+        if len(hours):
+            offsets += pd.to_timedelta(rng.choice(hours, n_rows), unit="h")
+        data[column] = pd.Series(base + offsets).where(rng.rand(n_rows) < fill_rate).to_numpy()
+    return pd.DataFrame(data, index=pd.RangeIndex(first_index, first_index + n_rows))
@@ -0,0 +1,146 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import scripts.stage3_report.report_generator as report_generator
+from scripts.stage3_report.report_generator import CorrectedWarehouseIOCalculator, _get_sqm
+from tests._factories import random_cases
+
+
+def _frame(n_rows: int = 400, seed: int = 3) -> pd.DataFrame:
+    df = random_cases(
+        n_rows,
+        seed,
+        span_days=90,
+        choices={
+            "Pkg": [1, 3, 0, np.nan],
+            "SQM": [np.nan, 1.5, 4.0],
+            "FLOW_CODE": [1, 2, 3],
+        },
+        first_index=1000,
+    )
+    # 동일 날짜(시각은 다름) 창고간 이동과 날짜가 아닌 셀
+    df.loc[df.index[::5], "DSV Al Markaz"] = df.loc[df.index[::5], "DSV Indoor"] + pd.Timedelta(
+        hours=7
+    )
+    df.loc[df.index[::7], "MOSB"] = df.loc[df.index[::7], "DSV Indoor"]
+    df["AAA Storage"] = df["AAA Storage"].astype(object)
+    df.loc[df.index[::11], "AAA Storage"] = "TBA"
+    return df
+
+
+def test_context_is_shared_until_frame_changes():
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _frame(50)
+
+    context = calculator.analysis_context(df)
+    df["Final_Location"] = "Unknown"  # 위치 날짜가 아닌 컬럼 추가는 유지
+    assert calculator.analysis_context(df) is context
+
+    df["MIR"] = pd.to_datetime(df["MIR"]) + pd.Timedelta(days=1)
+    reassigned = calculator.analysis_context(df)
+    assert reassigned is not context
+    assert calculator.analysis_context(df.copy()) is not reassigned
+
+    calculator.invalidate_analysis_context()
+    assert calculator._analysis is None
+
+
+def test_in_place_date_edits_rebuild_context():
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _frame()
+    df["DSV Indoor"] = pd.to_datetime(df["DSV Indoor"])
+    before = calculator.calculate_warehouse_inbound_corrected(df)["total_inbound"]
+    context = calculator.analysis_context(df)
+
+    df.loc[:, "DSV Indoor"] = pd.NaT
+    df.iloc[0, df.columns.get_loc("MIR")] = pd.Timestamp("2030-01-01")
+    after = calculator.calculate_warehouse_inbound_corrected(df)["total_inbound"]
+
+    calculator.invalidate_analysis_context()
+    assert calculator.analysis_context(df) is not context
+    assert after == calculator.calculate_warehouse_inbound_corrected(df)["total_inbound"]
+    assert after != before
+
+
+def test_vectorized_calculators_parse_dates_once(monkeypatch):
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _frame()
+    calls = []
+    original = report_generator.LocationTimeline.from_frame
+    monkeypatch.setattr(
+        report_generator.LocationTimeline,
+        "from_frame",
+        classmethod(
+            lambda cls, frame, columns: calls.append(len(frame)) or original(frame, columns)
+        ),
+    )
+
+    calculator.calculate_warehouse_inbound_corrected(df)
+    calculator.calculate_warehouse_outbound_corrected(df)
+    calculator.calculate_direct_delivery(df)
+    calculator.create_monthly_inbound_pivot(df)
+    calculator.calculate_monthly_sqm_inbound(df)
+    calculator.calculate_monthly_sqm_outbound(df)
+    calculator.calculate_monthly_invoice_charges_prorated(df, {})
+
+    assert calls == [len(df)]
+
+
+def test_shared_transfers_match_row_detection():
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _frame()
+
+    expected = [
+        (idx, t["from_warehouse"], t["to_warehouse"], t["transfer_date"], t["pkg_quantity"])
+        for idx, row in df.iterrows()
+        for t in calculator._detect_warehouse_transfers(row)
+    ]
+    assert expected
+
+    inbound = calculator.calculate_warehouse_inbound_corrected(df)
+    assert [
+        (
+            t["Row_ID"],
+            t["from_warehouse"],
+            t["to_warehouse"],
+            t["transfer_date"],
+            t["pkg_quantity"],
+        )
+        for t in inbound["warehouse_transfers"]
+    ] == expected
+
+    batch = calculator._vectorized_detect_warehouse_transfers_batch(df)
+    assert sorted(
+        zip(
+            batch["Row_ID"],
+            batch["from_warehouse"],
+            batch["to_warehouse"],
+            batch["transfer_date"],
+            batch["pkg_quantity"],
+        )
+    ) == sorted(expected)
+
+
+def test_sqm_transfer_outbound_uses_transfer_rows():
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _frame()
+
+    result, transferred = calculator._sqm_transfer_outbound(df)
+
+    expected = {}
+    for _, row in df.iterrows():
+        for transfer in calculator._detect_warehouse_transfers(row):
+            month = transfer["transfer_date"].strftime("%Y-%m")
+            by_warehouse = expected.setdefault(month, {})
+            warehouse = transfer["from_warehouse"]
+            by_warehouse[warehouse] = by_warehouse.get(warehouse, 0) + _get_sqm(row)
+    assert expected and result.keys() == expected.keys()
+    for month, by_warehouse in expected.items():
+        assert result[month] == pytest.approx(by_warehouse)
+    assert transferred == {w for values in expected.values() for w in values}
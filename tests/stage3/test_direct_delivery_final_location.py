@@ -0,0 +1,91 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.stage3_report.movement_events import EventRecords
+from scripts.stage3_report.report_generator import CorrectedWarehouseIOCalculator
+from tests._factories import random_cases
+
+
+def _calculator(use_vectorized: bool) -> CorrectedWarehouseIOCalculator:
+    return CorrectedWarehouseIOCalculator(use_vectorized=use_vectorized)
+
+
+def _cases(n_rows: int = 400, seed: int = 13) -> pd.DataFrame:
+    calculator = _calculator(True)
+    df = random_cases(
+        n_rows,
+        seed,
+        start="2023-05-01",
+        fill_rate=0.35,
+        choices={
+            "Pkg": [1, 3, 0, np.nan, "2", "x", 2.0],
+            "FLOW_CODE": [1, 1.0, 2, 3, None],
+        },
+        first_index=100,
+    )
+
+    # 텍스트 셀 (TBA, 날짜 문자열) 및 동일 날짜 동률
+    for site in ("MIR", "SHU"):
+        df[site] = df[site].astype(object)
+    df.loc[100:110, "MIR"] = "TBA"
+    df.loc[111:120, "SHU"] = "2023-06-30"
+    df.loc[121:140, ["DSV Indoor", "DSV Al Markaz", "MOSB", "DHL WH"]] = pd.Timestamp("2024-01-01")
+    df.loc[141:150, ["DHL WH", "AGI"]] = pd.Timestamp("2024-02-01")
+    df.loc[151:155, calculator.warehouse_columns + calculator.site_columns] = None
+    return df
+
+
+@pytest.mark.parametrize("seed", [13, 29])
+def test_direct_delivery_matches_legacy(seed):
+    df = _cases(seed=seed)
+
+    expected = _calculator(False).calculate_direct_delivery(df.copy())
+    result = _calculator(True).calculate_direct_delivery(df.copy())
+
+    assert isinstance(result["direct_deliveries"], EventRecords)
+    assert result["total_direct_delivery"] == expected["total_direct_delivery"]
+    assert result["direct_deliveries"] == expected["direct_deliveries"]
+    assert len(expected["direct_deliveries"]) > 0
+
+
+def test_direct_delivery_without_flow_code():
+    df = _cases().drop(columns=["FLOW_CODE"])
+
+    result = _calculator(True).calculate_direct_delivery(df)
+
+    assert result["total_direct_delivery"] == 0
+    assert list(result["direct_deliveries"]) == []
+
+
+@pytest.mark.parametrize("seed", [13, 29])
+def test_final_location_matches_legacy(seed):
+    df = _cases(seed=seed)
+
+    expected = _calculator(False).calculate_final_location(df.copy())
+    result = _calculator(True).calculate_final_location(df.copy())
+
+    pd.testing.assert_series_equal(result["Final_Location"], expected["Final_Location"])
+
+
+def test_final_location_same_date_uses_location_priority():
+    result = _calculator(True).calculate_final_location(_cases())
+
+    # DSV Al Markaz(1) < DSV Indoor(2) < MOSB(9) < DHL WH(우선순위 없음, 99)
+    assert set(result.loc[121:140, "Final_Location"]) == {"DSV Al Markaz"}
+    # 현장 AGI(11)가 우선순위 없는 DHL WH보다 앞섬
+    assert set(result.loc[141:150, "Final_Location"]) == {"AGI"}
+    assert set(result.loc[151:155, "Final_Location"]) == {"Unknown"}
+
+
+def test_final_location_prefers_status_location():
+    df = pd.DataFrame({"Status_Location": ["MIR", None], "DSV Indoor": ["2024-01-01", None]})
+
+    result = _calculator(True).calculate_final_location(df)
+
+    assert result["Final_Location"].tolist() == ["MIR", "Unknown"]
@@ -0,0 +1,71 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.stage3_report.report_generator import (
+    CorrectedWarehouseIOCalculator,
+    HVDCExcelReporterFinal,
+)
+from tests._factories import random_cases
+
+
+def _reporter(use_vectorized: bool) -> HVDCExcelReporterFinal:
+    reporter = HVDCExcelReporterFinal.__new__(HVDCExcelReporterFinal)
+    reporter.calculator = CorrectedWarehouseIOCalculator(use_vectorized=use_vectorized)
+    return reporter
+
+
+def _frame(n_rows: int = 300, seed: int = 21) -> pd.DataFrame:
+    calculator = CorrectedWarehouseIOCalculator()
+    df = random_cases(
+        n_rows,
+        seed,
+        fill_rate=0.2,
+        hours=[0, 0, 13],
+        choices={"Pkg": [1, 2, 0, 3.0, np.nan], "FLOW_CODE": [1, 2, 3]},
+        first_index=10,
+    )
+    df.insert(0, "Case No.", [f"HE-{i:05d}" for i in range(n_rows)])
+    # 동일 시각 방문 (컬럼 순서 유지)과 방문 없는 케이스
+    df.loc[df.index[::5], "MIR"] = df.loc[df.index[::5], "DSV Indoor"]
+    df.loc[df.index[::17], calculator.warehouse_columns + calculator.site_columns] = pd.NaT
+    return df
+
+
+def test_segments_match_legacy():
+    df = _frame()
+
+    expected = _reporter(False)._ftd__build_segments(df)
+    result = _reporter(True)._ftd__build_segments(df)
+
+    assert len(expected) > len(df)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_traceability_frames_match_legacy():
+    df = _frame(200, seed=4)
+    stats = {"processed_data": df}
+
+    expected = _reporter(False).create_flow_traceability_frames(stats)
+    result = _reporter(True).create_flow_traceability_frames(stats)
+
+    pd.testing.assert_frame_equal(result["sankey_links"], expected["sankey_links"])
+    assert result["sankey_nodes"] == expected["sankey_nodes"]
+    assert result["kpis"] == pytest.approx(expected["kpis"])
+
+
+def test_segments_without_case_column_or_visits():
+    calculator = CorrectedWarehouseIOCalculator()
+    df = _frame(40).drop(columns=["Case No.", "Pkg"])
+
+    expected = _reporter(False)._ftd__build_segments(df)
+    result = _reporter(True)._ftd__build_segments(df)
+    pd.testing.assert_frame_equal(result, expected)
+
+    df[calculator.warehouse_columns + calculator.site_columns] = pd.NaT
+    assert _reporter(True)._ftd__build_segments(df).empty
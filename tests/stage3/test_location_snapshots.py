@@ -0,0 +1,63 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import pandas as pd
+
+from scripts.stage3_report.report_generator import CorrectedWarehouseIOCalculator
+from tests._factories import random_cases
+
+
+def _cases(n_rows: int = 250, seed: int = 17) -> pd.DataFrame:
+    df = random_cases(n_rows, seed, start="2023-01-01", span_days=400, first_index=10)
+
+    # 동일 날짜 동률, 텍스트 셀, 시각이 있는 날짜, 방문 없는 케이스
+    df.loc[10:30, ["DSV Indoor", "DSV Al Markaz", "DHL WH"]] = pd.Timestamp("2023-06-30")
+    df["MIR"] = df["MIR"].astype(object)
+    df.loc[31:40, "MIR"] = "TBA"
+    df.loc[41:50, "MIR"] = "2023-07-31 15:00"
+    df.loc[51:55, :] = None
+    return df
+
+
+def test_snapshots_match_row_resolver():
+    calculator = CorrectedWarehouseIOCalculator()
+    df = _cases()
+    snapshot_dates = list(pd.date_range("2022-12-31", "2024-03-31", freq="ME"))
+    snapshot_dates += [pd.Timestamp("2023-07-31 12:00"), pd.Timestamp("2023-07-31 15:00")]
+
+    result = calculator.calculate_final_locations_at_dates(df, snapshot_dates)
+
+    assert result.shape == (len(df), len(snapshot_dates))
+    assert list(result.index) == list(df.index)
+    for target in snapshot_dates:
+        expected = [
+            calculator._calculate_final_location_at_date(row, target) for _, row in df.iterrows()
+        ]
+        assert result[target].tolist() == expected, target
+
+
+def test_snapshot_ties_and_missing_values():
+    calculator = CorrectedWarehouseIOCalculator()
+    df = _cases()
+
+    result = calculator.calculate_final_locations_at_dates(
+        df, ["2023-06-29", "2023-06-30", None]
+    ).loc[10:30]
+
+    june_30 = result[pd.Timestamp("2023-06-30")]
+    assert set(june_30) == {"DSV Al Markaz"}
+    assert set(result.iloc[:, 2]) == {"Unknown"}
+
+
+def test_snapshots_without_locations_or_dates():
+    calculator = CorrectedWarehouseIOCalculator()
+
+    empty = calculator.calculate_final_locations_at_dates(
+        pd.DataFrame({"Pkg": [1, 2]}), ["2024-01-31"]
+    )
+    assert empty.iloc[:, 0].tolist() == ["Unknown", "Unknown"]
+
+    no_dates = calculator.calculate_final_locations_at_dates(_cases(), [])
+    assert no_dates.shape == (250, 0)
@@ -0,0 +1,48 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.stage3_report.report_generator import CorrectedWarehouseIOCalculator
+from tests._factories import random_cases
+
+
+def _cases(n_rows: int = 500, seed: int = 21) -> pd.DataFrame:
+    df = random_cases(
+        n_rows,
+        seed,
+        start="2022-10-01",
+        span_days=1000,
+        choices={"Pkg": [1, 2, 5, np.nan, 1.5]},
+    )
+
+    # 텍스트 셀 (TBA / 날짜 문자열)
+    df["MIR"] = df["MIR"].astype(object)
+    df.loc[0:20, "MIR"] = "TBA"
+    df["DAS"] = df["DAS"].dt.strftime("%Y-%m-%d").astype(object)
+    return df
+
+
+@pytest.mark.parametrize("seed", [21, 8])
+def test_monthly_inbound_pivot_matches_legacy(seed):
+    df = _cases(seed=seed)
+
+    expected = CorrectedWarehouseIOCalculator(use_vectorized=False).create_monthly_inbound_pivot(df)
+    result = CorrectedWarehouseIOCalculator(use_vectorized=True).create_monthly_inbound_pivot(df)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_monthly_inbound_pivot_layout():
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+
+    result = calculator.create_monthly_inbound_pivot(_cases())
+
+    locations = calculator.warehouse_columns + calculator.site_columns
+    assert list(result.columns) == ["Year_Month"] + [f"{loc}_Inbound" for loc in locations]
+    assert result["Year_Month"].iloc[0] == "2023-02"
+    assert (result.iloc[:, 1:].dtypes == "int64").all()
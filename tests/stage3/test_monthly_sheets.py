@@ -0,0 +1,109 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.stage3_report.report_generator import (
+    CorrectedWarehouseIOCalculator,
+    HVDCExcelReporterFinal,
+)
+
+SITES = ["AGI", "DAS", "MIR", "SHU"]
+
+
+def _reporter(use_vectorized: bool) -> HVDCExcelReporterFinal:
+    reporter = HVDCExcelReporterFinal.__new__(HVDCExcelReporterFinal)
+    reporter.calculator = CorrectedWarehouseIOCalculator(use_vectorized=use_vectorized)
+    return reporter
+
+
+def _stats(seed: int = 7, n_items: int = 600) -> dict:
+    rng = np.random.RandomState(seed)
+    warehouses = list(CorrectedWarehouseIOCalculator().warehouse_columns) + ["Unknown WH"]
+    months = [f"{year}-{month:02d}" for year in (2022, 2023, 2024) for month in range(1, 13)]
+
+    def pick(values):
+        return values[rng.randint(len(values))]
+
+    inbound_items = [
+        {
+            "Warehouse": pick(warehouses),
+            "Year_Month": pick(months),
+            "Inbound_Type": pick(["external_arrival", "warehouse_transfer"]),
+            "Pkg_Quantity": pick([1, 2, 5, 3.0]),
+        }
+        for _ in range(n_items)
+    ]
+    inbound_items.append({"Warehouse": warehouses[0], "Year_Month": "2023-03"})
+    transfers = []
+    for _ in range(n_items // 3):
+        transfer = {
+            "from_warehouse": pick(warehouses),
+            "to_warehouse": pick(warehouses),
+            "Year_Month": pick(months),
+        }
+        key = pick(["pkg_quantity", "Pkg_Quantity", None])
+        if key:
+            transfer[key] = pick([0, 1, 4])
+        transfers.append(transfer)
+    outbound_items = []
+    for _ in range(n_items):
+        item = {"From_Location": pick(warehouses), "Year_Month": pick(months)}
+        key = pick(["Pkg_Quantity", "pkg_quantity", None])
+        if key:
+            item[key] = pick([0, 2, 6])
+        outbound_items.append(item)
+
+    n_cases = 400
+    processed = {
+        "Final_Location": [pick(SITES + ["DSV Indoor"]) for _ in range(n_cases)],
+        "Pkg": [pick([1, 2, 3, None]) for _ in range(n_cases)],
+    }
+    for site in SITES:
+        processed[site] = [
+            pick([None, "TBA"] + [f"{m}-{rng.randint(1, 28):02d}" for m in months[12:]])
+            for _ in range(n_cases)
+        ]
+
+    return {
+        "inbound_result": {"inbound_items": inbound_items, "warehouse_transfers": transfers},
+        "outbound_result": {"outbound_items": outbound_items},
+        "processed_data": pd.DataFrame(processed),
+    }
+
+
+@pytest.mark.parametrize("seed", [7, 11])
+def test_warehouse_monthly_sheet_matches_legacy(seed):
+    stats = _stats(seed)
+
+    expected = _reporter(False).create_warehouse_monthly_sheet(stats)
+    result = _reporter(True).create_warehouse_monthly_sheet(stats)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert result.iloc[-1]["입고월"] == "Total"
+    assert list(result.columns[-2:]) == ["누계_입고", "누계_출고"]
+
+
+def test_warehouse_monthly_sheet_without_events():
+    stats = {"inbound_result": {}, "outbound_result": {}}
+
+    expected = _reporter(False).create_warehouse_monthly_sheet(stats)
+    result = _reporter(True).create_warehouse_monthly_sheet(stats)
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_site_monthly_sheet_matches_legacy():
+    stats = _stats()
+
+    expected = _reporter(False).create_site_monthly_sheet(stats)
+    result = _reporter(True).create_site_monthly_sheet(stats)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert list(result.columns) == ["입고월"] + [f"입고_{s}" for s in SITES] + [
+        f"재고_{s}" for s in SITES
+    ]
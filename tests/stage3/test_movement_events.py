@@ -0,0 +1,170 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import pandas as pd
+
+from scripts.stage3_report.movement_events import (
+    DIRECT_LAYOUT,
+    EVENT_COLUMNS,
+    OUTBOUND_LAYOUT,
+    TRANSFER_CONSTANTS,
+    TRANSFER_LAYOUT,
+    EventRecords,
+    concat_events,
+    events_from_records,
+    location_dtype,
+)
+from scripts.stage3_report.report_generator import (
+    CorrectedWarehouseIOCalculator,
+    HVDCExcelReporterFinal,
+)
+from tests._factories import random_cases
+
+
+def _cases(n_rows: int = 300, seed: int = 3) -> pd.DataFrame:
+    df = random_cases(
+        n_rows,
+        seed,
+        start="2023-03-01",
+        span_days=300,
+        choices={"Pkg": [1, 2, 0, np.nan, 4], "FLOW_CODE": [1, 2]},
+    )
+    df.loc[::6, "DSV Al Markaz"] = df.loc[::6, "DSV Indoor"]
+    df.loc[::9, "MOSB"] = df.loc[::9, "DSV Indoor"]
+    return df
+
+
+def test_records_round_trip_keeps_keys_and_types():
+    records = [
+        {
+            "Row_ID": 4,
+            "from_warehouse": "DSV Indoor",
+            "to_warehouse": "MOSB",
+            "transfer_date": pd.Timestamp("2024-02-03"),
+            "pkg_quantity": 2,
+            "transfer_type": "warehouse_to_warehouse",
+            "Year_Month": "2024-02",
+        },
+        {
+            "Row_ID": 9,
+            "from_warehouse": "AAA Storage",
+            "to_warehouse": "New WH",
+            "transfer_date": pd.Timestamp("2023-11-30"),
+            "pkg_quantity": 1,
+            "transfer_type": "warehouse_to_warehouse",
+            "Year_Month": "2023-11",
+        },
+    ]
+    locations = location_dtype(["DSV Indoor", "MOSB", "AAA Storage"])
+
+    frame = events_from_records(records, TRANSFER_LAYOUT, "warehouse_transfer", locations)
+    view = EventRecords(frame, TRANSFER_LAYOUT, TRANSFER_CONSTANTS)
+
+    assert list(frame.columns) == EVENT_COLUMNS
+    assert str(frame["Year_Month"].dtype) == "int32"
+    assert str(frame["Pkg_Quantity"].dtype) == "int32"
+    assert str(frame["To_Location"].dtype) == "category"
+    assert frame["Year_Month"].tolist() == [202402, 202311]
+    assert view == records
+    assert [list(record) for record in view] == [list(record) for record in records]
+    assert view[-1]["to_warehouse"] == "New WH"
+    assert type(view[0]["Row_ID"]) is int
+    assert view[1:] == records[1:]
+    pd.testing.assert_frame_equal(pd.DataFrame(view), pd.DataFrame(records))
+
+
+def test_empty_records_and_concat():
+    empty = EventRecords(events_from_records([], DIRECT_LAYOUT, "direct_delivery"), DIRECT_LAYOUT)
+
+    assert len(empty) == 0 and not empty
+    assert list(empty) == []
+    assert list(empty.to_frame().columns) == [key for key, _ in DIRECT_LAYOUT]
+
+    a = events_from_records(
+        [
+            {
+                "Item_ID": 1,
+                "Site": "MIR",
+                "Delivery_Date": pd.Timestamp("2024-01-02"),
+                "Pkg_Quantity": 1,
+            }
+        ],
+        DIRECT_LAYOUT,
+        "direct_delivery",
+    )
+    b = events_from_records(
+        [
+            {
+                "Item_ID": 2,
+                "Site": "DAS",
+                "Delivery_Date": pd.Timestamp("2024-03-02"),
+                "Pkg_Quantity": 3,
+            }
+        ],
+        DIRECT_LAYOUT,
+        "direct_delivery",
+    )
+    combined = concat_events([a, b])
+    assert str(combined["To_Location"].dtype) == "category"
+    assert combined["To_Location"].tolist() == ["MIR", "DAS"]
+
+
+def test_calculators_return_columnar_events():
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _cases()
+
+    inbound = calculator.calculate_warehouse_inbound_corrected(df)
+    outbound = calculator.calculate_warehouse_outbound_corrected(df)
+    direct = calculator.calculate_direct_delivery(df)
+
+    for items in (
+        inbound["inbound_items"],
+        inbound["warehouse_transfers"],
+        outbound["outbound_items"],
+        direct["direct_deliveries"],
+    ):
+        assert isinstance(items, EventRecords)
+        assert list(items.frame.columns) == EVENT_COLUMNS
+        assert len(items) > 0
+
+    inbound_frame = inbound["inbound_items"].frame
+    assert inbound_frame["Pkg_Quantity"].sum() == inbound["total_inbound"]
+    by_warehouse = inbound_frame.groupby("To_Location", observed=True)["Pkg_Quantity"].sum()
+    assert by_warehouse.to_dict() == {
+        warehouse: total for warehouse, total in inbound["by_warehouse"].items() if total
+    }
+    assert outbound["outbound_items"].frame["Pkg_Quantity"].sum() == outbound["total_outbound"]
+    assert set(outbound["outbound_items"].frame["Event_Type"]) <= {
+        "warehouse_transfer",
+        "warehouse_to_site",
+    }
+    assert direct["direct_deliveries"].frame["Pkg_Quantity"].sum() == (
+        direct["total_direct_delivery"]
+    )
+    assert list(outbound["outbound_items"][0]) == [key for key, _ in OUTBOUND_LAYOUT]
+
+
+def test_monthly_sheet_same_from_events_and_dict_lists():
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _cases()
+    inbound = calculator.calculate_warehouse_inbound_corrected(df)
+    outbound = calculator.calculate_warehouse_outbound_corrected(df)
+    reporter = HVDCExcelReporterFinal.__new__(HVDCExcelReporterFinal)
+    reporter.calculator = calculator
+
+    columnar = {"inbound_result": inbound, "outbound_result": outbound}
+    as_lists = {
+        "inbound_result": {
+            "inbound_items": list(inbound["inbound_items"]),
+            "warehouse_transfers": list(inbound["warehouse_transfers"]),
+        },
+        "outbound_result": {"outbound_items": list(outbound["outbound_items"])},
+    }
+
+    pd.testing.assert_frame_equal(
+        reporter.create_warehouse_monthly_sheet(columnar),
+        reporter.create_warehouse_monthly_sheet(as_lists),
+    )
@@ -0,0 +1,136 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.stage3_report.report_generator import CorrectedWarehouseIOCalculator
+
+
+def _frame(n_rows: int = 600, seed: int = 11, distinct_warehouse_days: bool = False):
+    calculator = CorrectedWarehouseIOCalculator()
+    rng = np.random.RandomState(seed)
+    base = pd.Timestamp("2024-01-01")
+    warehouses = calculator.warehouse_columns
+    data = {
+        "Pkg": rng.choice([1, 2.7, 0, np.nan], n_rows),
+        "SQM": rng.choice([np.nan, 2.5], n_rows),
+    }
+    for position, column in enumerate(warehouses):
+        if distinct_warehouse_days:
+            days = rng.randint(0, 40, n_rows) * len(warehouses) + position
+        else:
+            days = rng.randint(0, 60, n_rows)
+        data[column] = pd.Series(base + pd.to_timedelta(days, unit="D")).where(
+            rng.rand(n_rows) < 0.35
+        )
+    for column in calculator.site_columns:
+        days = rng.randint(0, 40 * len(warehouses), n_rows)
+        hours = rng.choice([0, 0, 9, 18], n_rows)
+        data[column] = pd.Series(
+            base + pd.to_timedelta(days, unit="D") + pd.to_timedelta(hours, unit="h")
+        ).where(rng.rand(n_rows) < 0.4)
+    df = pd.DataFrame(data, index=pd.RangeIndex(100, 100 + n_rows))
+    # 동일 날짜/동일 시각 현장 도착과 날짜가 아닌 셀
+    df.loc[df.index[::6], "MIR"] = df.loc[df.index[::6], warehouses[1]]
+    df.loc[df.index[::9], "SHU"] = df.loc[df.index[::9], "MIR"]
+    df["DAS"] = df["DAS"].astype(object)
+    df.loc[df.index[::13], "DAS"] = "TBA"
+    return df
+
+
+def _reference_matches(calculator, df, by_day, first_only, excluded=()):
+    """행 단위 참조 구현: 창고별 가장 빠른 이후 현장 이동 (같은 날짜면 현장 컬럼 순서)"""
+    rows = []
+    for row_position in range(len(df)):
+        row = df.iloc[row_position]
+        sites = [
+            (site, pd.to_datetime(row[site], errors="coerce")) for site in calculator.site_columns
+        ]
+        sites = [(site, date) for site, date in sites if pd.notna(date)]
+        for wh_position, warehouse in enumerate(calculator.warehouse_columns):
+            wh_date = pd.to_datetime(row[warehouse], errors="coerce")
+            if warehouse in excluded or pd.isna(wh_date):
+                continue
+            if by_day:
+                later = [(s, d) for s, d in sites if d.normalize() > wh_date.normalize()]
+            else:
+                later = [(s, d) for s, d in sites if d > wh_date]
+            if later:
+                site, date = min(later, key=lambda item: item[1])
+                rows.append((row_position, warehouse, site, date))
+                if first_only:
+                    break
+    return rows
+
+
+@pytest.mark.parametrize(
+    "by_day,first_only,excluded",
+    [(True, True, ()), (False, False, ()), (False, False, ("DSV Indoor", "MOSB"))],
+)
+def test_matcher_matches_row_reference(by_day, first_only, excluded):
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _frame()
+
+    matches = calculator._warehouse_site_matches(
+        df, by_day=by_day, first_only=first_only, excluded_warehouses=excluded
+    )
+
+    result = list(
+        zip(
+            matches["Row"].tolist(),
+            matches["Warehouse"],
+            matches["Site"],
+            matches["Site_Date"],
+        )
+    )
+    assert result == _reference_matches(calculator, df, by_day, first_only, excluded)
+
+
+def test_matcher_without_site_dates_returns_none():
+    calculator = CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _frame(50)
+    df[calculator.site_columns] = np.nan
+
+    assert calculator._warehouse_site_matches(df, by_day=True, first_only=True) is None
+    result = calculator.calculate_warehouse_outbound_corrected(df)
+    sqm = calculator.calculate_monthly_sqm_outbound(df)
+    assert all(item["Outbound_Type"] != "warehouse_to_site" for item in result["outbound_items"])
+    assert isinstance(sqm, dict)
+
+
+def test_vectorized_outbound_matches_legacy_without_transfers():
+    df = _frame(300, seed=4, distinct_warehouse_days=True)
+    for column in CorrectedWarehouseIOCalculator().site_columns:
+        df[column] = pd.to_datetime(df[column], errors="coerce").dt.normalize()
+    legacy = CorrectedWarehouseIOCalculator(use_vectorized=False)
+    vectorized = CorrectedWarehouseIOCalculator(use_vectorized=True)
+
+    expected = legacy.calculate_warehouse_outbound_corrected(df)
+    result = vectorized.calculate_warehouse_outbound_corrected(df)
+
+    def site_events(outbound):
+        return [
+            (
+                item["Item_ID"],
+                item["From_Location"],
+                item["To_Location"],
+                pd.Timestamp(item["Outbound_Date"]),
+                int(item["Pkg_Quantity"]),
+            )
+            for item in outbound["outbound_items"]
+            if item["Outbound_Type"] == "warehouse_to_site"
+        ]
+
+    assert site_events(result) == site_events(expected)
+    assert result["total_outbound"] == expected["total_outbound"]
+    assert result["by_warehouse"] == expected["by_warehouse"]
+
+    expected_sqm = legacy.calculate_monthly_sqm_outbound(df)
+    result_sqm = vectorized.calculate_monthly_sqm_outbound(df)
+    assert expected_sqm.keys() == result_sqm.keys()
+    for month, by_warehouse in expected_sqm.items():
+        assert result_sqm[month] == pytest.approx(by_warehouse)
@@ -0,0 +1,130 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.stage3_report.parallel_executor import (
+    ChunkExecutionError,
+    ParallelExecutor,
+    SharedFrame,
+    partition_by_case,
+)
+from scripts.stage3_report.report_generator import CorrectedWarehouseIOCalculator
+from tests._factories import random_cases
+
+
+def _cases(n_rows: int = 1200, seed: int = 5) -> pd.DataFrame:
+    df = random_cases(
+        n_rows,
+        seed,
+        start="2023-01-01",
+        span_days=400,
+        choices={"Pkg": [1, 2, 0, np.nan, 4], "SQM": [np.nan, 1.5, 3.0]},
+        first_index=10,
+    )
+    df.insert(0, "Case No.", [f"C{i // 3:05d}" for i in range(n_rows)])
+    df.loc[::5, "DSV Al Markaz"] = df.loc[::5, "DSV Indoor"]
+    df.loc[::7, "MOSB"] = df.loc[::7, "DSV Indoor"]
+    # 케이스 행이 흩어져 있어도 같은 청크로
+    return df.sample(frac=1.0, random_state=seed)
+
+
+def _failing_task(context, chunk_df):
+    if context in chunk_df["Case No."].tolist():
+        raise ValueError("bad case")
+    return len(chunk_df)
+
+
+def _calculate_all(calculator, df):
+    return (
+        calculator.calculate_warehouse_inbound_corrected(df),
+        calculator.calculate_warehouse_outbound_corrected(df),
+        calculator.calculate_monthly_sqm_outbound(df),
+        calculator.calculate_monthly_invoice_charges_prorated(df, {}),
+    )
+
+
+def test_partition_keeps_cases_together():
+    df = _cases()
+
+    chunks = partition_by_case(df, 4)
+
+    positions = np.concatenate([chunk.positions for chunk in chunks])
+    assert sorted(positions.tolist()) == list(range(len(df)))
+    case_sets = [set(df["Case No."].iloc[chunk.positions]) for chunk in chunks]
+    assert sum(len(cases) for cases in case_sets) == df["Case No."].nunique()
+    assert all(np.all(np.diff(chunk.positions) > 0) for chunk in chunks)
+    assert [chunk.chunk_id for chunk in chunks] == [0, 1, 2, 3]
+
+
+def test_shared_frame_round_trip():
+    df = pd.DataFrame(
+        {
+            "Case No.": ["A", np.nan, "C"],
+            "Pkg": [1.0, np.nan, 3.0],
+            "DSV Indoor": pd.to_datetime(["2024-01-01", None, "2024-02-01"]),
+        },
+        index=[5, 6, 7],
+    )
+    with SharedFrame(df) as shared:
+        assert shared.format == "arrow"
+        pd.testing.assert_frame_equal(SharedFrame.load(*shared.load_args), df)
+        assert shared.path.exists()
+    assert not shared.path.exists()
+
+    mixed = df.assign(MIR=[pd.Timestamp("2024-01-03"), "TBA", None])
+    with SharedFrame(mixed) as shared:
+        assert shared.format == "pickle"
+        pd.testing.assert_frame_equal(SharedFrame.load(*shared.load_args), mixed)
+
+
+@pytest.mark.parametrize("workers,chunks", [(1, 4), (2, 3)])
+def test_parallel_calculators_match_vectorized(workers, chunks):
+    df = _cases()
+    calculator = CorrectedWarehouseIOCalculator(
+        use_vectorized=True, use_parallel=True, workers=workers
+    )
+    calculator.parallel_chunks = chunks
+
+    expected = _calculate_all(CorrectedWarehouseIOCalculator(use_vectorized=True), df)
+    result = _calculate_all(calculator, df)
+
+    for expected_part, result_part in zip(expected[:2], result[:2]):
+        assert expected_part.keys() == result_part.keys()
+        for key, value in expected_part.items():
+            if hasattr(value, "frame"):
+                pd.testing.assert_frame_equal(result_part[key].frame, value.frame)
+            else:
+                assert result_part[key] == value
+    assert result[2] == expected[2]
+    assert result[3] == expected[3]
+
+    assert set(calculator.parallel_timings) == {
+        "inbound",
+        "outbound",
+        "sqm_outbound",
+        "invoice_charges",
+    }
+    timings = calculator.parallel_timings["inbound"]
+    assert [timing.chunk_id for timing in timings] == list(range(chunks))
+    assert sum(timing.rows for timing in timings) == len(df)
+    assert all(timing.seconds >= 0 for timing in timings)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_chunk_errors_report_chunk_identity(workers):
+    df = _cases(n_rows=60)
+    bad_case = df["Case No."].iloc[-1]
+    executor = ParallelExecutor(workers=workers, chunks=3)
+
+    with pytest.raises(ChunkExecutionError) as excinfo:
+        executor.map(df, _failing_task, context=bad_case)
+
+    error = excinfo.value
+    assert bad_case in set(df["Case No."].iloc[error.chunk.positions])
+    assert f"chunk {error.chunk.chunk_id}" in str(error)
+    assert "_failing_task" in str(error) and "bad case" in str(error)
@@ -0,0 +1,87 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.stage3_report.report_generator import CorrectedWarehouseIOCalculator
+from tests._factories import random_cases
+
+
+def _calculator(use_vectorized: bool) -> CorrectedWarehouseIOCalculator:
+    return CorrectedWarehouseIOCalculator(use_vectorized=use_vectorized)
+
+
+def _cases(n_rows: int = 200, seed: int = 4) -> pd.DataFrame:
+    df = random_cases(
+        n_rows,
+        seed,
+        start="2023-01-01",
+        span_days=400,
+        fill_rate=0.25,
+        hours=range(24),
+        columns=_calculator(True).warehouse_columns,
+        choices={"Pkg": [1, 2, 3, np.nan], "SQM": [np.nan, 2.5, 10.0, 0.37]},
+    )
+    # 동일일 창고간 이동 (0일 구간)
+    df.loc[::5, "DSV Al Markaz"] = df.loc[::5, "DSV Indoor"]
+    return df
+
+
+def test_interval_engine_matches_daily_legacy():
+    df = _cases()
+    passthrough = {("2023-05", "AAA Storage"): 1234.567}
+
+    expected = _calculator(False).calculate_monthly_invoice_charges_prorated(df, passthrough)
+    result = _calculator(True).calculate_monthly_invoice_charges_prorated(df, passthrough)
+
+    assert list(result) == list(expected)
+    for ym, payload in expected.items():
+        assert list(result[ym]) == list(payload)
+        assert result[ym]["total_monthly_charge_aed"] == pytest.approx(
+            payload["total_monthly_charge_aed"], abs=0.011
+        )
+        for warehouse, entry in payload.items():
+            if warehouse == "total_monthly_charge_aed":
+                continue
+            got = result[ym][warehouse]
+            for key in ("billing_mode", "rate_aed", "amount_source"):
+                assert got[key] == entry[key]
+            # 합산 순서 차이로 반올림 경계에서 0.01 차이 허용
+            assert got["avg_sqm"] == pytest.approx(entry["avg_sqm"], abs=0.011)
+            assert got["monthly_charge_aed"] == pytest.approx(
+                entry["monthly_charge_aed"], abs=0.011
+            )
+    assert result["2023-05"]["AAA Storage"]["monthly_charge_aed"] == 1234.57
+
+
+def test_segment_clipped_to_month_boundaries():
+    df = pd.DataFrame(
+        {
+            "Pkg": [1, 1],
+            "SQM": [10.0, 4.0],
+            "DSV Indoor": [pd.Timestamp("2024-01-16 09:00"), pd.Timestamp("2024-02-01")],
+            "MOSB": [pd.Timestamp("2024-02-10"), pd.Timestamp("2024-02-01")],
+            "DSV Outdoor": [None, pd.Timestamp("2024-02-20")],
+        }
+    )
+
+    result = _calculator(True).calculate_monthly_invoice_charges_prorated(df)
+
+    assert list(result) == ["2024-01", "2024-02"]
+    # 1/16~1/31 = 16일, 2/1~2/9 = 9일 (2024-02 = 29일)
+    assert result["2024-01"]["DSV Indoor"]["avg_sqm"] == round(10 * 16 / 31, 2)
+    assert result["2024-02"]["DSV Indoor"]["avg_sqm"] == round(10 * 9 / 29, 2)
+    # 동일일 DSV Indoor → MOSB는 0일, 진행 중 체류는 마지막 과금 월 말일까지
+    assert result["2024-02"]["MOSB"]["avg_sqm"] == round((10 * 20 + 4 * 19) / 29, 2)
+    assert result["2024-02"]["DSV Outdoor"]["avg_sqm"] == round(4 * 10 / 29, 2)
+    assert result["2024-02"]["DSV Outdoor"]["monthly_charge_aed"] == round(4 * 10 / 29 * 18.0, 2)
+
+
+def test_no_billing_dates_returns_empty():
+    df = pd.DataFrame({"Pkg": [1], "DSV Indoor": [None]})
+
+    assert _calculator(True).calculate_monthly_invoice_charges_prorated(df) == {}
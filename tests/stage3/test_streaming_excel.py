@@ -0,0 +1,131 @@
+import os
+import sys
+from dataclasses import replace
+from datetime import date
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from scripts.stage3_report.streaming_excel import (
+    SheetLayoutError,
+    StreamingExcelWriter,
+    read_sheet_dimensions,
+    verify_sheet_dimensions,
+    write_excel_sheets,
+)
+
+
+def _sheets():
+    columns = pd.MultiIndex.from_arrays(
+        [
+            ["입고월", "입고", "입고", "출고", "출고"],
+            ["", "DSV Indoor", "MOSB", "DSV Indoor", "MOSB"],
+        ],
+        names=["Type", "Location"],
+    )
+    monthly = pd.DataFrame(
+        [["2024-01", 1, 2, 3, np.inf], ["2024-02", 4, np.nan, 6, 1.5]], columns=columns
+    )
+    raw = pd.DataFrame(
+        {
+            "Case No.": ["HE-1", None, "HE-3", "HE-4", ""],
+            "DSV Indoor": pd.to_datetime(
+                ["2024-01-01", None, "2024-03-01 10:30", None, "2024-05-05"], format="ISO8601"
+            ),
+            "MIR": [pd.Timestamp("2024-01-02"), "TBA", np.nan, date(2024, 2, 1), None],
+            "Pkg": [1, 2, 3, 4, 5],
+            "SQM": [1.5, np.nan, -np.inf, 2.0, 3.25],
+            "Qty": pd.array([1, None, 3, 4, None], dtype="Int64"),
+            "Flag": [True, False, True, False, True],
+            "Dwell": pd.to_timedelta([1, 2, None, 4, 5], unit="D"),
+            "Vendor": pd.Categorical(["HITACHI", None, "SIMENSE", "HITACHI", "HITACHI"]),
+        }
+    )
+    return [
+        ("창고_월별_입출고", monthly, True),
+        ("통합_원본데이터_Fixed", raw, False),
+        ("인덱스", raw.set_index("Case No."), True),
+        ("빈시트", raw.iloc[:0], False),
+    ]
+
+
+def _cell_signature(cell):
+    return (
+        cell.value,
+        cell.number_format,
+        cell.font.b,
+        cell.border.left.style,
+        cell.alignment.horizontal,
+        cell.alignment.vertical,
+    )
+
+
+def test_streaming_writer_matches_pandas_layout(tmp_path):
+    sheets = _sheets()
+    expected_path = tmp_path / "pandas.xlsx"
+    with pd.ExcelWriter(expected_path, engine="xlsxwriter") as writer:
+        for name, df, index in sheets:
+            df.to_excel(writer, sheet_name=name, index=index)
+
+    layouts = write_excel_sheets(tmp_path / "stream.xlsx", sheets, chunk_rows=2)
+
+    expected = openpyxl.load_workbook(expected_path)
+    result = openpyxl.load_workbook(tmp_path / "stream.xlsx")
+    assert result.sheetnames == expected.sheetnames == [name for name, _, _ in sheets]
+    for name in expected.sheetnames:
+        expected_ws, result_ws = expected[name], result[name]
+        assert result_ws.dimensions == expected_ws.dimensions
+        assert set(map(str, result_ws.merged_cells.ranges)) == set(
+            map(str, expected_ws.merged_cells.ranges)
+        )
+        for expected_row, result_row in zip(expected_ws.iter_rows(), result_ws.iter_rows()):
+            assert [_cell_signature(c) for c in result_row] == [
+                _cell_signature(c) for c in expected_row
+            ], name
+    assert [layout.header_rows for layout in layouts] == [3, 1, 1, 1]
+    assert layouts[1].data_rows == 5
+
+
+def test_verify_reads_dimensions_only(tmp_path):
+    path = tmp_path / "report.xlsx"
+    with StreamingExcelWriter(path) as writer:
+        for name, df, index in _sheets():
+            writer.write_frame(df, name, index=index)
+
+    dimensions = read_sheet_dimensions(path)
+
+    assert dimensions["통합_원본데이터_Fixed"] == (6, 9)
+    assert dimensions["창고_월별_입출고"] == (5, 6)
+    verify_sheet_dimensions(path, writer.layouts)
+    with pytest.raises(SheetLayoutError, match="빈시트"):
+        verify_sheet_dimensions(
+            path,
+            [
+                replace(layout, rows=layout.rows + 1) if layout.name == "빈시트" else layout
+                for layout in writer.layouts
+            ],
+        )
+    with pytest.raises(SheetLayoutError, match="시트 순서"):
+        verify_sheet_dimensions(path, writer.layouts[::-1])
+
+
+def test_column_less_sheet_verifies(tmp_path):
+    # SQM 데이터가 없으면 SQM 시트는 컬럼 없는 DataFrame
+    sheets = [("SQM_누적재고", pd.DataFrame(), False), ("빈인덱스", pd.DataFrame(), True)]
+    sheets.append(_sheets()[1])
+
+    layouts = write_excel_sheets(tmp_path / "empty.xlsx", sheets)
+
+    assert [(layout.rows, layout.columns) for layout in layouts[:2]] == [(1, 1), (1, 1)]
+    verify_sheet_dimensions(tmp_path / "empty.xlsx", layouts)
+
+
+def test_multiindex_columns_require_index(tmp_path):
+    monthly = _sheets()[0][1]
+    with StreamingExcelWriter(tmp_path / "x.xlsx") as writer:
+        with pytest.raises(NotImplementedError):
+            writer.write_frame(monthly, "창고_월별_입출고", index=False)
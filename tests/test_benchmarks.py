@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+benchmarks/ 합성 워크로드 생성기와 벤치마크 하네스 테스트
+
+Test Coverage:
+- 같은 (cases, seed) 재현성, Master/창고/SIMENSE/인보이스 구성과 통계
+- Stage 1 validator 패턴과 맞는 Case No./HVDC CODE
+- functions suite 소규모 실행 → 결과 JSON 기록, legacy 생략 기록
+- compare_results 회귀 판정
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "benchmarks"))
+
+from run_benchmarks import BenchmarkRunner, compare_results, parse_cases
+from synthetic_workload import WAREHOUSE_COLUMNS, generate_workload, load_manifest
+
+
+def test_workload_is_reproducible_and_realistic():
+    workload = generate_workload(400, seed=7)
+    again = generate_workload(400, seed=7)
+
+    pd.testing.assert_frame_equal(workload.master, again.master)
+    pd.testing.assert_frame_equal(workload.warehouse, again.warehouse)
+    assert set(workload.master_sheets) == {"Case List", "HE Local"}
+    assert len(workload.master) == 400
+    assert workload.master["Case No."].is_unique
+    assert workload.master["HVDC CODE"].str.match(r"^HVDC-ADOPT-\d{3}-\d{4}$").all()
+    assert set(WAREHOUSE_COLUMNS) <= set(workload.warehouse.columns)
+    # 창고 파일은 오래된 스냅샷: 신규 케이스 누락
+    assert len(workload.warehouse) < len(workload.master)
+    assert workload.stats["mosb_cases"] > 0
+    assert workload.stats["same_day_transfers"] > 0
+    assert len(workload.simense) == workload.stats["simense_cases"]
+    assert len(workload.invoice) > 0
+
+
+def test_write_records_manifest(tmp_path):
+    workload = generate_workload(50, seed=3)
+
+    paths = workload.write(tmp_path)
+
+    manifest = load_manifest(tmp_path)
+    assert manifest["cases"] == 50 and manifest["seed"] == 3
+    assert pd.read_excel(paths.master, sheet_name=None).keys() == workload.master_sheets.keys()
+    assert paths.invoice.exists() and paths.simense.exists()
+
+
+def test_function_suite_smoke(tmp_path):
+    runner = BenchmarkRunner(repeat=1, workers=1, legacy_max_cases=0, workdir=tmp_path)
+
+    runner.run_functions(generate_workload(150, seed=1))
+
+    report = runner.to_dict([150], ["functions"])
+    results = {row["key"]: row for row in report["results"]}
+    assert all(row["status"] in ("ok", "skipped") for row in results.values()), results
+    assert results["functions/stage1._apply_updates/vectorized@150"]["best_seconds"] > 0
+    assert results["functions/stage1._apply_updates/legacy@150"]["status"] == "skipped"
+    assert results["functions/stage3.invoice_charges/parallel@150"]["status"] == "ok"
+    assert "functions/stage4.HybridAnomalyDetector.run/current@150" in results
+    assert results["functions/stage4.HybridAnomalyDetector.run/legacy@150"]["status"] == "skipped"
+    json.dumps(report)
+
+
+def test_compare_results_flags_regressions():
+    baseline = {"results": [{"key": "a", "best_seconds": 1.0}, {"key": "b", "best_seconds": 2.0}]}
+    current = {"results": [{"key": "a", "best_seconds": 1.5}, {"key": "b", "best_seconds": 1.0}]}
+
+    rows = {row["key"]: row for row in compare_results(current, baseline, threshold=1.25)}
+
+    assert rows["a"]["regression"] and not rows["b"]["regression"]
+    assert parse_cases("1000, 10k,0.5k") == [1000, 10000, 500]
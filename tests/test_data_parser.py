@@ -15,7 +15,11 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
 
 from core.data_parser import (
+    StackParseCache,
+    clear_stack_status_cache,
     parse_stack_status,
+    parse_stack_status_many,
+    stack_status_cache_info,
     calculate_sqm,
     convert_mm_to_cm,
     map_stack_status,
@@ -234,5 +238,62 @@ class TestMapStackStatus:
         assert hasattr(result, "map")
 
 
+class TestStackStatusCache:
+    """Test cases for the parse_stack_status memo cache"""
+
+    def setup_method(self):
+        clear_stack_status_cache()
+
+    def test_hit_and_miss_counters(self):
+        """Repeated texts are served from the cache; blanks never reach it"""
+        for text in ["X2", "X2", " X2 ", "Not stackable", None, ""]:
+            parse_stack_status(text)
+
+        info = stack_status_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+        assert "hits=2" in info.summary()
+
+    def test_cache_is_bounded_lru(self):
+        """Oldest entries are evicted beyond maxsize"""
+        cache = StackParseCache(maxsize=2)
+        cache.get_or_parse("X2")
+        cache.get_or_parse("X3")
+        cache.get_or_parse("X2")
+        cache.get_or_parse("X4")
+
+        info = cache.info()
+        assert info.currsize == 2
+        assert cache.get_or_parse("X2") == 2
+        assert cache.info().hits == 2
+        cache.get_or_parse("X3")
+        assert cache.info().misses == 4
+
+    def test_concurrent_parsing(self):
+        """Parallel callers get correct results and consistent counters"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        texts = [f"Stackable X{i % 7 + 1}" for i in range(2000)]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(parse_stack_status, texts))
+
+        assert results == [i % 7 + 1 for i in range(2000)]
+        info = stack_status_cache_info()
+        assert info.hits + info.misses == 2000
+        assert info.currsize == 7
+
+    def test_parse_many_matches_map(self):
+        """Bulk parsing equals element-wise parsing and parses uniques once"""
+        import pandas as pd
+
+        series = pd.Series(
+            ["X2", "X2", "Not stackable", None, float("nan"), "None", 3, "X2"], dtype=object
+        )
+
+        result = parse_stack_status_many(series)
+
+        pd.testing.assert_series_equal(result, series.map(parse_stack_status))
+        assert stack_status_cache_info().currsize == 4
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+core.location_timeline 위치 날짜 타임라인 테스트
+
+Test Coverage:
+- 방문 순서 = 행별 sorted(방문, key=날짜) (동일 날짜는 컬럼 순서)
+- 일수/결측 마스크, 읽기 전용 배열, 컬럼 부분집합/행 부분집합
+- 시간대/변환 실패 셀 처리, process_real_data에서 1회 생성
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from core.location_timeline import NAT_INT64, LocationTimeline, parse_date_cells
+from tests._factories import random_cases
+
+LOCATIONS = ["DSV Indoor", "MOSB", "MIR", "SHU"]
+
+
+def _frame(n_rows: int = 200, seed: int = 5) -> pd.DataFrame:
+    df = random_cases(
+        n_rows,
+        seed,
+        span_days=20,
+        fill_rate=0.5,
+        hours=[0, 0, 6],
+        columns=LOCATIONS,
+        first_index=500,
+    )
+    df.loc[df.index[::4], "MIR"] = df.loc[df.index[::4], "DSV Indoor"]  # 동일 시각
+    df["SHU"] = df["SHU"].astype(object)
+    df.loc[df.index[::9], "SHU"] = "TBA"
+    return df
+
+
+def test_visit_order_matches_sorted_row_visits():
+    df = _frame()
+    timeline = LocationTimeline.from_frame(df, LOCATIONS)
+
+    case, location, ns = timeline.visits()
+
+    expected = []
+    for position, (_, row) in enumerate(df.iterrows()):
+        visits = [
+            (LOCATIONS.index(column), pd.to_datetime(row[column], errors="coerce"))
+            for column in LOCATIONS
+        ]
+        visits = [(column, date) for column, date in visits if pd.notna(date)]
+        expected.extend(
+            (position, column, date) for column, date in sorted(visits, key=lambda v: v[1])
+        )
+    assert expected
+    assert list(zip(case.tolist(), location.tolist(), pd.DatetimeIndex(ns))) == expected
+    starts = timeline.visit_start
+    assert len(starts) == len(df) + 1
+    assert (np.diff(starts) == (~timeline.missing).sum(axis=1)).all()
+
+
+def test_days_missing_and_read_only():
+    df = _frame(50)
+    timeline = LocationTimeline.from_frame(df, LOCATIONS + ["DAS"])
+
+    assert timeline.missing[:, -1].all()
+    assert timeline.missing[::9, LOCATIONS.index("SHU")].all()
+    dated = ~timeline.missing
+    expected_days = timeline.ns[dated].astype("datetime64[ns]").astype("datetime64[D]")
+    assert (timeline.days[dated] == expected_days.astype("int64")).all()
+    assert (timeline.days[~dated] == NAT_INT64).all()
+    for array in (timeline.ns, timeline.days, timeline.missing, timeline.visit_case):
+        with pytest.raises(ValueError):
+            array[0] = 0
+
+
+def test_column_subset_block_and_take():
+    df = _frame(80)
+    timeline = LocationTimeline.from_frame(df, LOCATIONS)
+    subset = ["SHU", "DSV Indoor", "AGI"]
+
+    block = timeline.block(subset)
+    assert (block[:, 2] == NAT_INT64).all()
+    assert (block[:, 1] == timeline.ns[:, 0]).all()
+
+    case, column, ns = timeline.visits(subset)
+    keep = np.isin(timeline.visit_location, [0, 3])
+    assert (case == timeline.visit_case[keep]).all()
+    assert (ns == block[case, column]).all()
+
+    rows = np.arange(0, len(df), 3)
+    taken = timeline.take(rows)
+    assert taken.n_cases == len(rows)
+    assert (taken.ns == timeline.ns[rows]).all()
+
+
+def test_parse_date_cells_handles_timezones_and_invalid_cells():
+    series = pd.Series(
+        [
+            "2024-03-01 10:00",
+            pd.Timestamp("2024-03-02 09:00", tz="Asia/Dubai"),
+            "not a date",
+            None,
+            "2024-03-01 10:00",
+        ]
+    )
+
+    parsed = parse_date_cells(series)
+
+    expected = [pd.to_datetime(value, errors="coerce") for value in series]
+    expected[1] = expected[1].tz_localize(None)
+    assert parsed.dtype == np.dtype("datetime64[ns]")
+    assert list(pd.DatetimeIndex(parsed)) == [
+        pd.NaT if pd.isna(value) else value for value in expected
+    ]
+    aware = pd.Series(pd.to_datetime(["2024-01-01 23:00"]).tz_localize("Asia/Dubai"))
+    assert parse_date_cells(aware)[0] == np.datetime64("2024-01-01T23:00")
+
+
+def test_process_real_data_builds_timeline_once(monkeypatch):
+    from scripts.stage3_report import report_generator
+
+    calculator = report_generator.CorrectedWarehouseIOCalculator(use_vectorized=True)
+    df = _frame(60)
+    for column in calculator.warehouse_columns + calculator.site_columns:
+        if column not in df.columns:
+            df[column] = pd.NaT
+    df["Pkg"] = 1
+    calculator.combined_data = df
+    calls = []
+    original = report_generator.LocationTimeline.from_frame
+    monkeypatch.setattr(
+        report_generator.LocationTimeline,
+        "from_frame",
+        classmethod(
+            lambda cls, frame, columns: calls.append(len(frame)) or original(frame, columns)
+        ),
+    )
+
+    processed = calculator.process_real_data()
+    timeline = calculator.location_timeline(processed)
+    calculator.calculate_final_location(processed)
+    calculator.calculate_warehouse_inbound_corrected(processed)
+    calculator.calculate_warehouse_outbound_corrected(processed)
+
+    assert calls == [len(df)]
+    assert calculator.location_timeline(processed) is timeline
+    assert timeline.locations == tuple(calculator.warehouse_columns + calculator.site_columns)
@@ -11,6 +11,7 @@ STACK.MD 구현의 정확성을 검증하는 포괄적인 테스트 스위트입
 - mm 단위 자동 변환
 - 폴백 전략 (치수 → 기존 추정)
 - 통합 테스트 (Stage 2 → Stage 3)
+- 벡터화 구현과 행 단위 구현의 결과 동일성
 
 작성자: AI Development Team
 버전: v1.0
@@ -33,6 +34,8 @@ from scripts.stage2_derived.stack_and_sqm import (
     add_sqm_and_stack,
     get_sqm_with_fallback,
     _to_float,
+    compute_sqm_series,
+    parse_stack_status_series,
 )
 
 
@@ -317,6 +320,46 @@ class TestIntegration(unittest.TestCase):
             self.assertGreater(sqm_value, 0)
 
 
+class TestVectorizedParity(unittest.TestCase):
+    """벡터화 구현 == 행 단위 구현"""
+
+    def test_sqm_series_matches_rowwise(self):
+        """문자열/쉼표/mm/음수/결측 및 반올림 경계값"""
+        df = pd.DataFrame(
+            {
+                "L(mm)": ["1,000", " 255 ", "abc", "", None, 125, 5.5, -10, 1250],
+                "W(CM)": [50, 100, 150, 10, 20, 1, 30, 40, 1],
+            }
+        )
+
+        expected = df.apply(lambda row: compute_sqm_from_dims(row), axis=1)
+        result = compute_sqm_series(df)
+
+        pd.testing.assert_series_equal(result, expected)
+
+    def test_sqm_series_without_dimensions_is_none(self):
+        """치수 컬럼이 없으면 모든 행 None"""
+        df = pd.DataFrame({"Length": [100, 200]})
+
+        result = compute_sqm_series(df)
+
+        self.assertEqual(result.tolist(), [None, None])
+
+    def test_stack_series_matches_apply(self):
+        """고유값 메모 파싱이 Series.apply와 동일"""
+        series = pd.Series(
+            ["Not stackable", "X2", "X2", "", None, np.nan, "None", "nan", 3, 2.5, "600kg/m2"],
+            dtype=object,
+        )
+
+        expected = series.apply(parse_stack_status)
+        result = parse_stack_status_series(series)
+
+        pd.testing.assert_series_equal(result, expected)
+        self.assertTrue(pd.isna(result.iloc[4]))
+        self.assertEqual(result.iloc[6], 1)
+
+
 class TestPerformance(unittest.TestCase):
     """성능 테스트"""
 
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+"""
+Stage 1 _apply_updates 벡터화 엔진 패리티 테스트
+
+Test Coverage:
+- 기존 iterrows 루프와 ChangeTracker 결과 동일성
+- stats (updates/date_updates/field_updates/appends/source_sheet_updates) 동일성
+- 중복 Case No., 신규 케이스 append, Master 전용 컬럼 처리
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.stage1_sync_sorted.data_synchronizer_v30 import DataSynchronizerV30
+
+MASTER_COLS = {
+    "case_number": "Case No.",
+    "item_number": "No",
+    "eta_ata": "ETA/ATA",
+    "dsv_indoor": "DSV Indoor",
+    "mir": "MIR",
+    "dhl_warehouse": "DHL WH",
+}
+WH_COLS = {
+    "case_number": "Case No.",
+    "item_number": "No",
+    "eta_ata": "ETA/ATA",
+    "dsv_indoor": "DSV Indoor",
+    "mir": "MIR",
+}
+
+
+def _master_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "No": [1, 2, 3, 4, 5, 6, 7, 8],
+            "Case No.": ["C001", "c002 ", "C003", "C-004", "C005", "C001", None, "C009"],
+            "ETA/ATA": [
+                pd.Timestamp("2024-01-01"),
+                "2024-01-05",
+                pd.Timestamp("2024-02-01 10:00"),
+                pd.Timestamp("2024-03-01"),
+                None,
+                pd.Timestamp("2024-01-02"),
+                pd.Timestamp("2024-01-09"),
+                "TBA",
+            ],
+            "DSV Indoor": [
+                pd.Timestamp("2024-01-10"),
+                np.nan,
+                pd.Timestamp("2024-02-10"),
+                np.nan,
+                pd.Timestamp("2024-05-05"),
+                pd.Timestamp("2024-01-11"),
+                np.nan,
+                np.nan,
+            ],
+            "MIR": [
+                np.nan,
+                pd.Timestamp("2024-01-20"),
+                np.nan,
+                np.nan,
+                np.nan,
+                np.nan,
+                np.nan,
+                "TBA",
+            ],
+            "DHL WH": [
+                np.nan,
+                pd.Timestamp("2024-01-03"),
+                np.nan,
+                np.nan,
+                np.nan,
+                "x",
+                np.nan,
+                np.nan,
+            ],
+            "Source_Sheet": [
+                "Case List",
+                "Case List",
+                "HE Local",
+                "Case List",
+                "HE Local",
+                "Case List",
+                "Case List",
+                "HE-2",
+            ],
+        }
+    )
+
+
+def _warehouse_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "No": [1, 2.0, 30, 9],
+            "Case No.": ["C001", "C002", "C003", "C-004"],
+            "ETA/ATA": [
+                pd.Timestamp("2024-01-01 08:00"),
+                pd.Timestamp("2024-01-04"),
+                pd.Timestamp("2024-02-01"),
+                pd.NaT,
+            ],
+            "DSV Indoor": [np.nan, np.nan, "2024-02-10", np.nan],
+            "MIR": [np.nan, np.nan, np.nan, "TBA"],
+            "Source_Sheet": ["Case List", "Old", "HE Local", "Case List"],
+        }
+    )
+
+
+def _run(use_vectorized: bool):
+    sync = DataSynchronizerV30(use_vectorized=use_vectorized)
+    updated, stats = sync._apply_updates(_master_frame(), _warehouse_frame(), MASTER_COLS, WH_COLS)
+    return sync, updated, stats
+
+
+def _same(a, b) -> bool:
+    if pd.isna(a) or pd.isna(b):
+        return bool(pd.isna(a) and pd.isna(b))
+    return bool(a == b)
+
+
+def test_vectorized_matches_legacy_changes_and_stats():
+    legacy_sync, legacy_wh, legacy_stats = _run(use_vectorized=False)
+    vector_sync, vector_wh, vector_stats = _run(use_vectorized=True)
+
+    assert vector_stats == legacy_stats
+
+    legacy_changes = legacy_sync.change_tracker.changes
+    vector_changes = vector_sync.change_tracker.changes
+    assert len(vector_changes) == len(legacy_changes)
+    for expected, actual in zip(legacy_changes, vector_changes):
+        assert actual.row_index == expected.row_index
+        assert actual.column_name == expected.column_name
+        assert actual.change_type == expected.change_type
+        assert _same(actual.old_value, expected.old_value)
+        assert _same(actual.new_value, expected.new_value)
+
+    assert list(vector_sync.change_tracker.new_cases) == list(legacy_sync.change_tracker.new_cases)
+
+    assert list(vector_wh.columns) == list(legacy_wh.columns)
+    assert len(vector_wh) == len(legacy_wh)
+    for col in legacy_wh.columns:
+        for expected, actual in zip(legacy_wh[col].tolist(), vector_wh[col].tolist()):
+            assert _same(actual, expected), col
+
+
+def test_vectorized_reports_expected_updates():
+    sync, updated, stats = _run(use_vectorized=True)
+
+    # C-004 / c002 keys keep the loop's strip+upper normalization only
+    assert stats["appends"] == 3
+    assert stats["source_sheet_updates"] == 1
+    assert updated.loc[0, "ETA/ATA"] == pd.Timestamp("2024-01-02")
+    assert updated.loc[1, "DHL WH"] == pd.Timestamp("2024-01-03")
+
+    change_types = {change.change_type for change in sync.change_tracker.changes}
+    assert change_types == {"date_update", "field_update", "master_only_update", "new_record"}
+
+
+@pytest.mark.parametrize("use_vectorized", [False, True])
+def test_new_records_point_at_appended_rows(use_vectorized):
+    sync, updated, _ = _run(use_vectorized=use_vectorized)
+
+    new_rows = [c.row_index for c in sync.change_tracker.changes if c.change_type == "new_record"]
+    assert new_rows == [4, 5, 6]
+    assert updated.loc[new_rows, "Case No."].tolist() == ["C-004", "C005", "C009"]
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+Stage 1 델타 동기화 모드 테스트
+
+Test Coverage:
+- 이전 동기화 결과를 Warehouse로 재동기화 시 변경/신규 케이스만 _apply_updates 처리
+- 전체 동기화와 ChangeTracker / stats / 출력 파일 동일성
+- 상태 파일이 없거나 컬럼 매핑이 다르면 전체 처리로 폴백
+"""
+
+import contextlib
+import datetime as dt
+import io
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.stage1_sync_sorted.data_synchronizer_v30 import DataSynchronizerV30
+
+N_CASES = 60
+
+
+def _master_frame(changed: bool = False) -> pd.DataFrame:
+    rows = []
+    for i in range(N_CASES):
+        eta = dt.datetime(2024, 1, 1) + dt.timedelta(days=i % 20)
+        if changed and i % 17 == 0:
+            eta += dt.timedelta(days=3)
+        rows.append(
+            {
+                "No": i + 1,
+                "Case No.": f"C{i:05d}",
+                "ETA/ATA": eta,
+                "DSV Indoor": dt.datetime(2024, 3, 1) if i % 3 == 0 else None,
+                "MIR": "TBA" if i % 11 == 0 else None,
+                "DHL WH": dt.datetime(2024, 2, 2) if i % 7 == 0 else None,
+                "Description": f"item {i % 13}",
+            }
+        )
+    if changed:
+        rows.append({"No": N_CASES + 1, "Case No.": "CNEW1", "ETA/ATA": dt.datetime(2024, 5, 5)})
+    return pd.DataFrame(rows)
+
+
+def _warehouse_frame() -> pd.DataFrame:
+    rows = []
+    for i in range(0, N_CASES, 2):
+        rows.append(
+            {
+                "No": i + 1,
+                "Case No.": f"C{i:05d}",
+                "ETA/ATA": dt.datetime(2024, 1, 1) + dt.timedelta(days=i % 20 + (i % 4 == 0)),
+                "DSV Indoor": None,
+                "MIR": None,
+                "Description": f"item {i % 13}",
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def _sync(master, warehouse, output, delta_state_path=None):
+    synchronizer = DataSynchronizerV30(delta_state_path=delta_state_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = synchronizer.synchronize(str(master), str(warehouse), str(output))
+    assert result.success, result.message
+    return synchronizer, result
+
+
+def _changes(synchronizer):
+    return [
+        (c.row_index, c.column_name, c.change_type, str(c.old_value), str(c.new_value))
+        for c in synchronizer.change_tracker.changes
+    ]
+
+
+@pytest.fixture
+def previous_sync(tmp_path):
+    master_v1 = tmp_path / "master_v1.xlsx"
+    master_v2 = tmp_path / "master_v2.xlsx"
+    warehouse = tmp_path / "warehouse.xlsx"
+    _master_frame().to_excel(master_v1, index=False, sheet_name="Case List")
+    _master_frame(changed=True).to_excel(master_v2, index=False, sheet_name="Case List")
+    _warehouse_frame().to_excel(warehouse, index=False, sheet_name="Case List")
+
+    state = tmp_path / "synced.delta.json"
+    _sync(master_v1, warehouse, tmp_path / "synced.xlsx", state)
+    return tmp_path, master_v2, state
+
+
+def test_delta_sync_matches_full_sync(previous_sync):
+    tmp_path, master_v2, state = previous_sync
+    synced = tmp_path / "synced.xlsx"
+
+    full, full_result = _sync(master_v2, synced, tmp_path / "full.xlsx")
+    delta, delta_result = _sync(master_v2, synced, tmp_path / "delta.xlsx", state)
+
+    assert delta.delta_stats["skipped_rows"] > N_CASES // 2
+    assert delta.delta_stats["changed_rows"] == N_CASES + 1 - delta.delta_stats["skipped_rows"]
+    assert _changes(delta) == _changes(full)
+    assert list(delta.change_tracker.new_cases) == list(full.change_tracker.new_cases) == ["CNEW1"]
+
+    delta_stats = dict(delta_result.stats)
+    assert delta_stats.pop("delta_skipped_rows") == delta.delta_stats["skipped_rows"]
+    for stats in (delta_stats, full_result.stats):
+        stats.pop("output_file")
+    assert delta_stats == full_result.stats
+
+    pd.testing.assert_frame_equal(
+        pd.read_excel(tmp_path / "delta.xlsx"), pd.read_excel(tmp_path / "full.xlsx")
+    )
+
+
+def test_delta_sync_without_usable_state_processes_everything(previous_sync):
+    tmp_path, master_v2, state = previous_sync
+
+    data = json.loads(state.read_text(encoding="utf-8"))
+    data["master_columns"]["case_number"] = "Other Case"
+    stale = tmp_path / "stale.delta.json"
+    stale.write_text(json.dumps(data), encoding="utf-8")
+
+    for state_path in (tmp_path / "missing.delta.json", stale):
+        delta, _ = _sync(master_v2, tmp_path / "synced.xlsx", tmp_path / "out.xlsx", state_path)
+        assert delta.delta_stats["skipped_rows"] == 0
+        assert delta.delta_stats["changed_rows"] == N_CASES + 1
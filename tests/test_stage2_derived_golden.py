@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+"""
+Stage 2 calculate_derived_columns 골든 파일 테스트
+
+Test Coverage:
+- 결정적 합성 입력에 대한 전체 출력(값 + dtype)이 골든 파일과 정확히 일치
+- 동일 날짜 동률 시 컬럼 순서상 첫 위치 선택 (idxmax 규칙)
+- 창고/현장 컬럼이 없는 입력의 기본값 (Pre Arrival, handling 0)
+
+골든 파일 재생성 (의도된 출력 변경 시에만):
+    python tests/test_stage2_derived_golden.py --regenerate
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from scripts.stage2_derived.column_definitions import SITE_COLUMNS, WAREHOUSE_COLUMNS
+from scripts.stage2_derived.derived_columns_processor import calculate_derived_columns
+
+GOLDEN_PATH = PROJECT_ROOT / "tests" / "golden" / "stage2_derived_columns.json"
+
+STACK_TEXTS = [
+    "Not stackable",
+    "Stackable",
+    "Stackable X2",
+    "Stackable 3 tier",
+    "600kg/m2",
+    "Only on top",
+    "X4",
+    "2 pcs",
+    "",
+    None,
+]
+
+
+def _golden_input(n_rows: int = 240) -> pd.DataFrame:
+    rng = np.random.RandomState(20251019)
+    base = pd.Timestamp("2024-01-01")
+    columns = WAREHOUSE_COLUMNS + SITE_COLUMNS
+    data = {"Case No.": [f"HE-{i:05d}" for i in range(n_rows)]}
+    for column in columns:
+        offsets = rng.randint(0, 400, size=n_rows)
+        present = rng.rand(n_rows) < 0.18
+        data[column] = [
+            base + pd.Timedelta(days=int(offset)) if flag else None
+            for offset, flag in zip(offsets, present)
+        ]
+    df = pd.DataFrame(data)
+
+    # 동률(같은 날짜) 및 텍스트 값 케이스
+    df.loc[0:14, columns] = None
+    df.loc[0:9, ["DSV Indoor", "DSV Outdoor", "MOSB"]] = pd.Timestamp("2024-06-01")
+    df.loc[10:14, ["DSV Indoor", "MIR", "DAS"]] = pd.Timestamp("2024-07-15")
+    df.loc[15:19, columns] = None
+    df["AGI"] = df["AGI"].astype(object)
+    df.loc[20:24, "AGI"] = "TBA"
+    df["SHU"] = df["SHU"].astype(object)
+    df.loc[25:29, "SHU"] = "2024-09-30"
+
+    df["Pkg"] = rng.randint(1, 5, size=n_rows)
+    df["L(CM)"] = rng.choice([120, 85.5, 0, -3, np.nan, 300], size=n_rows)
+    widths = rng.choice(["100", " 1,250 ", "abc", "", "45.5", "80"], size=n_rows)
+    df["W(CM)"] = pd.Series(widths, dtype=object)
+    df["Stackability"] = [STACK_TEXTS[i % len(STACK_TEXTS)] for i in range(n_rows)]
+    return df
+
+
+def _cell(value):
+    if value is None or (pd.api.types.is_scalar(value) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, (np.integer, int)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return float(value)
+    return str(value)
+
+
+def _snapshot(df: pd.DataFrame) -> dict:
+    return {
+        "columns": [str(column) for column in df.columns],
+        "dtypes": {str(column): str(dtype) for column, dtype in df.dtypes.items()},
+        "rows": [[_cell(value) for value in row] for row in df.itertuples(index=False)],
+    }
+
+
+def test_calculate_derived_columns_matches_golden():
+    golden = json.loads(GOLDEN_PATH.read_text(encoding="utf-8"))
+
+    snapshot = _snapshot(calculate_derived_columns(_golden_input()))
+
+    assert snapshot["columns"] == golden["columns"]
+    assert snapshot["dtypes"] == golden["dtypes"]
+    for i, (row, expected) in enumerate(zip(snapshot["rows"], golden["rows"])):
+        assert row == expected, f"row {i} differs"
+    assert len(snapshot["rows"]) == len(golden["rows"])
+
+
+def test_tie_picks_first_column_in_block_order():
+    result = calculate_derived_columns(_golden_input())
+
+    warehouse_ties = result.loc[0:9]
+    assert set(warehouse_ties["Status_Location"]) == {"DSV Indoor"}
+    assert set(warehouse_ties["Status_Storage"]) == {"warehouse"}
+    assert (warehouse_ties["Status_Location_Date"] == pd.Timestamp("2024-06-01")).all()
+
+    site_ties = result.loc[10:14]
+    assert set(site_ties["Status_Current"]) == {"site"}
+    assert set(site_ties["Status_Location"]) == {"MIR"}
+    assert (site_ties["Status_Location_Date"] == pd.Timestamp("2024-07-15")).all()
+
+
+def test_frame_without_location_columns_defaults():
+    result = calculate_derived_columns(pd.DataFrame({"Case No.": ["A", "B"]}))
+
+    assert result["Status_Current"].tolist() == ["Pre Arrival", "Pre Arrival"]
+    assert result["Status_Location"].tolist() == ["Pre Arrival", "Pre Arrival"]
+    assert result["Status_Storage"].tolist() == ["Pre Arrival", "Pre Arrival"]
+    assert result["Status_Location_Date"].isna().all()
+    assert result["total handling"].tolist() == [0, 0]
+
+
+if __name__ == "__main__":
+    if "--regenerate" in sys.argv:
+        GOLDEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+        snapshot = _snapshot(calculate_derived_columns(_golden_input()))
+        GOLDEN_PATH.write_text(
+            json.dumps(snapshot, ensure_ascii=False, indent=1) + "\n", encoding="utf-8"
+        )
+        print(f"Golden file written: {GOLDEN_PATH}")
@@ -6,6 +6,7 @@ Test Coverage:
 - Stack_Status 파싱 기본 테스트
 - Total sqm 계산 기본 테스트
 - 엣지 케이스 테스트
+- 벡터화 SQM 헬퍼와 행 단위 헬퍼(_get_sqm / _get_sqm_with_source) 결과 동일성
 """
 
 import pytest
@@ -20,6 +21,10 @@ sys.path.insert(0, str(project_root))
 from stage3_report.report_generator import (
     _calculate_stack_status,
     _calculate_total_sqm,
+    _get_sqm,
+    _get_sqm_series,
+    _get_sqm_with_source,
+    _get_sqm_with_source_frame,
 )
 
 
@@ -126,6 +131,50 @@ class TestCalculateTotalSqm:
         assert pd.isna(result.iloc[3]), "SQM=0 invalid"
         assert pd.isna(result.iloc[4]), "SQM<0 invalid"
 
+    def test_non_numeric_cells_and_rounding(self):
+        """문자열 값은 None, 결과는 소수 2자리 반올림"""
+        df = pd.DataFrame({
+            "Pkg": [3, "3", 2, 1],
+            "SQM": [1.005, 2.0, "x", 0.125],
+        }, dtype=object)
+        result = _calculate_total_sqm(df)
+
+        assert result.iloc[0] == round(1.005 * 3, 2)
+        assert pd.isna(result.iloc[1]), "Pkg 문자열은 None"
+        assert pd.isna(result.iloc[2]), "SQM 문자열은 None"
+        assert result.iloc[3] == round(0.125, 2)
+
+
+class TestVectorizedSqmHelpers:
+    """벡터화 SQM 헬퍼 == 행 단위 헬퍼"""
+
+    @staticmethod
+    def _frame():
+        return pd.DataFrame({
+            "SQM": [1.5, None, 0, "2.5", "abc", None, None, None],
+            "Area": [None, 2.0, None, None, None, None, None, None],
+            "L(CM)": [None, None, "1,200", None, 120, -5, None, "abc"],
+            "L(mm)": [None, None, None, None, None, None, 2500, None],
+            "W(CM)": [None, None, 45.5, None, 80, 30, 100, 30],
+            "Pkg": [1, 2, "3", "2.5", None, 0, 4, -2],
+            "M2": [None, None, None, None, None, None, None, 4.0],
+        }, dtype=object)
+
+    def test_get_sqm_series_matches_rowwise(self):
+        df = self._frame()
+
+        expected = df.apply(_get_sqm, axis=1).astype(float)
+
+        pd.testing.assert_series_equal(_get_sqm_series(df), expected)
+
+    def test_get_sqm_with_source_frame_matches_rowwise(self):
+        df = self._frame()
+
+        expected = [_get_sqm_with_source(row) for _, row in df.iterrows()]
+        result = _get_sqm_with_source_frame(df)
+
+        assert list(result.itertuples(index=False, name=None)) == expected
+
 
 class TestIntegration:
     """통합 테스트"""
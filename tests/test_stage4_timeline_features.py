@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+Stage 4 위치 날짜 행렬 기반 규칙/피처 테스트
+
+Test Coverage:
+- 시간 역전 레코드가 행 단위 time_reversal과 동일
+- 피처 프레임/dwell 목록이 행 단위 FeatureBuilder와 동일
+- HybridAnomalyDetector.run 결과(타임스탬프 제외)가 iterrows 경로와 동일
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from scripts.stage4_anomaly.anomaly_detector_balanced import (
+    DetectorConfig,
+    FeatureBuilder,
+    HeaderNormalizer,
+    HybridAnomalyDetector,
+    RuleDetector,
+)
+from tests._factories import random_cases
+
+LOCATIONS = [
+    "AAA Storage",
+    "DSV Al Markaz",
+    "DSV Indoor",
+    "DSV Outdoor",
+    "MOSB",
+    "Hauler Indoor",
+    "AGI",
+    "DAS",
+    "MIR",
+    "SHU",
+]
+
+
+def _raw(n_rows: int = 400, seed: int = 8) -> pd.DataFrame:
+    df = random_cases(
+        n_rows,
+        seed,
+        span_days=200,
+        hours=[0, 0, 15],
+        columns=LOCATIONS,
+        choices={"Pkg": [1, 2, 5, np.nan], "금액": [100.0, 2500.5, np.nan]},
+    )
+    df.insert(0, "Case No.", [f"HE-{i:05d}" for i in range(n_rows)])
+    # 동일 시각 방문, 날짜가 아닌 셀, 방문 없는 케이스
+    df.loc[::6, "MIR"] = df.loc[::6, "DSV Indoor"]
+    df["DAS"] = df["DAS"].astype(object)
+    df.loc[::11, "DAS"] = "TBA"
+    df.loc[::23, LOCATIONS] = pd.NaT
+    return df
+
+
+def _normalized(cfg: DetectorConfig) -> pd.DataFrame:
+    return HeaderNormalizer(cfg.column_map).normalize(_raw())
+
+
+def _without_timestamp(records):
+    return [{k: v for k, v in r.to_dict().items() if k != "Timestamp"} for r in records]
+
+
+def test_time_reversals_match_row_rule():
+    cfg = DetectorConfig()
+    df = _normalized(cfg)
+    rule = RuleDetector(cfg)
+
+    expected = [r for r in (rule.time_reversal(row) for _, row in df.iterrows()) if r]
+    result = rule.time_reversals(df)
+
+    assert expected
+    assert _without_timestamp(result) == _without_timestamp(expected)
+
+
+def test_features_and_dwell_match_rowwise():
+    df = _normalized(DetectorConfig())
+
+    expected_feat, expected_dwell = FeatureBuilder(DetectorConfig(use_vectorized=False)).build(df)
+    feat, dwell = FeatureBuilder(DetectorConfig()).build(df)
+
+    pd.testing.assert_frame_equal(feat, expected_feat)
+    assert expected_dwell and dwell == expected_dwell
+
+
+def test_run_matches_rowwise_path():
+    raw = _raw(300, seed=2)
+
+    expected = HybridAnomalyDetector(DetectorConfig(use_vectorized=False)).run(raw)
+    result = HybridAnomalyDetector(DetectorConfig()).run(raw)
+
+    assert result["summary"] == expected["summary"]
+    assert _without_timestamp(result["anomalies"]) == _without_timestamp(expected["anomalies"])
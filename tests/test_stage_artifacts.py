@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+core.stage_artifacts Parquet 사이드카 테스트
+
+Test Coverage:
+- xlsx 지문 일치 시 사이드카 로드 (dtype 보존)
+- xlsx 변경/사이드카 비활성화 시 pd.read_excel 폴백
+- 혼합 타입 object 컬럼 태그 JSON 저장 (pd.read_excel과 같은 값/결측/날짜 단위)
+- 태그 없는 셀 타입/해독 불가 셀은 사이드카 없이 xlsx 폴백
+- 정수 값 float 컬럼 int64, bool+공백 object 컬럼 float64 등 pd.read_excel dtype 규칙
+"""
+
+import datetime
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from core.stage_artifacts import (
+    SIDECAR_ENV_VAR,
+    read_excel_with_sidecar,
+    read_sidecar,
+    read_sidecar_metadata,
+    set_sidecars_enabled,
+    sidecar_path,
+    sidecar_paths,
+    write_sidecar,
+)
+
+
+@pytest.fixture(autouse=True)
+def _sidecars_on(monkeypatch):
+    monkeypatch.setenv(SIDECAR_ENV_VAR, "1")
+
+
+def _frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Case No.": ["C001", "C002", "C003"],
+            "Pkg": pd.array([1, 2, None], dtype="Int64"),
+            "DSV Indoor": pd.to_datetime(["2024-01-01", None, "2024-03-01"]),
+            "SQM": [1.25, np.nan, 3.5],
+        }
+    )
+
+
+def _write_xlsx(df: pd.DataFrame, path: Path, sheet_name: str = "Sheet1") -> Path:
+    df.to_excel(path, sheet_name=sheet_name, index=False)
+    return path
+
+
+def test_sidecar_round_trip_keeps_dtypes(tmp_path):
+    df = _frame()
+    xlsx = _write_xlsx(df, tmp_path / "synced.xlsx")
+
+    written = write_sidecar(df, xlsx)
+
+    assert written == tmp_path / "synced.parquet"
+    loaded = read_excel_with_sidecar(xlsx)
+    pd.testing.assert_frame_equal(loaded, df)
+    assert str(loaded["Pkg"].dtype) == "Int64"
+
+
+def test_stale_sidecar_falls_back_to_xlsx(tmp_path):
+    df = _frame()
+    xlsx = _write_xlsx(df, tmp_path / "synced.xlsx")
+    write_sidecar(df, xlsx)
+
+    edited = df.assign(SQM=[9.0, 9.0, 9.0])
+    _write_xlsx(edited, xlsx)
+
+    assert read_sidecar(xlsx) is None
+    loaded = read_excel_with_sidecar(xlsx)
+    assert loaded["SQM"].tolist() == [9.0, 9.0, 9.0]
+
+
+def test_named_sheet_sidecar_and_disable_switch(tmp_path):
+    df = _frame()
+    xlsx = _write_xlsx(df, tmp_path / "report.xlsx", sheet_name="통합_원본데이터_Fixed")
+
+    write_sidecar(df, xlsx, "통합_원본데이터_Fixed")
+
+    expected_name = "report.통합_원본데이터_Fixed.parquet"
+    assert sidecar_path(xlsx, "통합_원본데이터_Fixed").name == expected_name
+    assert sidecar_paths(xlsx) == [sidecar_path(xlsx, "통합_원본데이터_Fixed")]
+    assert read_sidecar(xlsx, "통합_원본데이터_Fixed") is not None
+    assert read_sidecar(xlsx) is None
+
+    set_sidecars_enabled(False)
+    assert read_sidecar(xlsx, "통합_원본데이터_Fixed") is None
+    assert write_sidecar(df, xlsx) is None
+
+
+def test_mixed_type_columns_match_read_excel(tmp_path):
+    df = pd.DataFrame(
+        {
+            "No": [1, "x", 3],
+            "Case No.": ["C001", np.nan, "C003"],
+            "MIR": [pd.Timestamp("2024-01-01"), "TBA", None],
+            "DSV Indoor": pd.to_datetime(["2024-01-01", None, "2024-03-01"]).as_unit("us"),
+        }
+    )
+    xlsx = _write_xlsx(df, tmp_path / "mixed.xlsx")
+
+    path = write_sidecar(df, xlsx)
+
+    assert read_sidecar_metadata(path)["tagged_columns"] == ["No", "MIR"]
+    assert pq.read_table(path).column("No").to_pylist() == ['["i", 1]', '["s", "x"]', '["i", 3]']
+    loaded = read_sidecar(xlsx)
+    expected = pd.read_excel(xlsx)
+    assert loaded.dtypes.to_dict() == expected.dtypes.to_dict()
+    assert loaded["No"].tolist() == [1, "x", 3]
+    assert loaded["MIR"].tolist()[:2] == [pd.Timestamp("2024-01-01"), "TBA"]
+    # object 컬럼 결측은 None이 아니라 NaN
+    for value in (loaded["Case No."][1], loaded["MIR"][2]):
+        assert isinstance(value, float) and np.isnan(value)
+    pd.testing.assert_series_equal(loaded["DSV Indoor"], expected["DSV Indoor"])
+
+
+def test_untaggable_cells_and_bad_tags_fall_back_to_xlsx(tmp_path):
+    df = pd.DataFrame({"No": [1, "x"], "ETA": [datetime.time(9, 30), "TBA"]})
+    xlsx = _write_xlsx(df, tmp_path / "mixed.xlsx")
+
+    assert write_sidecar(df, xlsx) is None
+    assert not sidecar_path(xlsx).exists()
+
+    path = write_sidecar(df[["No"]], xlsx)
+    table = pq.read_table(path)
+    forged = table.set_column(0, "No", pa.array(['["x", "payload"]', '["s", "x"]']))
+    pq.write_table(forged.replace_schema_metadata(table.schema.metadata), path)
+
+    assert read_sidecar(xlsx) is None
+    pd.testing.assert_frame_equal(read_excel_with_sidecar(xlsx), pd.read_excel(xlsx))
+
+
+def test_sidecar_dtypes_follow_read_excel(tmp_path):
+    df = pd.DataFrame(
+        {
+            "Pkg": [1.0, 2.0, 3.0],
+            "SQM": [1.0, np.nan, 2.0],
+            "Stack": pd.Series([True, None, False], dtype=object),
+            "Remark": pd.Series([None, None, None], dtype=object),
+            "No": pd.Series([2.0, "x", 1.5], dtype=object),
+            "MIR": pd.Series([pd.Timestamp("2024-01-01 10:00"), "TBA", 3], dtype=object),
+            "Flag": [True, False, True],
+        }
+    )
+    xlsx = _write_xlsx(df, tmp_path / "dtypes.xlsx")
+    write_sidecar(df, xlsx)
+
+    loaded = read_sidecar(xlsx)
+
+    expected = pd.read_excel(xlsx)
+    pd.testing.assert_frame_equal(loaded, expected)
+    assert [type(value) for value in loaded["No"]] == [type(value) for value in expected["No"]]
+    assert [type(value) for value in loaded["MIR"]] == [type(value) for value in expected["MIR"]]
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+core.stage_cache 콘텐츠 해시 Stage 캐시 테스트
+
+Test Coverage:
+- 입력/설정/코드/옵션 변경 시 키 변경
+- 저장 후 동일 키 조회 시 hit, 출력 누락 시 miss
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from core.stage_cache import StageCache
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    inputs = tmp_path / "inputs"
+    code = tmp_path / "code"
+    inputs.mkdir()
+    code.mkdir()
+    (inputs / "Case List.xlsx").write_bytes(b"master-v1")
+    (code / "stage.py").write_text("VALUE = 1\n", encoding="utf-8")
+    return tmp_path
+
+
+def _key(cache, root, config=None, options=None):
+    return cache.compute_key(
+        1,
+        inputs=[root / "inputs" / "Case List.xlsx"],
+        config=config or {"stage1": {"enabled": True}},
+        code_dirs=[root / "code"],
+        options=options,
+    )
+
+
+def test_key_tracks_inputs_config_code_and_options(workspace):
+    base = _key(StageCache(workspace / "cache", code_version="2.0.0"), workspace)
+
+    assert _key(StageCache(workspace / "cache", code_version="2.0.0"), workspace) == base
+    assert _key(StageCache(workspace / "cache", code_version="2.0.1"), workspace) != base
+    cache = StageCache(workspace / "cache", code_version="2.0.0")
+    assert _key(cache, workspace, config={"stage1": {"enabled": False}}) != base
+    assert _key(cache, workspace, options={"no_sorting": True}) != base
+
+    (workspace / "inputs" / "Case List.xlsx").write_bytes(b"master-v2")
+    assert _key(StageCache(workspace / "cache", code_version="2.0.0"), workspace) != base
+
+    (workspace / "inputs" / "Case List.xlsx").write_bytes(b"master-v1")
+    (workspace / "code" / "stage.py").write_text("VALUE = 2\n", encoding="utf-8")
+    assert _key(StageCache(workspace / "cache", code_version="2.0.0"), workspace) != base
+
+
+def test_lookup_hits_only_with_same_key_and_existing_outputs(workspace):
+    cache = StageCache(workspace / "cache")
+    output = workspace / "synced.xlsx"
+    output.write_bytes(b"synced")
+    key = _key(cache, workspace)
+
+    assert cache.lookup(1, key) is None
+    cache.store(1, key, [output])
+
+    entry = StageCache(workspace / "cache").lookup(1, key)
+    assert entry is not None
+    assert entry.outputs == [str(output)]
+    assert cache.lookup(1, "other-key") is None
+    assert cache.lookup(2, key) is None
+
+    output.unlink()
+    assert cache.lookup(1, key) is None
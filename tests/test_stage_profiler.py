@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+core.stage_profiler Stage 프로파일러 테스트
+
+Test Coverage:
+- 중첩 단계 타이머, 행 수/처리량, 실패/캐시 상태
+- run_profile.json 기록 및 cProfile pstats 덤프
+- 프로파일러 비활성 시 profile_phase/record_rows no-op
+- Stage 1(``scripts.*`` 패키지 import)도 ``core.stage_profiler``의 활성 프로파일러 사용
+- ``scripts.core``는 프로파일러를 재수출하지 않아 두 번째 프로파일러 모듈이 로드되지 않음
+"""
+
+import json
+import pstats
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from core.stage_profiler import (
+    StageProfiler,
+    get_active_profiler,
+    profile_phase,
+    record_rows,
+    set_active_profiler,
+)
+
+
+@pytest.fixture
+def profiler():
+    profiler = StageProfiler()
+    set_active_profiler(profiler)
+    yield profiler
+    set_active_profiler(None)
+
+
+def test_nested_phases_rows_and_rss(profiler):
+    with profiler.stage(2, "Derived Columns"):
+        with profile_phase("load"):
+            time.sleep(0.01)
+        record_rows(500)
+        with profile_phase("derive", rows=500):
+            with profile_phase("stack"):
+                pass
+        with profile_phase("save"):
+            pass
+
+    stage = profiler.to_dict()["stages"][0]
+    assert stage["stage"] == 2 and stage["status"] == "ok"
+    assert [phase["name"] for phase in stage["phases"]] == ["load", "derive", "save"]
+    assert stage["phases"][0]["seconds"] >= 0.01
+    assert stage["phases"][1]["phases"][0]["name"] == "stack"
+    assert stage["phases"][1]["rows"] == 500
+    assert stage["rows"] == 500 and stage["rows_per_sec"] > 0
+    assert stage["seconds"] >= stage["phases"][0]["seconds"]
+    assert stage["peak_rss_mb"] is None or stage["peak_rss_mb"] > 0
+
+
+def test_failed_and_cached_stages(profiler):
+    profiler.mark_cached(1, "Data Synchronization")
+    with pytest.raises(ValueError):
+        with profiler.stage(2):
+            with profile_phase("derive"):
+                raise ValueError("boom")
+    with profiler.stage(3):
+        profiler.mark_failed()
+
+    statuses = [(stage.stage, stage.status) for stage in profiler.stages]
+    assert statuses == [(1, "cached"), (2, "failed"), (3, "failed")]
+    assert profiler.stages[1].phases[0].name == "derive"
+
+
+def test_write_run_profile_json(profiler, tmp_path):
+    with profiler.stage(1):
+        record_rows(10)
+
+    path = profiler.write(tmp_path / "out" / "run_profile.json")
+
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["format_version"] == 1
+    assert data["stages"][0]["rows"] == 10
+    assert data["total_seconds"] >= data["stages"][0]["seconds"]
+    assert {"started_at", "argv", "pid"} <= set(data)
+
+
+def test_cprofile_dumps_pstats_per_stage(tmp_path):
+    profiler = StageProfiler(cprofile_dir=tmp_path / "profiles")
+
+    with profiler.stage(4):
+        sorted(range(1000), key=lambda value: -value)
+
+    pstats_path = Path(profiler.stages[0].pstats)
+    assert pstats_path == tmp_path / "profiles" / "stage4.pstats"
+    assert pstats.Stats(str(pstats_path)).total_calls > 0
+
+
+def test_inactive_profiler_is_noop():
+    set_active_profiler(None)
+
+    with profile_phase("load", rows=3):
+        record_rows(3)
+
+    assert get_active_profiler() is None
+
+
+def test_stage1_records_into_core_profiler(profiler):
+    import core.stage_profiler as core_module
+    from scripts.stage1_sync_sorted import data_synchronizer_v30 as stage1
+
+    assert stage1.profile_phase is core_module.profile_phase
+    with profiler.stage(1):
+        with stage1.profile_phase("sync"):
+            stage1.record_rows(5)
+    assert profiler.stages[0].phases[0].name == "sync"
+    assert profiler.stages[0].rows == 5
+
+
+def test_scripts_core_does_not_load_a_second_profiler(profiler):
+    import core.stage_profiler as core_module
+    import scripts.core
+    from scripts.stage3_report import report_generator
+
+    assert not hasattr(scripts.core, "set_active_profiler")
+    assert "scripts.core.stage_profiler" not in sys.modules
+    assert report_generator.profile_phase is core_module.profile_phase
+    assert core_module.get_active_profiler() is profiler
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+core.workbook_reader 단일 패스 로더 테스트
+
+Test Coverage:
+- 헤더 탐지 결과가 detect_header_row()와 동일
+- DataFrame이 pd.read_excel(header=...) 결과와 동일
+- 빈 시트 / 제목 행 / 중복 헤더 / 오류 셀 처리
+"""
+
+import datetime as dt
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(PROJECT_ROOT / "scripts"))
+
+from core import (
+    detect_header_row,
+    open_workbook,
+    read_sheet_with_header_detection,
+    read_workbook_sheets,
+)
+
+
+@pytest.fixture
+def multi_sheet_workbook(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Case List"
+    ws.append(["HVDC Case List"])
+    ws.append([])
+    ws.append(["No", "Case No.", "ETA/ATA", "DSV Indoor", "Qty", None, "Qty", "Stack"])
+    for i in range(40):
+        ws.append(
+            [
+                i + 1,
+                f"C{i:04d}",
+                dt.datetime(2024, 1, 1) + dt.timedelta(days=i),
+                None if i % 3 else dt.datetime(2024, 2, 1),
+                "12" if i % 5 == 0 else 3.0,
+                None,
+                1.5 * i,
+                "X2" if i % 2 else None,
+            ]
+        )
+    ws.append([])
+    ws.append([None, "C9999"])
+
+    local = wb.create_sheet("HE Local")
+    local.append(["No", "Case No.", "DSV WH", "MIR"])
+    for i in range(25):
+        local.append([i, f"H{i}", dt.datetime(2024, 3, 1), "=NA()" if i == 3 else None])
+
+    wb.create_sheet("empty")
+
+    path = tmp_path / "cases.xlsx"
+    wb.save(path)
+    return str(path)
+
+
+def test_single_pass_matches_two_step_load(multi_sheet_workbook):
+    xl = pd.ExcelFile(multi_sheet_workbook)
+
+    with open_workbook(multi_sheet_workbook) as book:
+        assert book.sheet_names == xl.sheet_names
+
+        for sheet_name in xl.sheet_names:
+            expected_row, expected_conf = detect_header_row(multi_sheet_workbook, sheet_name)
+            expected = pd.read_excel(xl, sheet_name=sheet_name, header=expected_row)
+
+            result = read_sheet_with_header_detection(book, sheet_name)
+
+            assert result.header_row == expected_row
+            assert result.confidence == pytest.approx(expected_conf)
+            pd.testing.assert_frame_equal(result.data, expected)
+            assert result.parse_seconds >= 0
+
+
+def test_detects_header_below_title_rows(multi_sheet_workbook):
+    with open_workbook(multi_sheet_workbook) as book:
+        result = read_sheet_with_header_detection(book, "Case List")
+
+    assert result.header_row == 2
+    assert list(result.data.columns[:3]) == ["No", "Case No.", "ETA/ATA"]
+    assert "Qty.1" in result.data.columns
+    assert pd.api.types.is_datetime64_any_dtype(result.data["ETA/ATA"])
+
+
+def test_parallel_read_keeps_sheet_order(multi_sheet_workbook):
+    sheet_names = ["HE Local", "Case List", "empty"]
+
+    serial = read_workbook_sheets(multi_sheet_workbook, sheet_names, max_workers=1)
+    parallel = read_workbook_sheets(multi_sheet_workbook, sheet_names, max_workers=2)
+
+    assert [r.sheet_name for r in parallel] == sheet_names
+    for expected, actual in zip(serial, parallel):
+        assert actual.header_row == expected.header_row
+        pd.testing.assert_frame_equal(actual.data, expected.data)